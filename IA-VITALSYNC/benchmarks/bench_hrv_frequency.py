@@ -0,0 +1,170 @@
+"""
+bench_hrv_frequency.py
+----------------------
+Benchmark das features de HRV no domínio da frequência (hrv_frequency.py) em
+registros de 24h: custo por registro (média dos segmentos de 5 min) e por janela
+deslizante, nos métodos 'welch' (reamostragem + FFT) e 'lomb' (Lomb-Scargle).
+
+O tempo é normalizado para 24h de registro e comparado com um orçamento fixo por
+método e modo (BUDGETS_MS); o script sai com código 1 se algum for estourado.
+
+Séries usadas:
+- duas séries sintéticas de 24h (synthetic_data.py), uma sinusal e uma de FA; na
+  sinusal, os picos de LF e HF são conferidos com as modulações geradas (Mayer em
+  0.1 Hz e respiração entre 0.2 e 0.3 Hz)
+- os intervalos NN dos registros do NSRDB (anotações .atr, ~24h), quando disponíveis
+
+USO:
+    python benchmarks/bench_hrv_frequency.py
+    python benchmarks/bench_hrv_frequency.py --repeat 10 --max-records 5 --hop-seconds 30
+    python benchmarks/bench_hrv_frequency.py --budget-scale 2    # máquina mais lenta
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from hrv_frequency import (
+    METHODS, SEGMENT_SECONDS, frequency_features, nn_intervals, windowed_frequency_features
+)
+from synthetic_data import generate_rr_intervals
+
+
+# Orçamento (ms por 24h de registro, 1 núcleo) de cada método e modo
+BUDGETS_MS = {
+    ('welch', 'registro'): 100,
+    ('welch', 'janelas'): 250,
+    ('lomb', 'registro'): 750,
+    ('lomb', 'janelas'): 2000,
+}
+
+# Faixas esperadas dos picos na série sinusal sintética (Hz)
+EXPECTED_PEAKS = {
+    'hrv_lf_peak_hz': (0.08, 0.12),
+    'hrv_hf_peak_hz': (0.18, 0.32),
+}
+
+
+def load_nsrdb_series(nsrdb_root: Path, max_records: int):
+    """
+    Intervalos NN e instantes dos batimentos dos registros do NSRDB.
+    """
+    import wfdb
+    series = []
+    for hea_file in sorted(nsrdb_root.glob('*.hea'))[:max_records]:
+        record_path = str(hea_file.with_suffix(''))
+        fs = wfdb.rdheader(record_path).fs
+        annotation = wfdb.rdann(record_path, 'atr')
+        series.append((hea_file.stem, *nn_intervals(annotation.sample, annotation.symbol, fs)))
+    return series
+
+
+def synthetic_series(seed: int = 42):
+    """
+    Uma série sinusal e uma de FA com 24h cada.
+    """
+    series = []
+    for i, rhythm in enumerate(['sinus', 'af']):
+        rr, _ = generate_rr_intervals(86400, rhythm, heart_rate=70.0, ectopic_rate=0.005,
+                                      rng=np.random.default_rng([seed, i]))
+        series.append((f"synthetic-{rhythm}", rr, np.cumsum(rr)))
+    return series
+
+
+def best_time(func, repeat: int) -> float:
+    """
+    Melhor tempo (s) de `repeat` execuções.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark das features de HRV no domínio da frequência')
+    parser.add_argument('--nsrdb-root', type=str,
+                        default=str(Path(__file__).parent.parent / 'data' / 'raw' / 'nsrdb'),
+                        help='Pasta do NSRDB (padrão: data/raw/nsrdb)')
+    parser.add_argument('--max-records', type=int, default=3,
+                        help='Número máximo de registros do NSRDB (padrão: 3)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Repetições por medida (padrão: 5)')
+    parser.add_argument('--window-seconds', type=float, default=SEGMENT_SECONDS,
+                        help=f'Duração das janelas (padrão: {SEGMENT_SECONDS:g} s)')
+    parser.add_argument('--hop-seconds', type=float, default=60.0,
+                        help='Passo entre janelas (padrão: 60 s)')
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help='Multiplicador dos orçamentos de BUDGETS_MS (padrão: 1)')
+    parser.add_argument('--seed', type=int, default=42, help='Semente das séries sintéticas (padrão: 42)')
+    args = parser.parse_args()
+
+    series = synthetic_series(args.seed)
+    nsrdb_root = Path(args.nsrdb_root)
+    if nsrdb_root.exists() and any(nsrdb_root.glob('*.atr')):
+        series += load_nsrdb_series(nsrdb_root, args.max_records)
+    else:
+        print("⚠️  NSRDB não encontrado, usando só as séries sintéticas")
+
+    print("=" * 90)
+    print("⏱️  BENCHMARK: HRV NO DOMÍNIO DA FREQUÊNCIA (ms por 24h de registro)")
+    print("=" * 90)
+    print(f"{'Registro':<18} {'Intervalos':>10} {'Horas':>6} {'Método':>7} {'Registro (ms)':>14} "
+          f"{'Janelas':>8} {'Janelas (ms)':>13} {'LF/HF':>7}")
+    print("-" * 90)
+
+    worst = {key: 0.0 for key in BUDGETS_MS}
+    failures = []
+
+    for name, rr_intervals, beat_times in series:
+        hours = (beat_times[-1] - beat_times[0]) / 3600
+        per_24h = 24 / hours
+        for method in METHODS:
+            features = frequency_features(rr_intervals, beat_times, method=method)
+            windows = windowed_frequency_features(rr_intervals, beat_times, args.window_seconds,
+                                                  args.hop_seconds, method)
+
+            record_ms = best_time(lambda: frequency_features(rr_intervals, beat_times, method=method),
+                                  args.repeat) * 1000 * per_24h
+            windows_ms = best_time(lambda: windowed_frequency_features(rr_intervals, beat_times,
+                                                                       args.window_seconds,
+                                                                       args.hop_seconds, method),
+                                   args.repeat) * 1000 * per_24h
+            worst[(method, 'registro')] = max(worst[(method, 'registro')], record_ms)
+            worst[(method, 'janelas')] = max(worst[(method, 'janelas')], windows_ms)
+
+            print(f"{name:<18} {len(rr_intervals):>10} {hours:>6.1f} {method:>7} {record_ms:>14.1f} "
+                  f"{len(windows):>8} {windows_ms:>13.1f} {features['hrv_lf_hf_ratio']:>7.2f}")
+
+            if name == 'synthetic-sinus':
+                for feature, (low, high) in EXPECTED_PEAKS.items():
+                    if not low <= features[feature] <= high:
+                        failures.append(f"{name} ({method}): {feature} = {features[feature]:.3f} Hz, "
+                                        f"esperado entre {low} e {high}")
+
+    print("-" * 90)
+    print("\n💰 Orçamento (pior caso, ms por 24h):")
+    for (method, mode), budget in BUDGETS_MS.items():
+        budget *= args.budget_scale
+        ok = worst[(method, mode)] <= budget
+        print(f"   {'✅' if ok else '❌'} {method:>5} / {mode:<8} {worst[(method, mode)]:8.1f} ms "
+              f"(limite: {budget:.0f} ms)")
+        if not ok:
+            failures.append(f"{method}/{mode}: {worst[(method, mode)]:.1f} ms > {budget:.0f} ms")
+
+    print("=" * 90)
+    if failures:
+        print("❌ Falhas:")
+        for failure in failures:
+            print(f"   • {failure}")
+        sys.exit(1)
+    print("✅ Dentro do orçamento e com picos de LF/HF nas frequências esperadas")
+
+
+if __name__ == "__main__":
+    main()
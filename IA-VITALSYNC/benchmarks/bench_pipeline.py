@@ -0,0 +1,377 @@
+"""
+bench_pipeline.py
+-----------------
+Benchmark de ponta a ponta do pipeline do IA-VITALSYNC com registros WFDB sintéticos.
+
+Gera um conjunto de registros com synthetic_data.py (FA no layout do aftdb, ritmo
+normal no do nsrdb) em uma pasta temporária e mede cada etapa:
+
+    load_all_records             catálogo frio (lê cabeçalhos e anotações)
+    load_all_records (quente)    revalidação incremental do catálogo
+    extract_features_from_all_records
+    extract_features_from_record latência por registro
+    train_models                 divisão treino/teste + os três modelos
+    evaluate_models
+    predict_ecg                  latência por registro (modelo compilado, como em produção)
+
+Para cada etapa: tempo (mediana de --repeat execuções), vazão (registros/s,
+batimentos/s, predições/s), percentis de latência por item e pico de RSS do
+processo durante a etapa (amostrado de /proc; processos filhos com --workers > 1
+não entram na conta).
+
+USO:
+    python benchmarks/bench_pipeline.py run --records 20 --duration-min 10
+    python benchmarks/bench_pipeline.py run --json reports/bench_baseline.json
+    python benchmarks/bench_pipeline.py run --baseline reports/bench_baseline.json
+    python benchmarks/bench_pipeline.py compare reports/bench_baseline.json reports/bench_new.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import threading
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from synthetic_data import generate_dataset
+
+# Versão do formato do JSON de resultados
+RESULTS_FORMAT_VERSION = 1
+
+# Métricas comparadas pelo `compare`: nome → True se "maior é melhor"
+COMPARED_METRICS = {
+    'seconds': False,
+    'records_per_s': True,
+    'beats_per_s': True,
+    'predictions_per_s': True,
+    'latency_p95_ms': False,
+    'peak_rss_mb': False,
+}
+
+
+class PeakRSSSampler:
+    """
+    Amostra o RSS do processo em uma thread (Linux: /proc/self/statm) e guarda o pico.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+    def _rss_bytes(self) -> int:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * self._page_size
+        except OSError:
+            import resource
+            scale = 1 if sys.platform == 'darwin' else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_bytes = self._rss_bytes()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._rss_bytes())
+
+
+def latency_percentiles(latencies_s: List[float]) -> Dict:
+    latencies_ms = np.asarray(latencies_s) * 1000
+    return {
+        'latency_p50_ms': float(np.percentile(latencies_ms, 50)),
+        'latency_p95_ms': float(np.percentile(latencies_ms, 95)),
+        'latency_p99_ms': float(np.percentile(latencies_ms, 99)),
+        'latency_max_ms': float(latencies_ms.max()),
+    }
+
+
+def measure_stage(func: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict:
+    """
+    Executa func `repeat` vezes (com setup antes de cada execução, fora da medição).
+
+    func pode devolver uma lista de latências por item (s); as de todas as
+    execuções entram nos percentis.
+
+    Returns:
+        {'seconds', 'seconds_min', 'peak_rss_mb', 'latencies', 'result'}
+    """
+    durations, latencies, peak = [], [], 0
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with PeakRSSSampler() as sampler, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            durations.append(time.perf_counter() - start)
+        peak = max(peak, sampler.peak_bytes)
+        if isinstance(result, dict) and 'latencies' in result:
+            latencies += result['latencies']
+    return {
+        'seconds': float(np.median(durations)),
+        'seconds_min': float(min(durations)),
+        'peak_rss_mb': peak / 1024 ** 2,
+        'latencies': latencies,
+        'result': result
+    }
+
+
+def run_benchmark(args) -> Dict:
+    """
+    Gera os dados sintéticos e mede todas as etapas.
+    """
+    from data_loader import load_all_records
+    from feature_extraction import extract_features_from_all_records, extract_features_from_record
+    from train_model import split_and_scale_data, train_models, evaluate_models, make_groups
+    from compiled_model import export_compiled_model, PassthroughScaler
+    from predict import predict_ecg
+    import reporting
+
+    # Mensagens de status do pipeline vão para o log (stderr): mede-se o modo
+    # --quiet, e só avisos/erros aparecem no meio da tabela
+    reporting.configure_logging(quiet=True)
+
+    work_dir = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix='vitalsync-bench-'))
+    data_root = work_dir / 'raw'
+    catalog_path = work_dir / 'record_catalog.json'
+    try:
+        print(f"🧪 Gerando {2 * args.records} registros sintéticos de {args.duration_min:g} min "
+              f"em {data_root}...")
+        start = time.perf_counter()
+        generated = generate_dataset(data_root, args.records, args.records, args.duration_min * 60,
+                                     args.fs, args.heart_rate, args.af_irregularity, args.ectopic_rate,
+                                     seed=args.seed)
+        print(f"   {generated['beats']} batimentos em {time.perf_counter() - start:.1f}s\n")
+        n_records, n_beats = generated['records'], generated['beats']
+
+        stages = {}
+
+        def record(name: str, measured: Dict, items: int = 0, beats: int = 0, predictions: int = 0):
+            stage = {
+                'seconds': measured['seconds'],
+                'seconds_min': measured['seconds_min'],
+                'peak_rss_mb': measured['peak_rss_mb'],
+            }
+            if items:
+                stage['records_per_s'] = items / measured['seconds']
+            if beats:
+                stage['beats_per_s'] = beats / measured['seconds']
+            if predictions:
+                stage['predictions_per_s'] = predictions / measured['seconds']
+            if measured['latencies']:
+                stage.update(latency_percentiles(measured['latencies']))
+            stages[name] = stage
+            extra = f" | p95 {stage['latency_p95_ms']:.2f} ms" if 'latency_p95_ms' in stage else ''
+            print(f"   ✅ {name:<36} {stage['seconds']:>8.3f} s | pico RSS {stage['peak_rss_mb']:>6.0f} MB{extra}")
+
+        print("⏱️  Etapas:")
+        load = measure_stage(lambda: load_all_records(str(data_root), catalog_path=catalog_path),
+                             args.repeat, setup=lambda: catalog_path.unlink(missing_ok=True))
+        records_info = load['result']
+        record('load_all_records', load, items=n_records, beats=n_beats)
+
+        warm = measure_stage(lambda: load_all_records(str(data_root), catalog_path=catalog_path), args.repeat)
+        record('load_all_records (quente)', warm, items=n_records)
+
+        extract = measure_stage(
+            lambda: extract_features_from_all_records(records_info, n_workers=args.workers or None),
+            args.repeat)
+        df = extract['result']
+        record('extract_features_from_all_records', extract, items=n_records, beats=n_beats)
+
+        def extract_each():
+            latencies = []
+            for info in records_info:
+                start = time.perf_counter()
+                extract_features_from_record(info['full_path'], info['label'], info['annotation_ext'])
+                latencies.append(time.perf_counter() - start)
+            return {'latencies': latencies}
+
+        record('extract_features_from_record', measure_stage(extract_each, args.repeat),
+               items=n_records, beats=n_beats)
+
+        feature_cols = [col for col in df.columns if col not in ['label', 'record_name', 'dataset', 'subset']]
+        X, y = df[feature_cols].values, df['label'].values
+        with contextlib.redirect_stdout(io.StringIO()):
+            X_train, X_test, y_train, y_test, scaler = split_and_scale_data(X, y, groups=make_groups(df))
+
+        train = measure_stage(lambda: train_models(X_train, y_train), args.repeat)
+        models = train['result']
+        record('train_models', train, items=len(X_train))
+
+        evaluate = measure_stage(lambda: evaluate_models(models, X_test, y_test), args.repeat)
+        record('evaluate_models', evaluate, predictions=len(X_test) * len(models))
+
+        compiled = export_compiled_model(models['Random Forest'], scaler, work_dir / 'best_model.npz',
+                                         feature_cols)
+
+        def predict_each():
+            latencies = []
+            for info in records_info:
+                start = time.perf_counter()
+                predict_ecg(info['full_path'], compiled, PassthroughScaler(), info['annotation_ext'])
+                latencies.append(time.perf_counter() - start)
+            return {'latencies': latencies}
+
+        record('predict_ecg', measure_stage(predict_each, args.repeat), predictions=n_records)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'version': RESULTS_FORMAT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'records': n_records,
+            'beats': n_beats,
+            'duration_min': args.duration_min,
+            'fs': args.fs,
+            'heart_rate': args.heart_rate,
+            'af_irregularity': args.af_irregularity,
+            'ectopic_rate': args.ectopic_rate,
+            'workers': args.workers,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'stages': stages
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, tolerance: float) -> List[str]:
+    """
+    Imprime a comparação etapa a etapa e devolve as regressões acima da tolerância.
+    """
+    if baseline.get('config') != current.get('config'):
+        print("⚠️  Configurações diferentes entre as execuções: a comparação pode não ser justa")
+
+    print(f"\n{'Etapa':<36} {'Métrica':<18} {'Baseline':>11} {'Atual':>11} {'Variação':>9}")
+    print("-" * 90)
+    regressions = []
+    for name, stage in current['stages'].items():
+        previous = baseline['stages'].get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric not in stage or metric not in previous or not previous[metric]:
+                continue
+            change = stage[metric] / previous[metric] - 1
+            worse = -change if higher_is_better else change
+            flag = '❌' if worse > tolerance else ('✅' if worse < -tolerance else '  ')
+            print(f"{name:<36} {metric:<18} {previous[metric]:>11.3f} {stage[metric]:>11.3f} "
+                  f"{change:>+8.1%} {flag}")
+            if worse > tolerance:
+                regressions.append(f"{name} / {metric}: {previous[metric]:.3f} → {stage[metric]:.3f} "
+                                   f"({change:+.1%})")
+    return regressions
+
+
+def report_regressions(regressions: List[str], tolerance: float):
+    if regressions:
+        print(f"\n❌ REGRESSÕES (tolerância {tolerance:.0%}):")
+        for regression in regressions:
+            print(f"   • {regression}")
+        sys.exit(1)
+    print(f"\n✅ Nenhuma regressão acima de {tolerance:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de ponta a ponta do pipeline (dados sintéticos)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Gerar registros sintéticos e medir as etapas')
+    run.add_argument('--records', type=int, default=20,
+                     help='Registros por classe (padrão: 20 de FA + 20 normais)')
+    run.add_argument('--duration-min', type=float, default=10.0,
+                     help='Duração de cada registro em minutos (padrão: 10)')
+    run.add_argument('--fs', type=int, default=128, help='Frequência de amostragem (padrão: 128 Hz)')
+    run.add_argument('--heart-rate', type=float, default=72.0,
+                     help='Frequência cardíaca média dos registros normais (padrão: 72 bpm; FA usa +15%%)')
+    run.add_argument('--af-irregularity', type=float, default=0.2,
+                     help='Coeficiente de variação dos intervalos R-R na FA (padrão: 0.2)')
+    run.add_argument('--ectopic-rate', type=float, default=0.005,
+                     help='Fração média de extrassístoles (padrão: 0.005)')
+    run.add_argument('--workers', '-j', type=int, default=1,
+                     help='Processos na extração de features (padrão: 1, 0 = todos os núcleos)')
+    run.add_argument('--repeat', type=int, default=3,
+                     help='Execuções por etapa; o tempo reportado é a mediana (padrão: 3)')
+    run.add_argument('--seed', type=int, default=42, help='Semente dos dados sintéticos (padrão: 42)')
+    run.add_argument('--keep', type=str, default=None,
+                     help='Gerar os dados nesta pasta e mantê-los (padrão: pasta temporária)')
+    run.add_argument('--json', type=str, default=None, help='Salvar os resultados em JSON')
+    run.add_argument('--baseline', type=str, default=None, help='Comparar com um JSON salvo antes')
+    run.add_argument('--tolerance', type=float, default=0.2,
+                     help='Piora máxima aceita em relação ao baseline (padrão: 0.2 = 20%%)')
+
+    compare = subparsers.add_parser('compare', help='Comparar dois JSONs de resultados')
+    compare.add_argument('baseline', type=str, help='JSON de referência')
+    compare.add_argument('current', type=str, help='JSON da execução atual')
+    compare.add_argument('--tolerance', type=float, default=0.2,
+                         help='Piora máxima aceita (padrão: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    print("=" * 90)
+    print("⏱️  BENCHMARK: PIPELINE IA-VITALSYNC")
+    print("=" * 90)
+
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        report_regressions(compare_results(baseline, current, args.tolerance), args.tolerance)
+        return
+
+    results = run_benchmark(args)
+
+    config = results['config']
+    print(f"\n📊 {config['records']} registros, {config['beats']} batimentos, {results['cpu_count']} CPU(s)")
+    print(f"\n{'Etapa':<36} {'Tempo (s)':>10} {'Registros/s':>12} {'Batimentos/s':>13} "
+          f"{'Predições/s':>12} {'p50/p95 (ms)':>15} {'RSS (MB)':>9}")
+    print("-" * 112)
+    for name, stage in results['stages'].items():
+        def fmt(key, spec='.1f'):
+            return format(stage[key], spec) if key in stage else '-'
+        percentiles = (f"{stage['latency_p50_ms']:.2f}/{stage['latency_p95_ms']:.2f}"
+                       if 'latency_p50_ms' in stage else '-')
+        print(f"{name:<36} {stage['seconds']:>10.3f} {fmt('records_per_s'):>12} {fmt('beats_per_s', '.0f'):>13} "
+              f"{fmt('predictions_per_s'):>12} {percentiles:>15} {stage['peak_rss_mb']:>9.0f}")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados salvos em: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report_regressions(compare_results(baseline, results, args.tolerance), args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+bench_rr_statistics.py
+----------------------
+Benchmark do kernel de estatísticas R-R (feature_extraction.compute_rr_statistics)
+contra o cálculo anterior, feature por feature, com np.mean/np.percentile/etc.
+
+Usa os registros longos do NSRDB (anotações .atr, ~24h) quando disponíveis;
+caso contrário, gera séries R-R sintéticas de 24h (synthetic_data.py).
+
+USO:
+    python benchmarks/bench_rr_statistics.py
+    python benchmarks/bench_rr_statistics.py --repeat 50 --max-records 5
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import wfdb
+
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from feature_extraction import (
+    extract_rr_intervals, calculate_cv, calculate_rmssd,
+    compute_rr_statistics, RR_STATISTICS_NAMES
+)
+from synthetic_data import generate_rr_intervals
+
+
+def legacy_rr_statistics(rr_intervals: np.ndarray) -> dict:
+    """
+    Cálculo original de extract_features_from_record (uma passada por feature).
+    """
+    return {
+        'rr_mean': np.mean(rr_intervals),
+        'rr_std': np.std(rr_intervals),
+        'rr_median': np.median(rr_intervals),
+        'rr_min': np.min(rr_intervals),
+        'rr_max': np.max(rr_intervals),
+        'rr_cv': calculate_cv(rr_intervals),
+        'rr_rmssd': calculate_rmssd(rr_intervals),
+        'rr_range': np.max(rr_intervals) - np.min(rr_intervals),
+        'rr_percentile_25': np.percentile(rr_intervals, 25),
+        'rr_percentile_75': np.percentile(rr_intervals, 75),
+        'rr_iqr': np.percentile(rr_intervals, 75) - np.percentile(rr_intervals, 25),
+        'mean_hr_bpm': 60.0 / np.mean(rr_intervals) if np.mean(rr_intervals) > 0 else 0,
+    }
+
+
+def load_nsrdb_rr_series(nsrdb_root: Path, max_records: int):
+    """
+    Lê as séries R-R dos registros do NSRDB (apenas anotações + cabeçalho).
+    """
+    series = []
+    for hea_file in sorted(nsrdb_root.glob('*.hea'))[:max_records]:
+        record_path = str(hea_file.with_suffix(''))
+        fs = wfdb.rdheader(record_path).fs
+        annotation = wfdb.rdann(record_path, 'atr')
+        series.append((hea_file.stem, extract_rr_intervals(annotation.sample, fs)))
+    return series
+
+
+def synthetic_rr_series(n_records: int, seed: int = 42):
+    """
+    Gera séries R-R de 24h (~100 mil batimentos) para quando o NSRDB não estiver disponível.
+    """
+    return [(f"synthetic-{i}", generate_rr_intervals(86400, 'sinus', heart_rate=70.0, ectopic_rate=0.005,
+                                                     rng=np.random.default_rng([seed, i]))[0])
+            for i in range(n_records)]
+
+
+def time_function(func, rr_intervals: np.ndarray, repeat: int) -> float:
+    """
+    Retorna o melhor tempo (em ms) de `repeat` execuções.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rr_intervals)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do kernel de estatísticas R-R')
+    parser.add_argument('--nsrdb-root', type=str,
+                        default=str(Path(__file__).parent.parent / 'data' / 'raw' / 'nsrdb'),
+                        help='Pasta do NSRDB (padrão: data/raw/nsrdb)')
+    parser.add_argument('--max-records', type=int, default=18,
+                        help='Número máximo de registros (padrão: 18)')
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='Repetições por registro (padrão: 20)')
+    args = parser.parse_args()
+
+    nsrdb_root = Path(args.nsrdb_root)
+    if nsrdb_root.exists() and any(nsrdb_root.glob('*.atr')):
+        series = load_nsrdb_rr_series(nsrdb_root, args.max_records)
+    else:
+        print("⚠️  NSRDB não encontrado, usando séries R-R sintéticas de 24h")
+        series = synthetic_rr_series(min(args.max_records, 5))
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK: ESTATÍSTICAS R-R (legado vs kernel)")
+    print("=" * 80)
+    print(f"{'Registro':<15} {'Intervalos':>10} {'Legado (ms)':>12} {'Kernel (ms)':>12} {'Speedup':>8}")
+    print("-" * 80)
+
+    total_legacy = 0.0
+    total_kernel = 0.0
+
+    for name, rr_intervals in series:
+        # Conferir que os dois caminhos produzem as mesmas features
+        legacy = legacy_rr_statistics(rr_intervals)
+        kernel = compute_rr_statistics(rr_intervals)
+        expected = np.array([legacy[feature] for feature in RR_STATISTICS_NAMES])
+        if not np.allclose(kernel, expected, rtol=1e-9):
+            raise AssertionError(f"Divergência nas features do registro {name}")
+
+        legacy_ms = time_function(legacy_rr_statistics, rr_intervals, args.repeat)
+        kernel_ms = time_function(compute_rr_statistics, rr_intervals, args.repeat)
+        total_legacy += legacy_ms
+        total_kernel += kernel_ms
+
+        print(f"{name:<15} {len(rr_intervals):>10} {legacy_ms:>12.3f} {kernel_ms:>12.3f} "
+              f"{legacy_ms / kernel_ms:>7.1f}x")
+
+    print("-" * 80)
+    print(f"{'TOTAL':<15} {'':>10} {total_legacy:>12.3f} {total_kernel:>12.3f} "
+          f"{total_legacy / total_kernel:>7.1f}x")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+bench_startup.py
+----------------
+Benchmark de inicialização a frio dos pontos de entrada (predict.py, train_model.py).
+
+Cada cenário roda em um interpretador novo com `python -X importtime` e mede:
+- o tempo total do processo (melhor de N execuções)
+- o tempo gasto em imports (soma da coluna "self" do -X importtime)
+- os módulos carregados, conferidos contra a lista de módulos pesados que o
+  cenário NÃO deve importar (ex: `predict.py --help` não deve carregar wfdb,
+  pandas ou scikit-learn)
+
+Com --baseline, compara com um JSON salvo antes (--json) e falha se algum
+cenário ficar mais lento que a tolerância.
+
+USO:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --json reports/startup.json
+    python benchmarks/bench_startup.py --baseline reports/startup.json --tolerance 0.25
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / 'src'
+
+# Módulos pesados acompanhados pelo benchmark
+HEAVY_MODULES = ['numpy', 'pandas', 'wfdb', 'joblib', 'sklearn', 'scipy', 'matplotlib', 'seaborn']
+
+SAMPLE_RECORD = PROJECT_ROOT / 'data' / 'raw' / 'nsrdb' / '16265'
+
+# Classificação de um vetor de features já calculado (caminho do prediction_server)
+PRECOMPUTED_FEATURES_CODE = """
+from pathlib import Path
+import predict
+model, scaler = predict.load_models(Path({models_dir!r}))
+from feature_extraction import MODEL_FEATURE_NAMES
+features = dict.fromkeys(MODEL_FEATURE_NAMES, 0.5)
+predict.predict_from_features([features], model, scaler)
+"""
+
+
+def compiled_model_available() -> bool:
+    """
+    Se o models/best_model.npz atual existe (sem ele, predict.py usa o scikit-learn).
+    """
+    sys.path.insert(0, str(SRC_DIR))
+    from compiled_model import COMPILED_MODEL_FILE, is_compiled_model_fresh
+    path = PROJECT_ROOT / 'models' / COMPILED_MODEL_FILE
+    return path.exists() and is_compiled_model_fresh(path)
+
+
+def build_scenarios() -> List[Dict]:
+    """
+    Cenários medidos: comando e módulos que não podem ser importados.
+    """
+    # Sem o modelo compilado atualizado, predict.py carrega o .pkl com scikit-learn
+    without_model = ['joblib', 'sklearn', 'scipy'] if compiled_model_available() else []
+
+    scenarios = [
+        {'name': 'predict.py --help',
+         'args': [str(SRC_DIR / 'predict.py'), '--help'],
+         'forbidden': HEAVY_MODULES},
+        {'name': 'import predict',
+         'args': ['-c', 'import predict'],
+         'forbidden': HEAVY_MODULES},
+        {'name': 'predict_from_features',
+         'args': ['-c', PRECOMPUTED_FEATURES_CODE.format(models_dir=str(PROJECT_ROOT / 'models'))],
+         'forbidden': ['pandas', 'wfdb', 'matplotlib', 'seaborn'] + without_model},
+        # train_model.py precisa de pandas/scikit-learn em todos os modos; só os
+        # gráficos (matplotlib/seaborn) são opcionais
+        {'name': 'train_model.py --help',
+         'args': [str(SRC_DIR / 'train_model.py'), '--help'],
+         'forbidden': ['matplotlib', 'seaborn']},
+    ]
+    if SAMPLE_RECORD.with_suffix('.hea').exists():
+        scenarios.append({'name': f'predict.py {SAMPLE_RECORD.name}',
+                          'args': [str(SRC_DIR / 'predict.py'), str(SAMPLE_RECORD)],
+                          'forbidden': ['matplotlib', 'seaborn'] + without_model})
+    return scenarios
+
+
+def parse_importtime(stderr: str) -> Dict:
+    """
+    Lê a saída do -X importtime: tempo total de import (ms), módulos e os
+    imports de primeiro nível mais caros.
+    """
+    modules = set()
+    top_level = []
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        total_us += int(self_us)
+        module = name.strip()
+        modules.add(module)
+        # Nível 0 = importado pelo próprio script (um único espaço antes do nome),
+        # sem os módulos da biblioteca padrão carregados na inicialização (site, encodings)
+        if len(name) - len(name.lstrip()) == 1 and module.split('.')[0] not in sys.stdlib_module_names:
+            top_level.append((int(cumulative_us) / 1000, module))
+    return {
+        'import_ms': total_us / 1000,
+        'modules': modules,
+        'top_imports': sorted(top_level, reverse=True)[:5]
+    }
+
+
+def run_scenario(scenario: Dict, repeat: int) -> Dict:
+    """
+    Executa o cenário `repeat` vezes e fica com a execução mais rápida.
+    """
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', *scenario['args']],
+                              cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, text=True)
+        wall_ms = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+            raise RuntimeError(f"{scenario['name']} terminou com código {proc.returncode}:\n"
+                               + '\n'.join(errors[-10:]))
+        if best is None or wall_ms < best['wall_ms']:
+            best = {'wall_ms': wall_ms, **parse_importtime(proc.stderr)}
+
+    loaded_roots = {module.split('.')[0] for module in best['modules']}
+    best['heavy_loaded'] = [m for m in HEAVY_MODULES if m in loaded_roots]
+    best['violations'] = [m for m in scenario['forbidden'] if m in loaded_roots]
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de inicialização (-X importtime) dos CLIs')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Execuções por cenário; vale a mais rápida (padrão: 5)')
+    parser.add_argument('--json', type=str, default=None,
+                        help='Salvar os resultados em JSON (para usar como --baseline depois)')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='JSON de uma execução anterior para comparar')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Aumento máximo do tempo em relação ao baseline (padrão: 0.25 = 25%%)')
+    args = parser.parse_args()
+
+    baseline: Optional[Dict] = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['scenarios']
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK: INICIALIZAÇÃO A FRIO (python -X importtime)")
+    print("=" * 80)
+    print(f"{'Cenário':<28} {'Total (ms)':>10} {'Imports (ms)':>13} {'Módulos':>8}  Pesados carregados")
+    print("-" * 80)
+
+    failures = []
+    results = {}
+    for scenario in build_scenarios():
+        result = run_scenario(scenario, args.repeat)
+        results[scenario['name']] = {
+            'wall_ms': round(result['wall_ms'], 1),
+            'import_ms': round(result['import_ms'], 1),
+            'modules': len(result['modules']),
+            'heavy_loaded': result['heavy_loaded']
+        }
+        print(f"{scenario['name']:<28} {result['wall_ms']:>10.1f} {result['import_ms']:>13.1f} "
+              f"{len(result['modules']):>8}  {', '.join(result['heavy_loaded']) or '-'}")
+        for cumulative_ms, module in result['top_imports'][:3]:
+            print(f"{'':<30}↳ {module} ({cumulative_ms:.1f} ms)")
+
+        if result['violations']:
+            failures.append(f"{scenario['name']}: importou {', '.join(result['violations'])}")
+        previous = (baseline or {}).get(scenario['name'])
+        if previous and result['wall_ms'] > previous['wall_ms'] * (1 + args.tolerance):
+            failures.append(f"{scenario['name']}: {result['wall_ms']:.0f} ms "
+                            f"(baseline {previous['wall_ms']:.0f} ms, tolerância {args.tolerance:.0%})")
+
+    print("=" * 80)
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'repeat': args.repeat, 'scenarios': results},
+                      f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados salvos em: {args.json}")
+
+    if failures:
+        print("❌ REGRESSÕES:")
+        for failure in failures:
+            print(f"   • {failure}")
+        sys.exit(1)
+    print("✅ Nenhuma regressão de inicialização")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""
+compiled_model.py
+-----------------
+Modelo de inferência "compilado": o melhor modelo do treinamento exportado para
+arrays NumPy em um único arquivo (models/best_model.npz), com o StandardScaler
+embutido nos parâmetros.
+
+- Random Forest (qualquer profundidade/número de folhas): os nós de todas as
+  árvores viram arrays planos (feature, limiar, filhos e probabilidade de cada
+  nó), percorridos para todos os pares (árvore, linha) ao mesmo tempo, um nível
+  por passo. O scaler é dobrado nos limiares:
+  a condição z <= t, com z = (x - média) / escala, vira x <= c na escala original
+  (com o mesmo arredondamento do scikit-learn, então as probabilidades são idênticas).
+- Regressão Logística: coeficientes e intercepto já na escala original das features.
+
+Carregar o artefato não exige scikit-learn nem joblib (apenas NumPy) e leva
+milissegundos. O .npz guarda tamanho, mtime e SHA-256 do best_model.pkl/scaler.pkl
+de origem, para que predict.load_models ignore um artefato desatualizado (o hash
+só é recalculado quando tamanho e mtime não bastam para decidir).
+
+O .npz é gerado (train_model.py ou este script) e não é versionado.
+
+USO:
+    python src/compiled_model.py                 # exporta models/best_model.pkl + scaler.pkl
+    python src/compiled_model.py models --check  # exporta e compara com o scikit-learn
+"""
+
+import os
+import time
+import hashlib
+import struct
+import argparse
+from pathlib import Path
+from typing import Dict, Sequence
+import numpy as np
+
+
+COMPILED_MODEL_FILE = 'best_model.npz'
+
+# Versão do formato do artefato (artefatos de outras versões são ignorados)
+COMPILED_FORMAT_VERSION = 2
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _scaler_params(scaler, n_features: int):
+    """
+    Média e escala do StandardScaler (identidade se não houver scaler).
+    """
+    mean = getattr(scaler, 'mean_', None)
+    scale = getattr(scaler, 'scale_', None)
+    mean = np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+    return mean, scale
+
+
+def _float_key(x: float) -> int:
+    """
+    Inteiro com a mesma ordem dos float64 (para busca binária entre floats vizinhos).
+    """
+    (bits,) = struct.unpack('<q', struct.pack('<d', x))
+    return bits if bits >= 0 else -(bits & 0x7FFFFFFFFFFFFFFF)
+
+
+def _key_float(key: int) -> float:
+    bits = key if key >= 0 else (-key) | -0x8000000000000000
+    return struct.unpack('<d', struct.pack('<q', bits))[0]
+
+
+def fold_threshold(threshold: float, mean: float, scale: float) -> float:
+    """
+    Limiar equivalente na escala original: o maior x (float64) tal que
+    float32((x - média) / escala) <= threshold.
+
+    As árvores do scikit-learn comparam a feature normalizada convertida para
+    float32; como essa conta é monótona em x, a condição vira x <= c e o c exato
+    é encontrado por busca binária, com resultado idêntico ao do scikit-learn.
+    """
+    def goes_left(x):
+        return np.float32((x - mean) / scale) <= threshold
+
+    guess = threshold * scale + mean
+    step = max(abs(guess), 1.0) * 1e-12
+    lo, hi = guess, guess
+    while goes_left(hi):
+        hi += step
+        step *= 2
+    while not goes_left(lo):
+        lo -= step
+        step *= 2
+
+    lo_key, hi_key = _float_key(lo), _float_key(hi)
+    while hi_key - lo_key > 1:
+        mid = (lo_key + hi_key) // 2
+        if goes_left(_key_float(mid)):
+            lo_key = mid
+        else:
+            hi_key = mid
+    return _key_float(lo_key)
+
+
+class CompiledForest:
+    """
+    Floresta de árvores de decisão binárias avaliada com NumPy vetorizado.
+
+    Os nós de todas as árvores ficam em arrays planos (um índice global por
+    nó), sem limite de folhas ou de profundidade. Cada passo desce um nível em
+    todos os pares (árvore, linha) que ainda não chegaram a uma folha; os pares
+    que chegam saem do conjunto ativo, então árvores profundas e desbalanceadas
+    não custam max_depth passos para todas as linhas.
+
+    Args:
+        feature: Feature testada por nó (0 nas folhas)
+        threshold: Limiar por nó na escala original das features (+inf nas folhas)
+        left: Filho esquerdo (x <= limiar) de cada nó; a própria folha nas folhas
+        right: Filho direito de cada nó; a própria folha nas folhas
+        proba: Probabilidade da classe 1 em cada nó (usada nas folhas)
+        roots: Índice da raiz de cada árvore
+        feature_names: Nomes das features, na ordem das colunas
+    """
+
+    kind = 'forest'
+
+    # Linhas avaliadas por vez (limita a memória das matrizes árvores × linhas)
+    CHUNK_ROWS = 4096
+
+    def __init__(self, feature, threshold, left, right, proba, roots,
+                 feature_names: Sequence[str] = ()):
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.proba = np.asarray(proba, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.feature_names = list(feature_names)
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = len(self.feature_names) or int(self.feature.max()) + 1
+        # Filhos intercalados: o próximo nó é children[2 * nó + (x > limiar)]
+        self._children = np.column_stack([self.left, self.right]).ravel()
+        self._is_leaf = self.left == np.arange(len(self.left))
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, feature_names: Sequence[str] = ()) -> 'CompiledForest':
+        """
+        Converte um RandomForestClassifier (ou outro ensemble de árvores com
+        estimators_) e dobra o scaler nos limiares.
+        """
+        mean, scale = _scaler_params(scaler, model.n_features_in_)
+        positive = list(model.classes_).index(1)
+        trees = [estimator.tree_ for estimator in getattr(model, 'estimators_', [model])]
+
+        features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            is_leaf = tree.children_left == -1
+            own = np.arange(tree.node_count) + offset
+            value = tree.value[:, 0, :]
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.array([
+                np.inf if leaf else fold_threshold(tree.threshold[node], mean[tree.feature[node]],
+                                                   scale[tree.feature[node]])
+                for node, leaf in enumerate(is_leaf)
+            ]))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            probas.append(value[:, positive] / value.sum(axis=1))
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(np.concatenate(features), np.concatenate(thresholds), np.concatenate(lefts),
+                   np.concatenate(rights), np.concatenate(probas), roots, feature_names)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'feature': self.feature, 'threshold': self.threshold, 'left': self.left,
+                'right': self.right, 'proba': self.proba, 'roots': self.roots}
+
+    @classmethod
+    def from_arrays(cls, data, feature_names: Sequence[str] = ()) -> 'CompiledForest':
+        return cls(data['feature'], data['threshold'], data['left'], data['right'], data['proba'],
+                   data['roots'], feature_names)
+
+    def _exit_leaves(self, X: np.ndarray) -> np.ndarray:
+        """
+        Folha de saída de cada árvore para cada linha de X, shape (n_árvores, n_linhas).
+        """
+        n_rows = len(X)
+        flat = np.ascontiguousarray(X.T).ravel()  # feature f da linha r em f * n_rows + r
+        offsets = self.feature * n_rows
+        node = np.repeat(self.roots, n_rows)
+        rows = np.tile(np.arange(n_rows), len(self.roots))
+        active = np.flatnonzero(~self._is_leaf[node])
+        while active.size:
+            current = node[active]
+            goes_right = flat[offsets[current] + rows[active]] > self.threshold[current]
+            current = self._children[2 * current + goes_right]
+            node[active] = current
+            active = active[~self._is_leaf[current]]
+        return node.reshape(len(self.roots), n_rows)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Probabilidades [P(normal), P(FA)] para cada linha de X (features sem normalizar).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        p_fa = np.empty(len(X))
+        for start in range(0, len(X), self.CHUNK_ROWS):
+            leaves = self._exit_leaves(X[start:start + self.CHUNK_ROWS])
+            p_fa[start:start + self.CHUNK_ROWS] = self.proba[leaves].mean(axis=0)
+        return np.column_stack([1.0 - p_fa, p_fa])
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_proba(X).argmax(axis=1)
+
+
+class CompiledLinear:
+    """
+    Modelo logístico binário com o scaler dobrado nos coeficientes.
+
+    Args:
+        coef: Coeficientes na escala original das features
+        intercept: Intercepto
+        feature_names: Nomes das features, na ordem das colunas
+    """
+
+    kind = 'linear'
+
+    def __init__(self, coef, intercept, feature_names: Sequence[str] = ()):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.feature_names = list(feature_names)
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = len(self.coef)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler=None, feature_names: Sequence[str] = ()) -> 'CompiledLinear':
+        mean, scale = _scaler_params(scaler, model.n_features_in_)
+        coef = model.coef_[0] / scale
+        intercept = model.intercept_[0] - coef @ mean
+        if list(model.classes_) != [0, 1]:
+            coef, intercept = -coef, -intercept
+        return cls(coef, intercept, feature_names)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {'coef': self.coef, 'intercept': np.array(self.intercept)}
+
+    @classmethod
+    def from_arrays(cls, data, feature_names: Sequence[str] = ()) -> 'CompiledLinear':
+        return cls(data['coef'], float(data['intercept']), feature_names)
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        p_fa = 1.0 / (1.0 + np.exp(-(X @ self.coef + self.intercept)))
+        return np.column_stack([1.0 - p_fa, p_fa])
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_proba(X).argmax(axis=1)
+
+
+class PassthroughScaler:
+    """
+    Scaler identidade: usado no lugar do StandardScaler quando o modelo
+    compilado já embute a normalização.
+    """
+
+    def transform(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64)
+
+
+COMPILED_KINDS = {cls.kind: cls for cls in (CompiledForest, CompiledLinear)}
+
+
+def compile_model(model, scaler=None, feature_names: Sequence[str] = ()):
+    """
+    Converte um modelo do scikit-learn (+ scaler) em CompiledForest ou CompiledLinear.
+
+    Raises:
+        ValueError: se o modelo não for suportado (ex: SVM) ou não for binário 0/1
+    """
+    if sorted(getattr(model, 'classes_', [])) != [0, 1]:
+        raise ValueError("apenas classificadores binários com classes 0/1 podem ser exportados")
+    if hasattr(model, 'estimators_') or hasattr(model, 'tree_'):
+        return CompiledForest.from_sklearn(model, scaler, feature_names)
+    if hasattr(model, 'coef_') and hasattr(model, 'predict_proba') and model.coef_.shape[0] == 1:
+        return CompiledLinear.from_sklearn(model, scaler, feature_names)
+    raise ValueError(f"modelo {type(model).__name__} não suportado pelo exportador")
+
+
+def export_compiled_model(model, scaler, path: Path, feature_names: Sequence[str] = (),
+                          source_files: Sequence[Path] = ()):
+    """
+    Exporta o modelo compilado para um .npz (gravação atômica).
+
+    Args:
+        model: Modelo treinado (scikit-learn)
+        scaler: Scaler do treinamento (ou None)
+        path: Arquivo .npz de destino
+        feature_names: Nomes das features, na ordem das colunas
+        source_files: Arquivos de origem (best_model.pkl, scaler.pkl) cujos tamanho,
+                      mtime e SHA-256 são gravados para detectar artefatos desatualizados
+
+    Returns:
+        O modelo compilado
+
+    Raises:
+        ValueError: se o modelo não for suportado
+    """
+    compiled = compile_model(model, scaler, feature_names)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+    stats = [Path(p).stat() for p in source_files]
+    np.savez(
+        tmp_path,
+        format_version=np.array(COMPILED_FORMAT_VERSION),
+        kind=np.array(compiled.kind),
+        feature_names=np.array(list(feature_names), dtype=str),
+        source_files=np.array([Path(p).name for p in source_files], dtype=str),
+        source_sha256=np.array([_file_sha256(p) for p in source_files], dtype=str),
+        source_size=np.array([stat.st_size for stat in stats], dtype=np.int64),
+        source_mtime_ns=np.array([stat.st_mtime_ns for stat in stats], dtype=np.int64),
+        **compiled.arrays()
+    )
+    os.replace(tmp_path, path)
+    return compiled
+
+
+def is_compiled_model_fresh(path: Path) -> bool:
+    """
+    Verifica se o artefato ainda corresponde aos .pkl de origem ao lado dele.
+    Sem os .pkl (implantação só com o .npz), o artefato é considerado válido.
+
+    Tamanho diferente → desatualizado; tamanho e mtime iguais → atual. Só com o
+    mesmo tamanho e outro mtime (ex: cópia ou checkout) o SHA-256 é recalculado.
+    """
+    path = Path(path)
+    with np.load(path) as data:
+        if int(data['format_version']) != COMPILED_FORMAT_VERSION:
+            return False
+        for name, digest, size, mtime_ns in zip(data['source_files'], data['source_sha256'],
+                                                data['source_size'], data['source_mtime_ns']):
+            source = path.parent / str(name)
+            try:
+                stat = source.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_size != size:
+                return False
+            if stat.st_mtime_ns != mtime_ns and _file_sha256(source) != str(digest):
+                return False
+    return True
+
+
+def load_compiled_model(path: Path):
+    """
+    Carrega um modelo compilado (apenas NumPy).
+
+    Raises:
+        ValueError: se o formato do artefato não for suportado
+    """
+    with np.load(Path(path)) as data:
+        if int(data['format_version']) != COMPILED_FORMAT_VERSION:
+            raise ValueError(f"formato de modelo compilado não suportado: {int(data['format_version'])}")
+        kind = str(data['kind'])
+        feature_names = [str(name) for name in data['feature_names']]
+        if kind in COMPILED_KINDS:
+            return COMPILED_KINDS[kind].from_arrays(data, feature_names)
+    raise ValueError(f"tipo de modelo compilado desconhecido: {kind}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exportar o melhor modelo para o formato compilado (.npz)')
+    parser.add_argument('models_dir', nargs='?', default=str(Path(__file__).parent.parent / 'models'),
+                        help='Pasta com best_model.pkl e scaler.pkl (padrão: models do projeto)')
+    parser.add_argument('--check', action='store_true',
+                        help='Comparar as probabilidades com o scikit-learn no features.csv')
+    args = parser.parse_args()
+
+    import joblib
+    from feature_extraction import MODEL_FEATURE_NAMES
+
+    models_dir = Path(args.models_dir)
+    model_path = models_dir / 'best_model.pkl'
+    scaler_path = models_dir / 'scaler.pkl'
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+
+    print("=" * 60)
+    print("📦 EXPORTANDO MODELO COMPILADO")
+    print("=" * 60)
+    output = models_dir / COMPILED_MODEL_FILE
+    compiled = export_compiled_model(model, scaler, output, MODEL_FEATURE_NAMES, [model_path, scaler_path])
+    print(f"✅ {type(model).__name__} → {output} ({output.stat().st_size / 1024:.0f} KB)")
+
+    start = time.perf_counter()
+    load_compiled_model(output)
+    print(f"   Carregamento: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.check:
+        import pandas as pd
+        features_path = Path(__file__).parent.parent / 'data' / 'processed' / 'features.csv'
+        X = pd.read_csv(features_path)[MODEL_FEATURE_NAMES].to_numpy(dtype=np.float64)
+        X = np.repeat(X, max(1, 10000 // len(X)), axis=0)
+
+        start = time.perf_counter()
+        expected = model.predict_proba(scaler.transform(X))
+        sklearn_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        got = compiled.predict_proba(X)
+        compiled_ms = (time.perf_counter() - start) * 1000
+
+        max_diff = float(np.abs(expected - got).max())
+        agree = float((expected.argmax(axis=1) == got.argmax(axis=1)).mean()) * 100
+        print(f"\n🔍 {len(X)} linhas: diferença máxima de probabilidade {max_diff:.2e}, "
+              f"{agree:.2f}% das classes iguais")
+        print(f"   scikit-learn: {sklearn_ms:.1f} ms | compilado: {compiled_ms:.1f} ms "
+              f"({len(X) / compiled_ms:.0f} linhas/ms)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
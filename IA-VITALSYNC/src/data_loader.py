@@ -5,13 +5,28 @@ Script para localizar e listar todos os registros de ECG dos datasets aftdb e ns
 
 Para aftdb: Processa TODAS as três pastas (learning-set, test-set-a, test-set-b)
             como exemplos de Fibrilação Atrial (label=1).
+
+Por padrão os registros vêm do catálogo persistente (record_catalog.py): uma
+varredura das pastas por execução, sem globs por dataset nem os.path.exists
+por arquivo. find_aftdb_records / find_nsrdb_records continuam disponíveis
+para leitura direta do disco.
 """
 
 import os
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import wfdb
 
+from instrumentation import count, timed
+from record_catalog import DEFAULT_CATALOG_PATH, load_catalog
+from reporting import get_logger
+
+log = get_logger('data_loader')
+
+# Subpastas do aftdb, na ordem dos resumos
+AFTDB_SUBSETS = ['learning-set', 'test-set-a', 'test-set-b']
+
 
 def find_aftdb_records(aftdb_root: str) -> List[Dict[str, str]]:
     """
@@ -40,16 +55,14 @@ def find_aftdb_records(aftdb_root: str) -> List[Dict[str, str]]:
     """
     aftdb_path = Path(aftdb_root)
     
-    # As três pastas que contêm dados de FA
-    subsets = ['learning-set', 'test-set-a', 'test-set-b']
-    
     all_records = []
     
-    for subset in subsets:
+    # As três pastas que contêm dados de FA
+    for subset in AFTDB_SUBSETS:
         subset_path = aftdb_path / subset
         
         if not subset_path.exists():
-            print(f"⚠️  Aviso: Pasta '{subset}' não encontrada em {aftdb_root}")
+            log.warning(f"⚠️  Aviso: Pasta '{subset}' não encontrada em {aftdb_root}")
             continue
         
         # Encontrar todos os arquivos .hea (header) nesta pasta
@@ -68,14 +81,22 @@ def find_aftdb_records(aftdb_root: str) -> List[Dict[str, str]]:
                 'annotation_ext': 'qrs'  # AFTDB usa .qrs
             })
     
-    print(f"✅ Dataset aftdb: {len(all_records)} registros encontrados")
-    print(f"   - learning-set: {sum(1 for r in all_records if r['subset'] == 'learning-set')}")
-    print(f"   - test-set-a: {sum(1 for r in all_records if r['subset'] == 'test-set-a')}")
-    print(f"   - test-set-b: {sum(1 for r in all_records if r['subset'] == 'test-set-b')}")
+    log_aftdb_summary(all_records)
     
     return all_records
 
 
+def log_aftdb_summary(aftdb_records: List[Dict]):
+    """
+    Registra o total do aftdb e a contagem por subpasta (uma única passada).
+    """
+    subset_counts = Counter(r['subset'] for r in aftdb_records)
+    log.info(f"✅ Dataset aftdb: {len(aftdb_records)} registros encontrados",
+             extra={'dataset': 'aftdb', 'records': len(aftdb_records), 'subsets': dict(subset_counts)})
+    for subset in AFTDB_SUBSETS:
+        log.info(f"   - {subset}: {subset_counts[subset]}")
+
+
 def find_nsrdb_records(nsrdb_root: str) -> List[Dict[str, str]]:
     """
     Encontra todos os registros de ECG do dataset nsrdb (Ritmo Normal).
@@ -109,7 +130,7 @@ def find_nsrdb_records(nsrdb_root: str) -> List[Dict[str, str]]:
     nsrdb_path = Path(nsrdb_root)
     
     if not nsrdb_path.exists():
-        print(f"⚠️  Aviso: Pasta '{nsrdb_root}' não encontrada")
+        log.warning(f"⚠️  Aviso: Pasta '{nsrdb_root}' não encontrada")
         return []
     
     all_records = []
@@ -130,17 +151,42 @@ def find_nsrdb_records(nsrdb_root: str) -> List[Dict[str, str]]:
             'annotation_ext': 'atr'  # NSRDB usa .atr em vez de .qrs
         })
     
-    print(f"✅ Dataset nsrdb: {len(all_records)} registros encontrados")
+    log.info(f"✅ Dataset nsrdb: {len(all_records)} registros encontrados")
     
     return all_records
 
 
-def load_all_records(data_root: str) -> List[Dict[str, str]]:
+def load_records(data_root: str, dataset: Optional[str] = None, subset: Optional[str] = None,
+                 label: Optional[int] = None, catalog_path=DEFAULT_CATALOG_PATH) -> List[Dict]:
+    """
+    Registros do catálogo filtrados por dataset, subset e/ou rótulo (sem imprimir nada).
+    
+    Args:
+        data_root: Caminho para a pasta 'data/raw'
+        dataset: 'aftdb' ou 'nsrdb'
+        subset: 'learning-set', 'test-set-a', 'test-set-b' ou 'main'
+        label: 1 (FA) ou 0 (Normal)
+        catalog_path: Arquivo do catálogo (padrão: data/cache/record_catalog.json)
+        
+    Returns:
+        Lista de registros no mesmo formato de load_all_records(), com os campos
+        extras do catálogo (fs, duration_s, num_beats, files)
+    """
+    catalog = load_catalog(data_root, catalog_path)
+    return catalog.records(dataset, subset, label, require_annotation=False)
+
+
+@timed('data_loader.load_all_records')
+def load_all_records(data_root: str, use_catalog: bool = True,
+                     catalog_path=DEFAULT_CATALOG_PATH) -> List[Dict[str, str]]:
     """
     Carrega informações de TODOS os registros (aftdb + nsrdb).
     
     Args:
         data_root: Caminho para a pasta 'data/raw' que contém as subpastas aftdb e nsrdb
+        use_catalog: Se True, usa o catálogo persistente (record_catalog.py);
+                     se False, varre as pastas com find_aftdb_records/find_nsrdb_records
+        catalog_path: Arquivo do catálogo (ex: um catálogo separado para dados de teste)
         
     Returns:
         Lista consolidada de todos os registros
@@ -150,25 +196,30 @@ def load_all_records(data_root: str) -> List[Dict[str, str]]:
     aftdb_root = data_path / 'aftdb'
     nsrdb_root = data_path / 'nsrdb'
     
-    print("=" * 60)
-    print("🔍 CARREGANDO REGISTROS DE ECG")
-    print("=" * 60)
-    
-    # Carregar registros de FA (todas as 3 pastas)
-    aftdb_records = find_aftdb_records(str(aftdb_root))
+    log.info("🔍 CARREGANDO REGISTROS DE ECG")
     
-    # Carregar registros normais
-    nsrdb_records = find_nsrdb_records(str(nsrdb_root))
+    if use_catalog:
+        all_records = load_records(data_root, catalog_path=catalog_path)
+        log_aftdb_summary([r for r in all_records if r['dataset'] == 'aftdb'])
+        log.info(f"✅ Dataset nsrdb: {sum(1 for r in all_records if r['dataset'] == 'nsrdb')} registros encontrados")
+    else:
+        # Carregar registros de FA (todas as 3 pastas)
+        aftdb_records = find_aftdb_records(str(aftdb_root))
+        
+        # Carregar registros normais
+        nsrdb_records = find_nsrdb_records(str(nsrdb_root))
+        
+        # Consolidar
+        all_records = aftdb_records + nsrdb_records
     
-    # Consolidar
-    all_records = aftdb_records + nsrdb_records
+    count('data_loader.records', len(all_records))
     
-    print("=" * 60)
-    print(f"📊 RESUMO TOTAL:")
-    print(f"   Total de registros: {len(all_records)}")
-    print(f"   - Fibrilação Atrial (label=1): {sum(1 for r in all_records if r['label'] == 1)}")
-    print(f"   - Ritmo Normal (label=0): {sum(1 for r in all_records if r['label'] == 0)}")
-    print("=" * 60)
+    label_counts = Counter(r['label'] for r in all_records)
+    log.info("📊 RESUMO TOTAL:")
+    log.info(f"   Total de registros: {len(all_records)}",
+             extra={'records': len(all_records), 'af': label_counts[1], 'normal': label_counts[0]})
+    log.info(f"   - Fibrilação Atrial (label=1): {label_counts[1]}")
+    log.info(f"   - Ritmo Normal (label=0): {label_counts[0]}")
     
     return all_records
 
@@ -177,6 +228,9 @@ def verify_record_files(record_info: Dict[str, str]) -> Dict[str, bool]:
     """
     Verifica se todos os arquivos necessários (.dat, .hea, .qrs/.atr) existem para um registro.
     
+    Registros vindos do catálogo já trazem o resultado da varredura ('files'),
+    sem novas chamadas ao sistema de arquivos.
+    
     Args:
         record_info: Dicionário com informações do registro (deve conter 'full_path' e 'annotation_ext')
         
@@ -188,6 +242,9 @@ def verify_record_files(record_info: Dict[str, str]) -> Dict[str, bool]:
             'annotation': True/False  # .qrs para AFTDB, .atr para NSRDB
         }
     """
+    if 'files' in record_info:
+        return {name: record_info['files'][name] is not None for name in ('dat', 'hea', 'annotation')}
+    
     base_path = record_info['full_path']
     annotation_ext = record_info.get('annotation_ext', 'qrs')  # Default para qrs (compatibilidade)
     
@@ -200,11 +257,19 @@ def verify_record_files(record_info: Dict[str, str]) -> Dict[str, bool]:
 
 if __name__ == "__main__":
     # Teste do script
-    import sys
+    import argparse
+    import reporting
+    
+    parser = argparse.ArgumentParser(description='Listar os registros de ECG de data/raw')
+    parser.add_argument('data_root', nargs='?', default=None,
+                        help='Pasta data/raw com aftdb e nsrdb (padrão: data/raw do projeto)')
+    reporting.add_arguments(parser)
+    args = parser.parse_args()
+    reporting.configure_from_args(args)
     
     # Caminho padrão (ajuste conforme necessário)
-    if len(sys.argv) > 1:
-        data_root = sys.argv[1]
+    if args.data_root is not None:
+        data_root = args.data_root
     else:
         # Assumir estrutura padrão do projeto
         script_dir = Path(__file__).parent
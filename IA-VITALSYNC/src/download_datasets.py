@@ -3,195 +3,485 @@ download_datasets.py
 -------------------
 Script para baixar automaticamente os datasets do PhysioNet.
 
-IMPORTANTE: Certifique-se de ter uma conexão com a internet estável.
-Os datasets podem ter alguns MB de tamanho.
+A lista de arquivos vem dos manifestos publicados junto com cada dataset:
+- RECORDS: registros do dataset (entradas terminadas em '/' são subpastas com
+  o próprio RECORDS, como os subsets do AFTDB)
+- SHA256SUMS.txt: hash SHA-256 de cada arquivo
+
+Os arquivos são baixados por um pool limitado de transferências simultâneas.
+Cada download vai para '<arquivo>.part' e só é renomeado depois que o SHA-256
+confere; um '.part' deixado por uma execução interrompida é retomado com HTTP
+Range a partir do ponto em que parou. Arquivos já presentes só são pulados se o
+hash bater com o manifesto.
+
+USO:
+    python src/download_datasets.py                    # aftdb + nsrdb em data/raw
+    python src/download_datasets.py nsrdb --workers 8
+    python src/download_datasets.py aftdb --dest /tmp/raw --mirror http://localhost:8765
+
+    # Servidor local (espelho/substituto do PhysioNet para testes), servindo
+    # uma pasta no mesmo layout de data/raw, com suporte a Range e manifestos
+    # gerados quando ausentes:
+    python src/download_datasets.py serve data/raw --port 8765
+
+Mensagens e progresso vão para o log (stderr), com --quiet/--log-level/--log-format.
 """
 
-import urllib.request
 import os
+import sys
+import time
+import hashlib
+import logging
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import List
-import shutil
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+
+import reporting
+from record_catalog import DATASETS
+from reporting import ProgressReporter, get_logger
+
+log = get_logger('download_datasets')
+
+
+PHYSIONET_URL = "https://physionet.org/files"
+DATASET_VERSIONS = {'aftdb': '1.0.0', 'nsrdb': '1.0.0'}
+
+# Tamanho dos blocos lidos da rede / do disco
+CHUNK_SIZE = 256 * 1024
+
+# Tentativas por arquivo em erros de rede ou respostas 5xx (com backoff exponencial)
+MAX_RETRIES = 4
+
+
+@dataclass
+class RemoteFile:
+    """
+    Um arquivo do manifesto: caminho relativo à raiz do dataset e hash esperado.
+    """
+    path: str
+    sha256: Optional[str]
+
+
+def dataset_url(dataset: str, mirror: Optional[str] = None) -> str:
+    """
+    URL base de um dataset (PhysioNet ou espelho com o mesmo layout).
+    """
+    return f"{(mirror or PHYSIONET_URL).rstrip('/')}/{dataset}/{DATASET_VERSIONS[dataset]}"
+
+
+def fetch_text(url: str, timeout: float = 30.0) -> Optional[str]:
+    """
+    Baixa um arquivo de texto pequeno (None se ele não existir no servidor).
+    """
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+
+
+def parse_sha256sums(text: str) -> Dict[str, str]:
+    """
+    Converte as linhas '<hash> <caminho>' de SHA256SUMS.txt em {caminho: hash}.
+    """
+    sums = {}
+    for line in text.splitlines():
+        parts = line.strip().split(maxsplit=1)
+        if len(parts) == 2:
+            sums[parts[1].lstrip('*')] = parts[0].lower()
+    return sums
+
+
+def list_records(base_url: str, prefix: str = '', timeout: float = 30.0) -> List[str]:
+    """
+    Lê o RECORDS de uma pasta do dataset, descendo nas subpastas listadas.
+
+    Returns:
+        Caminhos dos registros relativos à raiz do dataset (ex: 'learning-set/n01')
+    """
+    text = fetch_text(f"{base_url}/{prefix}RECORDS", timeout)
+    if text is None:
+        return []
+
+    records = []
+    for line in text.splitlines():
+        entry = line.strip()
+        if not entry:
+            continue
+        if entry.endswith('/'):
+            records += list_records(base_url, prefix + entry, timeout)
+        else:
+            records.append(prefix + entry)
+    return records
+
 
+def build_manifest(dataset: str, base_url: str, timeout: float = 30.0) -> List[RemoteFile]:
+    """
+    Lista os arquivos a baixar: cabeçalho, sinal e anotação de cada registro do
+    RECORDS, mais os próprios RECORDS, com o hash de SHA256SUMS.txt.
+
+    Raises:
+        RuntimeError: se o dataset não tiver RECORDS no servidor
+    """
+    records = list_records(base_url, timeout=timeout)
+    if not records:
+        raise RuntimeError(f"RECORDS não encontrado em {base_url}")
+
+    sums_text = fetch_text(f"{base_url}/SHA256SUMS.txt", timeout)
+    sums = parse_sha256sums(sums_text) if sums_text else {}
+    if not sums:
+        log.warning(f"   ⚠️  SHA256SUMS.txt ausente em {base_url}: arquivos não serão verificados")
+
+    extensions = ['hea', 'dat', DATASETS[dataset]['annotation_ext']]
+    folders = sorted({record.rpartition('/')[0] for record in records})
+    paths = [f"{folder}/RECORDS" if folder else 'RECORDS' for folder in folders]
+    paths += [f"{record}.{ext}" for record in records for ext in extensions]
+
+    # Com manifesto, arquivos que não existem no servidor (ex: registro sem .dat) ficam de fora
+    return [RemoteFile(path, sums.get(path)) for path in paths if not sums or path in sums]
 
-def download_file(url: str, destination: Path):
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _transfer(url: str, part_path: Path, timeout: float) -> str:
     """
-    Baixa um arquivo da internet.
-    
+    Baixa (ou continua baixando) url para part_path.
+
+    Returns:
+        'resumed' se a transferência continuou um .part existente, senão 'downloaded'
+    """
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    request = urllib.request.Request(url, headers={'Range': f'bytes={offset}-'} if offset else {})
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 416 and offset:
+            return 'resumed'  # o .part já tem o arquivo inteiro
+        raise
+
+    with response:
+        # 206 = o servidor aceitou o Range; 200 = recomeçar do zero
+        resumed = offset > 0 and response.status == 206
+        expected = response.headers.get('Content-Length')
+        written = 0
+        with open(part_path, 'ab' if resumed else 'wb') as f:
+            for block in iter(lambda: response.read(CHUNK_SIZE), b''):
+                f.write(block)
+                written += len(block)
+
+    if expected is not None and written != int(expected):
+        raise ConnectionError(f"transferência incompleta ({written} de {expected} bytes)")
+    return 'resumed' if resumed else 'downloaded'
+
+
+def download_file(url: str, destination: Path, sha256: Optional[str] = None,
+                  timeout: float = 30.0) -> str:
+    """
+    Baixa um arquivo da internet, retomando downloads parciais e verificando o hash.
+
     Args:
         url: URL do arquivo
         destination: Caminho local onde salvar
+        sha256: Hash esperado (None = sem verificação)
+        timeout: Timeout (s) de cada requisição
+
+    Returns:
+        'skipped' (já existia e confere), 'downloaded' ou 'resumed'
+
+    Raises:
+        ValueError: se o hash do arquivo baixado não conferir
     """
-    print(f"   Baixando: {destination.name}...", end=" ")
-    try:
-        urllib.request.urlretrieve(url, destination)
-        print("✅")
-        return True
-    except Exception as e:
-        print(f"❌ Erro: {e}")
-        return False
+    if destination.exists():
+        if sha256 is None or sha256_file(destination) == sha256:
+            return 'skipped'
+        destination.unlink()  # corrompido ou de outra versão
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    part_path = destination.with_name(destination.name + '.part')
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            status = _transfer(url, part_path, timeout)
+            break
+        except urllib.error.HTTPError as e:
+            if e.code < 500 or attempt == MAX_RETRIES - 1:
+                raise
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            if attempt == MAX_RETRIES - 1:
+                raise
+        time.sleep(0.5 * 2 ** attempt)
+
+    if sha256 is not None and sha256_file(part_path) != sha256:
+        part_path.unlink()
+        raise ValueError("SHA-256 não confere com o manifesto")
 
+    os.replace(part_path, destination)
+    return status
 
-def download_aftdb_records(base_url: str, subset: str, record_names: List[str], dest_folder: Path):
+
+def download_dataset(dataset: str, dest_root: Path, mirror: Optional[str] = None,
+                     n_workers: int = 8, verify: bool = True, timeout: float = 30.0) -> Dict:
     """
-    Baixa registros de um subset do AFTDB.
-    
+    Baixa um dataset completo.
+
     Args:
-        base_url: URL base do PhysioNet
-        subset: Nome do subset (learning-set, test-set-a, test-set-b)
-        record_names: Lista de nomes de registros (ex: ['a01', 'a02', ...])
-        dest_folder: Pasta de destino
-    """
-    dest_folder.mkdir(parents=True, exist_ok=True)
-    
-    print(f"\n📁 Baixando subset: {subset}")
-    print(f"   Destino: {dest_folder}")
-    
-    extensions = ['.dat', '.hea', '.qrs']
-    
-    for record in record_names:
-        for ext in extensions:
-            file_url = f"{base_url}/{subset}/{record}{ext}"
-            dest_file = dest_folder / f"{record}{ext}"
-            
-            # Pular se já existe
-            if dest_file.exists():
-                print(f"   ⏭️  {record}{ext} já existe, pulando...")
-                continue
-            
-            download_file(file_url, dest_file)
-
-
-def download_aftdb_dataset(dest_root: Path):
-    """
-    Baixa o dataset completo AFTDB.
-    
-    O dataset AFTDB tem a seguinte estrutura:
-    - learning-set: Registros para treinamento (a01-a25, n01-n25)
-    - test-set-a: Conjunto de teste A (a01-a25)
-    - test-set-b: Conjunto de teste B (b01-b10)
-    """
-    base_url = "https://physionet.org/files/aftdb/1.0.0"
-    
-    print("=" * 60)
-    print("📥 BAIXANDO DATASET AFTDB (Fibrilação Atrial)")
-    print("=" * 60)
-    
-    # Definir registros de cada subset
-    # NOTA: Estes são exemplos. Você pode precisar ajustar conforme a documentação do PhysioNet
-    
-    # Learning set: a01-a25, n01-n25
-    learning_records = [f"a{i:02d}" for i in range(1, 26)] + [f"n{i:02d}" for i in range(1, 26)]
-    
-    # Test set A: a01-a25
-    test_a_records = [f"a{i:02d}" for i in range(1, 26)]
-    
-    # Test set B: b01-b10 (exemplo, verifique a documentação)
-    test_b_records = [f"b{i:02d}" for i in range(1, 11)]
-    
-    # Baixar cada subset
-    download_aftdb_records(base_url, "learning-set", learning_records, dest_root / "learning-set")
-    download_aftdb_records(base_url, "test-set-a", test_a_records, dest_root / "test-set-a")
-    download_aftdb_records(base_url, "test-set-b", test_b_records, dest_root / "test-set-b")
-    
-    print("\n✅ Download do AFTDB concluído!")
-
-
-def download_nsrdb_dataset(dest_root: Path):
-    """
-    Baixa o dataset completo NSRDB.
-    
-    O dataset NSRDB contém registros de ritmo sinusal normal.
-    """
-    base_url = "https://physionet.org/files/nsrdb/1.0.0"
-    
-    print("\n" + "=" * 60)
-    print("📥 BAIXANDO DATASET NSRDB (Ritmo Normal)")
-    print("=" * 60)
-    
-    dest_root.mkdir(parents=True, exist_ok=True)
-    
-    # Registros do NSRDB (16001-16773, 19088-19093, 19140, 19830)
-    # Vamos baixar os principais
-    record_ranges = [
-        (16001, 16024),  # Primeiros 24 registros
-        (19088, 19094),  # Registros especiais
-    ]
-    
-    record_names = []
-    for start, end in record_ranges:
-        record_names.extend([str(i) for i in range(start, end)])
-    
-    extensions = ['.dat', '.hea', '.qrs']
-    
-    for record in record_names:
-        for ext in extensions:
-            file_url = f"{base_url}/{record}{ext}"
-            dest_file = dest_root / f"{record}{ext}"
-            
-            if dest_file.exists():
-                print(f"   ⏭️  {record}{ext} já existe, pulando...")
+        dataset: 'aftdb' ou 'nsrdb'
+        dest_root: Pasta de destino do dataset (ex: data/raw/aftdb)
+        mirror: URL base de um espelho no layout do PhysioNet (padrão: PhysioNet)
+        n_workers: Transferências simultâneas
+        verify: Conferir o SHA-256 de cada arquivo com o manifesto
+        timeout: Timeout (s) de cada requisição
+
+    Returns:
+        Contagem de arquivos por status, bytes transferidos e falhas
+    """
+    base_url = dataset_url(dataset, mirror)
+    log.info(f"📥 BAIXANDO DATASET {dataset.upper()}")
+    log.info(f"   Origem: {base_url}")
+    log.info(f"   Destino: {dest_root}")
+
+    manifest = build_manifest(dataset, base_url, timeout)
+    log.info(f"   Manifesto: {len(manifest)} arquivos ({n_workers} transferências simultâneas)",
+             extra={'dataset': dataset, 'files': len(manifest)})
+
+    stats = {'skipped': 0, 'downloaded': 0, 'resumed': 0, 'bytes': 0, 'failed': []}
+    lock = threading.Lock()
+    start = time.perf_counter()
+
+    def task(remote: RemoteFile) -> str:
+        destination = dest_root / remote.path
+        part_path = destination.with_name(destination.name + '.part')
+        already_had = part_path.stat().st_size if part_path.exists() else 0
+        status = download_file(f"{base_url}/{remote.path}", destination,
+                               remote.sha256 if verify else None, timeout)
+        if status != 'skipped':
+            with lock:
+                stats['bytes'] += destination.stat().st_size - (already_had if status == 'resumed' else 0)
+        return status
+
+    progress = ProgressReporter(len(manifest), f'Baixando {dataset}', logger=log, unit='arquivos')
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        futures = {executor.submit(task, remote): remote for remote in manifest}
+        for future in as_completed(futures):
+            remote = futures[future]
+            try:
+                status = future.result()
+            except Exception as e:
+                stats['failed'].append((remote.path, f"{type(e).__name__}: {e}"))
+                log.error(f"   ❌ {remote.path}: {e}", extra={'file': remote.path})
+                progress.update()
                 continue
-            
-            download_file(file_url, dest_file)
-    
-    print("\n✅ Download do NSRDB concluído!")
+            stats[status] += 1
+            if status != 'skipped':
+                log.debug(f"   ✅ {remote.path}{' (retomado)' if status == 'resumed' else ''}",
+                          extra={'file': remote.path, 'status': status})
+            progress.update()
+    progress.close()
+
+    elapsed = time.perf_counter() - start
+    summary = {key: stats[key] for key in ('downloaded', 'resumed', 'skipped', 'bytes')}
+    log.log(
+        logging.WARNING if stats['failed'] else logging.INFO,
+        f"{'✅' if not stats['failed'] else '⚠️ '} {dataset}: {stats['downloaded']} baixados, "
+        f"{stats['resumed']} retomados, {stats['skipped']} já verificados, {len(stats['failed'])} falhas",
+        extra={'dataset': dataset, **summary, 'failed': len(stats['failed'])})
+    log.info(f"   {stats['bytes'] / 1024 ** 2:.1f} MB em {elapsed:.1f}s "
+             f"({stats['bytes'] / 1024 ** 2 / max(elapsed, 1e-9):.1f} MB/s)",
+             extra={'dataset': dataset, 'elapsed_s': round(elapsed, 3)})
+    return stats
+
+
+class MirrorRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serve uma pasta no layout de data/raw como se fosse o PhysioNet
+    (/<dataset>/<versão>/<arquivo>), com suporte a 'Range: bytes=N-[M]'.
+
+    RECORDS e SHA256SUMS.txt ausentes na pasta são gerados na hora.
+    """
+
+    root: Path = Path('.')
+    _sums_cache: Dict[str, str] = {}
+    _sums_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_bytes(self, body: bytes):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _generated_records(self, folder: Path) -> str:
+        subfolders = sorted(p.name for p in folder.iterdir() if p.is_dir() and any(p.glob('*.hea')))
+        if subfolders:
+            return ''.join(f"{name}/\n" for name in subfolders)
+        return ''.join(f"{p.stem}\n" for p in sorted(folder.glob('*.hea')))
+
+    def _generated_sha256sums(self, dataset_dir: Path) -> str:
+        with self._sums_lock:
+            key = str(dataset_dir)
+            if key not in self._sums_cache:
+                lines = [f"{sha256_file(path)} {path.relative_to(dataset_dir).as_posix()}\n"
+                         for path in sorted(dataset_dir.rglob('*'))
+                         if path.is_file() and not path.name.startswith('.')]
+                self._sums_cache[key] = ''.join(lines)
+            return self._sums_cache[key]
+
+    def do_GET(self):
+        parts = unquote(urlsplit(self.path).path).strip('/').split('/')
+        if len(parts) < 3 or DATASET_VERSIONS.get(parts[0]) != parts[1]:
+            self.send_error(404)
+            return
+
+        dataset_dir = (self.root / parts[0]).resolve()
+        target = (dataset_dir / '/'.join(parts[2:])).resolve()
+        if dataset_dir not in target.parents:
+            self.send_error(404)
+            return
+
+        if not target.exists():
+            if target.name == 'SHA256SUMS.txt':
+                self._send_bytes(self._generated_sha256sums(dataset_dir).encode())
+            elif target.name == 'RECORDS' and target.parent.is_dir():
+                self._send_bytes(self._generated_records(target.parent).encode())
+            else:
+                self.send_error(404)
+            return
+        if not target.is_file():
+            self.send_error(404)
+            return
+
+        size = target.stat().st_size
+        start, end = 0, size - 1
+        range_header = self.headers.get('Range')
+        if range_header and range_header.startswith('bytes='):
+            first, _, last = range_header[6:].partition('-')
+            start = int(first or 0)
+            end = min(int(last), size - 1) if last else size - 1
+            if start >= size:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+        with open(target, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                block = f.read(min(CHUNK_SIZE, remaining))
+                if not block:
+                    break
+                self.wfile.write(block)
+                remaining -= len(block)
+
+
+def make_mirror_server(root: Path, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """
+    Cria (sem iniciar) o servidor espelho de uma pasta no layout de data/raw.
+    """
+    handler = type('BoundMirrorRequestHandler', (MirrorRequestHandler,),
+                   {'root': Path(root), '_sums_cache': {}})
+    return ThreadingHTTPServer((host, port), handler)
 
 
 def main():
     """
     Função principal.
     """
-    # Determinar caminhos
     script_dir = Path(__file__).parent
-    project_root = script_dir.parent
-    data_raw = project_root / 'data' / 'raw'
-    
-    print("=" * 60)
-    print("🏥 IA-VITALSYNC - DOWNLOAD AUTOMÁTICO DE DATASETS")
-    print("=" * 60)
-    print(f"\n📂 Diretório do projeto: {project_root}")
-    print(f"📂 Diretório de destino: {data_raw}")
-    
-    # Perguntar ao usuário o que baixar
-    print("\n" + "=" * 60)
-    print("O que você deseja baixar?")
-    print("1 - Dataset AFTDB (Fibrilação Atrial)")
-    print("2 - Dataset NSRDB (Ritmo Normal)")
-    print("3 - Ambos os datasets")
-    print("=" * 60)
-    
-    choice = input("Digite sua escolha (1/2/3): ").strip()
-    
-    if choice in ['1', '3']:
-        aftdb_dest = data_raw / 'aftdb'
-        download_aftdb_dataset(aftdb_dest)
-    
-    if choice in ['2', '3']:
-        nsrdb_dest = data_raw / 'nsrdb'
-        download_nsrdb_dataset(nsrdb_dest)
-    
-    print("\n" + "=" * 60)
-    print("✅ DOWNLOAD CONCLUÍDO!")
-    print("=" * 60)
-    print("\n🚀 Próximos passos:")
-    print("   1. Execute: python src/organize_datasets.py (para verificar)")
-    print("   2. Execute: python src/feature_extraction.py (para extrair features)")
+    data_raw = script_dir.parent / 'data' / 'raw'
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        parser = argparse.ArgumentParser(description='Servidor local no layout do PhysioNet (testes/espelho)')
+        parser.add_argument('command', choices=['serve'])
+        parser.add_argument('root', nargs='?', default=str(data_raw),
+                            help='Pasta com aftdb/ e nsrdb/ (padrão: data/raw do projeto)')
+        parser.add_argument('--host', default='127.0.0.1', help='Endereço (padrão: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8765, help='Porta (padrão: 8765)')
+        reporting.add_arguments(parser)
+        args = parser.parse_args()
+        reporting.configure_from_args(args)
+
+        server = make_mirror_server(Path(args.root), args.host, args.port)
+        log.info(f"🌐 Espelho de {args.root} em http://{args.host}:{args.port} (Ctrl+C para parar)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    parser = argparse.ArgumentParser(description='Baixar os datasets do PhysioNet (aftdb, nsrdb)')
+    parser.add_argument('datasets', nargs='*', metavar='DATASET',
+                        help=f"Datasets a baixar: {', '.join(sorted(DATASET_VERSIONS))} (padrão: todos)")
+    parser.add_argument('--dest', default=str(data_raw),
+                        help='Pasta de destino (padrão: data/raw do projeto)')
+    parser.add_argument('--workers', '-j', type=int, default=8,
+                        help='Transferências simultâneas (padrão: 8)')
+    parser.add_argument('--mirror', default=None,
+                        help=f'URL base de um espelho no layout do PhysioNet (padrão: {PHYSIONET_URL})')
+    parser.add_argument('--no-verify', action='store_true',
+                        help='Não conferir o SHA-256 dos arquivos')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='Timeout de cada requisição em segundos (padrão: 30)')
+    reporting.add_arguments(parser)
+    args = parser.parse_args()
+    reporting.configure_from_args(args)
+    unknown = sorted(set(args.datasets) - set(DATASET_VERSIONS))
+    if unknown:
+        parser.error(f"dataset(s) desconhecido(s): {', '.join(unknown)}")
+
+    log.info("🏥 IA-VITALSYNC - DOWNLOAD AUTOMÁTICO DE DATASETS")
+    log.info(f"📂 Diretório de destino: {args.dest}")
+
+    failed = []
+    for dataset in args.datasets or sorted(DATASET_VERSIONS):
+        try:
+            stats = download_dataset(dataset, Path(args.dest) / dataset, args.mirror,
+                                     n_workers=args.workers, verify=not args.no_verify,
+                                     timeout=args.timeout)
+        except (RuntimeError, urllib.error.URLError) as e:
+            log.error(f"❌ {dataset}: {e}")
+            failed.append(dataset)
+            continue
+        if stats['failed']:
+            failed.append(dataset)
+
+    if failed:
+        log.error(f"⚠️  DOWNLOAD INCOMPLETO: {', '.join(failed)} (execute novamente para retomar)",
+                  extra={'failed_datasets': failed})
+        sys.exit(1)
+    log.info("✅ DOWNLOAD CONCLUÍDO!")
+    log.info("🚀 Próximos passos:")
+    log.info("   1. Execute: python src/organize_datasets.py (para verificar)")
+    log.info("   2. Execute: python src/feature_extraction.py (para extrair features)")
 
 
 if __name__ == "__main__":
-    print("\n⚠️  AVISO: Este script pode não funcionar perfeitamente!")
-    print("   Razão: Os nomes exatos dos registros podem variar.")
-    print("   Recomendação: Baixe manualmente do PhysioNet:")
-    print("   - https://physionet.org/content/aftdb/1.0.0/")
-    print("   - https://physionet.org/content/nsrdb/1.0.0/")
-    print("\n   Ou use wget:")
-    print("   wget -r -N -c -np https://physionet.org/files/aftdb/1.0.0/")
-    print("   wget -r -N -c -np https://physionet.org/files/nsrdb/1.0.0/")
-    print("\n" + "=" * 60)
-    
-    proceed = input("\nDeseja continuar mesmo assim? (s/n): ").strip().lower()
-    if proceed == 's':
-        main()
-    else:
-        print("\n👋 Download cancelado. Use wget ou baixe manualmente!")
+    main()
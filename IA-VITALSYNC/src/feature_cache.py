@@ -0,0 +1,313 @@
+"""
+feature_cache.py
+----------------
+Cache persistente (em disco) das features extraídas de cada registro.
+
+A chave de cada entrada é o SHA-256 do conteúdo dos arquivos que alimentam a
+extração (.hea + anotação .qrs/.atr, e o .dat quando o sinal é lido) somado à
+versão do esquema de features. Assim, um registro só é reprocessado se algum
+desses arquivos mudar ou se o conjunto de features mudar.
+
+Para não recalcular o hash de arquivos grandes a cada execução, o hash de cada
+arquivo fica guardado junto com seu tamanho e mtime; enquanto ambos forem os
+mesmos, o hash salvo é reutilizado.
+
+Estrutura no disco:
+    cache_dir/
+    ├── entries/<chave>.json   ← features de um registro
+    └── files/<id>.json        ← (caminho, tamanho, mtime, sha256) de um arquivo
+
+USO (linha de comando):
+    python src/feature_cache.py stats
+    python src/feature_cache.py invalidate --record n01
+    python src/feature_cache.py invalidate --all
+    python src/feature_cache.py prune --max-entries 500
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / 'data' / 'cache' / 'features'
+
+# Tamanho dos blocos lidos ao calcular o hash de um arquivo
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def _to_builtin(value):
+    """
+    Converte escalares NumPy para tipos nativos (serializáveis em JSON).
+    """
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    return value
+
+
+def _write_json_atomic(path: Path, data: Dict):
+    """
+    Escreve um JSON de forma atômica (arquivo temporário + os.replace), para que
+    processos concorrentes nunca leiam uma entrada pela metade.
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class FeatureCache:
+    """
+    Cache de features por registro, endereçado pelo conteúdo dos arquivos.
+
+    Args:
+        cache_dir: Pasta onde o cache é salvo
+        schema_version: Versão do esquema de features (obrigatória; use
+                        feature_extraction.FEATURE_SCHEMA_VERSION); entradas de
+                        outras versões nunca são reutilizadas
+        max_entries: Número máximo de entradas mantidas por evict()
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, *, schema_version: int, max_entries: int = 5000):
+        self.cache_dir = Path(cache_dir)
+        self.schema_version = schema_version
+        self.max_entries = max_entries
+        self.entries_dir = self.cache_dir / 'entries'
+        self.files_dir = self.cache_dir / 'files'
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+
+    def file_digest(self, file_path) -> str:
+        """
+        Retorna o SHA-256 do conteúdo de um arquivo, reutilizando o valor salvo
+        enquanto tamanho e mtime não mudarem.
+        """
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        stamp_file = self.files_dir / f"{hashlib.sha1(str(file_path).encode()).hexdigest()}.json"
+
+        if stamp_file.exists():
+            try:
+                with open(stamp_file) as f:
+                    stamp = json.load(f)
+                if stamp['size'] == stat.st_size and stamp['mtime_ns'] == stat.st_mtime_ns:
+                    return stamp['sha256']
+            except (OSError, ValueError, KeyError):
+                pass  # Stamp corrompido: recalcular
+
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                sha256.update(block)
+        digest = sha256.hexdigest()
+
+        _write_json_atomic(stamp_file, {
+            'path': str(file_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest
+        })
+        return digest
+
+    def record_key(self, record_path: str, annotation_ext: str = 'qrs', read_signal: bool = False) -> str:
+        """
+        Calcula a chave de cache de um registro.
+
+        Args:
+            record_path: Caminho do registro (sem extensão)
+            annotation_ext: Extensão do arquivo de anotações ('qrs' ou 'atr')
+            read_signal: Se o .dat também é lido na extração (entra na chave)
+
+        Returns:
+            Chave hexadecimal (SHA-256)
+
+        Raises:
+            FileNotFoundError: Se algum dos arquivos do registro não existir
+        """
+        extensions = ['hea', annotation_ext]
+        if read_signal:
+            extensions.append('dat')
+
+        key = hashlib.sha256(f"schema={self.schema_version}".encode())
+        for ext in extensions:
+            key.update(f"|{ext}={self.file_digest(f'{record_path}.{ext}')}".encode())
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Retorna as features salvas para a chave, ou None se não houver entrada.
+        """
+        entry_file = self.entries_dir / f"{key}.json"
+        try:
+            with open(entry_file) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('schema_version') != self.schema_version:
+            return None
+
+        # Atualizar mtime da entrada (usado como "último acesso" no evict)
+        try:
+            os.utime(entry_file)
+        except OSError:
+            pass
+
+        return entry['features']
+
+    def put(self, key: str, record_path: str, features: Dict):
+        """
+        Salva as features de um registro no cache.
+        """
+        _write_json_atomic(self.entries_dir / f"{key}.json", {
+            'schema_version': self.schema_version,
+            'record_path': str(record_path),
+            'features': {name: _to_builtin(value) for name, value in features.items()}
+        })
+
+    def _entries(self) -> List[Path]:
+        return list(self.entries_dir.glob('*.json'))
+
+    def evict(self, max_entries: Optional[int] = None) -> int:
+        """
+        Remove as entradas menos usadas recentemente até restarem max_entries,
+        além das entradas de outras versões de esquema. Os stamps de arquivos
+        que não existem mais também são apagados (prune_stamps).
+
+        Returns:
+            Número de entradas removidas
+        """
+        max_entries = self.max_entries if max_entries is None else max_entries
+        removed = 0
+
+        entries = []
+        for entry_file in self._entries():
+            try:
+                with open(entry_file) as f:
+                    schema_version = json.load(f).get('schema_version')
+            except (OSError, ValueError):
+                schema_version = None
+
+            if schema_version != self.schema_version:
+                entry_file.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append(entry_file)
+
+        if len(entries) > max_entries:
+            entries.sort(key=lambda p: p.stat().st_mtime)
+            for entry_file in entries[:len(entries) - max_entries]:
+                entry_file.unlink(missing_ok=True)
+                removed += 1
+
+        self.prune_stamps()
+        return removed
+
+    def prune_stamps(self) -> int:
+        """
+        Remove os stamps (files/*.json) cujo arquivo de origem não existe mais,
+        além dos stamps corrompidos.
+
+        Returns:
+            Número de stamps removidos
+        """
+        removed = 0
+        for stamp_file in self.files_dir.glob('*.json'):
+            try:
+                with open(stamp_file) as f:
+                    source_path = json.load(f)['path']
+            except (OSError, ValueError, KeyError):
+                source_path = None
+
+            if source_path is None or not Path(source_path).exists():
+                stamp_file.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def invalidate(self, record_name: Optional[str] = None) -> int:
+        """
+        Remove entradas do cache.
+
+        Args:
+            record_name: Nome (ou caminho) do registro a invalidar.
+                         Se None, TODO o cache é apagado.
+
+        Returns:
+            Número de entradas removidas
+        """
+        removed = 0
+
+        for entry_file in self._entries():
+            if record_name is not None:
+                try:
+                    with open(entry_file) as f:
+                        record_path = json.load(f).get('record_path', '')
+                except (OSError, ValueError):
+                    record_path = ''
+
+                if record_name not in (record_path, Path(record_path).name):
+                    continue
+
+            entry_file.unlink(missing_ok=True)
+            removed += 1
+
+        if record_name is None:
+            for stamp_file in self.files_dir.glob('*.json'):
+                stamp_file.unlink(missing_ok=True)
+
+        return removed
+
+    def stats(self) -> Dict:
+        """
+        Retorna o número de entradas e o espaço ocupado pelo cache.
+        """
+        entries = self._entries()
+        return {
+            'cache_dir': str(self.cache_dir),
+            'schema_version': self.schema_version,
+            'entries': len(entries),
+            'size_bytes': sum(p.stat().st_size for p in entries)
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    from feature_extraction import FEATURE_SCHEMA_VERSION
+
+    parser = argparse.ArgumentParser(description='Gerenciar o cache de features')
+    parser.add_argument('--cache-dir', type=str, default=str(DEFAULT_CACHE_DIR),
+                        help=f'Pasta do cache (padrão: {DEFAULT_CACHE_DIR})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='Mostrar estatísticas do cache')
+
+    invalidate_parser = subparsers.add_parser('invalidate', help='Remover entradas do cache')
+    group = invalidate_parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--record', type=str, help='Nome ou caminho do registro a invalidar')
+    group.add_argument('--all', action='store_true', help='Apagar todo o cache')
+
+    prune_parser = subparsers.add_parser('prune', help='Remover entradas antigas ou de outra versão')
+    prune_parser.add_argument('--max-entries', type=int, default=5000,
+                              help='Número máximo de entradas mantidas (padrão: 5000)')
+
+    args = parser.parse_args()
+    cache = FeatureCache(args.cache_dir, schema_version=FEATURE_SCHEMA_VERSION)
+
+    if args.command == 'stats':
+        stats = cache.stats()
+        print(f"📦 Cache: {stats['cache_dir']}")
+        print(f"   Versão do esquema: {stats['schema_version']}")
+        print(f"   Entradas: {stats['entries']}")
+        print(f"   Tamanho: {stats['size_bytes'] / 1024:.1f} KB")
+    elif args.command == 'invalidate':
+        removed = cache.invalidate(None if args.all else args.record)
+        print(f"🗑️  {removed} entrada(s) removida(s)")
+    elif args.command == 'prune':
+        stamps_before = len(list(cache.files_dir.glob('*.json')))
+        removed = cache.evict(args.max_entries)
+        stamps_removed = stamps_before - len(list(cache.files_dir.glob('*.json')))
+        print(f"🗑️  {removed} entrada(s) e {stamps_removed} stamp(s) removido(s)")
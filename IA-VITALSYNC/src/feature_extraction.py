@@ -8,12 +8,32 @@ Features principais:
 - Estatísticas de variabilidade (desvio padrão, média, mediana, RMSSD, etc.)
 """
 
+import os
 import numpy as np
-import pandas as pd
-import wfdb
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Dict, List, Optional
 from pathlib import Path
 
+from feature_cache import FeatureCache
+import instrumentation
+from instrumentation import count, timed, timer
+import reporting
+from reporting import ProgressReporter, get_logger
+
+# wfdb (que carrega o pandas) e o pandas só são importados nas funções que leem
+# arquivos WFDB ou montam o DataFrame: quem calcula features a partir de picos R
+# já conhecidos (predict_from_features, prediction_server) não paga esse custo
+if TYPE_CHECKING:
+    import pandas as pd
+
+log = get_logger('feature_extraction')
+
+
+# Versão do conjunto de features. Incrementar sempre que uma feature for
+# adicionada, removida ou tiver o cálculo alterado (invalida o cache em disco)
+FEATURE_SCHEMA_VERSION = 2
+
 
 def extract_rr_intervals(annotation_samples: np.ndarray, sampling_freq: float) -> np.ndarray:
     """
@@ -91,7 +111,124 @@ def calculate_cv(rr_intervals: np.ndarray) -> float:
     return cv
 
 
-def extract_features_from_record(record_path: str, label: int, annotation_ext: str = 'qrs') -> Optional[Dict]:
+# Ordem EXATA das features usadas pelo modelo (treinamento e predição)
+MODEL_FEATURE_NAMES = [
+    'num_beats', 'num_rr_intervals', 'sampling_freq',
+    'rr_mean', 'rr_std', 'rr_median', 'rr_min', 'rr_max',
+    'rr_cv', 'rr_rmssd', 'rr_range',
+    'rr_percentile_25', 'rr_percentile_75', 'rr_iqr',
+    'mean_hr_bpm'
+]
+
+# Ordem fixa das estatísticas retornadas por compute_rr_statistics
+RR_STATISTICS_NAMES = [
+    'rr_mean', 'rr_std', 'rr_median', 'rr_min', 'rr_max',
+    'rr_cv', 'rr_rmssd', 'rr_range',
+    'rr_percentile_25', 'rr_percentile_75', 'rr_iqr',
+    'mean_hr_bpm'
+]
+
+
+def quantile_from_sorted(sorted_values: np.ndarray, q: float) -> float:
+    """
+    Quantil com interpolação linear (mesma definição de np.percentile)
+    sobre um array JÁ ORDENADO.
+    """
+    position = q * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def compute_rr_statistics(rr_intervals: np.ndarray) -> np.ndarray:
+    """
+    Calcula todas as estatísticas dos intervalos R-R de uma só vez.
+    
+    Em vez de uma passada por estatística (média 3x, percentis 4x, etc.),
+    o array é ordenado UMA vez (mínimo, máximo, mediana e percentis saem da
+    ordenação) e a média/desvio padrão são compartilhados por CV e FC média.
+    
+    Args:
+        rr_intervals: Array com intervalos R-R em segundos (não vazio)
+        
+    Returns:
+        Array float64 na ordem de RR_STATISTICS_NAMES
+    """
+    rr_intervals = np.asarray(rr_intervals, dtype=np.float64)
+    n = len(rr_intervals)
+    
+    # Momentos compartilhados
+    mean_rr = rr_intervals.sum() / n
+    centered = rr_intervals - mean_rr
+    std_rr = np.sqrt(np.dot(centered, centered) / n)
+    
+    # Diferenças sucessivas (RMSSD)
+    if n >= 2:
+        successive_diffs = np.diff(rr_intervals)
+        rmssd = np.sqrt(np.dot(successive_diffs, successive_diffs) / (n - 1))
+    else:
+        rmssd = 0.0
+    
+    # Estatísticas de ordem a partir de uma única ordenação
+    sorted_rr = np.sort(rr_intervals)
+    min_rr = sorted_rr[0]
+    max_rr = sorted_rr[-1]
+    median_rr = quantile_from_sorted(sorted_rr, 0.50)
+    p25 = quantile_from_sorted(sorted_rr, 0.25)
+    p75 = quantile_from_sorted(sorted_rr, 0.75)
+    
+    cv = (std_rr / mean_rr) * 100 if mean_rr != 0 else 0.0
+    mean_hr = 60.0 / mean_rr if mean_rr > 0 else 0.0
+    
+    return np.array([
+        mean_rr, std_rr, median_rr, min_rr, max_rr,
+        cv, rmssd, max_rr - min_rr,
+        p25, p75, p75 - p25,
+        mean_hr
+    ], dtype=np.float64)
+
+
+@timed('feature_extraction.rr_features')
+def features_from_rr_intervals(rr_intervals: np.ndarray, sampling_freq: float,
+                               num_beats: Optional[int] = None) -> Dict:
+    """
+    Monta o dicionário de features do modelo a partir de uma série R-R já calculada.
+    
+    Usado tanto na extração de registros WFDB quanto em séries R-R vindas de
+    outras fontes (servidor de predição, sensores).
+    
+    Args:
+        rr_intervals: Array com intervalos R-R em segundos (não vazio)
+        sampling_freq: Frequência de amostragem de origem dos picos R (feature do modelo)
+        num_beats: Número de picos R (padrão: len(rr_intervals) + 1)
+        
+    Returns:
+        Dicionário com as features de MODEL_FEATURE_NAMES
+    """
+    rr_intervals = np.asarray(rr_intervals, dtype=np.float64)
+    if num_beats is None:
+        num_beats = len(rr_intervals) + 1
+    
+    # Estatísticas R-R calculadas por um único kernel
+    rr_statistics = compute_rr_statistics(rr_intervals)
+    
+    return {
+        # Informações básicas
+        'num_beats': num_beats,
+        'num_rr_intervals': len(rr_intervals),
+        'sampling_freq': sampling_freq,
+        
+        # Features de intervalo R-R, variabilidade (CV, RMSSD - PRINCIPAIS
+        # para detectar FA), percentis e frequência cardíaca média
+        **dict(zip(RR_STATISTICS_NAMES, rr_statistics.tolist()))
+    }
+
+
+def extract_features_from_record(record_path: str, label: int, annotation_ext: str = 'qrs',
+                                 raise_errors: bool = False, read_signal: bool = False,
+                                 cache: Optional[FeatureCache] = None,
+                                 rr_store=None) -> Optional[Dict]:
     """
     Extrai todas as features de um registro de ECG.
     
@@ -100,17 +237,59 @@ def extract_features_from_record(record_path: str, label: int, annotation_ext: s
                     Ex: '/path/to/aftdb/test-set-a/a01'
         label: Rótulo do registro (1 para FA, 0 para Normal)
         annotation_ext: Extensão do arquivo de anotações ('qrs' para AFTDB, 'atr' para NSRDB)
+        raise_errors: Se True, propaga os erros (e registros sem picos suficientes)
+                      como exceções em vez de imprimi-los e retornar None
+        read_signal: Se True, abre também o sinal (.dat) com signal_reader.SignalReader
+                     (mapeado em memória, decodificado sob demanda). Por padrão apenas
+                     o cabeçalho (.hea) é lido, pois todas as features vêm das
+                     anotações e só a frequência de amostragem é necessária do registro
+        cache: Cache de features (feature_cache.FeatureCache). Se fornecido, as
+               features são reutilizadas enquanto os arquivos do registro não mudarem
+        rr_store: Store colunar de picos R (rr_store.RRStore). Se o registro estiver
+                  nele (e atualizado), os picos e intervalos R-R vêm do store em vez
+                  de uma nova leitura das anotações WFDB
         
     Returns:
         Dicionário com todas as features extraídas, ou None se houver erro
     """
     try:
-        # 1. Ler o registro (sinal + metadados)
-        record = wfdb.rdrecord(record_path)
+        # 0a. Store colunar: picos e intervalos já convertidos, sem ler o WFDB
+        stored = rr_store.get(record_path, annotation_ext) if rr_store is not None else None
+        if stored is not None and not read_signal:
+            r_peaks, rr_intervals, fs = stored
+            count('feature_extraction.rr_store_hits')
+            count('feature_extraction.beats', len(r_peaks))
+            return {
+                'record_name': Path(record_path).name,
+                'label': label,
+                **features_from_rr_intervals(rr_intervals, fs, num_beats=len(r_peaks))
+            }
+        
+        # 0b. Consultar o cache (chave = conteúdo dos arquivos + versão das features)
+        if cache is not None:
+            cache_key = cache.record_key(record_path, annotation_ext, read_signal)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                count('feature_extraction.cache_hits')
+                return {**cached, 'record_name': Path(record_path).name, 'label': label}
+        
+        # 1. Ler os metadados do registro
+        # O cabeçalho (.hea) já contém a frequência de amostragem; decodificar o
+        # .dat (horas de sinal no NSRDB) só é necessário se pedido explicitamente
+        import wfdb
+        with timer('feature_extraction.read_header'):
+            if read_signal:
+                from signal_reader import SignalReader
+                record = SignalReader(record_path)
+            else:
+                record = wfdb.rdheader(record_path)
         
         # 2. Ler as anotações dos picos R
         # IMPORTANTE: Usa 'qrs' para AFTDB e 'atr' para NSRDB
-        annotation = wfdb.rdann(record_path, annotation_ext)
+        with timer('feature_extraction.read_annotations'):
+            annotation = wfdb.rdann(record_path, annotation_ext)
+        count('feature_extraction.records_read')
+        count('feature_extraction.beats', len(annotation.sample))
         
         # 3. Obter frequência de amostragem
         fs = record.fs
@@ -120,14 +299,18 @@ def extract_features_from_record(record_path: str, label: int, annotation_ext: s
         
         # Verificar se há picos suficientes
         if len(r_peaks) < 2:
-            print(f"⚠️  Registro {Path(record_path).name}: Apenas {len(r_peaks)} pico(s) R encontrado(s). Pulando...")
+            if raise_errors:
+                raise ValueError(f"Apenas {len(r_peaks)} pico(s) R encontrado(s)")
+            log.warning(f"⚠️  Registro {Path(record_path).name}: Apenas {len(r_peaks)} pico(s) R encontrado(s). Pulando...")
             return None
         
         # 5. Calcular intervalos R-R em segundos
         rr_intervals = extract_rr_intervals(r_peaks, fs)
         
         if len(rr_intervals) == 0:
-            print(f"⚠️  Registro {Path(record_path).name}: Nenhum intervalo R-R calculado. Pulando...")
+            if raise_errors:
+                raise ValueError("Nenhum intervalo R-R calculado")
+            log.warning(f"⚠️  Registro {Path(record_path).name}: Nenhum intervalo R-R calculado. Pulando...")
             return None
         
         # 6. Extrair features estatísticas
@@ -135,89 +318,220 @@ def extract_features_from_record(record_path: str, label: int, annotation_ext: s
             # Identificação
             'record_name': Path(record_path).name,
             'label': label,
-            
-            # Informações básicas
-            'num_beats': len(r_peaks),
-            'num_rr_intervals': len(rr_intervals),
-            'sampling_freq': fs,
-            
-            # Features de intervalo R-R (em segundos)
-            'rr_mean': np.mean(rr_intervals),
-            'rr_std': np.std(rr_intervals),
-            'rr_median': np.median(rr_intervals),
-            'rr_min': np.min(rr_intervals),
-            'rr_max': np.max(rr_intervals),
-            
-            # Features de variabilidade (PRINCIPAIS para detectar FA)
-            'rr_cv': calculate_cv(rr_intervals),  # Coeficiente de Variação
-            'rr_rmssd': calculate_rmssd(rr_intervals),  # RMSSD
-            
-            # Features adicionais
-            'rr_range': np.max(rr_intervals) - np.min(rr_intervals),
-            'rr_percentile_25': np.percentile(rr_intervals, 25),
-            'rr_percentile_75': np.percentile(rr_intervals, 75),
-            'rr_iqr': np.percentile(rr_intervals, 75) - np.percentile(rr_intervals, 25),
-            
-            # Frequência cardíaca média (batimentos por minuto)
-            'mean_hr_bpm': 60.0 / np.mean(rr_intervals) if np.mean(rr_intervals) > 0 else 0,
+            **features_from_rr_intervals(rr_intervals, fs, num_beats=len(r_peaks))
         }
         
+        if cache is not None:
+            cache.put(cache_key, record_path, features)
+        
         return features
         
     except FileNotFoundError as e:
-        print(f"❌ Erro ao ler registro {Path(record_path).name}: Arquivo não encontrado - {e}")
+        count('feature_extraction.errors')
+        if raise_errors:
+            raise
+        log.error(f"❌ Erro ao ler registro {Path(record_path).name}: Arquivo não encontrado - {e}")
         return None
     except Exception as e:
-        print(f"❌ Erro ao processar registro {Path(record_path).name}: {e}")
+        count('feature_extraction.errors')
+        if raise_errors:
+            raise
+        log.error(f"❌ Erro ao processar registro {Path(record_path).name}: {e}")
         return None
 
 
-def extract_features_from_all_records(records_info: List[Dict]) -> pd.DataFrame:
+def _extract_features_task(record_info: Dict, cache: Optional[FeatureCache] = None,
+                           rr_store=None) -> Dict:
+    """
+    Processa um único registro dentro de um worker do pool.
+    
+    Os erros são capturados e devolvidos junto com o resultado (em vez de
+    impressos), para que o processo principal possa resumi-los no final.
+    
+    Args:
+        record_info: Dicionário com informações do registro (ver data_loader)
+        cache: Cache de features opcional
+        rr_store: Store colunar de picos R opcional
+        
+    Returns:
+        {'features': dict ou None, 'error': mensagem de erro ou None}
+    """
+    try:
+        features = extract_features_from_record(
+            record_info['full_path'],
+            record_info['label'],
+            record_info.get('annotation_ext', 'qrs'),
+            raise_errors=True,
+            cache=cache,
+            rr_store=rr_store
+        )
+    except Exception as e:
+        return {'features': None, 'error': f"{type(e).__name__}: {e}"}
+    
+    # Adicionar informações extras do dataset
+    features['dataset'] = record_info.get('dataset')
+    features['subset'] = record_info.get('subset', 'main')
+    return {'features': features, 'error': None}
+
+
+def _init_instrumented_worker():
+    """
+    Inicializador do pool com instrumentação: liga a coleta no worker e descarta
+    as métricas herdadas do processo principal (fork).
+    """
+    instrumentation.enable()
+    instrumentation.REGISTRY.reset()
+
+
+def _instrumented_task(record_info: Dict, task) -> Dict:
+    """
+    Executa a tarefa em um worker e devolve as métricas do worker junto com o
+    resultado (somadas no processo principal).
+    """
+    result = task(record_info)
+    result['metrics'] = instrumentation.REGISTRY.drain()
+    return result
+
+
+def resolve_pool_size(n_records: int, n_workers: Optional[int] = 1,
+                      chunksize: Optional[int] = None):
+    """
+    Define o número de workers e o tamanho dos blocos para a extração paralela.
+    
+    Args:
+        n_records: Número de registros a processar
+        n_workers: Número de processos pedido (None = todos os núcleos)
+        chunksize: Registros por bloco (None = automático)
+        
+    Returns:
+        Tupla (n_workers, chunksize)
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, n_records))
+    
+    if chunksize is None:
+        chunksize = max(1, n_records // (n_workers * 4))
+    
+    return n_workers, chunksize
+
+
+def iter_record_features(records_info: List[Dict], n_workers: Optional[int] = 1,
+                         chunksize: Optional[int] = None,
+                         cache: Optional[FeatureCache] = None,
+                         rr_store=None):
+    """
+    Extrai as features dos registros, em série ou em um pool de processos,
+    sem imprimir nada.
+    
+    Args:
+        records_info: Lista de dicionários com informações dos registros
+        n_workers: Número de processos (1 = serial, None = todos os núcleos)
+        chunksize: Registros enviados por vez a cada worker (None = automático)
+        cache: Cache de features opcional
+        rr_store: Store colunar de picos R opcional (rr_store.RRStore)
+        
+    Yields:
+        Tuplas (record_info, {'features': ..., 'error': ...}) na MESMA ordem de
+        records_info, independente do número de workers
+    """
+    n_workers, chunksize = resolve_pool_size(len(records_info), n_workers, chunksize)
+    task = partial(_extract_features_task, cache=cache, rr_store=rr_store)
+    
+    if n_workers == 1:
+        for record_info in records_info:
+            yield record_info, task(record_info)
+        return
+    
+    initializer = None
+    if instrumentation.is_enabled():
+        task = partial(_instrumented_task, task=task)
+        initializer = _init_instrumented_worker
+    
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=initializer) as executor:
+        # executor.map devolve os resultados na ordem de entrada (saída determinística)
+        results = executor.map(task, records_info, chunksize=chunksize)
+        for record_info, result in zip(records_info, results):
+            if 'metrics' in result:
+                instrumentation.REGISTRY.merge(result.pop('metrics'))
+            yield record_info, result
+
+
+@timed('feature_extraction.extract_all')
+def extract_features_from_all_records(records_info: List[Dict], n_workers: Optional[int] = 1,
+                                      chunksize: Optional[int] = None,
+                                      cache: Optional[FeatureCache] = None,
+                                      rr_store=None) -> 'pd.DataFrame':
     """
     Extrai features de todos os registros e retorna um DataFrame.
     
+    Com n_workers > 1 os registros são distribuídos em blocos (chunks) entre
+    processos. A ordem das linhas do DataFrame é sempre a mesma de records_info,
+    independente do número de workers.
+    
     Args:
         records_info: Lista de dicionários com informações dos registros
                      (retornado por data_loader.load_all_records())
+        n_workers: Número de processos (1 = serial, None = todos os núcleos)
+        chunksize: Registros enviados por vez a cada worker
+                   (padrão: calculado a partir do número de registros e workers)
+        cache: Cache de features opcional; apenas registros novos ou alterados
+               são reprocessados. Entradas excedentes são removidas ao final
+        rr_store: Store colunar de picos R (rr_store.RRStore); registros presentes
+                  nele não têm as anotações WFDB relidas
         
     Returns:
-        DataFrame do Pandas com todas as features extraídas
+        DataFrame do Pandas com todas as features extraídas. Os registros que
+        falharam ficam listados em df.attrs['errors']
     """
     all_features = []
+    errors = []
     
-    print("=" * 60)
-    print("⚙️  EXTRAINDO FEATURES DE TODOS OS REGISTROS")
-    print("=" * 60)
+    log.info("⚙️  EXTRAINDO FEATURES DE TODOS OS REGISTROS")
     
-    for i, record_info in enumerate(records_info, 1):
-        record_path = record_info['full_path']
-        label = record_info['label']
-        dataset = record_info['dataset']
-        annotation_ext = record_info.get('annotation_ext', 'qrs')  # Default para 'qrs'
-        
-        # Feedback de progresso
-        if i % 10 == 0 or i == 1:
-            print(f"Processando registro {i}/{len(records_info)}: {record_info['record_name']} ({dataset})")
-        
-        # Extrair features
-        features = extract_features_from_record(record_path, label, annotation_ext)
-        
-        if features is not None:
-            # Adicionar informações extras do dataset
-            features['dataset'] = dataset
-            features['subset'] = record_info.get('subset', 'main')
-            all_features.append(features)
+    n_workers, chunksize = resolve_pool_size(len(records_info), n_workers, chunksize)
+    if n_workers > 1:
+        log.info(f"🔀 Modo paralelo: {n_workers} workers (chunksize={chunksize})")
+    
+    results = iter_record_features(records_info, n_workers, chunksize, cache, rr_store)
+    
+    # Progresso com taxa e ETA a cada poucos segundos (não uma linha por registro)
+    with ProgressReporter(len(records_info), 'Extraindo features', log) as progress:
+        for record_info, result in results:
+            progress.update()
+            log.debug("   Registro %s (%s)", record_info['record_name'], record_info['dataset'],
+                      extra={'record': record_info['record_name']})
+            
+            if result['error'] is not None:
+                errors.append({
+                    'record_name': record_info['record_name'],
+                    'full_path': record_info['full_path'],
+                    'error': result['error']
+                })
+                continue
+            
+            all_features.append(result['features'])
+    
+    if cache is not None:
+        cache.evict()
     
     # Criar DataFrame
+    import pandas as pd
     df = pd.DataFrame(all_features)
+    df.attrs['errors'] = errors
     
-    print("=" * 60)
-    print(f"✅ EXTRAÇÃO CONCLUÍDA")
-    print(f"   Total de registros processados: {len(df)}")
-    print(f"   - Fibrilação Atrial (label=1): {len(df[df['label'] == 1])}")
-    print(f"   - Ritmo Normal (label=0): {len(df[df['label'] == 0])}")
-    print(f"   Features extraídas: {len(df.columns)} colunas")
-    print("=" * 60)
+    log.info("✅ EXTRAÇÃO CONCLUÍDA")
+    log.info(f"   Total de registros processados: {len(df)}",
+             extra={'records': len(df), 'errors': len(errors), 'features': len(df.columns)})
+    if len(df) > 0:
+        log.info(f"   - Fibrilação Atrial (label=1): {len(df[df['label'] == 1])}")
+        log.info(f"   - Ritmo Normal (label=0): {len(df[df['label'] == 0])}")
+    log.info(f"   Features extraídas: {len(df.columns)} colunas")
+    if errors:
+        log.warning(f"   ⚠️  {len(errors)} registro(s) com erro:")
+        for error in errors:
+            log.warning(f"      • {error['record_name']}: {error['error']}",
+                        extra={'record': error['full_path']})
     
     return df
 
@@ -225,12 +539,29 @@ def extract_features_from_all_records(records_info: List[Dict]) -> pd.DataFrame:
 if __name__ == "__main__":
     # Teste do script
     from data_loader import load_all_records
-    from pathlib import Path
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Extrair features de todos os registros de ECG')
+    parser.add_argument('data_root', nargs='?', default=None,
+                        help='Pasta data/raw com aftdb e nsrdb (padrão: data/raw do projeto)')
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='Número de processos para extração paralela (padrão: 1, 0 = todos os núcleos)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Registros enviados por vez a cada worker (padrão: automático)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recalcular todas as features sem consultar o cache em disco')
+    parser.add_argument('--rr-store', nargs='?', const='default', default=None, metavar='PASTA',
+                        help='Ler picos R do store colunar (python src/rr_store.py build) '
+                             'em vez das anotações WFDB')
+    instrumentation.add_arguments(parser)
+    reporting.add_arguments(parser)
+    args = parser.parse_args()
+    reporting.configure_from_args(args)
+    instrumentation.session_from_args(args).start()
     
     # Caminho padrão
-    if len(sys.argv) > 1:
-        data_root = sys.argv[1]
+    if args.data_root is not None:
+        data_root = args.data_root
     else:
         script_dir = Path(__file__).parent
         data_root = script_dir.parent / 'data' / 'raw'
@@ -238,18 +569,32 @@ if __name__ == "__main__":
     # Carregar registros
     records = load_all_records(str(data_root))
     
+    rr_store = None
+    if args.rr_store is not None:
+        from rr_store import DEFAULT_STORE_DIR, RRStore
+        rr_store = RRStore(DEFAULT_STORE_DIR if args.rr_store == 'default' else args.rr_store)
+        log.info(f"📦 Store R-R: {len(rr_store)} registros em {rr_store.store_dir}")
+    
     # Extrair features
-    df_features = extract_features_from_all_records(records)
+    df_features = extract_features_from_all_records(
+        records,
+        n_workers=args.workers or None,
+        chunksize=args.chunksize,
+        # Com o store, ler um registro já é uma fatia de array: o cache não ajuda
+        cache=None if (args.no_cache or rr_store is not None)
+        else FeatureCache(schema_version=FEATURE_SCHEMA_VERSION),
+        rr_store=rr_store
+    )
     
     # Salvar em CSV
     output_path = Path(__file__).parent.parent / 'data' / 'processed' / 'features.csv'
     df_features.to_csv(output_path, index=False)
-    print(f"\n💾 Features salvas em: {output_path}")
+    log.info(f"💾 Features salvas em: {output_path}")
     
     # Mostrar primeiras linhas
-    print("\n📊 Primeiras linhas do dataset:")
-    print(df_features.head())
+    log.info("📊 Primeiras linhas do dataset:")
+    log.info(df_features.head().to_string())
     
     # Estatísticas descritivas
-    print("\n📈 Estatísticas descritivas das principais features:")
-    print(df_features[['rr_mean', 'rr_std', 'rr_cv', 'rr_rmssd', 'label']].describe())
+    log.info("📈 Estatísticas descritivas das principais features:")
+    log.info(df_features[['rr_mean', 'rr_std', 'rr_cv', 'rr_rmssd', 'label']].describe().to_string())
@@ -0,0 +1,475 @@
+"""
+hrv_frequency.py
+----------------
+Features de variabilidade da frequência cardíaca (HRV) no domínio da frequência:
+potência nas bandas VLF, LF e HF, unidades normalizadas e razão LF/HF.
+
+As features de feature_extraction.py são todas no domínio do tempo (média,
+desvio padrão, CV, RMSSD, percentis). Aqui a série R-R, que tem um valor por
+batimento (amostragem irregular), vira um espectro por um de dois métodos:
+- 'welch' (padrão): tacograma reamostrado em grade uniforme de 4 Hz (spline
+  cúbica, a convenção usual em HRV) e FFT de todos os segmentos de uma vez, com
+  janela de Hann. A interpolação linear atenuaria a banda HF: com ~5 batimentos
+  por ciclo de 0.25 Hz, uma oscilação de 30 ms a 75 bpm sairia com ~23% menos
+  potência do que no Lomb-Scargle
+- 'lomb': periodograma de Lomb-Scargle direto nos instantes dos batimentos, sem
+  reamostragem (não inventa valores em lacunas), calculado em lote para todos os
+  segmentos e frequências
+
+Janela de Hann, rampa de remoção de tendência, grade de frequências e índices das
+bandas dependem só da duração do segmento: ficam em um plano em cache
+(spectral_plan) reaproveitado por todos os registros e janelas.
+
+Por registro (frequency_features), o espectro é a média dos segmentos de 5 min com
+50% de sobreposição (Holter de 24h). Por janela (windowed_frequency_features), cada
+janela deslizante tem o seu espectro (ex: razão LF/HF ao longo do dia).
+
+As features não entram no modelo (MODEL_FEATURE_NAMES): são uma análise à parte.
+
+USO:
+    from hrv_frequency import frequency_features
+    features = frequency_features(rr_intervals)
+
+    python src/hrv_frequency.py data/raw/nsrdb/16265 --annotation-ext atr
+    python src/hrv_frequency.py data/raw/nsrdb/16265 --method lomb --window-seconds 300 --show-windows
+"""
+
+import sys
+import argparse
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.append(str(Path(__file__).parent))
+from instrumentation import timed
+
+
+# Bandas padrão de HRV (Hz), intervalo [início, fim)
+HRV_BANDS = {
+    'vlf': (0.0033, 0.04),
+    'lf': (0.04, 0.15),
+    'hf': (0.15, 0.40),
+}
+
+# Ordem fixa das features (potências em ms², unidades normalizadas em %)
+FREQUENCY_FEATURE_NAMES = [
+    'hrv_total_power', 'hrv_vlf_power', 'hrv_lf_power', 'hrv_hf_power',
+    'hrv_lf_nu', 'hrv_hf_nu', 'hrv_lf_hf_ratio',
+    'hrv_lf_peak_hz', 'hrv_hf_peak_hz'
+]
+
+METHODS = ('welch', 'lomb')
+
+# Símbolos WFDB de batimento (os demais, como '~' ruído e '|' artefato, não são
+# batimentos) e, entre eles, os de condução normal (intervalos NN)
+BEAT_SYMBOLS = frozenset('NLRBAaJSVrFejnE/fQ?')
+NORMAL_BEAT_SYMBOLS = frozenset('NLRej')
+
+# Intervalos NN fisiologicamente plausíveis (s): fora disso são perda de sinal ou
+# batimento não anotado, e um único valor de 30 s domina o espectro do segmento
+MIN_NN_SECONDS = 0.3
+MAX_NN_SECONDS = 2.0
+
+# Frequência da grade uniforme do tacograma reamostrado (método 'welch')
+RESAMPLE_FS = 4.0
+
+# Segmentos de 5 min: resolução de 1/300 Hz, o início da banda VLF
+SEGMENT_SECONDS = 300.0
+
+# Segmento mínimo: abaixo disso as bandas LF/VLF têm poucos pontos e as
+# features saem como NaN
+MIN_SEGMENT_SECONDS = 30.0
+
+# Batimentos mínimos em um segmento do Lomb-Scargle (janelas com lacunas longas)
+MIN_SEGMENT_BEATS = 10
+
+# Elementos (segmentos × batimentos) por bloco do Lomb-Scargle em lote: ~512 KB
+# de números complexos, que ficam no cache durante as recorrências
+LOMB_CHUNK_ELEMENTS = 1 << 15
+
+
+@dataclass(frozen=True)
+class SpectralPlan:
+    """
+    Tudo o que depende só da duração do segmento, calculado uma vez por duração.
+    """
+    segment_seconds: float
+    n_samples: int            # amostras por segmento na grade uniforme
+    fs: float
+    window: np.ndarray        # Hann
+    ramp: np.ndarray          # rampa centrada e de norma 1 (remoção de tendência linear)
+    psd_scale: float          # densidade espectral unilateral: 2 / (fs Σw²)
+    freqs: np.ndarray         # k / segment_seconds, k = 0 .. último bin <= 0.4 Hz
+    band_slices: Dict[str, slice]
+
+    @property
+    def df(self) -> float:
+        return 1.0 / self.segment_seconds
+
+
+@lru_cache(maxsize=64)
+def spectral_plan(segment_seconds: float, fs: float = RESAMPLE_FS) -> SpectralPlan:
+    """
+    Plano em cache para segmentos de `segment_seconds` amostrados a `fs` Hz.
+    """
+    n_samples = int(round(segment_seconds * fs))
+    segment_seconds = n_samples / fs
+    window = np.hanning(n_samples + 1)[:-1]  # Hann periódica
+    ramp = np.arange(n_samples) - (n_samples - 1) / 2
+    ramp /= np.sqrt(np.dot(ramp, ramp))
+
+    n_bins = int(np.floor(HRV_BANDS['hf'][1] * segment_seconds)) + 1
+    freqs = np.arange(n_bins) / segment_seconds
+    band_slices = {name: slice(int(np.searchsorted(freqs, low)), int(np.searchsorted(freqs, high)))
+                   for name, (low, high) in HRV_BANDS.items()}
+
+    for array in (window, ramp, freqs):
+        array.setflags(write=False)
+    return SpectralPlan(segment_seconds, n_samples, fs, window, ramp,
+                        2.0 / (fs * np.dot(window, window)), freqs, band_slices)
+
+
+def nn_intervals(peak_samples: np.ndarray, symbols, sampling_freq: float,
+                 min_rr: float = MIN_NN_SECONDS, max_rr: float = MAX_NN_SECONDS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intervalos NN (entre dois batimentos normais consecutivos) de uma anotação WFDB.
+
+    Anotações que não são batimentos são descartadas; intervalos que começam ou
+    terminam em extrassístole, ou fora de [min_rr, max_rr], ficam de fora e
+    deixam uma lacuna na série.
+
+    Args:
+        peak_samples: Posições das anotações (amostras)
+        symbols: Símbolo de cada anotação
+        sampling_freq: Frequência de amostragem (Hz)
+        min_rr: Menor intervalo aceito (s)
+        max_rr: Maior intervalo aceito (s)
+
+    Returns:
+        Tupla (intervalos NN em segundos, instante em segundos do batimento que
+        encerra cada intervalo)
+    """
+    symbols = np.asarray(symbols)
+    is_beat = np.isin(symbols, list(BEAT_SYMBOLS))
+    peak_samples = np.asarray(peak_samples)[is_beat]
+    normal = np.isin(symbols[is_beat], list(NORMAL_BEAT_SYMBOLS))
+    rr_intervals = np.diff(peak_samples) / sampling_freq
+    keep = normal[1:] & normal[:-1] & (rr_intervals >= min_rr) & (rr_intervals <= max_rr)
+    return rr_intervals[keep], peak_samples[1:][keep] / sampling_freq
+
+
+def beat_times_from_rr(rr_intervals: np.ndarray) -> np.ndarray:
+    """
+    Instante (s) do batimento que encerra cada intervalo R-R, sem lacunas.
+    """
+    return np.cumsum(rr_intervals)
+
+
+def resample_tachogram(rr_ms: np.ndarray, beat_times: np.ndarray, fs: float = RESAMPLE_FS) -> np.ndarray:
+    """
+    Tacograma em grade uniforme de `fs` Hz a partir de beat_times[0] (spline cúbica).
+    """
+    from scipy.interpolate import CubicSpline
+
+    n_grid = int(np.floor((beat_times[-1] - beat_times[0]) * fs)) + 1
+    grid = beat_times[0] + np.arange(n_grid) / fs
+    return CubicSpline(beat_times, rr_ms)(grid)
+
+
+def segment_starts(duration: float, plan: SpectralPlan, hop_seconds: float) -> np.ndarray:
+    """
+    Início (s, relativo ao primeiro batimento) de cada segmento completo.
+    """
+    n_grid = int(np.floor(duration * plan.fs)) + 1
+    hop = max(1, int(round(hop_seconds * plan.fs)))
+    if n_grid < plan.n_samples:
+        return np.empty(0)
+    return np.arange((n_grid - plan.n_samples) // hop + 1) * hop / plan.fs
+
+
+def welch_segment_psd(tachogram: np.ndarray, plan: SpectralPlan, hop_seconds: float) -> np.ndarray:
+    """
+    Densidade espectral (ms²/Hz) de cada segmento do tacograma uniforme, com
+    tendência linear removida e janela de Hann.
+
+    Returns:
+        Array (segmentos, len(plan.freqs))
+    """
+    hop = max(1, int(round(hop_seconds * plan.fs)))
+    segments = sliding_window_view(tachogram, plan.n_samples)[::hop]
+    # Sem tendência: a média e a projeção na rampa centrada saem em dois produtos
+    detrended = segments - segments.mean(axis=1, keepdims=True)
+    detrended -= np.outer(detrended @ plan.ramp, plan.ramp)
+    spectrum = np.fft.rfft(detrended * plan.window, axis=1)[:, :len(plan.freqs)]
+    psd = (spectrum.real ** 2 + spectrum.imag ** 2) * plan.psd_scale
+    psd[:, 0] = 0.0
+    return psd
+
+
+def lomb_segment_psd(rr_ms: np.ndarray, beat_times: np.ndarray, starts: np.ndarray,
+                     plan: SpectralPlan) -> np.ndarray:
+    """
+    Periodograma de Lomb-Scargle (ms²/Hz) de cada segmento [start, start + T),
+    nas frequências k/T do plano.
+
+    Os segmentos são empilhados em uma matriz (segmentos × batimentos, com
+    preenchimento) e processados juntos. Como as frequências são múltiplas de
+    1/T, os termos exp(i2πkt/T) saem por recorrência (z^k = z^(k-1)·z, com
+    z = exp(i2πt/T)): uma multiplicação complexa por batimento e frequência em
+    vez de um seno e um cosseno. A normalização é a mesma do Welch (a integral
+    do espectro é a variância).
+
+    Returns:
+        Array (segmentos, len(plan.freqs)); NaN em segmentos com menos de
+        MIN_SEGMENT_BEATS batimentos
+    """
+    period = plan.segment_seconds
+    n_freqs = len(plan.freqs) - 1  # sem o bin 0
+    lo = np.searchsorted(beat_times, beat_times[0] + starts)
+    hi = np.searchsorted(beat_times, beat_times[0] + starts + period)
+    counts = hi - lo
+    psd = np.full((len(starts), len(plan.freqs)), np.nan)
+    psd[:, 0] = 0.0
+    if len(starts) == 0:
+        return psd
+
+    max_len = max(int(counts.max()), 1)
+    chunk = max(1, LOMB_CHUNK_ELEMENTS // max_len)
+    positions = np.arange(max_len)
+
+    for first in range(0, len(starts), chunk):
+        rows = slice(first, first + chunk)
+        n = counts[rows]
+        mask = positions < n[:, None]
+        index = np.minimum(lo[rows, None] + positions, len(beat_times) - 1)
+        # Tempo relativo ao início do segmento: ω·t pequeno mesmo em registros de 24h
+        t = np.where(mask, beat_times[index] - beat_times[0] - starts[rows, None], 0.0)
+        x = np.where(mask, rr_ms[index], 0.0)
+
+        # Tendência linear por segmento (mínimos quadrados só nos batimentos válidos)
+        safe_n = np.maximum(n, 1)[:, None]
+        # Intervalo médio entre amostras = R-R médio do segmento (s); com T/N,
+        # segmentos só parcialmente cobertos (lacunas) teriam a potência inflada
+        mean_interval = x.sum(axis=1, keepdims=True) / safe_n / 1000.0
+        t_centered = np.where(mask, t - t.sum(axis=1, keepdims=True) / safe_n, 0.0)
+        x_centered = np.where(mask, x - x.sum(axis=1, keepdims=True) / safe_n, 0.0)
+        t_norm = np.einsum('ij,ij->i', t_centered, t_centered)[:, None]
+        slope = np.einsum('ij,ij->i', t_centered, x_centered)[:, None] / np.where(t_norm > 0, t_norm, 1.0)
+        x = (x_centered - slope * t_centered).astype(np.complex128)
+
+        # X[k] = Σ x·z^k (k = 1..n_freqs) e Z2[k] = Σ z^2k (k = 1..n_freqs), com
+        # z = 0 no preenchimento
+        z = np.where(mask, np.exp(2j * np.pi * t / period), 0.0)
+        X = np.empty((len(n), n_freqs), dtype=np.complex128)
+        Z2 = np.empty((len(n), n_freqs), dtype=np.complex128)
+        power_k = z.copy()
+        for k in range(1, 2 * n_freqs + 1):
+            if k > 1:
+                power_k *= z
+            if k <= n_freqs:
+                X[:, k - 1] = np.einsum('sn,sn->s', power_k, x)
+            if k % 2 == 0:
+                Z2[:, k // 2 - 1] = power_k.sum(axis=1)
+
+        # Deslocamento τ do Lomb-Scargle: 2ωτ = arg(Z2)
+        rotated = X * np.exp(-0.5j * np.angle(Z2))
+        half_n = n[:, None] / 2
+        half_z2 = np.abs(Z2) / 2
+        power = 0.5 * (rotated.real ** 2 / np.maximum(half_n + half_z2, 1e-12)
+                       + rotated.imag ** 2 / np.maximum(half_n - half_z2, 1e-12))
+        # Densidade unilateral
+        psd[rows, 1:] = np.where(n[:, None] >= MIN_SEGMENT_BEATS, 2.0 * power * mean_interval, np.nan)
+    return psd
+
+
+def band_features(psd: np.ndarray, plan: SpectralPlan) -> np.ndarray:
+    """
+    Features de FREQUENCY_FEATURE_NAMES de uma ou várias densidades espectrais.
+
+    Args:
+        psd: Array (..., len(plan.freqs)) em ms²/Hz
+
+    Returns:
+        Array (..., len(FREQUENCY_FEATURE_NAMES))
+    """
+    psd = np.asarray(psd, dtype=np.float64)
+    powers = {name: psd[..., band].sum(axis=-1) * plan.df for name, band in plan.band_slices.items()}
+    vlf, lf, hf = powers['vlf'], powers['lf'], powers['hf']
+
+    def band_peak(name):
+        band = plan.band_slices[name]
+        if band.stop <= band.start:
+            return np.full(psd.shape[:-1], np.nan)
+        peak = plan.freqs[band][np.argmax(np.nan_to_num(psd[..., band], nan=-1.0), axis=-1)]
+        return np.where(np.isnan(powers[name]), np.nan, peak)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lf_hf = lf + hf
+        return np.stack([
+            vlf + lf + hf, vlf, lf, hf,
+            np.where(lf_hf > 0, lf / lf_hf * 100, np.nan),
+            np.where(lf_hf > 0, hf / lf_hf * 100, np.nan),
+            np.where(hf > 0, lf / hf, np.nan),
+            band_peak('lf'), band_peak('hf')
+        ], axis=-1)
+
+
+def _prepare(rr_intervals: np.ndarray, beat_times: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, float]:
+    rr_intervals = np.asarray(rr_intervals, dtype=np.float64)
+    if beat_times is None:
+        beat_times = beat_times_from_rr(rr_intervals)
+    beat_times = np.asarray(beat_times, dtype=np.float64)
+    if len(beat_times) != len(rr_intervals):
+        raise ValueError("beat_times precisa ter um instante por intervalo R-R")
+    duration = float(beat_times[-1] - beat_times[0]) if len(beat_times) else 0.0
+    return rr_intervals * 1000.0, beat_times, duration
+
+
+def segment_psd(rr_ms: np.ndarray, beat_times: np.ndarray, duration: float, plan: SpectralPlan,
+                hop_seconds: float, method: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Início (s) e densidade espectral de cada segmento, pelo método escolhido.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método desconhecido: {method} (use {' ou '.join(METHODS)})")
+    starts = segment_starts(duration, plan, hop_seconds)
+    if len(starts) == 0:
+        return starts, np.empty((0, len(plan.freqs)))
+    if method == 'welch':
+        return starts, welch_segment_psd(resample_tachogram(rr_ms, beat_times, plan.fs), plan, hop_seconds)
+    return starts, lomb_segment_psd(rr_ms, beat_times, starts, plan)
+
+
+@timed('hrv_frequency.record')
+def frequency_features(rr_intervals: np.ndarray, beat_times: Optional[np.ndarray] = None,
+                       method: str = 'welch', segment_seconds: float = SEGMENT_SECONDS) -> Dict:
+    """
+    Features de HRV no domínio da frequência de um registro inteiro.
+
+    O espectro é a média dos segmentos de `segment_seconds` com 50% de
+    sobreposição; registros mais curtos que um segmento usam um segmento único
+    com a duração do registro.
+
+    Args:
+        rr_intervals: Intervalos R-R em segundos
+        beat_times: Instante (s) do batimento que encerra cada intervalo. Padrão:
+                    soma acumulada dos intervalos (série sem lacunas)
+        method: 'welch' (reamostragem + FFT) ou 'lomb' (Lomb-Scargle)
+        segment_seconds: Duração de cada segmento (padrão: 300 s)
+
+    Returns:
+        Dicionário com as features de FREQUENCY_FEATURE_NAMES (NaN se o registro
+        tiver menos de MIN_SEGMENT_SECONDS)
+    """
+    rr_ms, beat_times, duration = _prepare(rr_intervals, beat_times)
+    segment_seconds = min(segment_seconds, np.floor(duration))
+    if segment_seconds < MIN_SEGMENT_SECONDS:
+        return dict.fromkeys(FREQUENCY_FEATURE_NAMES, float('nan'))
+
+    plan = spectral_plan(float(segment_seconds))
+    _, psd = segment_psd(rr_ms, beat_times, duration, plan, segment_seconds / 2, method)
+    valid = ~np.isnan(psd).any(axis=1)
+    if not valid.any():
+        return dict.fromkeys(FREQUENCY_FEATURE_NAMES, float('nan'))
+    features = band_features(psd[valid].mean(axis=0), plan)
+    return dict(zip(FREQUENCY_FEATURE_NAMES, features.tolist()))
+
+
+@timed('hrv_frequency.windows')
+def windowed_frequency_features(rr_intervals: np.ndarray, beat_times: Optional[np.ndarray] = None,
+                                window_seconds: float = SEGMENT_SECONDS,
+                                hop_seconds: Optional[float] = None,
+                                method: str = 'welch') -> List[Dict]:
+    """
+    Features de HRV no domínio da frequência por janela deslizante (um espectro
+    por janela, todas calculadas em lote).
+
+    Args:
+        rr_intervals: Intervalos R-R em segundos
+        beat_times: Instante (s) do batimento que encerra cada intervalo (padrão:
+                    soma acumulada dos intervalos)
+        window_seconds: Duração de cada janela (padrão: 300 s)
+        hop_seconds: Passo entre janelas (padrão: metade da janela)
+        method: 'welch' (reamostragem + FFT) ou 'lomb' (Lomb-Scargle)
+
+    Returns:
+        Lista com 'start_time', 'end_time' e as features de
+        FREQUENCY_FEATURE_NAMES de cada janela completa
+    """
+    if window_seconds < MIN_SEGMENT_SECONDS:
+        raise ValueError(f"Janela mínima: {MIN_SEGMENT_SECONDS:g} s")
+    rr_ms, beat_times, duration = _prepare(rr_intervals, beat_times)
+    if hop_seconds is None:
+        hop_seconds = window_seconds / 2
+
+    plan = spectral_plan(float(window_seconds))
+    starts, psd = segment_psd(rr_ms, beat_times, duration, plan, hop_seconds, method)
+    features = band_features(psd, plan)
+
+    origin = beat_times[0] if len(beat_times) else 0.0
+    return [{
+        'start_time': float(origin + start),
+        'end_time': float(origin + start + plan.segment_seconds),
+        **dict(zip(FREQUENCY_FEATURE_NAMES, row))
+    } for start, row in zip(starts.tolist(), features.tolist())]
+
+
+def main():
+    import wfdb
+    from predict import resolve_annotation_ext
+
+    parser = argparse.ArgumentParser(description='Features de HRV no domínio da frequência de um registro WFDB')
+    parser.add_argument('record_path', type=str, help='Caminho do registro (sem extensão)')
+    parser.add_argument('--annotation-ext', type=str, default='qrs', choices=['qrs', 'atr'],
+                        help='Extensão de anotação preferida (padrão: qrs)')
+    parser.add_argument('--method', choices=METHODS, default='welch',
+                        help='welch = reamostragem + FFT; lomb = Lomb-Scargle (padrão: welch)')
+    parser.add_argument('--window-seconds', type=float, default=SEGMENT_SECONDS,
+                        help=f'Duração dos segmentos/janelas (padrão: {SEGMENT_SECONDS:g} s)')
+    parser.add_argument('--hop-seconds', type=float, default=None,
+                        help='Passo entre janelas (padrão: metade da janela)')
+    parser.add_argument('--show-windows', action='store_true',
+                        help='Listar as features de cada janela')
+    args = parser.parse_args()
+
+    record_path = args.record_path
+    if record_path.endswith('.dat') or record_path.endswith('.hea'):
+        record_path = record_path.rsplit('.', 1)[0]
+
+    fs = wfdb.rdheader(record_path).fs
+    annotation = wfdb.rdann(record_path, resolve_annotation_ext(record_path, args.annotation_ext))
+    rr_intervals, beat_times = nn_intervals(annotation.sample, annotation.symbol, fs)
+
+    features = frequency_features(rr_intervals, beat_times, method=args.method,
+                                  segment_seconds=args.window_seconds)
+
+    print("=" * 80)
+    print(f"📈 HRV NO DOMÍNIO DA FREQUÊNCIA: {Path(record_path).name} ({args.method})")
+    print("=" * 80)
+    # Com menos de 2 intervalos NN não há duração (e as features saem NaN)
+    duration_h = (beat_times[-1] - beat_times[0]) / 3600 if len(beat_times) >= 2 else 0.0
+    print(f"   Intervalos NN: {len(rr_intervals)} de {max(len(annotation.sample) - 1, 0)} | "
+          f"Duração: {duration_h:.2f} h")
+    print(f"   Potência total: {features['hrv_total_power']:10.1f} ms²")
+    for band in HRV_BANDS:
+        print(f"   {band.upper():<15} {features[f'hrv_{band}_power']:10.1f} ms²")
+    print(f"   LF / HF (n.u.): {features['hrv_lf_nu']:.1f} / {features['hrv_hf_nu']:.1f}")
+    print(f"   Razão LF/HF:    {features['hrv_lf_hf_ratio']:.2f}")
+    print(f"   Picos: LF {features['hrv_lf_peak_hz']:.3f} Hz | HF {features['hrv_hf_peak_hz']:.3f} Hz")
+
+    if args.show_windows:
+        windows = windowed_frequency_features(rr_intervals, beat_times, args.window_seconds,
+                                              args.hop_seconds, args.method)
+        print(f"\n{'Início (s)':>12} {'Fim (s)':>12} {'Total (ms²)':>12} {'LF (ms²)':>10} "
+              f"{'HF (ms²)':>10} {'LF/HF':>7}")
+        for w in windows:
+            print(f"{w['start_time']:>12.1f} {w['end_time']:>12.1f} {w['hrv_total_power']:>12.1f} "
+                  f"{w['hrv_lf_power']:>10.1f} {w['hrv_hf_power']:>10.1f} {w['hrv_lf_hf_ratio']:>7.2f}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
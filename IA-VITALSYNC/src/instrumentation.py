@@ -0,0 +1,414 @@
+"""
+instrumentation.py
+------------------
+Instrumentação leve das etapas do pipeline: tempos, contadores e, opcionalmente,
+perfil de CPU (cProfile) e de memória (tracemalloc).
+
+Desligada por padrão. Desligada, `timer()` devolve um context manager vazio
+compartilhado e `count()` retorna logo após checar uma flag, então os pontos
+instrumentados em data_loader, feature_extraction, train_model e predict não
+custam nada mensurável.
+
+Nomes das etapas seguem '<módulo>.<etapa>' (ex: 'feature_extraction.read_annotations',
+'train_model.fit[Random Forest]').
+
+Ligar:
+- nos CLIs: --metrics ARQUIVO (.json ou .prom), --profile ARQUIVO (.prof ou .txt)
+  e --trace-memory
+- em qualquer processo: VITALSYNC_METRICS=1 (só o resumo em stderr) ou
+  VITALSYNC_METRICS=ARQUIVO, ou instrumentation.enable()
+
+USO:
+    python src/feature_extraction.py --no-cache --metrics reports/metrics.json
+    python src/predict.py data/raw/nsrdb --metrics reports/predict.prom --profile reports/predict.prof
+
+    from instrumentation import timer, count
+    with timer('predict.inference'):
+        ...
+    count('predict.predictions', len(batch))
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Optional
+
+# Variável de ambiente que liga a instrumentação em qualquer processo
+ENV_VAR = 'VITALSYNC_METRICS'
+
+# Limites (s) dos buckets do histograma exportado para o Prometheus
+HISTOGRAM_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0)
+
+# Prefixo das métricas no formato Prometheus
+PROMETHEUS_PREFIX = 'vitalsync'
+
+_enabled = os.environ.get(ENV_VAR, '') not in ('', '0')
+
+# Context manager vazio reutilizado por timer() quando a instrumentação está desligada
+_NULL_TIMER = nullcontext()
+
+
+class TimerStats:
+    """
+    Agregado das medições de uma etapa: contagem, soma, mínimo, máximo e
+    histograma (contagem por bucket de HISTOGRAM_BUCKETS, não cumulativo).
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        for i, limit in enumerate(HISTOGRAM_BUCKETS):
+            if seconds <= limit:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def merge(self, other: Dict):
+        self.count += other['count']
+        self.total += other['total_s']
+        self.min = min(self.min, other['min_s'])
+        self.max = max(self.max, other['max_s'])
+        self.buckets = [a + b for a, b in zip(self.buckets, other['buckets'])]
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else 0.0,
+            'min_s': self.min if self.count else 0.0,
+            'max_s': self.max,
+            'buckets': list(self.buckets)
+        }
+
+
+class MetricsRegistry:
+    """
+    Tempos e contadores do processo (thread-safe).
+
+    Processos filhos (pools de extração) coletam no próprio registro e devolvem
+    um snapshot(), somado ao do processo principal com merge().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers: Dict[str, TimerStats] = {}
+        self._counters: Dict[str, float] = {}
+
+    def record_time(self, name: str, seconds: float):
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                stats = self._timers[name] = TimerStats()
+            stats.add(seconds)
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'timers': {name: stats.to_dict() for name, stats in self._timers.items()},
+                'counters': dict(self._counters)
+            }
+
+    def merge(self, snapshot: Dict):
+        with self._lock:
+            for name, other in snapshot.get('timers', {}).items():
+                self._timers.setdefault(name, TimerStats()).merge(other)
+            for name, value in snapshot.get('counters', {}).items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def drain(self) -> Dict:
+        """
+        snapshot() seguido de reset(), atômico.
+        """
+        with self._lock:
+            snapshot = {
+                'timers': {name: stats.to_dict() for name, stats in self._timers.items()},
+                'counters': dict(self._counters)
+            }
+            self._timers.clear()
+            self._counters.clear()
+        return snapshot
+
+
+REGISTRY = MetricsRegistry()
+
+
+def enable(enabled: bool = True):
+    """
+    Liga (ou desliga) a coleta no processo atual.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class _Timer:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.record_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def timer(name: str):
+    """
+    Context manager que mede o bloco como uma execução da etapa `name`.
+    """
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed(name: Optional[str] = None):
+    """
+    Decorador: mede cada chamada da função (padrão: '<módulo>.<função>').
+    """
+    def decorator(func):
+        stage = name or f"{func.__module__}.{func.__name__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.record_time(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def count(name: str, value: float = 1):
+    """
+    Soma `value` ao contador `name`.
+    """
+    if _enabled:
+        REGISTRY.increment(name, value)
+
+
+def record_time(name: str, seconds: float):
+    """
+    Registra uma duração medida fora de timer() (ex: devolvida por um worker).
+    """
+    if _enabled:
+        REGISTRY.record_time(name, seconds)
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus(snapshot: Dict, prefix: str = PROMETHEUS_PREFIX) -> str:
+    """
+    Converte um snapshot para o formato texto de exposição do Prometheus.
+
+    Etapas viram um histograma `<prefix>_stage_seconds{stage=...}` e contadores
+    viram `<prefix>_events_total{event=...}`.
+    """
+    lines = []
+    if snapshot['timers']:
+        metric = f"{prefix}_stage_seconds"
+        lines += [f"# HELP {metric} Duração das etapas instrumentadas do pipeline",
+                  f"# TYPE {metric} histogram"]
+        for name, stats in sorted(snapshot['timers'].items()):
+            label = f'stage="{_escape_label(name)}"'
+            cumulative = 0
+            for limit, bucket in zip(HISTOGRAM_BUCKETS, stats['buckets']):
+                cumulative += bucket
+                lines.append(f'{metric}_bucket{{{label},le="{limit:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {stats["count"]}')
+            lines.append(f'{metric}_sum{{{label}}} {stats["total_s"]:.9g}')
+            lines.append(f'{metric}_count{{{label}}} {stats["count"]}')
+    if snapshot['counters']:
+        metric = f"{prefix}_events_total"
+        lines += [f"# HELP {metric} Contadores de eventos do pipeline",
+                  f"# TYPE {metric} counter"]
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'{metric}{{event="{_escape_label(name)}"}} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def format_summary(snapshot: Dict) -> str:
+    """
+    Tabela legível das etapas (ordenadas pelo tempo total) e dos contadores.
+    """
+    lines = ["=" * 80, "⏱️  INSTRUMENTAÇÃO",  "=" * 80,
+             f"{'Etapa':<44} {'N':>7} {'Total (s)':>10} {'Média (ms)':>11} {'Máx (ms)':>9}",
+             "-" * 80]
+    for name, stats in sorted(snapshot['timers'].items(), key=lambda item: -item[1]['total_s']):
+        lines.append(f"{name:<44} {stats['count']:>7} {stats['total_s']:>10.3f} "
+                     f"{stats['mean_s'] * 1000:>11.3f} {stats['max_s'] * 1000:>9.2f}")
+    if snapshot['counters']:
+        lines.append("-" * 80)
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"{name:<44} {_format_value(value):>7}")
+    memory = snapshot.get('memory')
+    if memory:
+        lines.append("-" * 80)
+        lines.append(f"Pico de memória rastreada (tracemalloc): {memory['peak_bytes'] / 1024 ** 2:.1f} MB")
+        for site in memory['top_allocations'][:5]:
+            lines.append(f"   {site['size_bytes'] / 1024:>9.1f} KB  {site['location']}")
+    lines.append("=" * 80)
+    return '\n'.join(lines)
+
+
+def write_metrics(path, snapshot: Dict):
+    """
+    Salva o snapshot em JSON ou, para arquivos .prom/.txt, no formato do Prometheus.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix in ('.prom', '.txt'):
+        path.write_text(to_prometheus(snapshot))
+    else:
+        path.write_text(json.dumps(snapshot, indent=2, ensure_ascii=False))
+
+
+class InstrumentationSession:
+    """
+    Liga a coleta durante a execução de um CLI e grava os resultados no fim.
+
+    Pode ser usada como context manager ou com start()/stop(); stop() também é
+    registrado no atexit, então sys.exit() no meio do script não perde as métricas.
+
+    Args:
+        metrics_path: Arquivo das métricas (.json ou .prom); None = só o resumo
+        profile_path: Arquivo do cProfile (.prof para pstats/snakeviz, senão texto)
+        trace_memory: Rastrear alocações com tracemalloc (pico e maiores origens)
+        summary: Imprimir o resumo em stderr ao final
+    """
+
+    def __init__(self, metrics_path=None, profile_path=None, trace_memory: bool = False,
+                 summary: bool = True):
+        self.metrics_path = metrics_path
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.summary = summary
+        self.active = bool(metrics_path or profile_path or trace_memory or _enabled)
+        self._profiler = None
+        self._started = False
+
+    def start(self):
+        if not self.active or self._started:
+            return self
+        self._started = True
+        REGISTRY.reset()
+        enable()
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile_path:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        if not self._started:
+            return
+        self._started = False
+        atexit.unregister(self.stop)
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._write_profile()
+
+        snapshot = REGISTRY.snapshot()
+        if self.trace_memory:
+            import tracemalloc
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:10]
+            tracemalloc.stop()
+            snapshot['memory'] = {
+                'peak_bytes': peak,
+                'top_allocations': [{'location': str(stat.traceback[0]), 'size_bytes': stat.size,
+                                     'count': stat.count} for stat in top]
+            }
+
+        if self.metrics_path:
+            write_metrics(self.metrics_path, snapshot)
+        if self.summary:
+            print(format_summary(snapshot), file=sys.stderr)
+            if self.metrics_path:
+                print(f"💾 Métricas salvas em: {self.metrics_path}", file=sys.stderr)
+            if self.profile_path:
+                print(f"💾 Perfil (cProfile) salvo em: {self.profile_path}", file=sys.stderr)
+        enable(False)
+
+    def _write_profile(self):
+        import pstats
+        path = Path(self.profile_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.prof':
+            self._profiler.dump_stats(str(path))
+            return
+        with open(path, 'w') as f:
+            pstats.Stats(self._profiler, stream=f).sort_stats('cumulative').print_stats(40)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def add_arguments(parser):
+    """
+    Adiciona --metrics, --profile e --trace-memory a um argparse.ArgumentParser.
+    """
+    group = parser.add_argument_group('instrumentação')
+    group.add_argument('--metrics', type=str, default=None, metavar='ARQUIVO',
+                       help='Medir as etapas e salvar em JSON (ou formato Prometheus se .prom)')
+    group.add_argument('--profile', type=str, default=None, metavar='ARQUIVO',
+                       help='Perfil de CPU com cProfile (.prof para pstats/snakeviz, senão texto)')
+    group.add_argument('--trace-memory', action='store_true',
+                       help='Rastrear alocações com tracemalloc (mais lento)')
+
+
+def session_from_args(args) -> InstrumentationSession:
+    """
+    Sessão configurada pelos argumentos de add_arguments().
+    """
+    env_value = os.environ.get(ENV_VAR, '')
+    metrics_path = args.metrics or (env_value if env_value not in ('', '0', '1') else None)
+    return InstrumentationSession(metrics_path, args.profile, args.trace_memory)
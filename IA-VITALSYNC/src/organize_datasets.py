@@ -41,6 +41,8 @@ import os
 from pathlib import Path
 from typing import List
 
+from record_catalog import scan_directory
+
 
 def check_aftdb_structure(aftdb_root: Path) -> bool:
     """
@@ -67,10 +69,11 @@ def check_aftdb_structure(aftdb_root: Path) -> bool:
             all_ok = False
             continue
         
-        # Contar arquivos
-        dat_files = list(subset_path.glob('*.dat'))
-        hea_files = list(subset_path.glob('*.hea'))
-        qrs_files = list(subset_path.glob('*.qrs'))
+        # Contar arquivos (uma única varredura da pasta)
+        files = scan_directory(subset_path)
+        dat_files = [name for name, exts in files.items() if 'dat' in exts]
+        hea_files = sorted(name for name, exts in files.items() if 'hea' in exts)
+        qrs_files = [name for name, exts in files.items() if 'qrs' in exts]
         
         num_records = len(hea_files)
         total_files += num_records
@@ -91,7 +94,7 @@ def check_aftdb_structure(aftdb_root: Path) -> bool:
         
         # Listar alguns exemplos
         if hea_files:
-            print(f"   📄 Exemplos: {', '.join([f.stem for f in hea_files[:5]])}")
+            print(f"   📄 Exemplos: {', '.join(hea_files[:5])}")
     
     print(f"\n{'✅' if all_ok else '❌'} Total de registros encontrados: {total_files}")
     
@@ -111,10 +114,11 @@ def check_nsrdb_structure(nsrdb_root: Path) -> bool:
         print(f"   Por favor, mova a pasta 'nsrdb' para: {nsrdb_root.parent}")
         return False
     
-    # Contar arquivos (excluindo backups .hea-)
-    dat_files = list(nsrdb_root.glob('*.dat'))
-    hea_files = [f for f in nsrdb_root.glob('*.hea') if not f.name.endswith('.hea-')]
-    atr_files = list(nsrdb_root.glob('*.atr'))  # NSRDB usa .atr
+    # Contar arquivos (uma única varredura; backups .hea- têm outra extensão)
+    files = scan_directory(nsrdb_root)
+    dat_files = [name for name, exts in files.items() if 'dat' in exts]
+    hea_files = sorted(name for name, exts in files.items() if 'hea' in exts)
+    atr_files = [name for name, exts in files.items() if 'atr' in exts]  # NSRDB usa .atr
     
     num_records = len(hea_files)
     
@@ -137,7 +141,7 @@ def check_nsrdb_structure(nsrdb_root: Path) -> bool:
     
     # Listar alguns exemplos
     if hea_files:
-        print(f"   📄 Exemplos: {', '.join([f.stem for f in hea_files[:5]])}")
+        print(f"   📄 Exemplos: {', '.join(hea_files[:5])}")
     
     print(f"\n{'✅' if all_ok else '⚠️'} Total de registros encontrados: {num_records}")
     
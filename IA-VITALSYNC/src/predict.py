@@ -15,25 +15,61 @@ EXEMPLOS:
     
     # Mostrar probabilidades
     python predict.py data/raw/aftdb/learning-set/t01 --show-proba
+    
+    # Predizer vários arquivos de uma vez (pastas, globs ou listas) em CSV/JSON lines
+    python predict.py data/raw/aftdb/learning-set data/raw/nsrdb --format jsonl
 """
 
 import sys
+import csv
+import json
+import glob
+import logging
 import argparse
 from pathlib import Path
-import numpy as np
-import joblib
-import wfdb
+from typing import Dict, List, Optional
 
-# Importar funções do módulo de extração de features
-import sys
+# Extração de features, modelo e store de picos R (NumPy, wfdb, pandas,
+# scikit-learn) são importados dentro das funções que os usam: `--help` e quem
+# só importa este módulo não pagam esse custo (benchmarks/bench_startup.py)
 sys.path.append(str(Path(__file__).parent))
-from feature_extraction import extract_features_from_record
+import instrumentation
+import reporting
+from instrumentation import count, timed, timer
+from reporting import ProgressReporter, get_logger
+
+log = get_logger('predict')
 
 
-def load_models(models_dir: Path):
+# Colunas da saída do modo em lote (CSV / JSON lines)
+BATCH_OUTPUT_FIELDS = [
+    'record_path', 'prediction', 'class_name', 'confidence',
+    'probability_normal', 'probability_fa', 'error'
+]
+
+
+@timed('predict.load_models')
+def load_models(models_dir: Path, compiled: bool = True):
     """
     Carrega o modelo treinado e o scaler.
+    
+    Se houver um modelo compilado (best_model.npz, gerado pelo train_model.py ou
+    pelo compiled_model.py) correspondente ao best_model.pkl, ele é usado: carrega
+    em milissegundos, sem scikit-learn, e já embute o scaler (o scaler devolvido
+    é então a identidade).
+    
+    Args:
+        models_dir: Pasta com best_model.pkl/scaler.pkl e/ou best_model.npz
+        compiled: Usar o modelo compilado quando disponível
     """
+    from compiled_model import (
+        COMPILED_MODEL_FILE, PassthroughScaler, is_compiled_model_fresh, load_compiled_model
+    )
+    
+    compiled_path = models_dir / COMPILED_MODEL_FILE
+    if compiled and compiled_path.exists() and is_compiled_model_fresh(compiled_path):
+        return load_compiled_model(compiled_path), PassthroughScaler()
+    
     model_path = models_dir / 'best_model.pkl'
     scaler_path = models_dir / 'scaler.pkl'
     
@@ -49,49 +85,81 @@ def load_models(models_dir: Path):
             "Execute 'python src/train_model.py' primeiro."
         )
     
+    import joblib
     model = joblib.load(model_path)
     scaler = joblib.load(scaler_path)
     
     return model, scaler
 
 
-def predict_ecg(record_path: str, model, scaler, annotation_ext='qrs', verbose=False):
+def describe_model(models_dir: Path, model) -> str:
+    """
+    Descrição do modelo para o banner: nome e ROC-AUC gravados no model_info.txt
+    pelo train_model.py (teste ou validação cruzada) e a classe carregada.
+    """
+    info = {}
+    info_file = Path(models_dir) / 'model_info.txt'
+    if info_file.exists():
+        lines = info_file.read_text(encoding='utf-8').splitlines()
+        info = dict(line.split(': ', 1) for line in lines if ': ' in line and not line.startswith(' '))
+        if any(line.startswith('Validação cruzada') for line in lines):
+            info['metric'] = 'ROC-AUC (validação cruzada)'
+        else:
+            info['metric'] = 'ROC-AUC (teste)'
+    
+    description = f"{info.get('Melhor Modelo', type(model).__name__)} [{type(model).__name__}]"
+    if 'ROC-AUC' in info:
+        description += f" | {info['metric']}: {info['ROC-AUC']}"
+    return description
+
+
+@timed('predict.predict_ecg')
+def predict_ecg(record_path: str, model, scaler, annotation_ext='qrs', verbose=False,
+                rr_store=None):
     """
     Realiza predição em um arquivo de ECG.
     
     Pipeline:
-    1. Carregar ECG e anotações
+    1. Carregar ECG e anotações (ou os picos R do store colunar, se houver)
     2. Extrair features (MESMAS do treinamento)
     3. Normalizar com o scaler salvo
     4. Fazer predição com o modelo
     """
+    import numpy as np
+    from feature_extraction import extract_features_from_record, MODEL_FEATURE_NAMES
+    
+    # Escolher .qrs/.atr pelo arquivo existente antes de ler: uma tentativa
+    # frustrada com a extensão errada não acerta o store e custa uma leitura WFDB
+    annotation_ext = resolve_annotation_ext(record_path, annotation_ext)
     
     if verbose:
-        print(f"\n{'='*80}")
-        print(f"🔍 PROCESSANDO: {record_path}")
-        print(f"{'='*80}")
+        log.info(f"🔍 PROCESSANDO: {record_path}")
     
     # ETAPA 1: Extrair features
     if verbose:
-        print(f"\n📊 ETAPA 1/3: Extraindo features do ECG...")
+        log.info("📊 ETAPA 1/3: Extraindo features do ECG...")
     
     try:
         # Tentar primeiro com a extensão fornecida
         features_dict = extract_features_from_record(
             record_path, 
             label=None,  # Não sabemos o label real
-            annotation_ext=annotation_ext
+            annotation_ext=annotation_ext,
+            raise_errors=True,
+            rr_store=rr_store
         )
     except Exception as e:
         # Se falhar, tentar com .atr (NSRDB)
         if annotation_ext == 'qrs':
             if verbose:
-                print(f"   ⚠️  Arquivo .qrs não encontrado, tentando .atr...")
+                log.warning("   ⚠️  Arquivo .qrs não encontrado, tentando .atr...")
             try:
                 features_dict = extract_features_from_record(
                     record_path, 
                     label=None,
-                    annotation_ext='atr'
+                    annotation_ext='atr',
+                    raise_errors=True,
+                    rr_store=rr_store
                 )
             except Exception as e2:
                 raise Exception(
@@ -104,46 +172,40 @@ def predict_ecg(record_path: str, model, scaler, annotation_ext='qrs', verbose=F
             raise e
     
     if verbose:
-        print(f"   ✅ Features extraídas:")
-        print(f"      • Número de batimentos: {features_dict['num_beats']}")
-        print(f"      • Frequência de amostragem: {features_dict['sampling_freq']} Hz")
-        print(f"      • RR médio: {features_dict['rr_mean']:.3f} s")
-        print(f"      • RR CV: {features_dict['rr_cv']:.2f}% {'⚠️ ALTO' if features_dict['rr_cv'] > 10 else '✅ Normal'}")
+        log.info("   ✅ Features extraídas:")
+        log.info(f"      • Número de batimentos: {features_dict['num_beats']}")
+        log.info(f"      • Frequência de amostragem: {features_dict['sampling_freq']} Hz")
+        log.info(f"      • RR médio: {features_dict['rr_mean']:.3f} s")
+        log.info(f"      • RR CV: {features_dict['rr_cv']:.2f}% {'⚠️ ALTO' if features_dict['rr_cv'] > 10 else '✅ Normal'}")
     
     # ETAPA 2: Preparar vetor de features (MESMA ORDEM do treinamento!)
     if verbose:
-        print(f"\n🔄 ETAPA 2/3: Normalizando features...")
-    
-    # Ordem EXATA das features usadas no treinamento
-    feature_names = [
-        'num_beats', 'num_rr_intervals', 'sampling_freq',
-        'rr_mean', 'rr_std', 'rr_median', 'rr_min', 'rr_max',
-        'rr_cv', 'rr_rmssd', 'rr_range',
-        'rr_percentile_25', 'rr_percentile_75', 'rr_iqr',
-        'mean_hr_bpm'
-    ]
+        log.info("🔄 ETAPA 2/3: Normalizando features...")
     
-    # Criar vetor de features na ordem correta
-    features_vector = np.array([[features_dict[name] for name in feature_names]])
+    # Criar vetor de features na ordem EXATA do treinamento
+    features_vector = np.array([[features_dict[name] for name in MODEL_FEATURE_NAMES]])
     
     # Normalizar usando o MESMO scaler do treinamento
-    features_normalized = scaler.transform(features_vector)
+    with timer('predict.scale'):
+        features_normalized = scaler.transform(features_vector)
     
     if verbose:
-        print(f"   ✅ Features normalizadas (média≈0, std≈1)")
+        log.info("   ✅ Features normalizadas (média≈0, std≈1)")
     
     # ETAPA 3: Fazer predição
     if verbose:
-        print(f"\n🤖 ETAPA 3/3: Fazendo predição com Random Forest...")
+        log.info("🤖 ETAPA 3/3: Fazendo predição com Random Forest...")
     
-    prediction = model.predict(features_normalized)[0]
-    probabilities = model.predict_proba(features_normalized)[0]
+    with timer('predict.inference'):
+        prediction = model.predict(features_normalized)[0]
+        probabilities = model.predict_proba(features_normalized)[0]
+    count('predict.predictions')
     
     # Probabilidade da classe predita
     confidence = probabilities[prediction] * 100
     
     if verbose:
-        print(f"   ✅ Predição concluída!")
+        log.info("   ✅ Predição concluída!")
     
     return {
         'prediction': prediction,
@@ -155,12 +217,181 @@ def predict_ecg(record_path: str, model, scaler, annotation_ext='qrs', verbose=F
     }
 
 
+def resolve_annotation_ext(record_path: str, preferred: str = 'qrs') -> str:
+    """
+    Escolhe a extensão de anotação de um registro: a preferida, se o arquivo
+    existir, senão a alternativa ('qrs' ↔ 'atr').
+    """
+    if Path(f"{record_path}.{preferred}").exists():
+        return preferred
+    
+    alternative = 'atr' if preferred == 'qrs' else 'qrs'
+    if Path(f"{record_path}.{alternative}").exists():
+        return alternative
+    
+    return preferred
+
+
+def expand_record_paths(inputs: List[str]) -> List[str]:
+    """
+    Expande a lista de entradas da linha de comando em caminhos de registros
+    (sem extensão).
+    
+    Cada entrada pode ser:
+    - Um registro, com ou sem extensão (.dat/.hea)
+    - Uma pasta (todos os .hea encontrados recursivamente)
+    - Um padrão glob entre aspas (ex: 'data/raw/nsrdb/16*')
+    """
+    record_paths = []
+    
+    for entry in inputs:
+        if Path(entry).is_dir():
+            record_paths.extend(str(hea.with_suffix('')) for hea in sorted(Path(entry).rglob('*.hea')))
+        elif glob.has_magic(entry):
+            matches = sorted(glob.glob(entry))
+            record_paths.extend(m.rsplit('.', 1)[0] for m in matches if m.endswith('.hea'))
+        elif entry.endswith('.dat') or entry.endswith('.hea'):
+            record_paths.append(entry.rsplit('.', 1)[0])
+        else:
+            record_paths.append(entry)
+    
+    # Remover duplicatas mantendo a ordem
+    return list(dict.fromkeys(record_paths))
+
+
+def predict_from_features(features_list: List[Dict], model, scaler,
+                          feature_names: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Classifica vários vetores de features de uma vez.
+    
+    As features são empilhadas em uma única matriz, de modo que scaler.transform
+    e model.predict_proba são chamados UMA vez para todo o lote.
+    
+    Args:
+        features_list: Lista de dicionários de features (extract_features_from_record)
+        model: Modelo treinado
+        scaler: Scaler do treinamento
+        feature_names: Features do modelo, na ordem das colunas
+                       (padrão: MODEL_FEATURE_NAMES, o modelo de registro inteiro)
+        
+    Returns:
+        Lista de resultados (mesmo formato de predict_ecg), na mesma ordem
+    """
+    if not features_list:
+        return []
+    
+    import numpy as np
+    from feature_extraction import MODEL_FEATURE_NAMES
+    
+    feature_names = feature_names or MODEL_FEATURE_NAMES
+    features_matrix = np.array([[features[name] for name in feature_names]
+                                for features in features_list])
+    with timer('predict.scale'):
+        features_scaled = scaler.transform(features_matrix)
+    with timer('predict.inference'):
+        probabilities = model.predict_proba(features_scaled)
+    predictions = probabilities.argmax(axis=1)
+    count('predict.predictions', len(features_list))
+    
+    results = []
+    for features, prediction, proba in zip(features_list, predictions, probabilities):
+        prediction = int(prediction)
+        results.append({
+            'prediction': prediction,
+            'class_name': 'Fibrilação Atrial' if prediction == 1 else 'Ritmo Sinusal Normal',
+            'confidence': float(proba[prediction]) * 100,
+            'probability_normal': float(proba[0]) * 100,
+            'probability_fa': float(proba[1]) * 100,
+            'features': features
+        })
+    
+    return results
+
+
+@timed('predict.predict_batch')
+def predict_batch(record_paths: List[str], model, scaler, annotation_ext: str = 'qrs',
+                  n_workers: Optional[int] = None, cache=None, rr_store=None) -> List[Dict]:
+    """
+    Classifica vários registros de ECG com um único carregamento do modelo.
+    
+    Pipeline:
+    1. Extrair features de todos os registros (em paralelo, ordem preservada)
+    2. Empilhar as features em uma matriz
+    3. Normalizar e predizer o lote inteiro de uma vez
+    
+    Args:
+        record_paths: Caminhos dos registros (sem extensão)
+        model: Modelo treinado
+        scaler: Scaler do treinamento
+        annotation_ext: Extensão de anotação preferida ('qrs' ou 'atr');
+                        se o arquivo não existir, tenta a outra
+        n_workers: Processos para extração de features (None = todos os núcleos)
+        cache: Cache de features opcional (feature_cache.FeatureCache)
+        rr_store: Store colunar de picos R opcional (rr_store.RRStore)
+        
+    Returns:
+        Lista com um resultado por registro, na ordem de record_paths. Registros
+        com erro têm 'prediction' = None e a mensagem em 'error'
+    """
+    from feature_extraction import iter_record_features
+    
+    records_info = [{
+        'record_name': Path(record_path).name,
+        'full_path': record_path,
+        'label': None,
+        'annotation_ext': resolve_annotation_ext(record_path, annotation_ext)
+    } for record_path in record_paths]
+    
+    extracted = []
+    with timer('predict.features'), ProgressReporter(len(records_info), 'Extraindo features', log) as progress:
+        for item in iter_record_features(records_info, n_workers=n_workers, cache=cache, rr_store=rr_store):
+            extracted.append(item)
+            progress.update()
+    
+    ok_features = [result['features'] for _, result in extracted if result['error'] is None]
+    predictions = iter(predict_from_features(ok_features, model, scaler))
+    
+    results = []
+    for record_info, result in extracted:
+        if result['error'] is not None:
+            results.append({
+                'record_path': record_info['full_path'],
+                'prediction': None,
+                'class_name': None,
+                'confidence': None,
+                'probability_normal': None,
+                'probability_fa': None,
+                'features': None,
+                'error': result['error']
+            })
+        else:
+            results.append({'record_path': record_info['full_path'], **next(predictions), 'error': None})
+    
+    return results
+
+
+def write_batch_results(results: List[Dict], output_format: str = 'csv', stream=None):
+    """
+    Escreve os resultados do modo em lote em CSV ou JSON lines (uma linha por registro).
+    """
+    stream = stream or sys.stdout
+    rows = [{field: result[field] for field in BATCH_OUTPUT_FIELDS} for result in results]
+    
+    if output_format == 'jsonl':
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+    else:
+        writer = csv.DictWriter(stream, fieldnames=BATCH_OUTPUT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
 def print_result(result, show_proba=False, verbose=False):
     """
     Exibe o resultado da predição de forma amigável.
     """
     print(f"\n{'='*80}")
-    print(f"🎯 RESULTADO DA PREDIÇÃO")
+    print("🎯 RESULTADO DA PREDIÇÃO")
     print(f"{'='*80}")
     
     # Determinar emoji e cor
@@ -176,19 +407,19 @@ def print_result(result, show_proba=False, verbose=False):
     print(f"   Confiança: {result['confidence']:.1f}%")
     
     if show_proba or verbose:
-        print(f"\n📊 PROBABILIDADES:")
+        print("\n📊 PROBABILIDADES:")
         print(f"   • Ritmo Normal: {result['probability_normal']:>5.1f}%")
         print(f"   • Fibrilação Atrial: {result['probability_fa']:>5.1f}%")
     
     if verbose:
-        print(f"\n📈 FEATURES PRINCIPAIS:")
+        print("\n📈 FEATURES PRINCIPAIS:")
         feat = result['features']
         print(f"   • CV dos intervalos R-R: {feat['rr_cv']:.2f}%")
         print(f"   • Desvio padrão R-R: {feat['rr_std']:.4f} s")
         print(f"   • RMSSD: {feat['rr_rmssd']:.4f} s")
         print(f"   • Frequência cardíaca média: {feat['mean_hr_bpm']:.1f} bpm")
         
-        print(f"\n💡 INTERPRETAÇÃO:")
+        print("\n💡 INTERPRETAÇÃO:")
         if feat['rr_cv'] > 15:
             print(f"   • CV alto ({feat['rr_cv']:.1f}%) indica alta irregularidade → Suspeita de FA")
         elif feat['rr_cv'] < 5:
@@ -223,19 +454,29 @@ EXEMPLOS DE USO:
   
   Especificar extensão de anotação:
     python predict.py data/raw/nsrdb/16265 --annotation-ext atr
+  
+  Modo em lote (vários registros, pastas ou globs) com saída CSV:
+    python predict.py data/raw/aftdb/test-set-a data/raw/nsrdb --workers 4
+  
+  Modo em lote com saída JSON lines em arquivo:
+    python predict.py 'data/raw/nsrdb/16*' --format jsonl --output preds.jsonl
 
 NOTAS:
   - O arquivo pode ser fornecido com ou sem extensão
   - Para AFTDB, use .qrs (padrão)
   - Para NSRDB, use .atr (--annotation-ext atr)
   - O script tenta detectar automaticamente o formato
+  - Com mais de um registro (ou uma pasta/glob) o modo em lote é usado:
+    o modelo é carregado uma vez e todas as predições saem em CSV/JSON lines
         """
     )
     
     parser.add_argument(
-        'record_path',
+        'record_paths',
         type=str,
-        help='Caminho para o arquivo de ECG (com ou sem extensão)'
+        nargs='+',
+        metavar='record_path',
+        help='Caminho(s) para arquivo(s) de ECG (com ou sem extensão), pastas ou globs'
     )
     
     parser.add_argument(
@@ -258,14 +499,54 @@ NOTAS:
         help='Mostrar probabilidades de cada classe'
     )
     
+    parser.add_argument(
+        '--format',
+        type=str,
+        default=None,
+        choices=['csv', 'jsonl'],
+        help='Formato de saída do modo em lote (padrão: csv; força o modo em lote)'
+    )
+    
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default=None,
+        help='Arquivo de saída do modo em lote (padrão: stdout)'
+    )
+    
+    parser.add_argument(
+        '--workers', '-j',
+        type=int,
+        default=0,
+        help='Processos para extração de features no modo em lote (padrão: 0 = todos os núcleos)'
+    )
+    
+    parser.add_argument(
+        '--no-compiled',
+        action='store_true',
+        help='Usar o best_model.pkl do scikit-learn mesmo se houver o modelo compilado (best_model.npz)'
+    )
+    
+    instrumentation.add_arguments(parser)
+    reporting.add_arguments(parser)
+    
     args = parser.parse_args()
+    reporting.configure_from_args(args)
+    instrumentation.session_from_args(args).start()
+    
+    batch_mode = (
+        args.format is not None
+        or len(args.record_paths) > 1
+        or any(Path(p).is_dir() or glob.has_magic(p) for p in args.record_paths)
+    )
+    
+    if batch_mode:
+        run_batch(args)
+        return
     
     # Banner
-    print(f"\n{'='*80}")
-    print(f"🏥 VITALSYNC - CLASSIFICADOR DE ECG")
-    print(f"{'='*80}")
-    print(f"Modelo: Random Forest (ROC-AUC: 1.000)")
-    print(f"Classes: 0 = Ritmo Normal | 1 = Fibrilação Atrial")
+    log.info("🏥 VITALSYNC - CLASSIFICADOR DE ECG")
+    log.info("Classes: 0 = Ritmo Normal | 1 = Fibrilação Atrial")
     
     try:
         # Carregar modelos
@@ -273,26 +554,33 @@ NOTAS:
         models_dir = project_root / 'models'
         
         if args.verbose:
-            print(f"\n📂 Carregando modelo e scaler...")
+            log.info("📂 Carregando modelo e scaler...")
         
-        model, scaler = load_models(models_dir)
+        model, scaler = load_models(models_dir, compiled=not args.no_compiled)
+        log.info(f"Modelo: {describe_model(models_dir, model)}")
         
         if args.verbose:
-            print(f"   ✅ Modelo carregado: {models_dir / 'best_model.pkl'}")
-            print(f"   ✅ Scaler carregado: {models_dir / 'scaler.pkl'}")
+            from compiled_model import COMPILED_MODEL_FILE, PassthroughScaler
+            if isinstance(scaler, PassthroughScaler):
+                log.info(f"   ✅ Modelo compilado carregado: {models_dir / COMPILED_MODEL_FILE}")
+            else:
+                log.info(f"   ✅ Modelo carregado: {models_dir / 'best_model.pkl'}")
+                log.info(f"   ✅ Scaler carregado: {models_dir / 'scaler.pkl'}")
         
         # Remover extensão se foi fornecida
-        record_path = args.record_path
+        record_path = args.record_paths[0]
         if record_path.endswith('.dat') or record_path.endswith('.hea'):
             record_path = record_path.rsplit('.', 1)[0]
         
         # Fazer predição
+        from rr_store import open_default_store
         result = predict_ecg(
             record_path=record_path,
             model=model,
             scaler=scaler,
             annotation_ext=args.annotation_ext,
-            verbose=args.verbose
+            verbose=args.verbose,
+            rr_store=open_default_store()
         )
         
         # Exibir resultado
@@ -303,16 +591,58 @@ NOTAS:
         sys.exit(0)
         
     except FileNotFoundError as e:
-        print(f"\n❌ ERRO: {e}", file=sys.stderr)
+        log.error(f"❌ ERRO: {e}")
         sys.exit(1)
     
     except Exception as e:
-        print(f"\n❌ ERRO INESPERADO: {e}", file=sys.stderr)
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
+        log.error(f"❌ ERRO INESPERADO: {e}", exc_info=args.verbose)
         sys.exit(1)
 
 
+def run_batch(args):
+    """
+    Modo em lote: carrega o modelo uma vez, classifica todos os registros e
+    escreve uma linha de resultado por registro (CSV ou JSON lines).
+    """
+    project_root = Path(__file__).parent.parent
+    models_dir = project_root / 'models'
+    
+    try:
+        model, scaler = load_models(models_dir, compiled=not args.no_compiled)
+    except FileNotFoundError as e:
+        log.error(f"❌ ERRO: {e}")
+        sys.exit(1)
+    
+    record_paths = expand_record_paths(args.record_paths)
+    if not record_paths:
+        log.error("❌ ERRO: Nenhum registro encontrado nas entradas fornecidas")
+        sys.exit(1)
+    
+    from rr_store import open_default_store
+    results = predict_batch(
+        record_paths,
+        model,
+        scaler,
+        annotation_ext=args.annotation_ext,
+        n_workers=args.workers or None,
+        rr_store=open_default_store()
+    )
+    
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            write_batch_results(results, args.format or 'csv', f)
+    else:
+        write_batch_results(results, args.format or 'csv')
+    
+    n_errors = sum(1 for result in results if result['error'] is not None)
+    if args.verbose or n_errors:
+        log.log(logging.WARNING if n_errors else logging.INFO,
+                f"✅ {len(results) - n_errors}/{len(results)} registros classificados"
+                + (f" | ⚠️  {n_errors} com erro" if n_errors else ""),
+                extra={'records': len(results), 'errors': n_errors})
+    
+    sys.exit(1 if n_errors == len(results) else 0)
+
+
 if __name__ == "__main__":
     main()
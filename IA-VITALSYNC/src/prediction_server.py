@@ -0,0 +1,360 @@
+"""
+prediction_server.py
+--------------------
+Serviço local de predição que mantém o modelo e o scaler carregados em memória.
+
+Cada chamada de `python predict.py` paga a inicialização do interpretador, os
+imports (wfdb, sklearn) e o joblib.load do modelo antes de fazer alguns
+milissegundos de trabalho útil. Este servidor carrega tudo UMA vez e atende
+requisições concorrentes via HTTP (TCP ou Unix socket).
+
+ENDPOINTS:
+    GET  /health   → status do serviço
+    GET  /metrics  → contagem de requisições e percentis de latência (ms)
+    POST /predict  → classifica um item ou uma lista de itens
+
+CORPO DO POST /predict (JSON), um dos formatos:
+    {"record_path": "data/raw/nsrdb/16265", "annotation_ext": "atr"}
+    {"r_peaks": [12, 140, 265, ...], "fs": 128}
+    {"rr_intervals": [0.81, 0.79, ...], "fs": 128}
+    {"items": [{...}, {...}]}     ← vários itens, uma única chamada por modelo
+
+Registros inteiros ('record_path') são classificados pelo best_model.pkl.
+Trechos de picos R / intervalos R-R são janelas de uma medição e usam o modelo
+de janela (window_model.pkl, train_window_model.py): o modelo de registro
+inteiro depende de num_beats/num_rr_intervals/sampling_freq e marcaria
+qualquer trecho curto como FA. Sem o modelo de janela, esses itens são
+recusados (HTTP 422).
+
+USO:
+    python src/prediction_server.py --port 8500
+    python src/prediction_server.py --unix-socket /tmp/vitalsync.sock
+
+    curl -s localhost:8500/predict -d '{"record_path": "data/raw/nsrdb/16265"}'
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+from feature_extraction import (
+    extract_features_from_record, extract_rr_intervals, features_from_rr_intervals
+)
+from predict import load_models, predict_from_features, resolve_annotation_ext
+from streaming_detector import load_window_model
+
+
+# Número de latências recentes guardadas por endpoint para calcular percentis
+LATENCY_WINDOW = 10000
+
+
+class LatencyTracker:
+    """
+    Guarda as latências mais recentes de cada endpoint (thread-safe) e
+    calcula percentis sob demanda.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._counts = {}
+        self._errors = {}
+
+    def record(self, endpoint: str, latency_ms: float, error: bool = False):
+        with self._lock:
+            if endpoint not in self._latencies:
+                self._latencies[endpoint] = deque(maxlen=self.window)
+                self._counts[endpoint] = 0
+                self._errors[endpoint] = 0
+            self._latencies[endpoint].append(latency_ms)
+            self._counts[endpoint] += 1
+            if error:
+                self._errors[endpoint] += 1
+
+    def summary(self) -> Dict:
+        with self._lock:
+            snapshot = {endpoint: np.array(latencies) for endpoint, latencies in self._latencies.items()}
+            counts = dict(self._counts)
+            errors = dict(self._errors)
+
+        summary = {}
+        for endpoint, latencies in snapshot.items():
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) if len(latencies) else (0, 0, 0)
+            summary[endpoint] = {
+                'requests': counts[endpoint],
+                'errors': errors[endpoint],
+                'latency_ms': {
+                    'p50': float(p50),
+                    'p90': float(p90),
+                    'p99': float(p99),
+                    'max': float(latencies.max()) if len(latencies) else 0.0
+                }
+            }
+        return summary
+
+
+class PredictionService:
+    """
+    Modelos + scalers residentes em memória, com predição a partir de registros
+    WFDB (modelo de registro inteiro) ou de picos R / intervalos R-R (modelo
+    de janela).
+
+    Args:
+        models_dir: Pasta com best_model.pkl, scaler.pkl e window_model.pkl
+        default_fs: Frequência de amostragem assumida quando o item não informa 'fs'
+    """
+
+    def __init__(self, models_dir: Path, default_fs: float = 128.0):
+        self.models_dir = Path(models_dir)
+        self.default_fs = default_fs
+        self.model, self.scaler = load_models(self.models_dir)
+        try:
+            self.window_model, self.window_scaler, self.window_config = load_window_model(self.models_dir)
+            self.window_model_error = None
+        except (FileNotFoundError, ValueError) as e:
+            self.window_model, self.window_scaler, self.window_config = None, None, {}
+            self.window_model_error = str(e).splitlines()[0]
+        self.latency = LatencyTracker()
+        self.started_at = time.time()
+
+    def features_from_item(self, item: Dict) -> Tuple[str, Dict]:
+        """
+        Converte um item da requisição no dicionário de features do modelo.
+
+        Returns:
+            ('record', features) para registros inteiros ou ('window', features)
+            para picos R / intervalos R-R
+
+        Raises:
+            ValueError: Se o item não tiver dados suficientes ou se for um
+                        trecho R-R e o modelo de janela não estiver carregado
+        """
+        if 'record_path' in item:
+            record_path = str(item['record_path'])
+            if record_path.endswith('.dat') or record_path.endswith('.hea'):
+                record_path = record_path.rsplit('.', 1)[0]
+            annotation_ext = resolve_annotation_ext(record_path, item.get('annotation_ext', 'qrs'))
+            return 'record', extract_features_from_record(record_path, label=None,
+                                                          annotation_ext=annotation_ext, raise_errors=True)
+
+        if 'r_peaks' not in item and 'rr_intervals' not in item:
+            raise ValueError("Item sem 'record_path', 'r_peaks' ou 'rr_intervals'")
+        if self.window_model is None:
+            raise ValueError(f"Modelo de janela indisponível para r_peaks/rr_intervals: {self.window_model_error}")
+
+        fs = float(item.get('fs', self.default_fs))
+
+        if 'r_peaks' in item:
+            r_peaks = np.asarray(item['r_peaks'], dtype=np.float64)
+            if len(r_peaks) < 2:
+                raise ValueError("São necessários pelo menos 2 picos R")
+            return 'window', features_from_rr_intervals(extract_rr_intervals(r_peaks, fs), fs,
+                                                        num_beats=len(r_peaks))
+
+        rr_intervals = np.asarray(item['rr_intervals'], dtype=np.float64)
+        if len(rr_intervals) == 0:
+            raise ValueError("A lista de intervalos R-R está vazia")
+        return 'window', features_from_rr_intervals(rr_intervals, fs)
+
+    def predict(self, payload: Dict) -> Dict:
+        """
+        Classifica um item ou uma lista de itens ({'items': [...]}).
+
+        Os itens válidos são normalizados e classificados com uma única chamada
+        por modelo (registro inteiro e janela). Itens com erro recebem 'error'
+        no resultado.
+        """
+        items = payload['items'] if 'items' in payload else [payload]
+
+        batches = {'record': [], 'window': []}
+        results: List = []
+        for item in items:
+            try:
+                kind, features = self.features_from_item(item)
+                batches[kind].append(features)
+                results.append(kind)
+            except Exception as e:
+                results.append({'error': f"{type(e).__name__}: {e}"})
+
+        predictions = {
+            'record': iter(predict_from_features(batches['record'], self.model, self.scaler)),
+            'window': iter(predict_from_features(batches['window'], self.window_model, self.window_scaler,
+                                                 self.window_config.get('feature_names'))),
+        }
+        for i, result in enumerate(results):
+            if isinstance(result, str):
+                prediction = next(predictions[result])
+                prediction['features'] = {name: (value.item() if isinstance(value, np.generic) else value)
+                                          for name, value in prediction['features'].items()}
+                results[i] = {**prediction, 'model': result, 'error': None}
+
+        if 'items' in payload:
+            return {'results': results}
+        return results[0]
+
+    def health(self) -> Dict:
+        return {
+            'status': 'ok',
+            'model': type(self.model).__name__,
+            'window_model': type(self.window_model).__name__ if self.window_model is not None else None,
+            'models_dir': str(self.models_dir),
+            'uptime_s': round(time.time() - self.started_at, 1)
+        }
+
+
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handler HTTP fino: decodifica JSON, chama o PredictionService e mede a latência.
+    """
+
+    server_version = 'VitalSyncPredict/1.0'
+    protocol_version = 'HTTP/1.1'  # keep-alive entre requisições do mesmo cliente
+
+    @property
+    def service(self) -> PredictionService:
+        return self.server.service
+
+    def address_string(self):
+        # Em Unix sockets client_address é uma string vazia
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, data: Dict):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        start = time.perf_counter()
+        if self.path == '/health':
+            self._send_json(200, self.service.health())
+        elif self.path == '/metrics':
+            self._send_json(200, self.service.latency.summary())
+        else:
+            self._send_json(404, {'error': f"Rota não encontrada: {self.path}"})
+            return
+        self.service.latency.record(self.path, (time.perf_counter() - start) * 1000)
+
+    def do_POST(self):
+        start = time.perf_counter()
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"Rota não encontrada: {self.path}"})
+            return
+
+        error = False
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("O corpo deve ser um objeto JSON")
+            result = self.service.predict(payload)
+            status = 200 if result.get('error') is None else 422
+            error = status != 200
+            self._send_json(status, result)
+        except (ValueError, KeyError) as e:
+            error = True
+            self._send_json(400, {'error': f"Requisição inválida: {e}"})
+        except Exception as e:
+            error = True
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+        finally:
+            self.service.latency.record('/predict', (time.perf_counter() - start) * 1000, error)
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    """
+    Servidor HTTP multi-thread sobre Unix socket.
+    """
+    daemon_threads = True
+
+    def server_bind(self):
+        UnixStreamServer.server_bind(self)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+
+def create_server(service: PredictionService, host: str = '127.0.0.1', port: int = 8500,
+                  unix_socket: str = None, quiet: bool = False):
+    """
+    Cria o servidor HTTP (TCP ou Unix socket) para o serviço.
+    """
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, PredictionRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), PredictionRequestHandler)
+        server.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de predição com modelo residente em memória')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='Endereço de escuta (padrão: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8500,
+                        help='Porta TCP (padrão: 8500)')
+    parser.add_argument('--unix-socket', type=str, default=None,
+                        help='Escutar em um Unix socket em vez de TCP')
+    parser.add_argument('--models-dir', type=str,
+                        default=str(Path(__file__).parent.parent / 'models'),
+                        help='Pasta com best_model.pkl, scaler.pkl e window_model.pkl')
+    parser.add_argument('--default-fs', type=float, default=128.0,
+                        help='Frequência de amostragem padrão para r_peaks/rr_intervals (padrão: 128)')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Não registrar cada requisição no terminal')
+    args = parser.parse_args()
+
+    try:
+        service = PredictionService(Path(args.models_dir), default_fs=args.default_fs)
+    except FileNotFoundError as e:
+        print(f"\n❌ ERRO: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    server = create_server(service, args.host, args.port, args.unix_socket, args.quiet)
+    address = args.unix_socket or f"http://{args.host}:{args.port}"
+
+    print("=" * 60)
+    print("🏥 VITALSYNC - SERVIDOR DE PREDIÇÃO")
+    print("=" * 60)
+    print(f"✅ Modelo carregado: {type(service.model).__name__}")
+    if service.window_model is None:
+        print(f"⚠️  Sem modelo de janela, r_peaks/rr_intervals serão recusados: {service.window_model_error}")
+    else:
+        print(f"✅ Modelo de janela: {type(service.window_model).__name__}")
+    print(f"🌐 Escutando em: {address}")
+    print("   POST /predict | GET /health | GET /metrics")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Encerrando servidor...")
+    finally:
+        server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+record_catalog.py
+-----------------
+Catálogo persistente dos registros de ECG em data/raw.
+
+Em vez de cada script repetir globs por dataset e três os.path.exists por
+registro, o catálogo faz UMA varredura das pastas (os.scandir, que já devolve
+tamanho e mtime de cada arquivo) e guarda em disco, por registro:
+
+- caminhos, tamanho e mtime do .dat, .hea e da anotação (.qrs/.atr)
+- dataset, subset, label e tipo de anotação
+- frequência de amostragem, número de amostras, duração e número de batimentos
+
+Nas execuções seguintes a varredura é refeita (barata) e só os registros cujo
+.hea ou anotação mudou têm o cabeçalho e as anotações relidos; registros
+removidos saem do catálogo.
+
+Estrutura no disco:
+    data/cache/record_catalog.json
+
+USO:
+    python src/record_catalog.py                      # atualiza e resume o catálogo
+    python src/record_catalog.py --dataset aftdb --subset test-set-a
+    python src/record_catalog.py --label 0 --list
+    python src/record_catalog.py --rebuild -j 0
+"""
+
+import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+import wfdb
+
+
+DEFAULT_DATA_ROOT = Path(__file__).parent.parent / 'data' / 'raw'
+DEFAULT_CATALOG_PATH = Path(__file__).parent.parent / 'data' / 'cache' / 'record_catalog.json'
+
+# Versão do formato do catálogo (catálogos de outras versões são reconstruídos)
+CATALOG_FORMAT_VERSION = 1
+
+# Layout de cada dataset em data/raw: subpastas, rótulo e extensão da anotação
+DATASETS = {
+    'aftdb': {
+        'subsets': ['learning-set', 'test-set-a', 'test-set-b'],
+        'label': 1,              # Fibrilação Atrial
+        'annotation_ext': 'qrs'
+    },
+    'nsrdb': {
+        'subsets': [None],       # arquivos direto na pasta do dataset ('main')
+        'label': 0,              # Ritmo Normal
+        'annotation_ext': 'atr'
+    }
+}
+
+
+def scan_directory(directory: Path) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Lista os arquivos de uma pasta agrupados por registro, com UMA chamada a os.scandir.
+
+    Backups como '.hea-' ficam com a própria extensão e são ignorados pelo catálogo.
+
+    Returns:
+        {nome_do_registro: {extensão: [tamanho, mtime_ns]}}
+    """
+    files = {}
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return files
+
+    for entry in entries:
+        stem, dot, ext = entry.name.rpartition('.')
+        if not dot or not entry.is_file():
+            continue
+        stat = entry.stat()
+        files.setdefault(stem, {})[ext] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+def _read_record_details(record: Dict) -> Dict:
+    """
+    Lê cabeçalho e anotações de um registro (executado nos workers).
+    """
+    try:
+        header = wfdb.rdheader(record['full_path'])
+        num_beats = len(wfdb.rdann(record['full_path'], record['annotation_ext']).sample) \
+            if record['files']['annotation'] else None
+    except Exception as e:
+        return {'fs': None, 'n_samples': None, 'duration_s': None, 'num_beats': None,
+                'error': f"{type(e).__name__}: {e}"}
+    return {
+        'fs': header.fs,
+        'n_samples': header.sig_len,
+        'duration_s': header.sig_len / header.fs if header.sig_len and header.fs else None,
+        'num_beats': num_beats,
+        'error': None
+    }
+
+
+class RecordCatalog:
+    """
+    Catálogo dos registros de data/raw, persistido em JSON.
+
+    Args:
+        data_root: Pasta data/raw com aftdb e nsrdb
+        catalog_path: Arquivo JSON do catálogo
+    """
+
+    def __init__(self, data_root=DEFAULT_DATA_ROOT, catalog_path=DEFAULT_CATALOG_PATH):
+        self.data_root = Path(data_root).resolve()
+        self.catalog_path = Path(catalog_path)
+        self.entries: Dict[str, Dict] = {}
+        self.last_refresh = {'scanned': 0, 'reread': 0, 'removed': 0}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.catalog_path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get('version') == CATALOG_FORMAT_VERSION and data.get('data_root') == str(self.data_root):
+            self.entries = {entry['full_path']: entry for entry in data['records']}
+
+    def save(self):
+        """
+        Grava o catálogo de forma atômica (arquivo temporário + os.replace).
+        """
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.catalog_path.with_name(f".{self.catalog_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': CATALOG_FORMAT_VERSION,
+                'data_root': str(self.data_root),
+                'records': list(self.entries.values())
+            }, f)
+        os.replace(tmp_path, self.catalog_path)
+
+    def _scan(self) -> List[Dict]:
+        """
+        Varre as pastas dos datasets e monta a entrada (sem cabeçalho) de cada registro.
+        """
+        records = []
+        for dataset, layout in DATASETS.items():
+            annotation_ext = layout['annotation_ext']
+            for subset in layout['subsets']:
+                directory = self.data_root / dataset / subset if subset else self.data_root / dataset
+                for record_name, files in sorted(scan_directory(directory).items()):
+                    if 'hea' not in files:
+                        continue
+                    records.append({
+                        'record_name': record_name,
+                        'full_path': str(directory / record_name),
+                        'subset': subset or 'main',
+                        'label': layout['label'],
+                        'dataset': dataset,
+                        'annotation_ext': annotation_ext,
+                        'files': {
+                            'dat': files.get('dat'),
+                            'hea': files['hea'],
+                            'annotation': files.get(annotation_ext)
+                        }
+                    })
+        return records
+
+    def refresh(self, n_workers: Optional[int] = 1, force: bool = False) -> bool:
+        """
+        Revalida o catálogo: uma varredura das pastas e releitura apenas dos
+        registros novos ou com .hea/anotação alterados.
+
+        Args:
+            n_workers: Processos para reler os registros (1 = serial, None = todos os núcleos)
+            force: Reler todos os registros
+
+        Returns:
+            True se o catálogo mudou (e foi salvo)
+        """
+        scanned = self._scan()
+        entries = {}
+        to_read = []
+        dat_changed = False
+        for record in scanned:
+            cached = self.entries.get(record['full_path'])
+            if (not force and cached is not None
+                    and cached['files']['hea'] == record['files']['hea']
+                    and cached['files']['annotation'] == record['files']['annotation']):
+                # Só o .dat pode ter mudado: atualizar a assinatura sem reler nada
+                dat_changed |= cached['files']['dat'] != record['files']['dat']
+                cached['files']['dat'] = record['files']['dat']
+                entries[record['full_path']] = cached
+            else:
+                to_read.append(record)
+                entries[record['full_path']] = record
+
+        if to_read:
+            from feature_extraction import resolve_pool_size
+            n_workers, chunksize = resolve_pool_size(len(to_read), n_workers)
+            if n_workers == 1:
+                details = list(map(_read_record_details, to_read))
+            else:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    details = list(executor.map(_read_record_details, to_read, chunksize=chunksize))
+            for record, detail in zip(to_read, details):
+                record.update(detail)
+
+        removed = len(set(self.entries) - set(entries))
+        changed = bool(to_read or removed or dat_changed)
+        self.entries = entries
+        self.last_refresh = {'scanned': len(scanned), 'reread': len(to_read), 'removed': removed}
+        if changed or not self.catalog_path.exists():
+            self.save()
+        return changed
+
+    def records(self, dataset: Optional[str] = None, subset: Optional[str] = None,
+                label: Optional[int] = None, require_annotation: bool = True,
+                require_signal: bool = False) -> List[Dict]:
+        """
+        Filtra os registros do catálogo.
+
+        Args:
+            dataset: 'aftdb' ou 'nsrdb'
+            subset: 'learning-set', 'test-set-a', 'test-set-b' ou 'main'
+            label: 1 (FA) ou 0 (Normal)
+            require_annotation: Só registros com o arquivo de anotação
+            require_signal: Só registros com o .dat
+
+        Returns:
+            Lista de dicionários no formato de data_loader.load_all_records()
+            (com os campos extras do catálogo), na ordem dataset → subset → nome
+        """
+        return [entry for entry in self.entries.values()
+                if (dataset is None or entry['dataset'] == dataset)
+                and (subset is None or entry['subset'] == subset)
+                and (label is None or entry['label'] == label)
+                and (not require_annotation or entry['files']['annotation'])
+                and (not require_signal or entry['files']['dat'])]
+
+
+def load_catalog(data_root=DEFAULT_DATA_ROOT, catalog_path=DEFAULT_CATALOG_PATH,
+                 n_workers: Optional[int] = 1) -> RecordCatalog:
+    """
+    Abre o catálogo e o revalida contra o disco.
+    """
+    catalog = RecordCatalog(data_root, catalog_path)
+    catalog.refresh(n_workers=n_workers)
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Catálogo dos registros de ECG em data/raw')
+    parser.add_argument('data_root', nargs='?', default=str(DEFAULT_DATA_ROOT),
+                        help='Pasta data/raw com aftdb e nsrdb (padrão: data/raw do projeto)')
+    parser.add_argument('--dataset', choices=sorted(DATASETS), default=None, help='Filtrar por dataset')
+    parser.add_argument('--subset', default=None, help='Filtrar por subset (ex: test-set-a, main)')
+    parser.add_argument('--label', type=int, choices=[0, 1], default=None,
+                        help='Filtrar por rótulo (1 = FA, 0 = Normal)')
+    parser.add_argument('--list', action='store_true', help='Listar os registros filtrados')
+    parser.add_argument('--rebuild', action='store_true', help='Reler todos os registros')
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='Processos para ler os registros (padrão: 1, 0 = todos os núcleos)')
+    args = parser.parse_args()
+
+    catalog = RecordCatalog(args.data_root)
+    catalog.refresh(n_workers=args.workers or None, force=args.rebuild)
+    records = catalog.records(args.dataset, args.subset, args.label, require_annotation=False)
+    refresh = catalog.last_refresh
+
+    print("=" * 60)
+    print(f"🗂️  CATÁLOGO DE REGISTROS: {catalog.catalog_path}")
+    print("=" * 60)
+    print(f"   Varredura: {refresh['scanned']} registros | relidos: {refresh['reread']} | "
+          f"removidos: {refresh['removed']}")
+    print(f"   Selecionados: {len(records)}")
+    for dataset in DATASETS:
+        for subset in sorted({r['subset'] for r in records if r['dataset'] == dataset}):
+            group = [r for r in records if r['dataset'] == dataset and r['subset'] == subset]
+            hours = sum(r['duration_s'] or 0 for r in group) / 3600
+            beats = sum(r['num_beats'] or 0 for r in group)
+            print(f"   - {dataset}/{subset}: {len(group)} registros, {hours:.1f} h, {beats} batimentos")
+
+    incomplete = [r for r in records if not r['files']['annotation'] or not r['files']['dat']]
+    if incomplete:
+        print(f"   ⚠️  {len(incomplete)} registro(s) sem .dat ou anotação")
+
+    if args.list:
+        print(f"\n{'Registro':<12} {'Dataset':<8} {'Subset':<14} {'Label':>5} {'fs':>6} "
+              f"{'Duração':>10} {'Batimentos':>11}  Arquivos")
+        for r in records:
+            present = ' '.join(ext for ext in ('dat', 'hea', 'annotation') if r['files'][ext])
+            duration = f"{r['duration_s']:.0f}s" if r['duration_s'] else '-'
+            print(f"{r['record_name']:<12} {r['dataset']:<8} {r['subset']:<14} {r['label']:>5} "
+                  f"{r['fs'] or '-':>6} {duration:>10} {r['num_beats'] or '-':>11}  {present}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
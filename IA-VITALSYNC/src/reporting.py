@@ -0,0 +1,217 @@
+"""
+reporting.py
+------------
+Logging estruturado e relatório de progresso dos scripts do pipeline.
+
+As mensagens de status (banners, contagens, avisos) passam pelo logging em vez
+de print:
+- vão para stderr, e o stdout fica só com a saída de dados (ex: CSV do predict.py)
+- têm nível: --quiet mostra apenas avisos e erros
+- com --log-format json saem em JSON lines, com os campos estruturados de cada
+  evento (ex: progresso com taxa e ETA), sem as linhas decorativas dos banners
+
+Loops longos usam ProgressReporter: no máximo uma linha a cada `interval`
+segundos com progresso, taxa e ETA, em vez de um print por item.
+
+USO:
+    from reporting import get_logger, ProgressReporter
+    log = get_logger('feature_extraction')
+    log.info("⚙️  EXTRAINDO FEATURES")
+    with ProgressReporter(len(records), 'Extraindo features', log) as progress:
+        for record in records:
+            ...
+            progress.update()
+
+    python src/feature_extraction.py --quiet
+    python src/feature_extraction.py --log-format json 2> extraction.jsonl
+"""
+
+import sys
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+# Logger raiz do projeto (os módulos usam 'vitalsync.<módulo>')
+LOGGER_NAME = 'vitalsync'
+
+# Campos de LogRecord que não são dados do evento
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Uma linha JSON por evento: horário, nível, logger, mensagem e os campos
+    passados em `extra` (ex: log.info(msg, extra={'done': 10, 'total': 100})).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage().strip(),
+        }
+        event.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            event['exception'] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class DecorationFilter(logging.Filter):
+    """
+    Descarta linhas só de separadores ('=' * 80) e linhas vazias (saída JSON).
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return bool(record.getMessage().strip(' \n=-'))
+
+
+def _make_handler(log_format: str = 'text', stream=None) -> logging.Handler:
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    if log_format == 'json':
+        handler.setFormatter(JsonFormatter())
+        handler.addFilter(DecorationFilter())
+    else:
+        handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
+
+
+def _root_logger() -> logging.Logger:
+    logger = logging.getLogger(LOGGER_NAME)
+    # Uso como biblioteca (notebooks, benchmarks) sem configure_logging(): as
+    # mensagens continuam aparecendo como antes, no formato texto
+    if not logger.handlers:
+        logger.addHandler(_make_handler())
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger do módulo ('vitalsync.<name>').
+    """
+    _root_logger()
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def configure_logging(level=logging.INFO, log_format: str = 'text', quiet: bool = False, stream=None):
+    """
+    Configura a saída de todos os loggers do projeto.
+
+    Args:
+        level: Nível mínimo (ex: logging.INFO ou 'DEBUG')
+        log_format: 'text' (mensagens como antes) ou 'json' (JSON lines)
+        quiet: Apenas avisos e erros (sobrepõe level)
+        stream: Destino (padrão: stderr)
+    """
+    logger = _root_logger()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(_make_handler(log_format, stream))
+    logger.setLevel(logging.WARNING if quiet else level)
+
+
+def add_arguments(parser):
+    """
+    Adiciona --quiet, --log-level e --log-format a um argparse.ArgumentParser.
+    """
+    group = parser.add_argument_group('saída')
+    group.add_argument('--quiet', '-q', action='store_true',
+                       help='Mostrar apenas avisos e erros')
+    group.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO',
+                       help='Nível mínimo das mensagens (padrão: INFO)')
+    group.add_argument('--log-format', choices=['text', 'json'], default='text',
+                       help='text = mensagens legíveis; json = uma linha JSON por evento (padrão: text)')
+
+
+def configure_from_args(args):
+    """
+    configure_logging() com os argumentos de add_arguments().
+    """
+    configure_logging(args.log_level, args.log_format, args.quiet)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Duração curta para humanos: '42s', '3m05s', '2h10m'.
+    """
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+
+class ProgressReporter:
+    """
+    Progresso de um loop longo: uma mensagem a cada `interval` segundos (e ao
+    final) com itens concluídos, percentual, taxa e ETA.
+
+    No formato JSON, cada mensagem leva os campos event='progress', task, done,
+    total, rate_per_s, elapsed_s e eta_s.
+
+    Args:
+        total: Número de itens esperado
+        description: Nome da tarefa (ex: 'Extraindo features')
+        logger: Logger de destino (padrão: 'vitalsync.progress')
+        unit: Unidade dos itens na mensagem (padrão: 'registros')
+        interval: Segundos mínimos entre duas mensagens
+    """
+
+    def __init__(self, total: int, description: str, logger: Optional[logging.Logger] = None,
+                 unit: str = 'registros', interval: float = 2.0):
+        self.total = total
+        self.description = description
+        self.logger = logger or get_logger('progress')
+        self.unit = unit
+        self.interval = interval
+        self.done = 0
+        self.start = time.perf_counter()
+        self._last_report = None
+        self._closed = False
+
+    def update(self, n: int = 1, **fields):
+        """
+        Soma n itens concluídos; campos extras vão para o evento JSON.
+        """
+        self.done += n
+        now = time.perf_counter()
+        if self._last_report is None or now - self._last_report >= self.interval:
+            self._report(now, fields)
+
+    def _report(self, now: float, fields=None, final: bool = False):
+        self._last_report = now
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.done, 0)
+        eta = remaining / rate if rate > 0 else None
+
+        pct = f" ({self.done / self.total:.0%})" if self.total else ''
+        if final:
+            timing = f"em {format_duration(elapsed)}"
+        else:
+            timing = f"ETA {format_duration(eta)}" if eta is not None else "ETA -"
+        self.logger.info(
+            f"   ⏳ {self.description}: {self.done}/{self.total}{pct} | {rate:.1f} {self.unit}/s | {timing}",
+            extra={'event': 'progress', 'task': self.description, 'done': self.done, 'total': self.total,
+                   'rate_per_s': round(rate, 3), 'elapsed_s': round(elapsed, 3),
+                   'eta_s': None if eta is None else round(eta, 3), 'final': final, **(fields or {})}
+        )
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._report(time.perf_counter(), final=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
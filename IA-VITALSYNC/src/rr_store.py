@@ -0,0 +1,305 @@
+"""
+rr_store.py
+-----------
+Armazenamento colunar dos picos R e intervalos R-R de todos os registros.
+
+Ler as anotações WFDB (.qrs/.atr) de centenas de registros a cada experimento
+domina o tempo de extração de features. Este módulo converte tudo UMA vez para
+poucos arrays NumPy contíguos, lidos depois com np.load(mmap_mode='r'): o
+acesso a um registro é uma fatia (view) do array mapeado, sem cópia e sem
+parsing.
+
+Estrutura no disco:
+    store_dir/
+    ├── peaks.npy     ← posições (amostras) dos picos R de todos os registros, int64
+    ├── rr.npy        ← intervalos R-R em segundos, float64
+    ├── offsets.npy   ← início de cada registro em peaks.npy (n_registros + 1), int64
+    └── meta.json     ← metadados por registro (dataset, label, fs, arquivos de origem)
+
+Os intervalos do registro i ocupam rr[offsets[i] - i : offsets[i + 1] - i - 1]
+(um intervalo a menos que o número de picos).
+
+Cada registro guarda o tamanho e o mtime do .hea e da anotação de origem; por
+padrão RRStore.get() confere esses valores e devolve None se o arquivo mudou,
+para que o chamador caia de volta na leitura WFDB.
+
+USO:
+    python src/rr_store.py build              # converte data/raw
+    python src/rr_store.py build --workers 0  # em paralelo (todos os núcleos)
+    python src/rr_store.py info
+"""
+
+import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / 'data' / 'processed' / 'rr_store'
+
+# Versão do formato em disco (stores de outras versões são recusados)
+STORE_FORMAT_VERSION = 1
+
+
+def _file_signature(path: str) -> Optional[List]:
+    """
+    (tamanho, mtime em ns) de um arquivo, ou None se ele não existir.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _source_signature(record_path: str, annotation_ext: str) -> Dict:
+    return {
+        'hea': _file_signature(f"{record_path}.hea"),
+        'annotation': _file_signature(f"{record_path}.{annotation_ext}")
+    }
+
+
+def _read_record_peaks(record_info: Dict) -> Dict:
+    """
+    Lê o cabeçalho e as anotações de um registro (executado nos workers).
+
+    Returns:
+        {'peaks': array ou None, 'fs': float, 'signature': dict, 'error': str ou None}
+    """
+    record_path = record_info['full_path']
+    annotation_ext = record_info.get('annotation_ext', 'qrs')
+    import wfdb  # só a construção do store lê arquivos WFDB
+    try:
+        signature = _source_signature(record_path, annotation_ext)
+        fs = wfdb.rdheader(record_path).fs
+        peaks = np.asarray(wfdb.rdann(record_path, annotation_ext).sample, dtype=np.int64)
+    except Exception as e:
+        return {'peaks': None, 'fs': None, 'signature': None, 'error': f"{type(e).__name__}: {e}"}
+    return {'peaks': peaks, 'fs': fs, 'signature': signature, 'error': None}
+
+
+def _save_npy_atomic(path: Path, array: np.ndarray):
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def build_rr_store(records_info: List[Dict], store_dir=DEFAULT_STORE_DIR,
+                   n_workers: Optional[int] = 1) -> Dict:
+    """
+    Converte as anotações de todos os registros para o store colunar.
+
+    Args:
+        records_info: Registros (data_loader.load_all_records())
+        store_dir: Pasta de destino (substituída por completo)
+        n_workers: Processos para ler as anotações (1 = serial, None = todos os núcleos)
+
+    Returns:
+        Resumo {'records': n, 'beats': n, 'errors': [...]}
+    """
+    from feature_extraction import resolve_pool_size
+
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    n_workers, chunksize = resolve_pool_size(len(records_info), n_workers)
+    if n_workers == 1:
+        results = map(_read_record_peaks, records_info)
+    else:
+        executor = ProcessPoolExecutor(max_workers=n_workers)
+        results = executor.map(_read_record_peaks, records_info, chunksize=chunksize)
+
+    records = []
+    peak_arrays = []
+    errors = []
+    try:
+        for record_info, result in zip(records_info, results):
+            if result['error'] is not None or len(result['peaks']) < 2:
+                errors.append({
+                    'record_name': record_info['record_name'],
+                    'error': result['error'] or f"Apenas {len(result['peaks'])} pico(s) R"
+                })
+                continue
+            peak_arrays.append(result['peaks'])
+            records.append({
+                'record_name': record_info['record_name'],
+                'full_path': os.path.abspath(record_info['full_path']),
+                'dataset': record_info.get('dataset'),
+                'subset': record_info.get('subset', 'main'),
+                'label': record_info.get('label'),
+                'annotation_ext': record_info.get('annotation_ext', 'qrs'),
+                'fs': result['fs'],
+                'num_beats': len(result['peaks']),
+                'source': result['signature']
+            })
+    finally:
+        if n_workers > 1:
+            executor.shutdown()
+
+    lengths = np.array([len(p) for p in peak_arrays], dtype=np.int64)
+    offsets = np.zeros(len(peak_arrays) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    peaks = np.concatenate(peak_arrays) if peak_arrays else np.zeros(0, dtype=np.int64)
+    fs = np.repeat(np.array([r['fs'] for r in records], dtype=np.float64), lengths - 1)
+    # Diferenças dentro de cada registro: descarta a que cruza a fronteira entre registros
+    boundary = np.ones(len(peaks), dtype=bool)
+    boundary[offsets[:-1]] = False
+    rr = np.diff(peaks)[boundary[1:]] / fs if len(peaks) else np.zeros(0)
+
+    # meta.json por último: um store só é válido depois que ele é escrito
+    meta_path = store_dir / 'meta.json'
+    if meta_path.exists():
+        meta_path.unlink()
+    _save_npy_atomic(store_dir / 'peaks.npy', peaks)
+    _save_npy_atomic(store_dir / 'rr.npy', rr.astype(np.float64))
+    _save_npy_atomic(store_dir / 'offsets.npy', offsets)
+    tmp_meta = store_dir / f".meta.{os.getpid()}.tmp"
+    with open(tmp_meta, 'w') as f:
+        json.dump({'version': STORE_FORMAT_VERSION, 'records': records}, f)
+    os.replace(tmp_meta, meta_path)
+
+    return {'records': len(records), 'beats': int(len(peaks)), 'errors': errors}
+
+
+class RRStore:
+    """
+    Leitura do store colunar (arrays mapeados em memória, fatias sem cópia).
+
+    Args:
+        store_dir: Pasta criada por build_rr_store
+        validate: Se True, get() confere tamanho/mtime dos arquivos de origem
+    """
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR, validate: bool = True):
+        self.store_dir = Path(store_dir)
+        self.validate = validate
+
+        meta_path = self.store_dir / 'meta.json'
+        if not meta_path.exists():
+            raise FileNotFoundError(
+                f"Store de intervalos R-R não encontrado em {self.store_dir}\n"
+                "Execute 'python src/rr_store.py build' primeiro."
+            )
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('version') != STORE_FORMAT_VERSION:
+            raise ValueError(f"Versão do store ({meta.get('version')}) diferente de {STORE_FORMAT_VERSION}; "
+                             "reconstrua com 'python src/rr_store.py build'")
+
+        self.records = meta['records']
+        self.peaks_array = np.load(self.store_dir / 'peaks.npy', mmap_mode='r')
+        self.rr_array = np.load(self.store_dir / 'rr.npy', mmap_mode='r')
+        self.offsets = np.load(self.store_dir / 'offsets.npy')
+        self._index = {os.path.abspath(r['full_path']): i for i, r in enumerate(self.records)}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getstate__(self):
+        # Workers de ProcessPoolExecutor reabrem os arquivos em vez de copiar os arrays
+        return {'store_dir': self.store_dir, 'validate': self.validate}
+
+    def __setstate__(self, state):
+        self.__init__(state['store_dir'], state['validate'])
+
+    def index_of(self, record_path: str) -> Optional[int]:
+        """
+        Posição do registro no store (None se ele não foi convertido).
+        """
+        return self._index.get(os.path.abspath(str(record_path)))
+
+    def peaks(self, i: int) -> np.ndarray:
+        """Picos R (amostras) do registro i — view somente leitura."""
+        return self.peaks_array[self.offsets[i]:self.offsets[i + 1]]
+
+    def rr(self, i: int) -> np.ndarray:
+        """Intervalos R-R (s) do registro i — view somente leitura."""
+        return self.rr_array[self.offsets[i] - i:self.offsets[i + 1] - i - 1]
+
+    def is_fresh(self, i: int) -> bool:
+        """
+        True se o .hea e a anotação de origem não mudaram desde a conversão.
+        """
+        record = self.records[i]
+        return _source_signature(record['full_path'], record['annotation_ext']) == record['source']
+
+    def get(self, record_path: str, annotation_ext: Optional[str] = None
+            ) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        """
+        Picos R, intervalos R-R e frequência de amostragem de um registro.
+
+        Returns:
+            (peaks, rr, fs), ou None se o registro não estiver no store, tiver
+            sido convertido com outra anotação ou (com validate) tiver mudado
+        """
+        i = self.index_of(record_path)
+        if i is None:
+            return None
+        record = self.records[i]
+        if annotation_ext is not None and record['annotation_ext'] != annotation_ext:
+            return None
+        if self.validate and not self.is_fresh(i):
+            return None
+        return self.peaks(i), self.rr(i), record['fs']
+
+
+def open_default_store(validate: bool = True) -> Optional[RRStore]:
+    """
+    Abre o store padrão (data/processed/rr_store) se ele já tiver sido criado.
+    """
+    try:
+        return RRStore(DEFAULT_STORE_DIR, validate=validate)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def main():
+    from data_loader import load_all_records
+
+    parser = argparse.ArgumentParser(description='Store colunar de picos R e intervalos R-R')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Converter as anotações de data/raw')
+    build_parser.add_argument('data_root', nargs='?', default=None,
+                              help='Pasta data/raw com aftdb e nsrdb (padrão: data/raw do projeto)')
+    build_parser.add_argument('--workers', '-j', type=int, default=1,
+                              help='Processos para ler as anotações (padrão: 1, 0 = todos os núcleos)')
+    build_parser.add_argument('--store-dir', default=str(DEFAULT_STORE_DIR),
+                              help=f'Pasta do store (padrão: {DEFAULT_STORE_DIR})')
+
+    info_parser = subparsers.add_parser('info', help='Resumo do store')
+    info_parser.add_argument('--store-dir', default=str(DEFAULT_STORE_DIR),
+                             help=f'Pasta do store (padrão: {DEFAULT_STORE_DIR})')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        data_root = args.data_root or Path(__file__).parent.parent / 'data' / 'raw'
+        records = load_all_records(str(data_root))
+        summary = build_rr_store(records, args.store_dir, n_workers=args.workers or None)
+        print(f"\n💾 Store salvo em: {args.store_dir}")
+        print(f"   Registros: {summary['records']} | Picos R: {summary['beats']}")
+        if summary['errors']:
+            print(f"   ⚠️  {len(summary['errors'])} registro(s) com erro:")
+            for error in summary['errors']:
+                print(f"      • {error['record_name']}: {error['error']}")
+        return
+
+    store = RRStore(args.store_dir)
+    stale = [r['record_name'] for i, r in enumerate(store.records) if not store.is_fresh(i)]
+    size_mb = sum(f.stat().st_size for f in Path(args.store_dir).iterdir()) / 1024 ** 2
+    print("=" * 60)
+    print(f"📦 STORE R-R: {args.store_dir}")
+    print("=" * 60)
+    print(f"   Registros: {len(store)} | Picos R: {len(store.peaks_array)} | Tamanho: {size_mb:.1f} MB")
+    for dataset in sorted({r['dataset'] for r in store.records}):
+        print(f"   - {dataset}: {sum(1 for r in store.records if r['dataset'] == dataset)}")
+    print(f"   Desatualizados: {len(stale)}{' (' + ', '.join(stale[:10]) + ')' if stale else ''}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+signal_reader.py
+----------------
+Leitura preguiçosa (lazy) de sinais WFDB via memory-map.
+
+wfdb.rdrecord sem sampfrom/sampto decodifica o registro INTEIRO em um
+p_signal float64 (horas de sinal no NSRDB) mesmo quando só alguns segundos são
+usados. Aqui o arquivo .dat é mapeado em memória e apenas o trecho pedido é
+decodificado, então o uso de RAM depende do tamanho do trecho, não do registro.
+
+Formatos suportados (todos os canais no mesmo .dat, 1 amostra por quadro):
+- 16:  int16 little-endian intercalado → visões sem cópia das amostras digitais
+- 212: pares de amostras de 12 bits em 3 bytes (usado no NSRDB)
+- 80:  uint8 com deslocamento de 128
+
+Nos demais casos (outros formatos, canais em vários .dat, mais de uma amostra
+por quadro) cada leitura cai em wfdb.rdrecord(sampfrom=..., sampto=...): sem
+memory-map, mas ainda decodificando só o trecho pedido.
+
+EXEMPLO:
+    reader = SignalReader('data/raw/nsrdb/16265')
+    trecho = reader.read(start_sec=3600, duration=10)          # mV, float64
+    digital = reader.read(0, 10, channels=[0], physical=False)  # int16
+    for start_sample, chunk in reader.iter_chunks(chunk_seconds=300):
+        ...
+"""
+
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+import wfdb
+
+
+# Valores digitais que o WFDB reserva para "amostra inválida" (viram NaN no sinal físico)
+INVALID_SAMPLE_VALUES = {'16': -32768, '212': -2048, '80': -128}
+
+SUPPORTED_FORMATS = set(INVALID_SAMPLE_VALUES)
+
+
+class SignalReader:
+    """
+    Leitor de um registro WFDB com acesso aleatório e por blocos ao sinal.
+
+    Args:
+        record_path: Caminho do registro (sem extensão)
+
+    Atributos:
+        mapped: True quando o .dat é lido via memory-map; False quando o layout
+                não é suportado e as leituras usam wfdb.rdrecord
+    """
+
+    def __init__(self, record_path: str):
+        self.record_path = str(record_path)
+        self.header = wfdb.rdheader(self.record_path)
+
+        formats = set(self.header.fmt)
+        files = set(self.header.file_name)
+        self.mapped = (
+            len(formats) == 1 and len(files) == 1 and not formats - SUPPORTED_FORMATS
+            and all((spf or 1) == 1 for spf in (self.header.samps_per_frame or []))
+        )
+
+        self.fmt = formats.pop() if len(formats) == 1 else None
+        self.dat_path = Path(self.record_path).parent / files.pop() if len(files) == 1 else None
+        self.fs = self.header.fs
+        self.n_channels = self.header.n_sig
+        self.sig_name = self.header.sig_name
+        self.units = self.header.units
+        self.byte_offset = self.header.byte_offset[0] or 0
+        self.gain = np.array([g if g else 200.0 for g in self.header.adc_gain], dtype=np.float64)
+        self.baseline = np.array(self.header.baseline, dtype=np.float64)
+
+        self._mmap = None
+        if self.header.sig_len:
+            self.n_samples = self.header.sig_len
+        elif self.mapped:
+            self.n_samples = self._samples_in_file()
+        else:
+            self.n_samples = wfdb.rdrecord(self.record_path, physical=False).sig_len
+
+    @property
+    def duration(self) -> float:
+        """Duração do registro em segundos."""
+        return self.n_samples / self.fs
+
+    def _samples_in_file(self) -> int:
+        n_bytes = self.dat_path.stat().st_size - self.byte_offset
+        if self.fmt == '16':
+            return n_bytes // (2 * self.n_channels)
+        if self.fmt == '212':
+            return (n_bytes * 2 // 3) // self.n_channels
+        return n_bytes // self.n_channels
+
+    def _data(self) -> np.memmap:
+        """
+        Mapeia o .dat em memória (apenas na primeira leitura).
+        """
+        if self._mmap is None:
+            if self.fmt == '16':
+                self._mmap = np.memmap(self.dat_path, dtype='<i2', mode='r', offset=self.byte_offset,
+                                       shape=(self.n_samples, self.n_channels))
+            else:
+                self._mmap = np.memmap(self.dat_path, dtype=np.uint8, mode='r', offset=self.byte_offset)
+        return self._mmap
+
+    def _read_digital(self, start: int, stop: int) -> np.ndarray:
+        """
+        Amostras digitais [start, stop) de todos os canais, shape (n, n_channels).
+        """
+        data = self._data()
+
+        if self.fmt == '16':
+            return data[start:stop]  # visão, sem cópia
+
+        if self.fmt == '80':
+            frames = np.asarray(data[start * self.n_channels:stop * self.n_channels])
+            return (frames.astype(np.int16) - 128).reshape(-1, self.n_channels)
+
+        # Formato 212: cada 3 bytes guardam 2 amostras de 12 bits (em ordem de quadro)
+        first = start * self.n_channels
+        last = stop * self.n_channels
+        pair_start = first // 2
+        pair_stop = (last + 1) // 2
+        raw = np.asarray(data[pair_start * 3:pair_stop * 3])
+        if len(raw) % 3:
+            # Número ímpar de amostras: o último par ocupa só 2 bytes no arquivo
+            raw = np.concatenate([raw, np.zeros(3 - len(raw) % 3, dtype=np.uint8)])
+        packed = raw.reshape(-1, 3).astype(np.int16)
+
+        samples = np.empty(len(packed) * 2, dtype=np.int16)
+        samples[0::2] = packed[:, 0] | ((packed[:, 1] & 0x0F) << 8)
+        samples[1::2] = packed[:, 2] | ((packed[:, 1] & 0xF0) << 4)
+        samples[samples > 2047] -= 4096  # extensão de sinal (12 bits)
+
+        offset = first - pair_start * 2
+        return samples[offset:offset + (last - first)].reshape(-1, self.n_channels)
+
+    def _to_physical(self, digital: np.ndarray, channels: List[int]) -> np.ndarray:
+        physical = (digital - self.baseline[channels]) / self.gain[channels]
+        invalid = digital == INVALID_SAMPLE_VALUES[self.fmt]
+        if invalid.any():
+            physical[invalid] = np.nan
+        return physical
+
+    def _read_rdrecord(self, start: int, stop: int, channels: List[int], physical: bool) -> np.ndarray:
+        """
+        Trecho [start, stop) lido com wfdb.rdrecord (layouts sem memory-map).
+        """
+        if stop <= start:
+            return np.empty((0, len(channels)), dtype=np.float64 if physical else np.int16)
+        record = wfdb.rdrecord(self.record_path, sampfrom=start, sampto=stop, channels=channels,
+                               physical=physical)
+        return record.p_signal if physical else record.d_signal
+
+    def read_samples(self, start: int = 0, stop: Optional[int] = None,
+                     channels: Optional[List[int]] = None, physical: bool = True) -> np.ndarray:
+        """
+        Lê o trecho de amostras [start, stop).
+
+        Args:
+            start: Primeira amostra
+            stop: Amostra final (exclusiva); None = fim do registro
+            channels: Índices dos canais (None = todos)
+            physical: True → float64 em unidades físicas (mV);
+                      False → valores digitais (int16 no memory-map, visão sem
+                      cópia no formato 16; no fallback, o tipo do wfdb.rdrecord)
+
+        Returns:
+            Array (n_amostras, n_canais)
+        """
+        stop = self.n_samples if stop is None else min(stop, self.n_samples)
+        start = max(0, min(start, stop))
+        channels = list(range(self.n_channels)) if channels is None else list(channels)
+
+        if not self.mapped:
+            return self._read_rdrecord(start, stop, channels, physical)
+
+        digital = self._read_digital(start, stop)
+        if channels != list(range(self.n_channels)):
+            digital = digital[:, channels]
+
+        if not physical:
+            return digital
+        return self._to_physical(digital, channels)
+
+    def read(self, start_sec: float = 0.0, duration: Optional[float] = None,
+             channels: Optional[List[int]] = None, physical: bool = True) -> np.ndarray:
+        """
+        Lê um intervalo de tempo do sinal.
+
+        Args:
+            start_sec: Início em segundos
+            duration: Duração em segundos (None = até o fim)
+            channels: Índices dos canais (None = todos)
+            physical: Unidades físicas (float64) ou digitais (int16)
+
+        Returns:
+            Array (n_amostras, n_canais)
+        """
+        start = int(round(start_sec * self.fs))
+        stop = None if duration is None else start + int(round(duration * self.fs))
+        return self.read_samples(start, stop, channels, physical)
+
+    def iter_chunks(self, chunk_seconds: float = 60.0, start_sec: float = 0.0,
+                    end_sec: Optional[float] = None, channels: Optional[List[int]] = None,
+                    physical: bool = True) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Percorre o sinal em blocos de chunk_seconds.
+
+        Yields:
+            Tuplas (amostra_inicial, bloco) com bloco de shape (n, n_canais)
+        """
+        chunk = max(1, int(round(chunk_seconds * self.fs)))
+        start = int(round(start_sec * self.fs))
+        stop = self.n_samples if end_sec is None else min(self.n_samples, int(round(end_sec * self.fs)))
+
+        for chunk_start in range(start, stop, chunk):
+            yield chunk_start, self.read_samples(chunk_start, min(chunk_start + chunk, stop),
+                                                 channels, physical)
+
+    def close(self):
+        """Libera o mapeamento do arquivo."""
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
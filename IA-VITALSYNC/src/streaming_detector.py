@@ -0,0 +1,539 @@
+"""
+streaming_detector.py
+---------------------
+Detector de Fibrilação Atrial em fluxo (streaming) sobre janelas deslizantes
+de intervalos R-R.
+
+O pipeline offline (extract_features_from_record) resume um registro inteiro
+em UM vetor de features. Aqui os picos R chegam um a um (sensor ao vivo ou
+leitura de um Holter longo) e uma probabilidade de FA é emitida para cada
+janela configurável (ex: 60 batimentos ou 30 s), avançando em passos (hop).
+
+As janelas são classificadas pelo modelo de JANELA (models/window_model.pkl,
+gerado por train_window_model.py), que usa só as features de
+WINDOW_FEATURE_NAMES. O modelo de registro inteiro (best_model.pkl) não serve:
+ele usa num_beats, num_rr_intervals e sampling_freq, que numa janela refletem o
+tamanho da janela e não o ritmo (marcava todas as janelas de um registro
+sinusal como FA), e por isso é recusado.
+
+As estatísticas da janela são mantidas de forma incremental:
+- soma, soma dos quadrados e soma das diferenças sucessivas²: O(1) por batimento
+- mínimo/máximo: deques monotônicas, O(1) amortizado
+- mediana/percentis: lista ordenada; a posição é achada com bisect em O(log n),
+  mas inserir/remover desloca os elementos seguintes (memmove), então o custo
+  por batimento é O(n) no tamanho n da janela. Com janelas de até algumas
+  centenas de intervalos (60 batimentos; 30 s a 200 bpm = 100 intervalos) o
+  deslocamento é desprezível perto do resto do push.
+
+USO:
+    python src/streaming_detector.py data/raw/aftdb/learning-set/n01
+    python src/streaming_detector.py data/raw/nsrdb/16265 --window-seconds 30 --hop-seconds 10
+"""
+
+import sys
+import bisect
+import argparse
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+from feature_extraction import MODEL_FEATURE_NAMES, quantile_from_sorted
+from hrv_frequency import BEAT_SYMBOLS
+
+
+DEFAULT_MODELS_DIR = Path(__file__).parent.parent / 'models'
+
+# Artefato do modelo de janela (train_window_model.py)
+WINDOW_MODEL_FILE = 'window_model.pkl'
+
+# Features que numa janela medem o tamanho da janela ou o dispositivo, não o ritmo
+WINDOW_DEPENDENT_FEATURES = ('num_beats', 'num_rr_intervals', 'sampling_freq')
+
+# Features usadas pelo modelo de janela, na ordem das colunas
+WINDOW_FEATURE_NAMES = [name for name in MODEL_FEATURE_NAMES if name not in WINDOW_DEPENDENT_FEATURES]
+
+
+# A cada quantos batimentos as somas são recalculadas do zero (evita acúmulo
+# de erro de ponto flutuante em fluxos muito longos)
+RESYNC_INTERVAL = 100_000
+
+
+class RollingRRStatistics:
+    """
+    Janela deslizante de intervalos R-R com estatísticas incrementais.
+
+    A janela é limitada por número de intervalos (max_beats), por duração total
+    em segundos (max_seconds) ou pelos dois. Cada push custa O(n) no tamanho da
+    janela por causa da lista ordenada (ver docstring do módulo).
+
+    Args:
+        max_beats: Número máximo de intervalos R-R na janela
+        max_seconds: Duração máxima da janela (soma dos intervalos), em segundos
+    """
+
+    def __init__(self, max_beats: Optional[int] = None, max_seconds: Optional[float] = None):
+        if max_beats is None and max_seconds is None:
+            raise ValueError("Defina max_beats e/ou max_seconds")
+
+        self.max_beats = max_beats
+        self.max_seconds = max_seconds
+
+        self._values = deque()
+        self._sorted = []
+        self._min_deque = deque()  # (índice, valor) crescentes
+        self._max_deque = deque()  # (índice, valor) decrescentes
+        self._next_index = 0
+        self._first_index = 0
+
+        # Somas deslocadas por uma referência (reduz cancelamento numérico)
+        self._reference = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._sum_diff_sq = 0.0
+        self._total = 0.0
+        self._pushes_since_resync = 0
+        self._evicted = False
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def is_full(self) -> bool:
+        """True quando a janela já atingiu o tamanho configurado."""
+        if self._evicted:
+            return True
+        return self.max_beats is not None and len(self._values) >= self.max_beats
+
+    @property
+    def duration(self) -> float:
+        """Soma dos intervalos da janela (s)."""
+        return self._total
+
+    def push(self, rr: float):
+        """
+        Adiciona um intervalo R-R (s) e remove os mais antigos que saíram da janela.
+        """
+        rr = float(rr)
+        if self._reference is None:
+            self._reference = rr
+
+        if self._values:
+            self._sum_diff_sq += (rr - self._values[-1]) ** 2
+
+        shifted = rr - self._reference
+        self._values.append(rr)
+        self._sum += shifted
+        self._sum_sq += shifted * shifted
+        self._total += rr
+        bisect.insort(self._sorted, rr)
+
+        index = self._next_index
+        self._next_index += 1
+        while self._min_deque and self._min_deque[-1][1] >= rr:
+            self._min_deque.pop()
+        self._min_deque.append((index, rr))
+        while self._max_deque and self._max_deque[-1][1] <= rr:
+            self._max_deque.pop()
+        self._max_deque.append((index, rr))
+
+        while self._values and (
+            (self.max_beats is not None and len(self._values) > self.max_beats)
+            or (self.max_seconds is not None and self._total > self.max_seconds and len(self._values) > 1)
+        ):
+            self._pop_oldest()
+
+        self._pushes_since_resync += 1
+        if self._pushes_since_resync >= RESYNC_INTERVAL:
+            self._resync()
+
+    def _pop_oldest(self):
+        self._evicted = True
+        oldest = self._values.popleft()
+        if self._values:
+            self._sum_diff_sq -= (self._values[0] - oldest) ** 2
+
+        shifted = oldest - self._reference
+        self._sum -= shifted
+        self._sum_sq -= shifted * shifted
+        self._total -= oldest
+        del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+
+        if self._min_deque and self._min_deque[0][0] == self._first_index:
+            self._min_deque.popleft()
+        if self._max_deque and self._max_deque[0][0] == self._first_index:
+            self._max_deque.popleft()
+        self._first_index += 1
+
+    def _resync(self):
+        """
+        Recalcula as somas a partir dos valores da janela (O(n), raro).
+        """
+        values = np.fromiter(self._values, dtype=np.float64, count=len(self._values))
+        self._reference = float(values[0]) if len(values) else None
+        shifted = values - (self._reference or 0.0)
+        self._sum = float(shifted.sum())
+        self._sum_sq = float(np.dot(shifted, shifted))
+        self._sum_diff_sq = float(np.sum(np.diff(values) ** 2))
+        self._total = float(values.sum())
+        self._pushes_since_resync = 0
+
+    def features(self, sampling_freq: float) -> Dict:
+        """
+        Features da janela atual, com as mesmas chaves de
+        feature_extraction.features_from_rr_intervals.
+        """
+        n = len(self._values)
+        if n == 0:
+            raise ValueError("Janela vazia")
+
+        mean_shifted = self._sum / n
+        mean_rr = self._reference + mean_shifted
+        variance = max(self._sum_sq / n - mean_shifted * mean_shifted, 0.0)
+        std_rr = variance ** 0.5
+        rmssd = (max(self._sum_diff_sq, 0.0) / (n - 1)) ** 0.5 if n >= 2 else 0.0
+
+        min_rr = self._min_deque[0][1]
+        max_rr = self._max_deque[0][1]
+        p25 = quantile_from_sorted(self._sorted, 0.25)
+        p75 = quantile_from_sorted(self._sorted, 0.75)
+
+        return {
+            'num_beats': n + 1,
+            'num_rr_intervals': n,
+            'sampling_freq': sampling_freq,
+            'rr_mean': mean_rr,
+            'rr_std': std_rr,
+            'rr_median': quantile_from_sorted(self._sorted, 0.50),
+            'rr_min': min_rr,
+            'rr_max': max_rr,
+            'rr_cv': (std_rr / mean_rr) * 100 if mean_rr != 0 else 0.0,
+            'rr_rmssd': rmssd,
+            'rr_range': max_rr - min_rr,
+            'rr_percentile_25': p25,
+            'rr_percentile_75': p75,
+            'rr_iqr': p75 - p25,
+            'mean_hr_bpm': 60.0 / mean_rr if mean_rr > 0 else 0.0,
+        }
+
+
+class RRWindowStream:
+    """
+    Consome instantes de picos R incrementalmente e emite as features de cada
+    janela deslizante (sem classificar). Base do StreamingAFDetector e fonte
+    dos exemplos de treino do modelo de janela (train_window_model.py).
+
+    Args:
+        window_beats: Tamanho da janela em intervalos R-R
+        window_seconds: Tamanho da janela em segundos
+        hop_beats: Emitir uma janela a cada N batimentos
+        hop_seconds: Emitir uma janela a cada N segundos
+        min_beats: Intervalos mínimos para emitir antes de a janela encher
+                   (padrão: None = só emitir janelas completas)
+        sampling_freq: Frequência de amostragem do sinal de origem (Hz),
+                       informada na feature 'sampling_freq' da janela
+    """
+
+    def __init__(self, window_beats: Optional[int] = 60, window_seconds: Optional[float] = None,
+                 hop_beats: Optional[int] = None, hop_seconds: Optional[float] = None,
+                 min_beats: Optional[int] = None, sampling_freq: float = 128.0):
+        self.window = RollingRRStatistics(max_beats=window_beats, max_seconds=window_seconds)
+        self.hop_beats = hop_beats if (hop_beats or hop_seconds) else max(1, (window_beats or 60) // 2)
+        self.hop_seconds = hop_seconds
+        self.min_beats = min_beats
+        self.sampling_freq = sampling_freq
+
+        self._last_peak_time = None
+        self._beats_since_emit = 0
+        self._last_emit_time = None
+
+    def break_chain(self):
+        """
+        Esquece o último pico: o próximo não forma intervalo com ele (ex.:
+        lacuna no sinal). A janela de intervalos já acumulados é mantida.
+        """
+        self._last_peak_time = None
+
+    def _window_ready(self, peak_time: float) -> bool:
+        if not self.window.is_full and (self.min_beats is None or len(self.window) < self.min_beats):
+            return False
+        if self.hop_seconds is not None:
+            if self._last_emit_time is None:
+                return True
+            return peak_time - self._last_emit_time >= self.hop_seconds
+        return self._beats_since_emit >= self.hop_beats
+
+    def _push(self, peak_time: float) -> Optional[Dict]:
+        """
+        Avança o fluxo em um pico R; retorna as features da janela se for hora de emitir.
+        """
+        if self._last_peak_time is None:
+            self._last_peak_time = peak_time
+            return None
+
+        rr = peak_time - self._last_peak_time
+        self._last_peak_time = peak_time
+        if rr <= 0:
+            return None  # pico duplicado ou fora de ordem
+
+        self.window.push(rr)
+        self._beats_since_emit += 1
+
+        if not self._window_ready(peak_time):
+            return None
+
+        self._beats_since_emit = 0
+        self._last_emit_time = peak_time
+        return {
+            'start_time': peak_time - self.window.duration,
+            'end_time': peak_time,
+            'features': self.window.features(self.sampling_freq)
+        }
+
+    def windows(self, peak_times) -> List[Dict]:
+        """
+        Adiciona vários picos R e retorna as janelas emitidas
+        ({'start_time', 'end_time', 'features'}).
+        """
+        windows = []
+        for peak_time in np.asarray(peak_times, dtype=np.float64).tolist():
+            window = self._push(peak_time)
+            if window is not None:
+                windows.append(window)
+        return windows
+
+
+def check_window_model(model, feature_names: List[str] = WINDOW_FEATURE_NAMES):
+    """
+    Recusa modelos que não foram treinados em janelas.
+
+    Raises:
+        ValueError: Se feature_names incluir features dependentes do tamanho da
+                    janela ou se o modelo esperar outro número de features (ex:
+                    o modelo de registro inteiro, com 15)
+    """
+    dependent = [name for name in feature_names if name in WINDOW_DEPENDENT_FEATURES]
+    if dependent:
+        raise ValueError(f"Features dependentes do tamanho da janela: {', '.join(dependent)}")
+
+    n_features = getattr(model, 'n_features_in_', None)
+    model_names = list(getattr(model, 'feature_names', None) or [])
+    if (n_features is not None and n_features != len(feature_names)) or (model_names and model_names != list(feature_names)):
+        raise ValueError(
+            f"O modelo espera {n_features} features, não as {len(feature_names)} de janela; "
+            "modelos de registro inteiro (best_model.pkl) não classificam janelas. "
+            "Execute 'python src/train_window_model.py' para treinar o modelo de janela."
+        )
+
+
+def load_window_model(models_dir: Path = DEFAULT_MODELS_DIR):
+    """
+    Carrega o modelo de janela (window_model.pkl, gerado por train_window_model.py).
+
+    Returns:
+        (model, scaler, config): config traz as chaves do artefato além de
+        model/scaler (feature_names, window_beats, hop_beats, metrics...)
+
+    Raises:
+        FileNotFoundError: Se o artefato não existir
+        ValueError: Se o artefato não tiver o marcador 'window_calibrated'
+    """
+    import joblib
+
+    model_path = Path(models_dir) / WINDOW_MODEL_FILE
+    if not model_path.exists():
+        raise FileNotFoundError(
+            f"Modelo de janela não encontrado em {model_path}\n"
+            "Execute 'python src/train_window_model.py' primeiro para treinar o modelo."
+        )
+
+    artifact = joblib.load(model_path)
+    if not isinstance(artifact, dict) or not artifact.get('window_calibrated'):
+        raise ValueError(f"{model_path} não é um modelo calibrado em janelas (marcador 'window_calibrated' ausente)")
+
+    config = {key: value for key, value in artifact.items() if key not in ('model', 'scaler')}
+    check_window_model(artifact['model'], config['feature_names'])
+    return artifact['model'], artifact['scaler'], config
+
+
+def beat_peak_times(annotation, sampling_freq: float) -> np.ndarray:
+    """
+    Instantes (s) dos batimentos de uma anotação WFDB, sem as marcas que não
+    são batimentos (ruído '~', artefato '|', mudança de ritmo '+', ...).
+    """
+    is_beat = np.isin(annotation.symbol, list(BEAT_SYMBOLS))
+    return np.asarray(annotation.sample)[is_beat] / sampling_freq
+
+
+class StreamingAFDetector(RRWindowStream):
+    """
+    Consome instantes de picos R incrementalmente e emite uma probabilidade de
+    FA por janela.
+
+    Só aceita modelos treinados em janelas (load_window_model); o modelo de
+    registro inteiro é recusado (ver check_window_model).
+
+    Args:
+        model: Modelo de janela (predict_proba)
+        scaler: Scaler do treinamento do modelo de janela
+        window_beats: Tamanho da janela em intervalos R-R
+        window_seconds: Tamanho da janela em segundos
+        hop_beats: Emitir uma janela a cada N batimentos
+        hop_seconds: Emitir uma janela a cada N segundos
+        min_beats: Intervalos mínimos para emitir antes de a janela encher
+                   (padrão: None = só emitir janelas completas)
+        sampling_freq: Frequência de amostragem do sinal de origem (Hz)
+        threshold: Probabilidade de FA a partir da qual a janela é marcada como FA
+        feature_names: Features do modelo, na ordem das colunas
+
+    Raises:
+        ValueError: Se o modelo não for um modelo de janela
+    """
+
+    def __init__(self, model, scaler, window_beats: Optional[int] = 60,
+                 window_seconds: Optional[float] = None, hop_beats: Optional[int] = None,
+                 hop_seconds: Optional[float] = None, min_beats: Optional[int] = None,
+                 sampling_freq: float = 128.0, threshold: float = 0.5,
+                 feature_names: List[str] = WINDOW_FEATURE_NAMES):
+        check_window_model(model, feature_names)
+        super().__init__(window_beats, window_seconds, hop_beats, hop_seconds, min_beats, sampling_freq)
+        self.model = model
+        self.scaler = scaler
+        self.threshold = threshold
+        self.feature_names = list(feature_names)
+
+    def _score(self, windows: List[Dict]) -> List[Dict]:
+        """
+        Classifica várias janelas com uma única chamada ao modelo.
+        """
+        if not windows:
+            return []
+
+        matrix = np.array([[w['features'][name] for name in self.feature_names] for w in windows])
+        probabilities = self.model.predict_proba(self.scaler.transform(matrix))[:, 1]
+
+        return [{
+            'start_time': w['start_time'],
+            'end_time': w['end_time'],
+            'num_rr_intervals': w['features']['num_rr_intervals'],
+            'mean_hr_bpm': w['features']['mean_hr_bpm'],
+            'rr_cv': w['features']['rr_cv'],
+            'probability_fa': float(p),
+            'is_af': bool(p >= self.threshold)
+        } for w, p in zip(windows, probabilities)]
+
+    def push_peak(self, peak_time: float) -> Optional[Dict]:
+        """
+        Adiciona um pico R (instante em segundos). Retorna o resultado da
+        janela quando uma nova janela é emitida, senão None.
+        """
+        window = self._push(peak_time)
+        return self._score([window])[0] if window is not None else None
+
+    def push_peaks(self, peak_times) -> List[Dict]:
+        """
+        Adiciona vários picos R de uma vez (ex: um arquivo Holter inteiro). As
+        janelas emitidas são classificadas em lote.
+        """
+        return self._score(self.windows(peak_times))
+
+
+def merge_af_episodes(window_results: List[Dict], max_gap_seconds: float = 5.0) -> List[Dict]:
+    """
+    Junta janelas marcadas como FA em episódios, quando a distância entre o fim
+    de um episódio e o início da janela seguinte for no máximo max_gap_seconds.
+    """
+    episodes = []
+    for result in window_results:
+        if not result['is_af']:
+            continue
+        if episodes and result['start_time'] <= episodes[-1]['end_time'] + max_gap_seconds:
+            episode = episodes[-1]
+            episode['end_time'] = max(episode['end_time'], result['end_time'])
+            episode['max_probability_fa'] = max(episode['max_probability_fa'], result['probability_fa'])
+            episode['num_windows'] += 1
+        else:
+            episodes.append({
+                'start_time': result['start_time'],
+                'end_time': result['end_time'],
+                'max_probability_fa': result['probability_fa'],
+                'num_windows': 1
+            })
+    return episodes
+
+
+def main():
+    import wfdb
+    from predict import resolve_annotation_ext
+
+    parser = argparse.ArgumentParser(description='Detecção de FA em janelas deslizantes de um registro WFDB')
+    parser.add_argument('record_path', type=str, help='Caminho do registro (sem extensão)')
+    parser.add_argument('--annotation-ext', type=str, default='qrs', choices=['qrs', 'atr'],
+                        help='Extensão de anotação preferida (padrão: qrs)')
+    parser.add_argument('--window-beats', type=int, default=None,
+                        help='Tamanho da janela em batimentos (padrão: o do treino do modelo de janela)')
+    parser.add_argument('--window-seconds', type=float, default=None,
+                        help='Tamanho da janela em segundos (substitui --window-beats)')
+    parser.add_argument('--hop-beats', type=int, default=None,
+                        help='Emitir uma janela a cada N batimentos (padrão: metade da janela)')
+    parser.add_argument('--hop-seconds', type=float, default=None,
+                        help='Emitir uma janela a cada N segundos')
+    parser.add_argument('--models-dir', type=str, default=str(DEFAULT_MODELS_DIR),
+                        help=f'Pasta com {WINDOW_MODEL_FILE} (padrão: models/)')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='Probabilidade mínima para marcar FA (padrão: 0.5)')
+    parser.add_argument('--show-windows', action='store_true',
+                        help='Listar todas as janelas (não só os episódios)')
+    args = parser.parse_args()
+
+    record_path = args.record_path
+    if record_path.endswith('.dat') or record_path.endswith('.hea'):
+        record_path = record_path.rsplit('.', 1)[0]
+
+    try:
+        model, scaler, config = load_window_model(Path(args.models_dir))
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    fs = wfdb.rdheader(record_path).fs
+    annotation = wfdb.rdann(record_path, resolve_annotation_ext(record_path, args.annotation_ext))
+    peak_times = beat_peak_times(annotation, fs)
+
+    window_beats = None if args.window_seconds else (args.window_beats or config['window_beats'])
+    detector = StreamingAFDetector(
+        model, scaler,
+        window_beats=window_beats,
+        window_seconds=args.window_seconds,
+        hop_beats=args.hop_beats,
+        hop_seconds=args.hop_seconds,
+        sampling_freq=fs,
+        threshold=args.threshold,
+        feature_names=config['feature_names']
+    )
+    results = detector.push_peaks(peak_times)
+    episodes = merge_af_episodes(results)
+
+    print("=" * 80)
+    print(f"📡 DETECÇÃO EM JANELAS: {Path(record_path).name}")
+    print("=" * 80)
+    print(f"   Batimentos: {len(peak_times)} | Janelas avaliadas: {len(results)}")
+    print(f"   Janelas com FA: {sum(r['is_af'] for r in results)}")
+
+    if args.show_windows:
+        print(f"\n{'Início (s)':>12} {'Fim (s)':>12} {'FC (bpm)':>10} {'CV (%)':>8} {'P(FA)':>7}")
+        for r in results:
+            print(f"{r['start_time']:>12.1f} {r['end_time']:>12.1f} {r['mean_hr_bpm']:>10.1f} "
+                  f"{r['rr_cv']:>8.2f} {r['probability_fa']:>7.2f}{'  ⚠️' if r['is_af'] else ''}")
+
+    print(f"\n⚠️  EPISÓDIOS DE FA: {len(episodes)}")
+    for episode in episodes:
+        print(f"   • {episode['start_time']:.1f}s → {episode['end_time']:.1f}s "
+              f"({episode['end_time'] - episode['start_time']:.0f}s, "
+              f"P(FA) máx: {episode['max_probability_fa']:.2f})")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
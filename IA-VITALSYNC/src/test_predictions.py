@@ -6,11 +6,17 @@ Valida se o modelo está acertando comparando predições com labels reais.
 """
 
 import random
+import logging
 import pandas as pd
 from pathlib import Path
 import joblib
 import numpy as np
-from feature_extraction import extract_features_from_record
+import reporting
+from feature_extraction import extract_features_from_record, MODEL_FEATURE_NAMES
+from reporting import ProgressReporter, get_logger
+from rr_store import open_default_store
+
+log = get_logger('test_predictions')
 
 
 def load_dataset_info():
@@ -69,27 +75,20 @@ def get_annotation_ext(dataset):
     return 'qrs' if dataset == 'aftdb' else 'atr'
 
 
-def predict_record(record_path, annotation_ext, model, scaler):
+def predict_record(record_path, annotation_ext, model, scaler, rr_store=None):
     """
     Faz predição em um registro.
     """
-    # Extrair features
+    # Extrair features (do store colunar de picos R, se disponível)
     features_dict = extract_features_from_record(
         str(record_path), 
         label=None,
-        annotation_ext=annotation_ext
+        annotation_ext=annotation_ext,
+        rr_store=rr_store
     )
     
     # Preparar vetor de features (mesma ordem do treinamento)
-    feature_names = [
-        'num_beats', 'num_rr_intervals', 'sampling_freq',
-        'rr_mean', 'rr_std', 'rr_median', 'rr_min', 'rr_max',
-        'rr_cv', 'rr_rmssd', 'rr_range',
-        'rr_percentile_25', 'rr_percentile_75', 'rr_iqr',
-        'mean_hr_bpm'
-    ]
-    
-    features_vector = np.array([[features_dict[name] for name in feature_names]])
+    features_vector = np.array([[features_dict[name] for name in MODEL_FEATURE_NAMES]])
     
     # Normalizar
     features_normalized = scaler.transform(features_vector)
@@ -111,35 +110,40 @@ def run_tests(n_samples=10, verbose=True):
     """
     Executa testes com amostras aleatórias.
     """
-    print("=" * 80)
-    print("🧪 TESTE DO PIPELINE DE PREDIÇÃO")
-    print("=" * 80)
-    print(f"\n📊 Testando com {n_samples} amostras aleatórias do dataset...")
+    log.info("🧪 TESTE DO PIPELINE DE PREDIÇÃO")
+    log.info(f"📊 Testando com {n_samples} amostras aleatórias do dataset...")
     
     # Carregar dataset
     df = load_dataset_info()
-    print(f"✅ Dataset carregado: {len(df)} registros totais")
-    print(f"   - {(df['label']==0).sum()} Normais | {(df['label']==1).sum()} FA")
+    log.info(f"✅ Dataset carregado: {len(df)} registros totais")
+    log.info(f"   - {(df['label']==0).sum()} Normais | {(df['label']==1).sum()} FA")
     
     # Selecionar amostras
     samples = get_random_samples(df, n_samples=n_samples)
-    print(f"\n✅ Selecionadas {len(samples)} amostras aleatórias:")
-    print(f"   - {(samples['label']==0).sum()} Normais | {(samples['label']==1).sum()} FA")
+    log.info(f"✅ Selecionadas {len(samples)} amostras aleatórias:")
+    log.info(f"   - {(samples['label']==0).sum()} Normais | {(samples['label']==1).sum()} FA")
     
     # Carregar modelo e scaler
     models_dir = Path(__file__).parent.parent / 'models'
     model = joblib.load(models_dir / 'best_model.pkl')
     scaler = joblib.load(models_dir / 'scaler.pkl')
-    print(f"\n✅ Modelo e scaler carregados")
+    log.info("✅ Modelo e scaler carregados")
+    
+    rr_store = open_default_store()
+    if rr_store is not None:
+        log.info(f"✅ Store R-R: {len(rr_store)} registros")
     
     # Testar cada amostra
-    print(f"\n{'=' * 80}")
-    print(f"🔍 TESTANDO PREDIÇÕES...")
-    print(f"{'=' * 80}\n")
+    log.info("🔍 TESTANDO PREDIÇÕES...")
     
     results = []
     correct = 0
     
+    # Uma linha por registro só com --verbose (ou --log-level DEBUG); erros de
+    # predição sempre aparecem como aviso
+    record_level = logging.INFO if verbose else logging.DEBUG
+    progress = ProgressReporter(len(samples), 'Testando predições', log)
+    
     for idx, row in samples.iterrows():
         record_name = row['record_name']
         true_label = row['label']
@@ -152,7 +156,7 @@ def run_tests(n_samples=10, verbose=True):
         
         # Fazer predição
         try:
-            pred_result = predict_record(record_path, annotation_ext, model, scaler)
+            pred_result = predict_record(record_path, annotation_ext, model, scaler, rr_store)
             pred_label = pred_result['prediction']
             pred_class = 'FA' if pred_label == 1 else 'Normal'
             confidence = pred_result['confidence']
@@ -176,15 +180,18 @@ def run_tests(n_samples=10, verbose=True):
             
             # Exibir resultado
             status = "✅" if is_correct else "❌"
-            print(f"{status} {record_name:20} | Real: {true_class:6} | Predito: {pred_class:6} | "
-                  f"Confiança: {confidence:5.1f}% | CV: {rr_cv:6.2f}%")
+            log.log(record_level if is_correct else logging.WARNING,
+                    f"{status} {record_name:20} | Real: {true_class:6} | Predito: {pred_class:6} | "
+                    f"Confiança: {confidence:5.1f}% | CV: {rr_cv:6.2f}%",
+                    extra={'record': record_name, 'true_label': true_class, 'predicted': pred_class,
+                           'correct': bool(is_correct), 'confidence': float(confidence)})
             
             if verbose and not is_correct:
-                print(f"   ⚠️  ERRO! Esperava {true_class}, mas previu {pred_class}")
-                print(f"   Probabilidades: Normal={pred_result['proba_normal']:.1f}% | FA={pred_result['proba_fa']:.1f}%")
+                log.warning(f"   ⚠️  ERRO! Esperava {true_class}, mas previu {pred_class}")
+                log.warning(f"   Probabilidades: Normal={pred_result['proba_normal']:.1f}% | FA={pred_result['proba_fa']:.1f}%")
         
         except Exception as e:
-            print(f"❌ {record_name:20} | ERRO: {str(e)}")
+            log.error(f"❌ {record_name:20} | ERRO: {str(e)}", extra={'record': record_name})
             results.append({
                 'record': record_name,
                 'dataset': dataset,
@@ -194,77 +201,76 @@ def run_tests(n_samples=10, verbose=True):
                 'confidence': 0,
                 'rr_cv': 0
             })
+        
+        progress.update(correct=correct)
+    
+    progress.close()
     
     # Calcular estatísticas
-    print(f"\n{'=' * 80}")
-    print(f"📊 RESULTADOS FINAIS")
-    print(f"{'=' * 80}")
+    log.info("📊 RESULTADOS FINAIS")
     
     accuracy = (correct / len(samples)) * 100
     
-    print(f"\n🎯 ACURÁCIA GERAL:")
-    print(f"   Acertos: {correct}/{len(samples)}")
-    print(f"   Acurácia: {accuracy:.1f}%")
+    log.info("🎯 ACURÁCIA GERAL:")
+    log.info(f"   Acertos: {correct}/{len(samples)}")
+    log.info(f"   Acurácia: {accuracy:.1f}%",
+             extra={'correct': correct, 'samples': len(samples), 'accuracy': accuracy})
     
     # Analisar por classe
     results_df = pd.DataFrame(results)
     results_df = results_df[results_df['predicted'] != 'ERROR']
     
     if len(results_df) > 0:
-        print(f"\n📈 ACURÁCIA POR CLASSE:")
+        log.info("📈 ACURÁCIA POR CLASSE:")
         
         # Normal
         normal_results = results_df[results_df['true_label'] == 'Normal']
         if len(normal_results) > 0:
             normal_acc = (normal_results['correct'].sum() / len(normal_results)) * 100
-            print(f"   Normal: {normal_results['correct'].sum()}/{len(normal_results)} "
+            log.info(f"   Normal: {normal_results['correct'].sum()}/{len(normal_results)} "
                   f"({normal_acc:.1f}%)")
         
         # FA
         fa_results = results_df[results_df['true_label'] == 'FA']
         if len(fa_results) > 0:
             fa_acc = (fa_results['correct'].sum() / len(fa_results)) * 100
-            print(f"   FA: {fa_results['correct'].sum()}/{len(fa_results)} "
+            log.info(f"   FA: {fa_results['correct'].sum()}/{len(fa_results)} "
                   f"({fa_acc:.1f}%)")
         
         # Confiança média
-        print(f"\n💪 CONFIANÇA MÉDIA:")
+        log.info("💪 CONFIANÇA MÉDIA:")
         correct_preds = results_df[results_df['correct'] == True]
         incorrect_preds = results_df[results_df['correct'] == False]
         
         if len(correct_preds) > 0:
-            print(f"   Predições corretas: {correct_preds['confidence'].mean():.1f}%")
+            log.info(f"   Predições corretas: {correct_preds['confidence'].mean():.1f}%")
         if len(incorrect_preds) > 0:
-            print(f"   Predições incorretas: {incorrect_preds['confidence'].mean():.1f}%")
+            log.info(f"   Predições incorretas: {incorrect_preds['confidence'].mean():.1f}%")
         
         # Análise de erros
         if len(incorrect_preds) > 0:
-            print(f"\n⚠️  ANÁLISE DE ERROS:")
-            print(f"   Total de erros: {len(incorrect_preds)}")
+            log.warning("⚠️  ANÁLISE DE ERROS:")
+            log.warning(f"   Total de erros: {len(incorrect_preds)}")
             
             for _, error in incorrect_preds.iterrows():
-                print(f"   • {error['record']}: Real={error['true_label']}, "
+                log.warning(f"   • {error['record']}: Real={error['true_label']}, "
                       f"Previu={error['predicted']}, CV={error['rr_cv']:.2f}%")
     
     # Conclusão
-    print(f"\n{'=' * 80}")
-    print(f"🎓 CONCLUSÃO:")
-    print(f"{'=' * 80}")
+    log.info("🎓 CONCLUSÃO:")
     
     if accuracy == 100:
-        print(f"   ✅ PERFEITO! O modelo acertou 100% das predições!")
-        print(f"   ✅ Tanto FA quanto Normal foram detectados corretamente!")
+        log.info("   ✅ PERFEITO! O modelo acertou 100% das predições!")
+        log.info("   ✅ Tanto FA quanto Normal foram detectados corretamente!")
     elif accuracy >= 90:
-        print(f"   ✅ EXCELENTE! Acurácia de {accuracy:.1f}%")
-        print(f"   ⚠️  Alguns erros encontrados - revisar casos limítrofes")
+        log.info(f"   ✅ EXCELENTE! Acurácia de {accuracy:.1f}%")
+        log.warning("   ⚠️  Alguns erros encontrados - revisar casos limítrofes")
     elif accuracy >= 80:
-        print(f"   ⚠️  BOM, mas pode melhorar. Acurácia de {accuracy:.1f}%")
-        print(f"   ⚠️  Considere analisar os erros e ajustar o modelo")
+        log.warning(f"   ⚠️  BOM, mas pode melhorar. Acurácia de {accuracy:.1f}%")
+        log.warning("   ⚠️  Considere analisar os erros e ajustar o modelo")
     else:
-        print(f"   ❌ ATENÇÃO! Acurácia baixa ({accuracy:.1f}%)")
-        print(f"   ❌ Revisar pipeline e modelo")
-    
-    print(f"\n{'=' * 80}")
+        log.error(f"   ❌ ATENÇÃO! Acurácia baixa ({accuracy:.1f}%)")
+        log.error("   ❌ Revisar pipeline e modelo")
     
     return results_df
 
@@ -279,8 +285,10 @@ if __name__ == "__main__":
                        help='Mostrar detalhes dos erros')
     parser.add_argument('--seed', type=int, default=42,
                        help='Seed para reprodutibilidade (padrão: 42)')
+    reporting.add_arguments(parser)
     
     args = parser.parse_args()
+    reporting.configure_from_args(args)
     
     # Configurar seed global
     random.seed(args.seed)
@@ -5,16 +5,24 @@ Script para treinar e avaliar modelos de classificação de ECG.
 Implementa técnicas para lidar com desbalanceamento de classes.
 """
 
+import os
+import math
+import time
+import hashlib
+import argparse
+from itertools import zip_longest
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Dict, List, Optional
 import joblib
 import warnings
 warnings.filterwarnings('ignore')
 
-from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
+from sklearn.model_selection import (
+    train_test_split, ParameterGrid, StratifiedKFold, StratifiedGroupKFold
+)
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.svm import SVC
@@ -25,19 +33,48 @@ from sklearn.metrics import (
     roc_curve, auc
 )
 
+from compiled_model import COMPILED_MODEL_FILE, export_compiled_model
+import instrumentation
+import reporting
+from instrumentation import count, record_time, timed, timer
+from reporting import ProgressReporter, get_logger
+
+log = get_logger('train_model')
+
+
+# Colunas que identificam o registro de origem de cada linha. Linhas do mesmo
+# registro (ex.: janelas/segmentos) ficam sempre do mesmo lado da divisão.
+GROUP_COLUMNS = ['dataset', 'subset', 'record_name']
+
+# Pasta onde as divisões em folds (índices + estatísticas do scaler) ficam salvas
+FOLDS_CACHE_DIR = Path(__file__).parent.parent / 'data' / 'cache' / 'folds'
+
+
+def make_groups(df: pd.DataFrame, group_cols: List[str] = GROUP_COLUMNS) -> Optional[np.ndarray]:
+    """
+    Gera o identificador de grupo (registro de origem) de cada linha.
+    
+    Returns:
+        Array de strings 'dataset/subset/record_name', ou None se o CSV não
+        tiver nenhuma das colunas de grupo
+    """
+    cols = [col for col in group_cols if col in df.columns]
+    if not cols:
+        return None
+    return df[cols].astype(str).agg('/'.join, axis=1).to_numpy()
+
 
 def load_and_prepare_data(features_path: Path):
     """
     Carrega e prepara os dados para treinamento.
     """
-    print("=" * 80)
-    print("📂 CARREGANDO DADOS")
-    print("=" * 80)
+    log.info("📂 CARREGANDO DADOS")
     
-    df = pd.read_csv(features_path)
-    print(f"\n✅ Dataset carregado: {len(df)} registros")
-    print(f"   - Classe 0 (Normal): {(df['label']==0).sum()} registros")
-    print(f"   - Classe 1 (FA): {(df['label']==1).sum()} registros")
+    with timer('train_model.read_features'):
+        df = pd.read_csv(features_path)
+    log.info(f"✅ Dataset carregado: {len(df)} registros")
+    log.info(f"   - Classe 0 (Normal): {(df['label']==0).sum()} registros")
+    log.info(f"   - Classe 1 (FA): {(df['label']==1).sum()} registros")
     
     # Separar features e labels
     # Remover colunas não-features
@@ -47,43 +84,61 @@ def load_and_prepare_data(features_path: Path):
     X = df[feature_cols].values
     y = df['label'].values
     
-    print(f"\n📊 Features selecionadas: {len(feature_cols)}")
-    print(f"   {', '.join(feature_cols[:5])}...")
+    log.info(f"📊 Features selecionadas: {len(feature_cols)}")
+    log.info(f"   {', '.join(feature_cols[:5])}...")
     
     return X, y, feature_cols, df
 
 
-def split_and_scale_data(X, y, test_size=0.2, random_state=42):
+def split_and_scale_data(X, y, test_size=0.2, random_state=42, groups=None):
     """
     Divide os dados em treino/teste e normaliza.
-    """
-    print("\n" + "=" * 80)
-    print("✂️  DIVIDINDO E NORMALIZANDO DADOS")
-    print("=" * 80)
-    
-    # Divisão estratificada (mantém proporção de classes)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state, stratify=y
-    )
-    
-    print(f"\n📦 Conjunto de TREINO:")
-    print(f"   - Total: {len(y_train)} registros")
-    print(f"   - Classe 0 (Normal): {(y_train==0).sum()} ({(y_train==0).sum()/len(y_train)*100:.1f}%)")
-    print(f"   - Classe 1 (FA): {(y_train==1).sum()} ({(y_train==1).sum()/len(y_train)*100:.1f}%)")
     
-    print(f"\n📦 Conjunto de TESTE:")
-    print(f"   - Total: {len(y_test)} registros")
-    print(f"   - Classe 0 (Normal): {(y_test==0).sum()} ({(y_test==0).sum()/len(y_test)*100:.1f}%)")
-    print(f"   - Classe 1 (FA): {(y_test==1).sum()} ({(y_test==1).sum()/len(y_test)*100:.1f}%)")
+    Args:
+        groups: Registro de origem de cada linha (ver make_groups). Se informado,
+                a divisão é estratificada POR REGISTRO: nenhum registro aparece
+                em treino e teste ao mesmo tempo. None = divisão por linha.
+    """
+    log.info("✂️  DIVIDINDO E NORMALIZANDO DADOS")
+    
+    with timer('train_model.split'):
+        if groups is None:
+            # Divisão estratificada (mantém proporção de classes)
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=test_size, random_state=random_state, stratify=y
+            )
+        else:
+            # Divisão estratificada por grupo: o primeiro fold de um StratifiedGroupKFold
+            # com 1/test_size folds vira o conjunto de teste
+            sgkf = StratifiedGroupKFold(n_splits=int(round(1 / test_size)), shuffle=True,
+                                        random_state=random_state)
+            train_idx, test_idx = next(sgkf.split(X, y, groups))
+            X_train, X_test, y_train, y_test = X[train_idx], X[test_idx], y[train_idx], y[test_idx]
+    
+    if groups is not None:
+        shared = set(groups[train_idx]) & set(groups[test_idx])
+        log.info(f"🔒 Divisão por registro: {len(set(groups[train_idx]))} registros no treino, "
+              f"{len(set(groups[test_idx]))} no teste, {len(shared)} em comum")
+    
+    log.info("📦 Conjunto de TREINO:")
+    log.info(f"   - Total: {len(y_train)} registros")
+    log.info(f"   - Classe 0 (Normal): {(y_train==0).sum()} ({(y_train==0).sum()/len(y_train)*100:.1f}%)")
+    log.info(f"   - Classe 1 (FA): {(y_train==1).sum()} ({(y_train==1).sum()/len(y_train)*100:.1f}%)")
+    
+    log.info("📦 Conjunto de TESTE:")
+    log.info(f"   - Total: {len(y_test)} registros")
+    log.info(f"   - Classe 0 (Normal): {(y_test==0).sum()} ({(y_test==0).sum()/len(y_test)*100:.1f}%)")
+    log.info(f"   - Classe 1 (FA): {(y_test==1).sum()} ({(y_test==1).sum()/len(y_test)*100:.1f}%)")
     
     # Normalização (importante para SVM e Logistic Regression)
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
+    with timer('train_model.scale'):
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
     
-    print(f"\n🔄 Dados normalizados (StandardScaler)")
-    print(f"   - Média antes: {X_train.mean():.2f} → Depois: {X_train_scaled.mean():.2f}")
-    print(f"   - Std antes: {X_train.std():.2f} → Depois: {X_train_scaled.std():.2f}")
+    log.info("🔄 Dados normalizados (StandardScaler)")
+    log.info(f"   - Média antes: {X_train.mean():.2f} → Depois: {X_train_scaled.mean():.2f}")
+    log.info(f"   - Std antes: {X_train.std():.2f} → Depois: {X_train_scaled.std():.2f}")
     
     return X_train_scaled, X_test_scaled, y_train, y_test, scaler
 
@@ -92,9 +147,7 @@ def train_models(X_train, y_train):
     """
     Treina múltiplos modelos com class_weight='balanced'.
     """
-    print("\n" + "=" * 80)
-    print("🤖 TREINANDO MODELOS (com class_weight='balanced')")
-    print("=" * 80)
+    log.info("🤖 TREINANDO MODELOS (com class_weight='balanced')")
     
     models = {
         'Random Forest': RandomForestClassifier(
@@ -120,10 +173,11 @@ def train_models(X_train, y_train):
     trained_models = {}
     
     for name, model in models.items():
-        print(f"\n🔧 Treinando {name}...")
-        model.fit(X_train, y_train)
+        log.info(f"🔧 Treinando {name}...")
+        with timer(f'train_model.fit[{name}]'):
+            model.fit(X_train, y_train)
         trained_models[name] = model
-        print(f"   ✅ {name} treinado!")
+        log.info(f"   ✅ {name} treinado!")
     
     return trained_models
 
@@ -160,51 +214,49 @@ def evaluate_models(models, X_test, y_test):
     """
     Avalia todos os modelos e retorna métricas.
     """
-    print("\n" + "=" * 80)
-    print("📊 AVALIAÇÃO DOS MODELOS")
-    print("=" * 80)
+    log.info("📊 AVALIAÇÃO DOS MODELOS")
     
     results = {}
     
     for name, model in models.items():
-        print(f"\n{'=' * 80}")
-        print(f"🔍 Avaliando: {name}")
-        print(f"{'=' * 80}")
+        log.info(f"🔍 Avaliando: {name}")
         
         # Predições
-        y_pred = model.predict(X_test)
-        y_pred_proba = model.predict_proba(X_test)[:, 1]
+        with timer(f'train_model.inference[{name}]'):
+            y_pred = model.predict(X_test)
+            y_pred_proba = model.predict_proba(X_test)[:, 1]
+        count('train_model.predictions', len(X_test))
         
         # Calcular métricas
         metrics = calculate_metrics(y_test, y_pred, y_pred_proba)
         results[name] = metrics
         
         # Exibir resultados
-        print(f"\n📈 MÉTRICAS:")
-        print(f"   Acurácia:        {metrics['accuracy']:.3f} ({metrics['accuracy']*100:.1f}%)")
-        print(f"   Sensibilidade:   {metrics['sensitivity']:.3f} ({metrics['sensitivity']*100:.1f}%) - Detectar FA")
-        print(f"   Especificidade:  {metrics['specificity']:.3f} ({metrics['specificity']*100:.1f}%) - Detectar Normal")
-        print(f"   Precisão:        {metrics['precision']:.3f} ({metrics['precision']*100:.1f}%)")
-        print(f"   F1-Score:        {metrics['f1_score']:.3f}")
-        print(f"   ROC-AUC:         {metrics['roc_auc']:.3f}")
+        log.info("📈 MÉTRICAS:")
+        log.info(f"   Acurácia:        {metrics['accuracy']:.3f} ({metrics['accuracy']*100:.1f}%)")
+        log.info(f"   Sensibilidade:   {metrics['sensitivity']:.3f} ({metrics['sensitivity']*100:.1f}%) - Detectar FA")
+        log.info(f"   Especificidade:  {metrics['specificity']:.3f} ({metrics['specificity']*100:.1f}%) - Detectar Normal")
+        log.info(f"   Precisão:        {metrics['precision']:.3f} ({metrics['precision']*100:.1f}%)")
+        log.info(f"   F1-Score:        {metrics['f1_score']:.3f}")
+        log.info(f"   ROC-AUC:         {metrics['roc_auc']:.3f}")
         
         # Matriz de confusão
         cm = metrics['confusion_matrix']
-        print(f"\n🔢 MATRIZ DE CONFUSÃO:")
-        print(f"                Predito: Normal  |  Predito: FA")
-        print(f"   Real: Normal    {cm['tn']:>4} (TN)      |  {cm['fp']:>4} (FP)")
-        print(f"   Real: FA        {cm['fn']:>4} (FN)      |  {cm['tp']:>4} (TP)")
+        log.info("🔢 MATRIZ DE CONFUSÃO:")
+        log.info("                Predito: Normal  |  Predito: FA")
+        log.info(f"   Real: Normal    {cm['tn']:>4} (TN)      |  {cm['fp']:>4} (FP)")
+        log.info(f"   Real: FA        {cm['fn']:>4} (FN)      |  {cm['tp']:>4} (TP)")
         
         # Interpretação
-        print(f"\n💡 INTERPRETAÇÃO:")
+        log.info("💡 INTERPRETAÇÃO:")
         if metrics['sensitivity'] > 0.85 and metrics['specificity'] > 0.70:
-            print(f"   ✅ EXCELENTE! Bom equilíbrio entre detectar FA e Normal")
+            log.info("   ✅ EXCELENTE! Bom equilíbrio entre detectar FA e Normal")
         elif metrics['sensitivity'] > 0.90 and metrics['specificity'] < 0.60:
-            print(f"   ⚠️  VIÉS para FA: Ótimo em detectar FA, mas perde muitos Normais")
+            log.warning("   ⚠️  VIÉS para FA: Ótimo em detectar FA, mas perde muitos Normais")
         elif metrics['sensitivity'] < 0.75:
-            print(f"   ⚠️  SENSIBILIDADE BAIXA: Não detecta bem os casos de FA")
+            log.warning("   ⚠️  SENSIBILIDADE BAIXA: Não detecta bem os casos de FA")
         else:
-            print(f"   ✅ BOM: Desempenho razoável, mas pode melhorar")
+            log.info("   ✅ BOM: Desempenho razoável, mas pode melhorar")
     
     return results
 
@@ -213,9 +265,12 @@ def plot_comparison(results, output_dir):
     """
     Cria gráficos comparando os modelos.
     """
-    print("\n" + "=" * 80)
-    print("📊 GERANDO VISUALIZAÇÕES COMPARATIVAS")
-    print("=" * 80)
+    # matplotlib + seaborn levam ~1,5 s para importar e só são usados aqui
+    # (o modo --cv e o `--help` não geram gráficos)
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    log.info("📊 GERANDO VISUALIZAÇÕES COMPARATIVAS")
     
     # Preparar dados para plotagem
     models_names = list(results.keys())
@@ -296,43 +351,61 @@ def plot_comparison(results, output_dir):
     # Salvar
     output_file = output_dir / 'model_comparison.png'
     plt.savefig(output_file, dpi=150, bbox_inches='tight')
-    print(f"\n💾 Visualização salva em: {output_file}")
+    log.info(f"💾 Visualização salva em: {output_file}")
     
     plt.show()
 
 
-def save_best_model(models, results, output_dir):
+def export_inference_model(model, scaler, output_dir: Path, feature_cols: List[str]):
+    """
+    Exporta o modelo (com o scaler embutido) para o formato compilado usado por
+    predict.load_models. Modelos sem suporte (ex: SVM) mantêm só o .pkl.
+    """
+    compiled_file = output_dir / COMPILED_MODEL_FILE
+    try:
+        export_compiled_model(model, scaler, compiled_file, feature_cols,
+                              [output_dir / 'best_model.pkl', output_dir / 'scaler.pkl'])
+    except ValueError as e:
+        compiled_file.unlink(missing_ok=True)
+        log.warning(f"⚠️  Modelo compilado não gerado: {e}")
+        return
+    log.info(f"✅ Modelo compilado (scaler embutido) salvo em: {compiled_file}")
+
+
+def save_best_model(models, results, output_dir, scaler=None, feature_cols: Optional[List[str]] = None):
     """
     Salva o melhor modelo baseado em ROC-AUC.
+    
+    Com o scaler do treinamento, exporta também o modelo compilado (best_model.npz).
     """
-    print("\n" + "=" * 80)
-    print("💾 SALVANDO MELHOR MODELO")
-    print("=" * 80)
+    log.info("💾 SALVANDO MELHOR MODELO")
     
     # Encontrar melhor modelo por ROC-AUC
     best_model_name = max(results.keys(), key=lambda k: results[k]['roc_auc'])
     best_model = models[best_model_name]
     best_roc_auc = results[best_model_name]['roc_auc']
     
-    print(f"\n🏆 Melhor modelo: {best_model_name}")
-    print(f"   ROC-AUC: {best_roc_auc:.3f}")
+    log.info(f"🏆 Melhor modelo: {best_model_name}")
+    log.info(f"   ROC-AUC: {best_roc_auc:.3f}")
     
     # Salvar modelo
     model_file = output_dir / 'best_model.pkl'
     joblib.dump(best_model, model_file)
-    print(f"\n✅ Modelo salvo em: {model_file}")
+    log.info(f"✅ Modelo salvo em: {model_file}")
+    if scaler is not None:
+        export_inference_model(best_model, scaler, output_dir, feature_cols or [])
     
     # Salvar informações do modelo
     info_file = output_dir / 'model_info.txt'
     with open(info_file, 'w') as f:
         f.write(f"Melhor Modelo: {best_model_name}\n")
         f.write(f"ROC-AUC: {best_roc_auc:.3f}\n")
-        f.write(f"\nMétricas completas:\n")
+        f.write("\nMétricas completas:\n")
         for metric, value in results[best_model_name].items():
             if metric != 'confusion_matrix':
                 f.write(f"  {metric}: {value:.3f}\n")
     
-    print(f"✅ Informações salvas em: {info_file}")
+    log.info(f"✅ Informações salvas em: {info_file}")
     
     return best_model_name, best_model
 
@@ -341,26 +414,22 @@ def print_summary(results):
     """
     Imprime resumo final.
     """
-    print("\n" + "=" * 80)
-    print("📋 RESUMO FINAL")
-    print("=" * 80)
+    log.info("📋 RESUMO FINAL")
     
-    print("\n🎯 RANKING DOS MODELOS (por ROC-AUC):")
+    log.info("🎯 RANKING DOS MODELOS (por ROC-AUC):")
     sorted_models = sorted(results.items(), 
                           key=lambda x: x[1]['roc_auc'], 
                           reverse=True)
     
     for i, (name, metrics) in enumerate(sorted_models, 1):
-        print(f"\n   {i}º {name}")
-        print(f"      ROC-AUC: {metrics['roc_auc']:.3f}")
-        print(f"      Sensibilidade: {metrics['sensitivity']:.3f} | Especificidade: {metrics['specificity']:.3f}")
-        print(f"      F1-Score: {metrics['f1_score']:.3f}")
+        log.info(f"   {i}º {name}")
+        log.info(f"      ROC-AUC: {metrics['roc_auc']:.3f}")
+        log.info(f"      Sensibilidade: {metrics['sensitivity']:.3f} | Especificidade: {metrics['specificity']:.3f}")
+        log.info(f"      F1-Score: {metrics['f1_score']:.3f}")
     
-    print("\n" + "=" * 80)
-    print("✅ TREINAMENTO CONCLUÍDO COM SUCESSO!")
-    print("=" * 80)
+    log.info("✅ TREINAMENTO CONCLUÍDO COM SUCESSO!")
     
-    print("""
+    log.info("""
 💡 PRÓXIMOS PASSOS:
 
 1. ✅ Modelos treinados com class_weight='balanced'
@@ -376,7 +445,444 @@ def print_summary(results):
 """)
 
 
+# =============================================================================
+# MODO --cv: VALIDAÇÃO CRUZADA + BUSCA DE HIPERPARÂMETROS
+# =============================================================================
+
+# Espaço de busca por modelo (cada combinação vira uma configuração candidata)
+SEARCH_SPACES = {
+    'Random Forest': {
+        'n_estimators': [100, 300],
+        'max_depth': [5, 10, None],
+        'min_samples_leaf': [1, 3],
+        'max_features': ['sqrt', 0.5]
+    },
+    'SVM (RBF)': {
+        'C': [0.1, 1, 10, 100],
+        'gamma': ['scale', 0.01, 0.1]
+    },
+    'Logistic Regression': {
+        'C': [0.01, 0.1, 1, 10, 100]
+    }
+}
+
+# Dados compartilhados com os workers (definidos uma vez por processo no initializer)
+_CV_DATA = {}
+
+
+def build_model(name: str, params: Dict, for_search: bool = False):
+    """
+    Cria um modelo com class_weight='balanced' e os hiperparâmetros dados.
+    
+    Args:
+        name: Nome do modelo (chave de SEARCH_SPACES)
+        params: Hiperparâmetros da configuração
+        for_search: Se True, cria a versão usada dentro da validação cruzada
+                    (RF com 1 thread, pois o paralelismo já é entre processos;
+                    SVM sem probability=True, pois o ROC-AUC usa decision_function)
+    """
+    if name == 'Random Forest':
+        return RandomForestClassifier(class_weight='balanced', random_state=42,
+                                      n_jobs=1 if for_search else -1, **params)
+    if name == 'SVM (RBF)':
+        return SVC(kernel='rbf', class_weight='balanced', probability=not for_search,
+                   random_state=42, **params)
+    if name == 'Logistic Regression':
+        return LogisticRegression(class_weight='balanced', max_iter=1000, random_state=42, **params)
+    raise ValueError(f"Modelo desconhecido: {name}")
+
+
+class FoldLayout:
+    """
+    Divisão em k folds + estatísticas do StandardScaler de cada fold.
+    
+    Calculada uma vez e salva em .npz (ver get_fold_layout), para que
+    experimentos repetidos usem exatamente os mesmos folds sem redividir os
+    dados nem reajustar os scalers.
+    
+    Args:
+        test_fold: Fold de validação de cada linha, shape (n_linhas,)
+        scaler_mean: Média das features no treino de cada fold, shape (k, n_features)
+        scaler_scale: Desvio padrão das features no treino de cada fold, shape (k, n_features)
+    """
+    
+    def __init__(self, test_fold: np.ndarray, scaler_mean: np.ndarray, scaler_scale: np.ndarray):
+        self.test_fold = test_fold
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+    
+    @property
+    def n_splits(self) -> int:
+        return len(self.scaler_mean)
+    
+    def folds(self) -> List:
+        """
+        Lista de (índices de treino, índices de validação) de cada fold.
+        """
+        return [(np.flatnonzero(self.test_fold != k), np.flatnonzero(self.test_fold == k))
+                for k in range(self.n_splits)]
+    
+    def transform(self, X, fold: int) -> np.ndarray:
+        """
+        Normaliza X com o scaler do treino do fold (equivalente a StandardScaler.transform).
+        """
+        return (X - self.scaler_mean[fold]) / self.scaler_scale[fold]
+    
+    @classmethod
+    def build(cls, X, y, groups=None, n_splits: int = 5, random_state: int = 42) -> 'FoldLayout':
+        """
+        Divide os dados em folds estratificados (por grupo, se informado) e
+        ajusta o scaler de cada fold.
+        """
+        if groups is None:
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        else:
+            splitter = StratifiedGroupKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        
+        test_fold = np.empty(len(y), dtype=np.int64)
+        scaler_mean = np.empty((n_splits, X.shape[1]))
+        scaler_scale = np.empty((n_splits, X.shape[1]))
+        for k, (train_idx, val_idx) in enumerate(splitter.split(X, y, groups)):
+            test_fold[val_idx] = k
+            scaler = StandardScaler().fit(X[train_idx])
+            scaler_mean[k] = scaler.mean_
+            scaler_scale[k] = scaler.scale_
+        
+        return cls(test_fold, scaler_mean, scaler_scale)
+    
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, test_fold=self.test_fold, scaler_mean=self.scaler_mean,
+                 scaler_scale=self.scaler_scale)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> 'FoldLayout':
+        with np.load(path) as data:
+            return cls(data['test_fold'], data['scaler_mean'], data['scaler_scale'])
+
+
+def fold_layout_key(X, y, groups=None, n_splits: int = 5, random_state: int = 42) -> str:
+    """
+    Chave da divisão em folds: SHA-256 dos dados, dos grupos e dos parâmetros.
+    Qualquer mudança no features.csv gera uma divisão nova.
+    """
+    key = hashlib.sha256(f"n_splits={n_splits}|random_state={random_state}".encode())
+    key.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    key.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+    if groups is not None:
+        key.update('\0'.join(map(str, groups)).encode())
+    return key.hexdigest()
+
+
+def get_fold_layout(X, y, groups=None, n_splits: int = 5, random_state: int = 42,
+                    cache_dir: Optional[Path] = FOLDS_CACHE_DIR) -> FoldLayout:
+    """
+    Retorna a divisão em folds, reutilizando a salva em cache_dir quando os
+    dados e os parâmetros forem os mesmos.
+    
+    Args:
+        cache_dir: Pasta do cache (None = sempre recalcular, sem salvar)
+    """
+    if cache_dir is None:
+        return FoldLayout.build(X, y, groups, n_splits, random_state)
+    
+    path = Path(cache_dir) / f"{fold_layout_key(X, y, groups, n_splits, random_state)}.npz"
+    if path.exists():
+        try:
+            layout = FoldLayout.load(path)
+            log.info(f"♻️  Folds reutilizados do cache: {path.name[:12]}...")
+            return layout
+        except (OSError, ValueError, KeyError):
+            pass  # Arquivo corrompido: recalcular
+    
+    layout = FoldLayout.build(X, y, groups, n_splits, random_state)
+    layout.save(path)
+    log.info(f"💾 Folds salvos em cache: {path.name[:12]}...")
+    return layout
+
+
+def _init_cv_worker(X, y, layout):
+    _CV_DATA.update(X=X, y=y, layout=layout, folds=layout.folds())
+
+
+def _fit_fold(task):
+    """
+    Treina uma configuração em um fold e retorna o ROC-AUC de validação.
+    
+    A normalização usa o scaler do treino do fold, pré-calculado no FoldLayout.
+    """
+    config_id, name, params, fold = task
+    X, y, layout = _CV_DATA['X'], _CV_DATA['y'], _CV_DATA['layout']
+    train_idx, val_idx = _CV_DATA['folds'][fold]
+    
+    start = time.perf_counter()
+    model = build_model(name, params, for_search=True)
+    model.fit(layout.transform(X[train_idx], fold), y[train_idx])
+    
+    X_val = layout.transform(X[val_idx], fold)
+    if hasattr(model, 'decision_function'):
+        scores = model.decision_function(X_val)
+    else:
+        scores = model.predict_proba(X_val)[:, 1]
+    
+    return config_id, fold, roc_auc_score(y[val_idx], scores), time.perf_counter() - start
+
+
+def halving_schedule(n_splits: int, min_folds: int = 2, eta: int = 3) -> List[int]:
+    """
+    Número de folds avaliados em cada rodada do successive halving.
+    
+    Ex.: n_splits=5, min_folds=2, eta=3 → [2, 5]
+    """
+    schedule = []
+    n_folds = max(1, min(min_folds, n_splits))
+    while n_folds < n_splits:
+        schedule.append(n_folds)
+        n_folds *= eta
+    schedule.append(n_splits)
+    return schedule
+
+
+@timed('train_model.cross_validate_search')
+def cross_validate_search(X, y, layout: FoldLayout, search_spaces: Dict = SEARCH_SPACES,
+                          n_workers: Optional[int] = None, time_budget: Optional[float] = None,
+                          eta: int = 3, min_folds: int = 2) -> pd.DataFrame:
+    """
+    Busca de hiperparâmetros com validação cruzada, em paralelo e com poda.
+    
+    Cada par (configuração, fold) é uma tarefa do pool de processos. As rodadas
+    seguem o successive halving: todas as configurações são avaliadas nos
+    primeiros `min_folds` folds, só a melhor fração 1/eta (e sempre a melhor de
+    cada modelo) segue para mais folds, até a validação completa.
+    
+    Args:
+        X: Matriz de features (sem normalizar; cada fold usa o seu scaler)
+        y: Labels
+        layout: Divisão em folds (ver get_fold_layout)
+        search_spaces: Grade de hiperparâmetros por modelo
+        n_workers: Número de processos (1 = serial, None = todos os núcleos)
+        time_budget: Tempo máximo em segundos (None = sem limite). Ao estourar,
+                     tarefas pendentes são canceladas e as configurações
+                     incompletas ficam com status 'timeout'
+        eta: Fator de poda entre rodadas
+        min_folds: Folds avaliados na primeira rodada
+        
+    Returns:
+        DataFrame com uma linha por configuração, ordenado pelo ROC-AUC médio
+    """
+    # Configurações intercaladas entre modelos, para que um orçamento curto não
+    # seja gasto inteiro no modelo mais caro
+    families = [[(name, params) for params in ParameterGrid(space)]
+                for name, space in search_spaces.items()]
+    configs = [config for group in zip_longest(*families) for config in group if config is not None]
+    n_splits = layout.n_splits
+    schedule = halving_schedule(n_splits, min_folds, eta)
+    
+    scores = {config_id: {} for config_id in range(len(configs))}
+    fit_times = {config_id: 0.0 for config_id in range(len(configs))}
+    status = {config_id: 'complete' for config_id in range(len(configs))}
+    
+    def rank_key(config_id):
+        # Maior ROC-AUC médio; em empate, a configuração mais barata de treinar
+        mean = np.mean(list(scores[config_id].values())) if scores[config_id] else -np.inf
+        return mean, -fit_times[config_id]
+    
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(1, min(n_workers, len(configs) * n_splits))
+    
+    log.info("🔬 VALIDAÇÃO CRUZADA + BUSCA DE HIPERPARÂMETROS")
+    log.info(f"   Configurações: {len(configs)} | Folds: {n_splits} | Workers: {n_workers}")
+    log.info(f"   Rodadas (folds por rodada): {schedule}")
+    if time_budget:
+        log.info(f"   Orçamento de tempo: {time_budget:.0f}s")
+    
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    active = list(range(len(configs)))
+    timed_out = False
+    
+    if n_workers == 1:
+        _init_cv_worker(X, y, layout)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=n_workers, initializer=_init_cv_worker,
+                                       initargs=(X, y, layout))
+    
+    # Total = limite superior: configurações podadas não chegam a todos os folds
+    progress = ProgressReporter(len(configs) * n_splits, 'Validação cruzada', log, unit='ajustes')
+    
+    try:
+        for round_idx, n_folds in enumerate(schedule):
+            # Ordem fold a fold: com orçamento curto, todas as configurações
+            # recebem pelo menos um fold antes de alguma receber o segundo
+            tasks = [(config_id, *configs[config_id], fold)
+                     for fold in range(n_folds) for config_id in active
+                     if fold not in scores[config_id]]
+            
+            if executor is None:
+                for task in tasks:
+                    if deadline and time.perf_counter() > deadline:
+                        timed_out = True
+                        break
+                    config_id, fold, score, elapsed = _fit_fold(task)
+                    scores[config_id][fold] = score
+                    fit_times[config_id] += elapsed
+                    record_time(f'train_model.cv_fit[{configs[config_id][0]}]', elapsed)
+                    progress.update(round=round_idx + 1)
+            else:
+                futures = [executor.submit(_fit_fold, task) for task in tasks]
+                try:
+                    remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                    for future in as_completed(futures, timeout=remaining):
+                        config_id, fold, score, elapsed = future.result()
+                        scores[config_id][fold] = score
+                        fit_times[config_id] += elapsed
+                        record_time(f'train_model.cv_fit[{configs[config_id][0]}]', elapsed)
+                        progress.update(round=round_idx + 1)
+                except FuturesTimeoutError:
+                    timed_out = True
+                    for future in futures:
+                        future.cancel()
+            
+            if timed_out:
+                log.info(f"⏱️  Orçamento de tempo esgotado na rodada {round_idx + 1}")
+                for config_id in active:
+                    if len(scores[config_id]) < n_splits:
+                        status[config_id] = 'timeout'
+                break
+            
+            log.info(f"   ✅ Rodada {round_idx + 1}: {len(active)} configurações × {n_folds} folds")
+            
+            if round_idx == len(schedule) - 1:
+                break
+            
+            # Poda: manter a fração 1/eta das melhores + a melhor de cada modelo
+            ranked = sorted(active, key=rank_key, reverse=True)
+            keep = set(ranked[:max(1, math.ceil(len(ranked) / eta))])
+            for name in search_spaces:
+                family = [config_id for config_id in ranked if configs[config_id][0] == name]
+                if family:
+                    keep.add(family[0])
+            for config_id in active:
+                if config_id not in keep:
+                    status[config_id] = 'pruned'
+            active = [config_id for config_id in ranked if config_id in keep]
+    finally:
+        progress.close()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    rows = []
+    for config_id, (name, params) in enumerate(configs):
+        fold_scores = list(scores[config_id].values())
+        rows.append({
+            'model': name,
+            'params': params,
+            'roc_auc_mean': np.mean(fold_scores) if fold_scores else np.nan,
+            'roc_auc_std': np.std(fold_scores) if fold_scores else np.nan,
+            'folds': len(fold_scores),
+            'fit_time_s': fit_times[config_id],
+            'status': status[config_id]
+        })
+    
+    results = pd.DataFrame(rows)
+    # Configurações avaliadas em mais folds primeiro; empates de ROC-AUC:
+    # menor desvio entre folds, depois menor custo de treino
+    results = results.sort_values(['folds', 'roc_auc_mean', 'roc_auc_std', 'fit_time_s'],
+                                  ascending=[False, False, True, True], na_position='last')
+    return results.reset_index(drop=True)
+
+
+def print_cv_results(results: pd.DataFrame, top: int = 3):
+    """
+    Imprime as melhores configurações de cada modelo.
+    """
+    log.info("📋 RESULTADOS DA VALIDAÇÃO CRUZADA (ROC-AUC médio ± desvio)")
+    
+    for name, group in results.groupby('model', sort=False):
+        counts = group['status'].value_counts().to_dict()
+        log.info(f"🤖 {name} ({len(group)} configurações: "
+              f"{', '.join(f'{n} {s}' for s, n in counts.items())})")
+        for _, row in group.head(top).iterrows():
+            log.info(f"   {row['roc_auc_mean']:.3f} ± {row['roc_auc_std']:.3f} "
+                  f"[{row['folds']} folds, {row['fit_time_s']:.1f}s] {row['params']}")
+
+
+def select_best_config(results: pd.DataFrame) -> pd.Series:
+    """
+    Escolhe a melhor configuração avaliada em todos os folds.
+    
+    Se o orçamento de tempo impediu qualquer configuração de completar a
+    validação, usa a melhor dentre as avaliadas.
+    """
+    complete = results[results['status'] == 'complete']
+    candidates = complete if len(complete) else results.dropna(subset=['roc_auc_mean'])
+    if candidates.empty:
+        raise RuntimeError("Nenhuma configuração foi avaliada dentro do orçamento de tempo")
+    return candidates.iloc[0]
+
+
+def save_cv_best_model(best: pd.Series, X, y, feature_cols: List[str], output_dir: Path):
+    """
+    Retreina a melhor configuração com todos os dados e salva modelo + scaler.
+    """
+    log.info("💾 SALVANDO MELHOR MODELO (escolhido pela validação cruzada)")
+    
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    model = build_model(best['model'], best['params'])
+    model.fit(X_scaled, y)
+    
+    log.info(f"🏆 Melhor modelo: {best['model']} {best['params']}")
+    log.info(f"   ROC-AUC (CV): {best['roc_auc_mean']:.3f} ± {best['roc_auc_std']:.3f} ({best['folds']} folds)")
+    
+    model_file = output_dir / 'best_model.pkl'
+    scaler_file = output_dir / 'scaler.pkl'
+    joblib.dump(model, model_file)
+    joblib.dump(scaler, scaler_file)
+    log.info(f"✅ Modelo salvo em: {model_file}")
+    log.info(f"✅ Scaler salvo em: {scaler_file}")
+    export_inference_model(model, scaler, output_dir, feature_cols)
+    
+    info_file = output_dir / 'model_info.txt'
+    with open(info_file, 'w') as f:
+        f.write(f"Melhor Modelo: {best['model']}\n")
+        f.write(f"ROC-AUC: {best['roc_auc_mean']:.3f}\n")
+        f.write("\nValidação cruzada:\n")
+        f.write(f"  roc_auc_std: {best['roc_auc_std']:.3f}\n")
+        f.write(f"  folds: {best['folds']}\n")
+        f.write(f"  hiperparâmetros: {best['params']}\n")
+        f.write(f"  features: {', '.join(feature_cols)}\n")
+    log.info(f"✅ Informações salvas em: {info_file}")
+    
+    return model, scaler
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Treinar e avaliar modelos de classificação de ECG')
+    parser.add_argument('--cv', action='store_true',
+                        help='Validação cruzada + busca de hiperparâmetros (escolhe o best_model.pkl pelo CV)')
+    parser.add_argument('--folds', type=int, default=5,
+                        help='Número de folds da validação cruzada (padrão: 5)')
+    parser.add_argument('--workers', '-j', type=int, default=0,
+                        help='Processos paralelos no modo --cv (padrão: 0 = todos os núcleos)')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Tempo máximo da busca em segundos (padrão: sem limite)')
+    parser.add_argument('--eta', type=int, default=3,
+                        help='Fator de poda entre rodadas do successive halving (padrão: 3)')
+    parser.add_argument('--group-by', choices=['record', 'none'], default='record',
+                        help='record = treino/teste e folds separados por registro de origem '
+                             '(padrão); none = divisão por linha')
+    parser.add_argument('--no-fold-cache', action='store_true',
+                        help='Recalcular os folds do modo --cv em vez de reutilizar data/cache/folds')
+    instrumentation.add_arguments(parser)
+    reporting.add_arguments(parser)
+    args = parser.parse_args()
+    reporting.configure_from_args(args)
+    instrumentation.session_from_args(args).start()
+    
     # Caminhos
     project_root = Path(__file__).parent.parent
     features_path = project_root / 'data' / 'processed' / 'features.csv'
@@ -387,26 +893,43 @@ if __name__ == "__main__":
     models_dir.mkdir(parents=True, exist_ok=True)
     figures_dir.mkdir(parents=True, exist_ok=True)
     
-    # Pipeline completo
     X, y, feature_cols, df = load_and_prepare_data(features_path)
-    X_train, X_test, y_train, y_test, scaler = split_and_scale_data(X, y)
-    
-    # Salvar scaler
-    scaler_file = models_dir / 'scaler.pkl'
-    joblib.dump(scaler, scaler_file)
-    print(f"\n💾 Scaler salvo em: {scaler_file}")
-    
-    # Treinar modelos
-    models = train_models(X_train, y_train)
-    
-    # Avaliar modelos
-    results = evaluate_models(models, X_test, y_test)
-    
-    # Visualizações
-    plot_comparison(results, figures_dir)
-    
-    # Salvar melhor modelo
-    best_model_name, best_model = save_best_model(models, results, models_dir)
-    
-    # Resumo
-    print_summary(results)
+    groups = make_groups(df) if args.group_by == 'record' else None
+    
+    if args.cv:
+        layout = get_fold_layout(X, y, groups, n_splits=args.folds,
+                                 cache_dir=None if args.no_fold_cache else FOLDS_CACHE_DIR)
+        results = cross_validate_search(X, y, layout,
+                                        n_workers=args.workers or None,
+                                        time_budget=args.time_budget,
+                                        eta=args.eta)
+        print_cv_results(results)
+        
+        results_file = project_root / 'reports' / 'cv_results.csv'
+        results.to_csv(results_file, index=False)
+        log.info(f"💾 Tabela completa salva em: {results_file}")
+        
+        save_cv_best_model(select_best_config(results), X, y, feature_cols, models_dir)
+    else:
+        # Pipeline completo (divisão única treino/teste)
+        X_train, X_test, y_train, y_test, scaler = split_and_scale_data(X, y, groups=groups)
+        
+        # Salvar scaler
+        scaler_file = models_dir / 'scaler.pkl'
+        joblib.dump(scaler, scaler_file)
+        log.info(f"💾 Scaler salvo em: {scaler_file}")
+        
+        # Treinar modelos
+        models = train_models(X_train, y_train)
+        
+        # Avaliar modelos
+        results = evaluate_models(models, X_test, y_test)
+        
+        # Visualizações
+        plot_comparison(results, figures_dir)
+        
+        # Salvar melhor modelo
+        best_model_name, best_model = save_best_model(models, results, models_dir, scaler, feature_cols)
+        
+        # Resumo
+        print_summary(results)
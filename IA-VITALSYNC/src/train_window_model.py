@@ -0,0 +1,197 @@
+"""
+train_window_model.py
+---------------------
+Treina o modelo de Fibrilação Atrial por JANELA usado pelo streaming_detector.py
+(e pela ponte --edge-af da api-vitalsync).
+
+O modelo de train_model.py resume um registro inteiro e depende de features que,
+numa janela, só medem o tamanho da janela ou o dispositivo (num_beats,
+num_rr_intervals, sampling_freq). Aqui cada exemplo é uma janela deslizante de
+intervalos R-R calculada pelo mesmo RRWindowStream do detector, e o modelo usa
+apenas WINDOW_FEATURE_NAMES.
+
+Dados: janelas dos registros do AFTDB (FA, label=1) e do NSRDB (sinusal,
+label=0). A avaliação separa os REGISTROS entre treino e teste (janelas de um
+mesmo registro nunca aparecem dos dois lados); o modelo salvo é então ajustado
+com todos os registros.
+
+Saída: models/window_model.pkl, um dicionário com o modelo, o scaler, as
+features, a configuração das janelas, as métricas da avaliação e o marcador
+'window_calibrated' exigido por streaming_detector.load_window_model.
+
+USO:
+    python src/train_window_model.py
+    python src/train_window_model.py --window-beats 60 --max-windows-per-record 300
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, recall_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(str(Path(__file__).parent))
+import reporting
+from reporting import ProgressReporter, get_logger
+from streaming_detector import (
+    DEFAULT_MODELS_DIR, WINDOW_FEATURE_NAMES, WINDOW_MODEL_FILE, RRWindowStream, beat_peak_times
+)
+
+log = get_logger('train_window_model')
+
+
+# Passo entre janelas (batimentos): os registros de FA do AFTDB têm só 1 minuto,
+# então as janelas de FA se sobrepõem bastante; as do NSRDB (~24h) não
+AF_HOP_BEATS = 5
+MAX_WINDOWS_PER_RECORD = 300
+
+
+def record_windows(peak_times: np.ndarray, window_beats: int, hop_beats: int,
+                   max_windows: Optional[int] = None, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Matriz (janelas × WINDOW_FEATURE_NAMES) das janelas deslizantes de uma série
+    de picos R, com no máximo max_windows janelas sorteadas.
+    """
+    stream = RRWindowStream(window_beats=window_beats, hop_beats=hop_beats)
+    windows = stream.windows(peak_times)
+    if max_windows is not None and len(windows) > max_windows:
+        rng = rng or np.random.default_rng(42)
+        keep = np.sort(rng.choice(len(windows), max_windows, replace=False))
+        windows = [windows[i] for i in keep]
+    return np.array([[w['features'][name] for name in WINDOW_FEATURE_NAMES] for w in windows],
+                    dtype=np.float64).reshape(len(windows), len(WINDOW_FEATURE_NAMES))
+
+
+def collect_windows(records: List[Dict], window_beats: int, max_windows_per_record: int = MAX_WINDOWS_PER_RECORD,
+                    seed: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Janelas de todos os registros (formato de data_loader.load_records).
+
+    Returns:
+        (X, y, groups): features, rótulos e índice do registro de cada janela
+    """
+    import wfdb
+    from predict import resolve_annotation_ext
+
+    rng = np.random.default_rng(seed)
+    X, y, groups = [], [], []
+    progress = ProgressReporter(len(records), 'Extraindo janelas', logger=log)
+    for index, record in enumerate(records):
+        record_path = record['full_path']
+        fs = wfdb.rdheader(record_path).fs
+        annotation = wfdb.rdann(record_path, resolve_annotation_ext(record_path, 'qrs'))
+        hop_beats = AF_HOP_BEATS if record['label'] == 1 else window_beats
+        matrix = record_windows(beat_peak_times(annotation, fs), window_beats, hop_beats,
+                                max_windows_per_record, rng)
+        X.append(matrix)
+        y.append(np.full(len(matrix), record['label']))
+        groups.append(np.full(len(matrix), index))
+        progress.update()
+    progress.close()
+    return np.vstack(X), np.concatenate(y), np.concatenate(groups)
+
+
+def fit_window_model(X: np.ndarray, y: np.ndarray, random_state: int = 42):
+    """
+    Ajusta o scaler e o Random Forest de janela.
+
+    Returns:
+        (model, scaler)
+    """
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(
+        n_estimators=100,
+        max_depth=8,
+        min_samples_leaf=5,
+        class_weight='balanced',
+        random_state=random_state,
+        n_jobs=-1
+    )
+    model.fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def evaluate_by_record(X: np.ndarray, y: np.ndarray, groups: np.ndarray, test_size: float = 0.25,
+                       random_state: int = 42) -> Dict:
+    """
+    Treina com parte dos registros e avalia nas janelas dos registros restantes.
+    """
+    record_ids = np.unique(groups)
+    record_labels = np.array([y[groups == record_id][0] for record_id in record_ids])
+    train_ids, test_ids = train_test_split(record_ids, test_size=test_size, stratify=record_labels,
+                                           random_state=random_state)
+    train, test = np.isin(groups, train_ids), np.isin(groups, test_ids)
+
+    model, scaler = fit_window_model(X[train], y[train], random_state)
+    proba = model.predict_proba(scaler.transform(X[test]))[:, 1]
+    pred = (proba >= 0.5).astype(int)
+    return {
+        'test_records': int(len(test_ids)),
+        'test_windows': int(test.sum()),
+        'accuracy': float(accuracy_score(y[test], pred)),
+        'sensitivity': float(recall_score(y[test], pred, pos_label=1)),
+        'specificity': float(recall_score(y[test], pred, pos_label=0)),
+        'roc_auc': float(roc_auc_score(y[test], proba)),
+    }
+
+
+def save_window_model(model, scaler, path: Path, window_beats: int, metrics: Optional[Dict] = None):
+    """
+    Salva o artefato lido por streaming_detector.load_window_model.
+    """
+    joblib.dump({
+        'window_calibrated': True,
+        'model': model,
+        'scaler': scaler,
+        'feature_names': list(WINDOW_FEATURE_NAMES),
+        'window_beats': window_beats,
+        'metrics': metrics or {},
+    }, path, compress=3)
+
+
+def main():
+    from data_loader import load_records
+
+    parser = argparse.ArgumentParser(description='Treinar o modelo de FA por janela (streaming_detector.py)')
+    parser.add_argument('--data-root', type=str, default=str(Path(__file__).parent.parent / 'data' / 'raw'),
+                        help='Pasta data/raw com aftdb e nsrdb')
+    parser.add_argument('--models-dir', type=str, default=str(DEFAULT_MODELS_DIR),
+                        help='Pasta de saída (padrão: models/)')
+    parser.add_argument('--window-beats', type=int, default=60,
+                        help='Tamanho da janela em intervalos R-R (padrão: 60)')
+    parser.add_argument('--max-windows-per-record', type=int, default=MAX_WINDOWS_PER_RECORD,
+                        help=f'Janelas sorteadas por registro (padrão: {MAX_WINDOWS_PER_RECORD})')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do sorteio e do modelo (padrão: 42)')
+    reporting.add_arguments(parser)
+    args = parser.parse_args()
+    reporting.configure_from_args(args)
+
+    records = load_records(args.data_root)
+    if not records:
+        log.error("❌ Nenhum registro encontrado em %s", args.data_root)
+        sys.exit(1)
+
+    log.info("🪟 Extraindo janelas de %d intervalos de %d registros", args.window_beats, len(records))
+    X, y, groups = collect_windows(records, args.window_beats, args.max_windows_per_record, args.seed)
+    log.info("   Janelas: %d (FA: %d, Normal: %d)", len(y), int(y.sum()), int(len(y) - y.sum()),
+             extra={'windows': len(y), 'af': int(y.sum())})
+
+    metrics = evaluate_by_record(X, y, groups, random_state=args.seed)
+    log.info("📊 Avaliação em registros separados (%d registros, %d janelas)",
+             metrics['test_records'], metrics['test_windows'], extra=metrics)
+    for name in ('accuracy', 'sensitivity', 'specificity', 'roc_auc'):
+        log.info("   %s: %.3f", name, metrics[name])
+
+    model, scaler = fit_window_model(X, y, args.seed)
+    output_path = Path(args.models_dir) / WINDOW_MODEL_FILE
+    save_window_model(model, scaler, output_path, args.window_beats, metrics)
+    log.info("✅ Modelo de janela salvo em: %s", output_path)
+
+
+if __name__ == "__main__":
+    main()
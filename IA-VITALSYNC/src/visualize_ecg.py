@@ -15,8 +15,11 @@ import wfdb
 from pathlib import Path
 import sys
 
+from signal_reader import SignalReader
+from rr_store import open_default_store
 
-def plot_ecg_with_r_peaks(record_path: str, duration: int = 10, title: str = "ECG"):
+
+def plot_ecg_with_r_peaks(record_path: str, duration: int = 10, title: str = "ECG", rr_store=None):
     """
     Plota um ECG com os picos R marcados.
     
@@ -24,25 +27,27 @@ def plot_ecg_with_r_peaks(record_path: str, duration: int = 10, title: str = "EC
         record_path: Caminho completo para o registro (sem extensão)
         duration: Duração em segundos para plotar (padrão: 10 segundos)
         title: Título do gráfico
+        rr_store: Store colunar de picos R opcional (rr_store.RRStore)
     """
     try:
-        # 1. Ler o registro (sinal + metadados)
-        record = wfdb.rdrecord(record_path)
+        # 1. Abrir o registro (apenas cabeçalho; o .dat é mapeado em memória)
+        reader = SignalReader(record_path)
+        fs = reader.fs  # Frequência de amostragem
         
-        # 2. Ler as anotações dos picos R
-        annotation = wfdb.rdann(record_path, 'qrs')
+        # 2. Limitar ao período de visualização
+        num_samples = min(int(duration * fs), reader.n_samples)
         
-        # 3. Extrair informações
-        signal = record.p_signal[:, 0]  # Primeiro canal do ECG
-        fs = record.fs  # Frequência de amostragem
-        r_peaks = annotation.sample  # Posições dos picos R
+        # 3. Ler apenas o trecho plotado do primeiro canal do ECG
+        signal_segment = reader.read_samples(0, num_samples, channels=[0])[:, 0]
         
-        # 4. Limitar ao período de visualização
-        num_samples = int(duration * fs)
-        if num_samples > len(signal):
-            num_samples = len(signal)
+        # 4. Picos R do trecho: do store colunar, ou das anotações WFDB
+        stored = rr_store.get(record_path, 'qrs') if rr_store is not None else None
+        if stored is not None:
+            r_peaks = stored[0]
+        else:
+            annotation = wfdb.rdann(record_path, 'qrs', sampto=num_samples)
+            r_peaks = annotation.sample  # Posições dos picos R
         
-        signal_segment = signal[:num_samples]
         time = np.arange(len(signal_segment)) / fs
         
         # Filtrar picos R que estão no segmento
@@ -134,6 +139,7 @@ def visualize_multiple_examples(aftdb_root: str, num_examples: int = 3):
     print("=" * 80)
     
     all_stats = []
+    rr_store = open_default_store()
     
     for subset, records in examples.items():
         print(f"\n📁 Subset: {subset}")
@@ -156,7 +162,8 @@ def visualize_multiple_examples(aftdb_root: str, num_examples: int = 3):
             
             # Plotar
             title = f"Fibrilação Atrial - {subset}"
-            fig, stats = plot_ecg_with_r_peaks(str(record_path), duration=10, title=title)
+            fig, stats = plot_ecg_with_r_peaks(str(record_path), duration=10, title=title,
+                                               rr_store=rr_store)
             
             if stats:
                 mean_rr, std_rr, cv_rr, mean_hr = stats
@@ -0,0 +1,11 @@
+"""
+Configuração dos testes: os módulos de src/ são importados pelo nome (como nos
+scripts e benchmarks, que colocam src/ no sys.path).
+"""
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / 'src'
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
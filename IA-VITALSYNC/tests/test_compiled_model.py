@@ -0,0 +1,88 @@
+"""
+Testes do modelo compilado (compiled_model.py) contra o scikit-learn.
+"""
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+import compiled_model
+from compiled_model import (
+    CompiledForest, export_compiled_model, is_compiled_model_fresh, load_compiled_model
+)
+
+
+def training_data(n_rows=2000, n_features=6, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features)) * rng.uniform(0.01, 100, n_features) + rng.normal(0, 50, n_features)
+    y = (X[:, 0] / X[:, 0].std() + rng.normal(size=n_rows) > 0).astype(int)
+    return X, y
+
+
+def assert_same_proba(compiled, model, scaler, X):
+    expected = model.predict_proba(scaler.transform(X))
+    np.testing.assert_allclose(compiled.predict_proba(X), expected, rtol=0, atol=1e-12)
+
+
+@pytest.fixture(scope='module')
+def deep_forest():
+    X, y = training_data()
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=20, max_depth=None, random_state=0).fit(scaler.transform(X), y)
+    return model, scaler
+
+
+def test_deep_forest_matches_sklearn(deep_forest):
+    model, scaler = deep_forest
+    assert max(tree.tree_.n_leaves for tree in model.estimators_) > 64
+
+    compiled = CompiledForest.from_sklearn(model, scaler)
+    X, _ = training_data(n_rows=5000, seed=1)
+    assert_same_proba(compiled, model, scaler, X)
+    assert compiled.predict_proba(X[0]).shape == (1, 2)
+
+
+def test_linear_matches_sklearn():
+    X, y = training_data()
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression().fit(scaler.transform(X), y)
+    compiled = compiled_model.compile_model(model, scaler)
+    assert_same_proba(compiled, model, scaler, training_data(seed=1)[0])
+
+
+def test_export_load_roundtrip(tmp_path, deep_forest):
+    model, scaler = deep_forest
+    path = tmp_path / compiled_model.COMPILED_MODEL_FILE
+    export_compiled_model(model, scaler, path, feature_names=[f'f{i}' for i in range(6)])
+
+    loaded = load_compiled_model(path)
+    assert loaded.feature_names == [f'f{i}' for i in range(6)]
+    assert_same_proba(loaded, model, scaler, training_data(seed=2)[0])
+
+
+def test_freshness_checks_size_and_mtime_before_hashing(tmp_path, deep_forest, monkeypatch):
+    model, scaler = deep_forest
+    source = tmp_path / 'best_model.pkl'
+    source.write_bytes(b'modelo-v1')
+    path = tmp_path / compiled_model.COMPILED_MODEL_FILE
+    export_compiled_model(model, scaler, path, source_files=[source])
+
+    def no_hash(_):
+        raise AssertionError("SHA-256 recalculado com tamanho e mtime iguais")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(compiled_model, '_file_sha256', no_hash)
+        assert is_compiled_model_fresh(path)
+
+    # Mesmo conteúdo com outro mtime (cópia/checkout): o hash decide
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert is_compiled_model_fresh(path)
+
+    source.write_bytes(b'modelo-v2')
+    assert not is_compiled_model_fresh(path)
+    source.write_bytes(b'modelo-v10')
+    assert not is_compiled_model_fresh(path)
@@ -0,0 +1,46 @@
+"""
+Testes do cache de features (feature_cache.py).
+"""
+import pytest
+
+from feature_cache import FeatureCache
+from feature_extraction import FEATURE_SCHEMA_VERSION
+
+
+def make_record(directory, name='r01'):
+    for ext in ('hea', 'qrs'):
+        (directory / f'{name}.{ext}').write_text(f'{name}.{ext}')
+    return str(directory / name)
+
+
+def test_schema_version_is_required(tmp_path):
+    with pytest.raises(TypeError):
+        FeatureCache(tmp_path / 'cache')
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = FeatureCache(tmp_path / 'cache', schema_version=FEATURE_SCHEMA_VERSION)
+    record = make_record(tmp_path)
+    key = cache.record_key(record)
+    cache.put(key, record, {'mean_rr': 0.8})
+
+    assert cache.get(key) == {'mean_rr': 0.8}
+    other_version = FeatureCache(tmp_path / 'cache', schema_version=FEATURE_SCHEMA_VERSION + 1)
+    assert other_version.get(key) is None
+
+
+def test_evict_prunes_stamps_of_deleted_files(tmp_path):
+    cache = FeatureCache(tmp_path / 'cache', schema_version=FEATURE_SCHEMA_VERSION)
+    kept = make_record(tmp_path, 'kept')
+    deleted = make_record(tmp_path, 'deleted')
+    cache.record_key(kept)
+    cache.record_key(deleted)
+    assert len(list(cache.files_dir.glob('*.json'))) == 4
+
+    for ext in ('hea', 'qrs'):
+        (tmp_path / f'deleted.{ext}').unlink()
+    cache.evict()
+
+    assert len(list(cache.files_dir.glob('*.json'))) == 2
+    cache.record_key(kept)
+    assert len(list(cache.files_dir.glob('*.json'))) == 2
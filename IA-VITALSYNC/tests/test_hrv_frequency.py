@@ -0,0 +1,83 @@
+"""
+Testes das features de HRV no domínio da frequência (hrv_frequency.py).
+"""
+import math
+import sys
+
+import numpy as np
+import pytest
+import wfdb
+from scipy.signal import welch
+
+import hrv_frequency
+from hrv_frequency import (
+    FREQUENCY_FEATURE_NAMES, METHODS, frequency_features, spectral_plan, welch_segment_psd,
+    windowed_frequency_features
+)
+
+
+def modulated_rr(duration_s=600.0, mean_ms=800.0, lf=(20.0, 0.1), hf=(30.0, 0.25)):
+    """
+    Série R-R (s) com senoides de amplitude conhecida (ms) em LF e HF, amostradas
+    em cada batimento, e os instantes dos batimentos.
+    """
+    beat_times, rr_intervals = [], []
+    t = 0.0
+    while t < duration_s:
+        rr = (mean_ms + lf[0] * math.sin(2 * math.pi * lf[1] * t)
+              + hf[0] * math.sin(2 * math.pi * hf[1] * t)) / 1000.0
+        t += rr
+        rr_intervals.append(rr)
+        beat_times.append(t)
+    return np.array(rr_intervals), np.array(beat_times)
+
+
+def test_welch_segment_psd_matches_scipy():
+    plan = spectral_plan(300.0)
+    hop_seconds = 150.0
+    hop = int(hop_seconds * plan.fs)
+    tachogram = 800 + np.random.default_rng(0).normal(0, 30, plan.n_samples * 3)
+
+    psd = welch_segment_psd(tachogram, plan, hop_seconds).mean(axis=0)
+    freqs, expected = welch(tachogram, fs=plan.fs, window='hann', nperseg=plan.n_samples,
+                            noverlap=plan.n_samples - hop, detrend='linear', scaling='density')
+
+    n_bins = len(plan.freqs)
+    np.testing.assert_allclose(plan.freqs, freqs[:n_bins])
+    np.testing.assert_allclose(psd[1:], expected[1:n_bins], rtol=1e-9)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_known_sinusoids_give_expected_band_power(method):
+    # Potência de uma senoide de amplitude A: A²/2 (200 ms² em LF, 450 ms² em HF)
+    rr_intervals, beat_times = modulated_rr()
+    features = frequency_features(rr_intervals, beat_times, method=method)
+
+    assert features['hrv_lf_power'] == pytest.approx(200.0, rel=0.05)
+    assert features['hrv_hf_power'] == pytest.approx(450.0, rel=0.05)
+    assert features['hrv_lf_peak_hz'] == pytest.approx(0.1, abs=1 / 300)
+    assert features['hrv_hf_peak_hz'] == pytest.approx(0.25, abs=1 / 300)
+    assert features['hrv_lf_hf_ratio'] == pytest.approx(200 / 450, rel=0.1)
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('n_intervals', [0, 1, 20])
+def test_short_input_gives_nan(method, n_intervals):
+    rr_intervals = np.full(n_intervals, 0.8)
+    features = frequency_features(rr_intervals, method=method)
+    assert list(features) == FREQUENCY_FEATURE_NAMES
+    assert all(math.isnan(value) for value in features.values())
+    assert windowed_frequency_features(rr_intervals, method=method) == []
+
+
+def test_cli_handles_record_with_too_few_nn_intervals(tmp_path, monkeypatch, capsys):
+    record_path = tmp_path / 'short'
+    wfdb.wrsamp('short', fs=128, units=['mV'], sig_name=['ECG'], p_signal=np.zeros((512, 1)),
+                fmt=['16'], write_dir=str(tmp_path))
+    wfdb.wrann('short', 'atr', np.array([100, 200, 300]), symbol=['N', 'V', 'N'], write_dir=str(tmp_path))
+
+    monkeypatch.setattr(sys, 'argv', ['hrv_frequency.py', str(record_path), '--annotation-ext', 'atr'])
+    hrv_frequency.main()
+    output = capsys.readouterr().out
+    assert 'Intervalos NN: 0 de 2' in output
+    assert 'nan' in output
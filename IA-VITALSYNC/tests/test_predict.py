@@ -0,0 +1,18 @@
+"""
+Testes do banner do predict.py (describe_model).
+"""
+from sklearn.linear_model import LogisticRegression
+
+from predict import describe_model
+
+
+def test_describe_model_uses_saved_cv_metric(tmp_path):
+    (tmp_path / 'model_info.txt').write_text(
+        "Melhor Modelo: Logistic Regression\nROC-AUC: 0.874\n\nValidação cruzada:\n"
+        "  roc_auc_std: 0.041\n  folds: 5\n", encoding='utf-8')
+    description = describe_model(tmp_path, LogisticRegression())
+    assert description == "Logistic Regression [LogisticRegression] | ROC-AUC (validação cruzada): 0.874"
+
+
+def test_describe_model_without_info_names_the_class(tmp_path):
+    assert describe_model(tmp_path, LogisticRegression()) == "LogisticRegression [LogisticRegression]"
@@ -0,0 +1,71 @@
+"""
+Testes do servidor de predição (prediction_server.py): trechos R-R usam o
+modelo de janela, registros inteiros o best_model.pkl.
+"""
+import json
+import shutil
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from prediction_server import PredictionService, create_server
+from streaming_detector import DEFAULT_MODELS_DIR, WINDOW_MODEL_FILE
+
+pytestmark = pytest.mark.skipif(
+    not all((DEFAULT_MODELS_DIR / name).exists() for name in ('best_model.pkl', 'scaler.pkl', WINDOW_MODEL_FILE)),
+    reason='modelos não treinados')
+
+REGULAR_RR = [0.8, 0.82, 0.79] * 20
+
+
+@pytest.fixture(scope='module')
+def service():
+    return PredictionService(DEFAULT_MODELS_DIR)
+
+
+def post(service, payload):
+    server = create_server(service, port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}/predict",
+                                     data=json.dumps(payload).encode())
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_regular_rr_series_is_not_af(service):
+    status, result = post(service, {'rr_intervals': REGULAR_RR})
+    assert status == 200
+    assert result['model'] == 'window'
+    assert result['prediction'] == 0
+
+    peaks = np.concatenate([[0], np.cumsum(REGULAR_RR)]) * 128
+    result = service.predict({'r_peaks': peaks.tolist(), 'fs': 128})
+    assert result['prediction'] == 0
+
+
+def test_irregular_rr_series_is_af(service):
+    rr = np.random.default_rng(0).uniform(0.4, 1.2, 60)
+    result = service.predict({'rr_intervals': rr.tolist()})
+    assert result['error'] is None
+    assert result['prediction'] == 1
+
+
+def test_rr_items_refused_without_window_model(tmp_path):
+    for name in ('best_model.pkl', 'scaler.pkl'):
+        shutil.copy(DEFAULT_MODELS_DIR / name, tmp_path / name)
+    service = PredictionService(tmp_path)
+    assert service.window_model is None
+
+    status, result = post(service, {'rr_intervals': REGULAR_RR})
+    assert status == 422
+    assert 'janela' in result['error']
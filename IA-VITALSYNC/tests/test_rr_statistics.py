@@ -0,0 +1,65 @@
+"""
+Kernel de estatísticas R-R (compute_rr_statistics) contra o cálculo original,
+uma chamada NumPy por feature.
+"""
+
+import numpy as np
+import pytest
+
+from feature_extraction import (
+    MODEL_FEATURE_NAMES, RR_STATISTICS_NAMES, calculate_cv, calculate_rmssd,
+    compute_rr_statistics, features_from_rr_intervals
+)
+from synthetic_data import generate_rr_intervals
+
+
+def legacy_rr_statistics(rr_intervals: np.ndarray) -> dict:
+    """
+    Cálculo original de extract_features_from_record (uma passada por feature).
+    """
+    return {
+        'rr_mean': np.mean(rr_intervals),
+        'rr_std': np.std(rr_intervals),
+        'rr_median': np.median(rr_intervals),
+        'rr_min': np.min(rr_intervals),
+        'rr_max': np.max(rr_intervals),
+        'rr_cv': calculate_cv(rr_intervals),
+        'rr_rmssd': calculate_rmssd(rr_intervals),
+        'rr_range': np.max(rr_intervals) - np.min(rr_intervals),
+        'rr_percentile_25': np.percentile(rr_intervals, 25),
+        'rr_percentile_75': np.percentile(rr_intervals, 75),
+        'rr_iqr': np.percentile(rr_intervals, 75) - np.percentile(rr_intervals, 25),
+        'mean_hr_bpm': 60.0 / np.mean(rr_intervals) if np.mean(rr_intervals) > 0 else 0,
+    }
+
+
+def assert_matches_legacy(rr_intervals):
+    expected = legacy_rr_statistics(rr_intervals)
+    kernel = compute_rr_statistics(rr_intervals)
+    np.testing.assert_allclose(kernel, [expected[name] for name in RR_STATISTICS_NAMES],
+                               rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize('rhythm', ['sinus', 'af'])
+def test_kernel_matches_legacy_on_long_series(rhythm):
+    rr, _ = generate_rr_intervals(3600, rhythm, ectopic_rate=0.01, rng=np.random.default_rng(7))
+    assert_matches_legacy(rr)
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 4, 5, 10, 11])
+def test_kernel_matches_legacy_on_short_series(n):
+    # Tamanhos pares e ímpares: posições de quantil exatas e interpoladas
+    assert_matches_legacy(np.random.default_rng(n).uniform(0.4, 1.2, n))
+
+
+def test_kernel_handles_repeated_values():
+    assert_matches_legacy(np.full(50, 0.8))
+
+
+def test_features_from_rr_intervals_has_model_features_in_order():
+    rr = np.random.default_rng(0).uniform(0.5, 1.0, 120)
+    features = features_from_rr_intervals(rr, 128.0)
+    assert list(features) == MODEL_FEATURE_NAMES
+    assert features['num_beats'] == 121
+    assert features['num_rr_intervals'] == 120
+    assert features['rr_cv'] == pytest.approx(calculate_cv(rr))
@@ -0,0 +1,62 @@
+"""
+Testes da leitura mapeada de sinais (signal_reader.py) contra wfdb.rdrecord.
+"""
+import numpy as np
+import pytest
+import wfdb
+
+from signal_reader import SignalReader
+
+# Faixa digital de cada formato (sem o valor reservado para amostra inválida)
+FORMAT_RANGES = {'16': (-32767, 32767), '212': (-2047, 2047), '80': (-127, 127), '32': (-2**31 + 1, 2**31 - 1)}
+
+# Trechos [start, stop) com inícios/fins pares e ímpares (pares de 12 bits no 212)
+RANGES = [(0, None), (0, 1), (1, 2), (3, 10), (7, 250), (500, 999), (998, 1001)]
+
+
+def write_record(directory, fmt, n_channels=2, n_samples=1001, seed=0):
+    low, high = FORMAT_RANGES[fmt]
+    d_signal = np.random.default_rng(seed).integers(low, high, size=(n_samples, n_channels))
+    d_signal[5, 0] = low - 1  # amostra inválida (NaN no sinal físico)
+    name = f'rec{fmt}'
+    wfdb.wrsamp(name, fs=128, units=['mV'] * n_channels, sig_name=[f'ECG{i + 1}' for i in range(n_channels)],
+                d_signal=d_signal, fmt=[fmt] * n_channels, adc_gain=[200.0] * n_channels,
+                baseline=[10] * n_channels, write_dir=str(directory))
+    return str(directory / name)
+
+
+@pytest.mark.parametrize('fmt', ['212', '16', '80'])
+@pytest.mark.parametrize('n_channels', [1, 2])
+def test_mapped_formats_match_rdrecord(tmp_path, fmt, n_channels):
+    record_path = write_record(tmp_path, fmt, n_channels)
+    reader = SignalReader(record_path)
+    assert reader.mapped
+    assert reader.n_samples == 1001
+
+    for start, stop in RANGES:
+        expected = wfdb.rdrecord(record_path, sampfrom=start, sampto=stop, physical=False).d_signal
+        np.testing.assert_array_equal(reader.read_samples(start, stop, physical=False), expected)
+
+        expected = wfdb.rdrecord(record_path, sampfrom=start, sampto=stop).p_signal
+        np.testing.assert_allclose(reader.read_samples(start, stop), expected, equal_nan=True)
+
+
+def test_channel_subset_and_chunks(tmp_path):
+    record_path = write_record(tmp_path, '212', n_channels=2)
+    reader = SignalReader(record_path)
+    full = wfdb.rdrecord(record_path, channels=[1]).p_signal
+
+    np.testing.assert_allclose(reader.read_samples(0, None, channels=[1]), full, equal_nan=True)
+    chunks = [chunk for _, chunk in reader.iter_chunks(chunk_seconds=1.0, channels=[1])]
+    np.testing.assert_allclose(np.vstack(chunks), full, equal_nan=True)
+
+
+def test_unsupported_format_falls_back_to_rdrecord(tmp_path):
+    record_path = write_record(tmp_path, '32', n_channels=2)
+    reader = SignalReader(record_path)
+    assert not reader.mapped
+
+    for start, stop in RANGES:
+        expected = wfdb.rdrecord(record_path, sampfrom=start, sampto=stop).p_signal
+        np.testing.assert_allclose(reader.read_samples(start, stop), expected, equal_nan=True)
+    assert reader.read_samples(10, 10).shape == (0, 2)
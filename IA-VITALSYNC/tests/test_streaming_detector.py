@@ -0,0 +1,88 @@
+"""
+Testes do detector de FA em janelas (streaming_detector.py) e do modelo de
+janela (train_window_model.py).
+"""
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from feature_extraction import MODEL_FEATURE_NAMES, features_from_rr_intervals
+from streaming_detector import (
+    DEFAULT_MODELS_DIR, WINDOW_FEATURE_NAMES, WINDOW_MODEL_FILE, RollingRRStatistics,
+    StreamingAFDetector, load_window_model
+)
+from synthetic_data import generate_rr_intervals
+from train_window_model import fit_window_model, record_windows, save_window_model
+
+
+def synthetic_peaks(rhythm, seed, duration_s=1800):
+    rr, _ = generate_rr_intervals(duration_s, rhythm, heart_rate=70.0, ectopic_rate=0.005,
+                                  rng=np.random.default_rng(seed))
+    return np.concatenate([[0.0], np.cumsum(rr)])
+
+
+def af_fraction(model, scaler, peak_times):
+    results = StreamingAFDetector(model, scaler, window_beats=60, hop_beats=10).push_peaks(peak_times)
+    assert results
+    return sum(r['is_af'] for r in results) / len(results)
+
+
+@pytest.fixture(scope='module')
+def synthetic_window_model():
+    X, y = [], []
+    for seed in range(4):
+        for label, rhythm in enumerate(['sinus', 'af']):
+            matrix = record_windows(synthetic_peaks(rhythm, seed), window_beats=60, hop_beats=30)
+            X.append(matrix)
+            y.append(np.full(len(matrix), label))
+    return fit_window_model(np.vstack(X), np.concatenate(y))
+
+
+@pytest.mark.parametrize('max_beats, max_seconds', [(60, None), (None, 30.0), (60, 30.0)])
+def test_rolling_statistics_match_batch_features(max_beats, max_seconds):
+    rr = np.random.default_rng(3).uniform(0.4, 1.2, 500)
+    window = RollingRRStatistics(max_beats=max_beats, max_seconds=max_seconds)
+    for value in rr:
+        window.push(value)
+
+    expected = features_from_rr_intervals(rr[-len(window):], 128.0)
+    actual = window.features(128.0)
+    for name in MODEL_FEATURE_NAMES:
+        assert actual[name] == pytest.approx(expected[name], rel=1e-9, abs=1e-12), name
+
+
+def test_whole_record_model_is_refused():
+    rng = np.random.default_rng(0)
+    model = RandomForestClassifier(n_estimators=2, random_state=0).fit(
+        rng.normal(size=(20, len(MODEL_FEATURE_NAMES))), np.arange(20) % 2)
+    with pytest.raises(ValueError):
+        StreamingAFDetector(model, None)
+    with pytest.raises(ValueError):
+        StreamingAFDetector(model, None, feature_names=MODEL_FEATURE_NAMES)
+
+
+def test_artifact_without_marker_is_refused(tmp_path, synthetic_window_model):
+    model, scaler = synthetic_window_model
+    joblib.dump({'model': model, 'scaler': scaler, 'feature_names': WINDOW_FEATURE_NAMES},
+                tmp_path / WINDOW_MODEL_FILE)
+    with pytest.raises(ValueError):
+        load_window_model(tmp_path)
+
+    save_window_model(model, scaler, tmp_path / WINDOW_MODEL_FILE, window_beats=60)
+    _, _, config = load_window_model(tmp_path)
+    assert config['feature_names'] == WINDOW_FEATURE_NAMES
+
+
+def test_synthetic_sinus_record_is_not_af(synthetic_window_model):
+    model, scaler = synthetic_window_model
+    assert af_fraction(model, scaler, synthetic_peaks('sinus', seed=100)) < 0.05
+    assert af_fraction(model, scaler, synthetic_peaks('af', seed=100)) > 0.9
+
+
+@pytest.mark.skipif(not (DEFAULT_MODELS_DIR / WINDOW_MODEL_FILE).exists(),
+                    reason='models/window_model.pkl não treinado')
+def test_shipped_window_model_on_synthetic_records():
+    model, scaler, _ = load_window_model()
+    assert af_fraction(model, scaler, synthetic_peaks('sinus', seed=100)) < 0.05
+    assert af_fraction(model, scaler, synthetic_peaks('af', seed=100)) > 0.9
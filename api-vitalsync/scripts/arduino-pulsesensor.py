@@ -1,30 +1,172 @@
-import serial
-import requests
+import argparse
+import functools
+import queue
+import threading
 import time
 
-ser = serial.Serial('/dev/ttyACM0', 9600, timeout=1)
-time.sleep(2)
+from bridge_serial import DeviceConfig, SerialMultiplexer, load_device_map, parse_device_arg
+from bridge_spool import DEFAULT_MAX_ROWS, ReadingSpool, SpoolReplayer, SpoolWriter
+from bridge_uploader import (
+    BatchUploader, BridgeMetrics, MeasurementClient, Reading, enqueue_reading, parse_bpm_line
+)
+from pulse_beats import PulseStream, parse_sample_line
+from bridge_inference import DEFAULT_MODELS_DIR, EdgeAFMonitor, load_af_model
 
+DEFAULT_PORT = '/dev/ttyACM0'
+DEFAULT_USER_ID = "68253c885c74f4364f021de3"
 API_URL = "http://localhost:3000/measurements"
+DEFAULT_SPOOL = 'bridge_spool.db'
 
-try:
-    while True:
-        line = ser.readline().decode('utf-8').strip()
-        if line.startswith("BPM:"):
-            try:
-                bpm_value = int(line.split(":")[1].strip())
-                print(f"Enviando BPM: {bpm_value}")
-
-                data = {
-                    "userId": "68253c885c74f4364f021de3",
-                    "heartRate": bpm_value
-                }
-                headers = {'Content-Type': 'application/json'}
-                response = requests.post(API_URL, json=data, headers=headers)
-                print(f"Status: {response.status_code} | Resposta: {response.text}")
-            except Exception as e:
-                print(f"Erro ao enviar dados: {e}")
-        time.sleep(0.1)
-except KeyboardInterrupt:
-    print("\nInterrompido pelo usuário. Fechando porta serial.")
-    ser.close()
+
+def make_line_handler(readings, metrics, beats_per_batch=30, af_monitor=None):
+    # Roda na thread do multiplexador: só interpreta e enfileira, nunca espera pela API
+    pulse_streams = {}
+
+    def on_line(device, line, timestamp):
+        if device.mode == 'raw':
+            samples = parse_sample_line(line)
+            if not samples:
+                return
+            stream = pulse_streams.get(device.port)
+            if stream is None:
+                on_beat = functools.partial(af_monitor.push_beat, device) if af_monitor else None
+                stream = pulse_streams[device.port] = PulseStream(device.user_id, device.sample_rate,
+                                                                  max_beats=beats_per_batch,
+                                                                  on_beat=on_beat)
+            batches = stream.feed(samples, timestamp)
+            if af_monitor:
+                return  # com inferência local, só as janelas classificadas vão para a API
+            for batch in batches:
+                enqueue_reading(readings, batch, metrics)
+                # BPM derivado dos intervalos, para o histórico/alertas de Measurement
+                enqueue_reading(readings, Reading(device.user_id, batch.heart_rate(), batch.end()), metrics)
+            return
+
+        bpm_value = parse_bpm_line(line)
+        if bpm_value is not None:
+            enqueue_reading(readings, Reading(device.user_id, bpm_value, timestamp), metrics)
+    return on_line
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ponte Arduino (pulse sensor) → API VitalSync')
+    parser.add_argument('--port', default=DEFAULT_PORT, help=f'Porta serial (padrão: {DEFAULT_PORT})')
+    parser.add_argument('--baud', type=int, default=9600, help='Baud rate (padrão: 9600)')
+    parser.add_argument('--user-id', default=DEFAULT_USER_ID, help='ID do usuário das medições')
+    parser.add_argument('--device', action='append', default=[], metavar='PORTA=USER_ID',
+                        help='Dispositivo adicional (pode repetir); substitui --port/--user-id')
+    parser.add_argument('--devices', metavar='ARQUIVO.json',
+                        help='Arquivo JSON com o mapeamento porta → usuário (ver bridge_serial.py)')
+    parser.add_argument('--raw', action='store_true',
+                        help='Dispositivos de --port/--device enviam o sinal bruto (S:...) em vez do BPM')
+    parser.add_argument('--sample-rate', type=float, default=250.0,
+                        help='Taxa de amostragem do sinal bruto em Hz (padrão: 250)')
+    parser.add_argument('--beats-per-batch', type=int, default=30,
+                        help='Intervalos entre batimentos por lote enviado no modo raw (padrão: 30)')
+    parser.add_argument('--edge-af', action='store_true',
+                        help='Classificar FA no gateway (dispositivos raw) e enviar só os resultados por janela')
+    parser.add_argument('--model-dir', default=str(DEFAULT_MODELS_DIR),
+                        help='Diretório com window_model.pkl (padrão: IA-VITALSYNC/models)')
+    parser.add_argument('--af-window-beats', type=int, default=None,
+                        help='Janela de classificação em batimentos (padrão: a do treino do modelo de janela)')
+    parser.add_argument('--af-hop-beats', type=int, default=10,
+                        help='Classificar uma janela a cada N batimentos (padrão: 10)')
+    parser.add_argument('--af-threshold', type=float, default=0.5,
+                        help='Probabilidade mínima para marcar FA (padrão: 0.5)')
+    parser.add_argument('--af-onset-windows', type=int, default=None,
+                        help='Janelas seguidas com FA para gerar o alerta (padrão: janela/passo + 1)')
+    parser.add_argument('--api-url', default=API_URL, help=f'URL de /measurements (padrão: {API_URL})')
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help='Máximo de leituras por requisição no modo --no-spool (padrão: 50)')
+    parser.add_argument('--max-delay', type=float, default=1.0,
+                        help='Espera máxima de uma leitura antes do envio, em segundos (padrão: 1.0)')
+    parser.add_argument('--queue-size', type=int, default=10000,
+                        help='Tamanho máximo da fila de leituras (padrão: 10000)')
+    parser.add_argument('--metrics-interval', type=float, default=30.0,
+                        help='Intervalo entre relatórios de métricas, em segundos (0 = desligado)')
+    parser.add_argument('--spool', default=DEFAULT_SPOOL,
+                        help=f'Arquivo SQLite onde as leituras ficam até a API confirmar (padrão: {DEFAULT_SPOOL})')
+    parser.add_argument('--spool-max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help=f'Máximo de leituras pendentes no spool (padrão: {DEFAULT_MAX_ROWS})')
+    parser.add_argument('--replay-batch-size', type=int, default=500,
+                        help='Máximo de leituras por requisição ao drenar o spool (padrão: 500)')
+    parser.add_argument('--no-spool', action='store_true',
+                        help='Enviar direto da memória (leituras se perdem se a API estiver fora)')
+    args = parser.parse_args()
+
+    mode = 'raw' if args.raw else 'bpm'
+    try:
+        devices = load_device_map(args.devices) if args.devices else []
+        devices += [parse_device_arg(value, args.baud, mode, args.sample_rate) for value in args.device]
+    except (OSError, KeyError, ValueError) as e:
+        parser.error(f"dispositivos inválidos: {e}")
+    if not devices:
+        devices = [DeviceConfig(args.port, args.user_id, args.baud, mode, args.sample_rate)]
+
+    readings = queue.Queue(maxsize=args.queue_size)
+    metrics = BridgeMetrics()
+
+    af_monitor = None
+    if args.edge_af:
+        if not any(device.mode == 'raw' for device in devices):
+            parser.error("--edge-af precisa de dispositivos no modo raw (--raw ou \"mode\": \"raw\")")
+        try:
+            model, scaler, detector_class, config = load_af_model(args.model_dir)
+        except (ImportError, FileNotFoundError, ValueError) as e:
+            parser.error(f"--edge-af desativado: {e}")
+        window_beats = args.af_window_beats or config['window_beats']
+        af_monitor = EdgeAFMonitor(model, scaler, detector_class, readings, metrics,
+                                   window_beats=window_beats, hop_beats=args.af_hop_beats,
+                                   threshold=args.af_threshold, feature_names=config['feature_names'],
+                                   onset_windows=args.af_onset_windows)
+        print(f"🧠 Inferência de FA no gateway: {type(model).__name__} (janela de "
+              f"{window_beats} batimentos, a cada {args.af_hop_beats})")
+
+    client = MeasurementClient(args.api_url, metrics)
+    if args.no_spool:
+        spool = None
+        workers = [BatchUploader(client, readings, batch_size=args.batch_size, max_delay=args.max_delay)]
+    else:
+        spool = ReadingSpool(args.spool, max_rows=args.spool_max_rows, metrics=metrics)
+        if len(spool):
+            print(f"♻️  {len(spool)} leituras pendentes no spool serão reenviadas")
+        workers = [SpoolWriter(readings, spool),
+                   SpoolReplayer(client, spool, replay_batch_size=args.replay_batch_size,
+                                 max_delay=args.max_delay)]
+
+    # Uma única thread lê todas as portas
+    multiplexer = SerialMultiplexer(devices, make_line_handler(readings, metrics, args.beats_per_batch,
+                                                               af_monitor))
+    reader = threading.Thread(target=multiplexer.run, name='serial-reader', daemon=True)
+    if af_monitor:
+        workers.insert(0, af_monitor)
+    for worker in workers:
+        worker.start()
+    reader.start()
+    print(f"Lendo {len(devices)} dispositivo(s) e enviando para {args.api_url}")
+
+    def report():
+        print(metrics.format(readings.qsize(), len(spool) if spool else None))
+        connected = sum(device['connected'] for device in multiplexer.stats().values())
+        print(f"🔌 dispositivos conectados: {connected}/{len(devices)}")
+
+    try:
+        while True:
+            time.sleep(args.metrics_interval or 1.0)
+            if args.metrics_interval:
+                report()
+    except KeyboardInterrupt:
+        print("\nInterrompido pelo usuário. Fechando portas seriais.")
+    finally:
+        multiplexer.stop()
+        reader.join(2)
+        for worker in workers:
+            worker.stop()
+        report()
+        if spool and not any(worker.is_alive() for worker in workers):
+            spool.close()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
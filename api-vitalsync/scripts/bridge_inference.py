@@ -0,0 +1,181 @@
+"""
+bridge_inference.py
+-------------------
+Inferência de Fibrilação Atrial no próprio gateway (modo --edge-af).
+
+O modelo de janela treinado em IA-VITALSYNC (models/window_model.pkl, gerado
+por src/train_window_model.py) é carregado UMA vez na inicialização. Os
+batimentos detectados no sinal bruto de cada dispositivo (pulse_beats.PulseStream)
+alimentam um StreamingAFDetector por porta, que calcula as features R-R de forma
+incremental em janelas deslizantes e classifica cada janela.
+
+O modelo de registro inteiro (best_model.pkl) não é usado: aplicado a janelas,
+ele marcava todo usuário saudável como FA já na primeira janela. Sem um artefato
+com o marcador 'window_calibrated', o modo --edge-af se recusa a iniciar.
+
+Em vez de cada batimento, a API recebe apenas um RhythmSummary por janela
+(probabilidade de FA, FC média) e uma medição de BPM. Um episódio só começa
+(`af_onset`) quando onset_windows janelas SEGUIDAS têm FA (por padrão, o bastante
+para que nenhum batimento da primeira janela ainda esteja na última, então uma
+extrassístole isolada não gera alerta); o início vira um alerta na API, enviado
+sem esperar o intervalo normal de envio do spool.
+
+A classificação roda em uma thread própria: a thread serial só enfileira os
+instantes dos batimentos.
+"""
+
+import sys
+import queue
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bridge_serial import DeviceConfig
+from bridge_uploader import BridgeMetrics, Reading, RhythmSummary, collect_batch, enqueue_reading
+
+IA_ROOT = Path(__file__).resolve().parents[2] / 'IA-VITALSYNC'
+DEFAULT_MODELS_DIR = IA_ROOT / 'models'
+
+
+def load_af_model(models_dir: Path = DEFAULT_MODELS_DIR) -> Tuple:
+    """
+    Carrega o modelo de janela (IA-VITALSYNC/src/streaming_detector.py).
+
+    Returns:
+        (model, scaler, StreamingAFDetector, config), com config trazendo
+        feature_names, window_beats e as métricas do treino
+
+    Raises:
+        FileNotFoundError: Se window_model.pkl não existir
+        ValueError: Se o artefato não for um modelo calibrado em janelas
+    """
+    # Dependências de ML (numpy, scikit-learn, joblib) só são exigidas com --edge-af
+    sys.path.append(str(IA_ROOT / 'src'))
+    from streaming_detector import StreamingAFDetector, load_window_model
+
+    model, scaler, config = load_window_model(Path(models_dir))
+    return model, scaler, StreamingAFDetector, config
+
+
+class EdgeAFMonitor(threading.Thread):
+    """
+    Classifica janelas de batimentos de todos os dispositivos raw.
+
+    Args:
+        model: Modelo de janela (predict_proba)
+        scaler: Scaler do treinamento do modelo de janela
+        detector_class: StreamingAFDetector (recebido de load_af_model)
+        readings: Fila de envio da ponte (RhythmSummary + Reading)
+        metrics: Métricas da ponte (af_alerts)
+        window_beats: Tamanho da janela em intervalos entre batimentos
+        hop_beats: Classificar uma janela a cada N batimentos
+        threshold: Probabilidade mínima para marcar a janela como FA
+        max_delay: Espera máxima (s) de um batimento antes de ser classificado
+        feature_names: Features do modelo de janela (config['feature_names'] de load_af_model)
+        onset_windows: Janelas seguidas com FA para marcar o início de um episódio
+                       (padrão: window_beats // hop_beats + 1)
+    """
+
+    def __init__(self, model, scaler, detector_class, readings: queue.Queue, metrics: BridgeMetrics,
+                 window_beats: int = 60, hop_beats: int = 10, threshold: float = 0.5,
+                 max_delay: float = 0.05, feature_names: Optional[List[str]] = None,
+                 onset_windows: Optional[int] = None):
+        super().__init__(name='edge-af', daemon=True)
+        self.model = model
+        self.scaler = scaler
+        self.detector_class = detector_class
+        self.readings = readings
+        self.metrics = metrics
+        self.window_beats = window_beats
+        self.hop_beats = hop_beats
+        self.threshold = threshold
+        self.max_delay = max_delay
+        self.feature_names = feature_names
+        self.onset_windows = onset_windows or window_beats // max(1, hop_beats) + 1
+
+        self.beats = queue.Queue()
+        self.detectors: Dict[str, object] = {}
+        self.af_streak: Dict[str, int] = {}  # janelas seguidas com FA, por porta
+        self._stop_event = threading.Event()
+
+    def push_beat(self, device: DeviceConfig, beat_time: float, new_chain: bool):
+        """
+        Chamado pela thread serial a cada batimento detectado (não bloqueia).
+        """
+        self.beats.put((device, beat_time, new_chain))
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        self.join(timeout)
+
+    def _detector(self, device: DeviceConfig):
+        detector = self.detectors.get(device.port)
+        if detector is None:
+            options = {'feature_names': self.feature_names} if self.feature_names else {}
+            detector = self.detectors[device.port] = self.detector_class(
+                self.model, self.scaler,
+                window_beats=self.window_beats,
+                hop_beats=self.hop_beats,
+                sampling_freq=device.sample_rate,
+                threshold=self.threshold,
+                **options
+            )
+        return detector
+
+    def _classify(self, device: DeviceConfig, beats: List[Tuple[float, bool]]) -> List[Dict]:
+        """
+        Passa os batimentos de um dispositivo ao detector; as janelas completas
+        de cada trecho contínuo são classificadas em uma única chamada ao modelo.
+        """
+        detector = self._detector(device)
+        results = []
+        times = []
+        for beat_time, new_chain in beats:
+            if new_chain:
+                results += detector.push_peaks(times)
+                times = []
+                detector.break_chain()
+            times.append(beat_time)
+        results += detector.push_peaks(times)
+        return results
+
+    def _summarize(self, device: DeviceConfig, result: Dict) -> RhythmSummary:
+        streak = self.af_streak.get(device.port, 0) + 1 if result['is_af'] else 0
+        self.af_streak[device.port] = streak
+        onset = streak == self.onset_windows
+        if onset:
+            self.metrics.add('af_alerts')
+            print(f"⚠️  {device.port}: possível FA (P={result['probability_fa']:.2f}, "
+                  f"FC média {result['mean_hr_bpm']:.0f} bpm)")
+        return RhythmSummary(
+            user_id=device.user_id,
+            start=result['start_time'],
+            end=result['end_time'],
+            num_intervals=result['num_rr_intervals'],
+            mean_heart_rate=result['mean_hr_bpm'],
+            probability_af=result['probability_fa'],
+            is_af=result['is_af'],
+            af_onset=onset
+        )
+
+    def run(self):
+        while not (self._stop_event.is_set() and self.beats.empty()):
+            batch = collect_batch(self.beats, 10000, self.max_delay, self._stop_event)
+            if not batch:
+                continue
+
+            by_device = defaultdict(list)
+            devices = {}
+            for device, beat_time, new_chain in batch:
+                by_device[device.port].append((beat_time, new_chain))
+                devices[device.port] = device
+
+            for port, beats in by_device.items():
+                device = devices[port]
+                for result in self._classify(device, beats):
+                    summary = self._summarize(device, result)
+                    enqueue_reading(self.readings, summary, self.metrics)
+                    # BPM da janela para o histórico de Measurement (um por janela, não por batimento)
+                    enqueue_reading(self.readings, Reading(device.user_id, int(round(summary.mean_heart_rate)),
+                                                           summary.end), self.metrics)
@@ -0,0 +1,213 @@
+"""
+bridge_serial.py
+----------------
+Leitura de várias portas seriais em uma única thread (selectors), para que um
+gateway atenda dezenas de sensores sem um processo ou thread por dispositivo.
+
+Cada porta é aberta em modo não bloqueante e registrada no selector; quando há
+bytes disponíveis, eles são acumulados no buffer do dispositivo e cada linha
+completa é entregue ao callback `on_line(device, line, timestamp)`. Portas que
+caem (cabo USB desconectado) são reabertas periodicamente.
+
+ARQUIVO DE DISPOSITIVOS (JSON):
+    {
+      "devices": [
+        {"port": "/dev/ttyACM0", "userId": "68253c885c74f4364f021de3"},
+        {"port": "/dev/ttyACM1", "userId": "663d9b15d11aac5f406697a5", "baud": 115200,
+         "mode": "raw", "sampleRate": 250}
+      ]
+    }
+
+    mode: "bpm" (linhas 'BPM: 72', padrão) ou "raw" (amostras 'S:512,...', ver pulse_beats.py)
+
+Requer portas com fileno() (Linux/macOS).
+"""
+
+import json
+import time
+import selectors
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import serial
+
+# Linhas maiores que isso sem '\n' são descartadas (ruído na serial)
+MAX_LINE_BYTES = 1024
+
+# Distância mínima (s) entre os timestamps de duas linhas do mesmo dispositivo:
+# (userId, timestamp) é a chave de deduplicação no spool e na API, que guarda
+# milissegundos, então linhas lidas no mesmo read() não podem compartilhar o horário
+TIMESTAMP_STEP = 0.001
+
+
+@dataclass
+class DeviceConfig:
+    """
+    Um sensor: porta serial, usuário dono das medições e formato das linhas.
+    """
+    port: str
+    user_id: str
+    baud: int = 9600
+    mode: str = 'bpm'
+    sample_rate: float = 250.0
+
+
+@dataclass
+class DeviceState:
+    config: DeviceConfig
+    ser: Optional[serial.Serial] = None
+    buffer: bytearray = field(default_factory=bytearray)
+    lines: int = 0
+    reconnects: int = 0
+    next_retry: float = 0.0
+    last_timestamp: float = 0.0
+
+
+def load_device_map(path: str) -> List[DeviceConfig]:
+    """
+    Lê o mapeamento dispositivo → usuário de um arquivo JSON.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    devices = [DeviceConfig(d['port'], d['userId'], int(d.get('baud', 9600)),
+                            d.get('mode', 'bpm'), float(d.get('sampleRate', 250.0)))
+               for d in data['devices']]
+    ports = [d.port for d in devices]
+    if len(set(ports)) != len(ports):
+        raise ValueError(f"Porta repetida em {path}")
+    for device in devices:
+        if device.mode not in ('bpm', 'raw'):
+            raise ValueError(f"Modo inválido para {device.port}: {device.mode!r} (use 'bpm' ou 'raw')")
+    return devices
+
+
+def parse_device_arg(value: str, baud: int = 9600, mode: str = 'bpm',
+                     sample_rate: float = 250.0) -> DeviceConfig:
+    """
+    Converte '--device /dev/ttyACM1=<userId>' em DeviceConfig.
+    """
+    port, sep, user_id = value.partition('=')
+    if not sep or not port or not user_id:
+        raise ValueError(f"Use PORTA=USER_ID, recebido: {value!r}")
+    return DeviceConfig(port, user_id, baud, mode, sample_rate)
+
+
+class SerialMultiplexer:
+    """
+    Lê todas as portas em uma única thread.
+
+    Args:
+        devices: Dispositivos a ler
+        on_line: Callback chamado com (DeviceConfig, linha sem '\\n', timestamp); os
+                 timestamps de um dispositivo são estritamente crescentes, em
+                 milissegundos inteiros (ver TIMESTAMP_STEP)
+        retry_interval: Intervalo (s) entre tentativas de reabrir uma porta
+    """
+
+    def __init__(self, devices: List[DeviceConfig],
+                 on_line: Callable[[DeviceConfig, str, float], None],
+                 retry_interval: float = 5.0):
+        self.devices = [DeviceState(config) for config in devices]
+        self.on_line = on_line
+        self.retry_interval = retry_interval
+        self.selector = selectors.DefaultSelector()
+        self._stop_event = threading.Event()
+
+    def _open(self, state: DeviceState) -> bool:
+        try:
+            state.ser = serial.Serial(state.config.port, state.config.baud, timeout=0)
+        except (serial.SerialException, OSError) as e:
+            print(f"⚠️  {state.config.port}: não foi possível abrir ({e}), nova tentativa em "
+                  f"{self.retry_interval:g}s")
+            state.next_retry = time.monotonic() + self.retry_interval
+            return False
+
+        state.buffer.clear()
+        self.selector.register(state.ser.fileno(), selectors.EVENT_READ, state)
+        print(f"🔌 {state.config.port} conectado (usuário {state.config.user_id})")
+        return True
+
+    def _close(self, state: DeviceState, error: Exception = None):
+        if state.ser is None:
+            return
+        try:
+            self.selector.unregister(state.ser.fileno())
+        except (KeyError, ValueError, OSError):
+            pass
+        try:
+            state.ser.close()
+        except (serial.SerialException, OSError):
+            pass
+        state.ser = None
+        if error is not None:
+            print(f"⚠️  {state.config.port} desconectado ({error})")
+            state.reconnects += 1
+            state.next_retry = time.monotonic() + self.retry_interval
+
+    def _read(self, state: DeviceState):
+        try:
+            data = state.ser.read(state.ser.in_waiting or 1)
+        except (serial.SerialException, OSError) as e:
+            self._close(state, e)
+            return
+        if not data:
+            return
+
+        now = round(time.time(), 3)
+        state.buffer.extend(data)
+        while True:
+            end = state.buffer.find(b'\n')
+            if end < 0:
+                break
+            line = state.buffer[:end].decode('utf-8', errors='ignore').strip()
+            del state.buffer[:end + 1]
+            if line:
+                state.lines += 1
+                timestamp = round(max(now, state.last_timestamp + TIMESTAMP_STEP), 3)
+                state.last_timestamp = timestamp
+                self.on_line(state.config, line, timestamp)
+
+        if len(state.buffer) > MAX_LINE_BYTES:
+            state.buffer.clear()
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Estado de cada porta: conectada, linhas lidas e reconexões.
+        """
+        return {state.config.port: {'user_id': state.config.user_id,
+                                    'connected': state.ser is not None,
+                                    'lines': state.lines,
+                                    'reconnects': state.reconnects}
+                for state in self.devices}
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self, poll: float = 1.0):
+        """
+        Loop principal: espera bytes em qualquer porta (sem espera ativa) e
+        tenta reabrir as portas desconectadas.
+        """
+        for state in self.devices:
+            self._open(state)
+
+        try:
+            while not self._stop_event.is_set():
+                if self.selector.get_map():
+                    events = self.selector.select(timeout=poll)
+                else:
+                    self._stop_event.wait(poll)
+                    events = []
+
+                for key, _ in events:
+                    self._read(key.data)
+
+                now = time.monotonic()
+                for state in self.devices:
+                    if state.ser is None and now >= state.next_retry:
+                        self._open(state)
+        finally:
+            for state in self.devices:
+                self._close(state)
+            self.selector.close()
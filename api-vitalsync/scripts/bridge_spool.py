@@ -0,0 +1,392 @@
+"""
+bridge_spool.py
+---------------
+Spool local (SQLite em modo WAL) das leituras da ponte Arduino → API.
+
+Toda leitura é gravada no spool antes de ir para a rede. O SpoolReplayer envia
+as leituras pendentes em lotes e só as apaga depois que a API confirma; se a
+API cair, as leituras se acumulam no disco e são reenviadas em lotes maiores
+quando ela voltar, sem buracos no histórico de Measurement.
+
+- Deduplicação: (userId, timestamp) é único no spool, e a API ignora leituras
+  que já tem (reenvio de um lote cuja resposta se perdeu).
+- Disco limitado: acima de max_rows leituras pendentes, as mais antigas são
+  removidas (contadas em `spool_evicted`). O mesmo vale para os lotes de
+  intervalos entre batimentos do modo raw e para as janelas de inferência de
+  FA do modo --edge-af, cada um em sua tabela.
+- Alertas: uma janela com início de FA acorda o SpoolReplayer na hora, sem
+  esperar o intervalo de verificação do spool.
+- Recusas: um lote recusado pela API (4xx) é dividido ao meio até isolar os
+  itens recusados, que vão para a tabela dead_letters (contados em `rejected`)
+  em vez de bloquear o spool de todos os usuários. Falhas de rede e 5xx
+  continuam sendo reenviadas.
+"""
+
+import json
+import time
+import queue
+import sqlite3
+import threading
+from typing import Callable, List, Optional, Tuple
+
+from bridge_uploader import (
+    BridgeMetrics, IntervalBatch, MeasurementClient, Reading, RhythmSummary, collect_batch
+)
+
+# ~500 mil leituras ≈ 1 leitura/s de 5 dispositivos por 1 dia, algumas dezenas de MB
+DEFAULT_MAX_ROWS = 500_000
+
+
+class ReadingSpool:
+    """
+    Fila persistente de leituras (thread-safe).
+
+    Args:
+        path: Arquivo SQLite do spool
+        max_rows: Máximo de leituras pendentes mantidas no disco
+        metrics: Métricas da ponte (spooled / spool_evicted)
+    """
+
+    def __init__(self, path: str, max_rows: int = DEFAULT_MAX_ROWS, metrics: BridgeMetrics = None):
+        self.path = path
+        self.max_rows = max_rows
+        self.metrics = metrics or BridgeMetrics()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL: seguro contra queda do processo
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS readings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                heart_rate INTEGER NOT NULL,
+                timestamp REAL NOT NULL,
+                UNIQUE (user_id, timestamp)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rhythm_summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                start REAL NOT NULL,
+                end_time REAL NOT NULL,
+                num_intervals INTEGER NOT NULL,
+                mean_heart_rate REAL NOT NULL,
+                probability_af REAL NOT NULL,
+                is_af INTEGER NOT NULL,
+                af_onset INTEGER NOT NULL,
+                UNIQUE (user_id, end_time)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS interval_batches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                start REAL NOT NULL,
+                intervals_ms TEXT NOT NULL,
+                UNIQUE (user_id, start)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status INTEGER,
+                rejected_at REAL NOT NULL
+            )
+        """)
+        self._sizes = {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                       for table in ('readings', 'interval_batches', 'rhythm_summaries')}
+        # Sinalizado quando chega um início de FA (o replayer envia sem esperar)
+        self.urgent = threading.Event()
+
+    def __len__(self) -> int:
+        return sum(self._sizes.values())
+
+    def _insert(self, table: str, sql: str, rows: List[Tuple]) -> Tuple[int, int]:
+        # Chamado com o lock e a transação abertos
+        before = self._conn.total_changes
+        self._conn.executemany(sql, rows)
+        inserted = self._conn.total_changes - before
+        self._sizes[table] += inserted
+
+        evicted = 0
+        if self._sizes[table] > self.max_rows:
+            evicted = self._conn.execute(
+                f"DELETE FROM {table} WHERE id IN (SELECT id FROM {table} ORDER BY id LIMIT ?)",
+                (self._sizes[table] - self.max_rows,)
+            ).rowcount
+            self._sizes[table] -= evicted
+        return inserted, evicted
+
+    def append(self, items: List) -> int:
+        """
+        Grava leituras (Reading), lotes de intervalos (IntervalBatch) e janelas
+        de FA (RhythmSummary) em uma única transação (duplicados são ignorados).
+
+        Returns:
+            Número de itens novos gravados
+        """
+        readings = [(r.user_id, r.heart_rate, r.timestamp)
+                    for r in items if isinstance(r, Reading)]
+        batches = [(b.user_id, b.start, json.dumps(b.intervals_ms))
+                   for b in items if isinstance(b, IntervalBatch)]
+        summaries = [(r.user_id, r.start, r.end, r.num_intervals, r.mean_heart_rate,
+                      r.probability_af, int(r.is_af), int(r.af_onset))
+                     for r in items if isinstance(r, RhythmSummary)]
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            inserted, evicted = self._insert(
+                'readings',
+                "INSERT OR IGNORE INTO readings (user_id, heart_rate, timestamp) VALUES (?, ?, ?)",
+                readings
+            )
+            if batches:
+                batch_inserted, batch_evicted = self._insert(
+                    'interval_batches',
+                    "INSERT OR IGNORE INTO interval_batches (user_id, start, intervals_ms) VALUES (?, ?, ?)",
+                    batches
+                )
+                inserted += batch_inserted
+                evicted += batch_evicted
+            if summaries:
+                summary_inserted, summary_evicted = self._insert(
+                    'rhythm_summaries',
+                    "INSERT OR IGNORE INTO rhythm_summaries (user_id, start, end_time, num_intervals, "
+                    "mean_heart_rate, probability_af, is_af, af_onset) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    summaries
+                )
+                inserted += summary_inserted
+                evicted += summary_evicted
+            self._conn.execute("COMMIT")
+
+        if any(isinstance(r, RhythmSummary) and r.af_onset for r in items):
+            self.urgent.set()
+
+        self.metrics.add('spooled', inserted)
+        if evicted:
+            self.metrics.add('spool_evicted', evicted)
+        return inserted
+
+    def peek(self, limit: int) -> List[Tuple[int, Reading]]:
+        """
+        Retorna as `limit` leituras pendentes mais antigas, sem removê-las.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, user_id, heart_rate, timestamp FROM readings ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(row_id, Reading(user_id, heart_rate, timestamp))
+                for row_id, user_id, heart_rate, timestamp in rows]
+
+    def peek_intervals(self, limit: int) -> List[Tuple[int, IntervalBatch]]:
+        """
+        Retorna os `limit` lotes de intervalos pendentes mais antigos, sem removê-los.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, user_id, start, intervals_ms FROM interval_batches ORDER BY id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [(row_id, IntervalBatch(user_id, start, json.loads(intervals_ms)))
+                for row_id, user_id, start, intervals_ms in rows]
+
+    def peek_rhythm(self, limit: int) -> List[Tuple[int, RhythmSummary]]:
+        """
+        Retorna as `limit` janelas de FA pendentes mais antigas, sem removê-las.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, user_id, start, end_time, num_intervals, mean_heart_rate, probability_af, "
+                "is_af, af_onset FROM rhythm_summaries ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(row[0], RhythmSummary(row[1], row[2], row[3], row[4], row[5], row[6],
+                                       bool(row[7]), bool(row[8])))
+                for row in rows]
+
+    def _ack(self, table: str, last_id: int) -> int:
+        with self._lock:
+            removed = self._conn.execute(f"DELETE FROM {table} WHERE id <= ?", (last_id,)).rowcount
+            self._sizes[table] -= removed
+        return removed
+
+    def ack(self, last_id: int) -> int:
+        """
+        Remove as leituras já confirmadas pela API (todas com id <= last_id).
+        """
+        return self._ack('readings', last_id)
+
+    def ack_intervals(self, last_id: int) -> int:
+        """
+        Remove os lotes de intervalos já confirmados pela API (todos com id <= last_id).
+        """
+        return self._ack('interval_batches', last_id)
+
+    def ack_rhythm(self, last_id: int) -> int:
+        """
+        Remove as janelas de FA já confirmadas pela API (todas com id <= last_id).
+        """
+        return self._ack('rhythm_summaries', last_id)
+
+    def dead_letter(self, table: str, row_id: int, item, status: Optional[int]):
+        """
+        Move um item recusado pela API da tabela de pendências para dead_letters
+        (JSON enviado + status HTTP). Mantém no máximo max_rows itens recusados.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO dead_letters (source, payload, status, rejected_at) VALUES (?, ?, ?, ?)",
+                (table, json.dumps(item.to_json()), status, time.time())
+            )
+            self._sizes[table] -= self._conn.execute(f"DELETE FROM {table} WHERE id = ?", (row_id,)).rowcount
+            self._conn.execute("DELETE FROM dead_letters WHERE id <= (SELECT MAX(id) FROM dead_letters) - ?",
+                               (self.max_rows,))
+            self._conn.execute("COMMIT")
+        self.metrics.add('rejected')
+
+    def dead_letters(self, limit: int = 100) -> List[Tuple[str, dict, Optional[int]]]:
+        """
+        Itens recusados pela API, dos mais antigos para os mais novos: (tabela, JSON, status).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, payload, status FROM dead_letters ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(source, json.loads(payload), status) for source, payload, status in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+
+
+class SpoolWriter(threading.Thread):
+    """
+    Esvazia a fila em memória para o spool, em pequenas transações.
+    """
+
+    def __init__(self, readings: queue.Queue, spool: ReadingSpool,
+                 batch_size: int = 200, max_delay: float = 0.2):
+        super().__init__(name='spool-writer', daemon=True)
+        self.readings = readings
+        self.spool = spool
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._stop_event = threading.Event()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop_event.set()
+        self.join(timeout)
+
+    def run(self):
+        while not (self._stop_event.is_set() and self.readings.empty()):
+            batch = collect_batch(self.readings, self.batch_size, self.max_delay, self._stop_event)
+            if batch:
+                self.spool.append(batch)
+
+
+class SpoolReplayer(threading.Thread):
+    """
+    Envia as leituras pendentes do spool para a API, das mais antigas para as
+    mais novas, e as remove do spool após a confirmação.
+
+    Em operação normal os lotes são pequenos (o que chegou desde o último
+    envio); depois de uma queda, o acúmulo é drenado em lotes de até
+    replay_batch_size leituras. Falhas de rede e 5xx usam backoff exponencial;
+    itens recusados pela API (4xx) são isolados e vão para a dead-letter.
+
+    Args:
+        client: Cliente HTTP da API
+        spool: Spool de leituras
+        replay_batch_size: Máximo de leituras por requisição
+        max_delay: Intervalo (s) entre verificações do spool quando ele está vazio
+        max_backoff: Intervalo máximo (s) entre tentativas após falhas
+    """
+
+    def __init__(self, client: MeasurementClient, spool: ReadingSpool,
+                 replay_batch_size: int = 500, max_delay: float = 1.0, max_backoff: float = 30.0):
+        super().__init__(name='spool-replayer', daemon=True)
+        self.client = client
+        self.spool = spool
+        self.replay_batch_size = replay_batch_size
+        self.max_delay = max_delay
+        self.max_backoff = max_backoff
+        self._stop_event = threading.Event()
+
+    def stop(self, flush_timeout: float = 5.0):
+        """
+        Encerra o envio; o que não for enviado continua no spool para a próxima execução.
+        """
+        self._stop_event.set()
+        self.spool.urgent.set()
+        self.join(flush_timeout)
+
+    def _replay_once(self) -> Tuple[bool, bool]:
+        """
+        Envia um lote de cada tipo pendente. Retorna (havia pendências, tudo foi aceito).
+        """
+        # Janelas de FA primeiro: levam os alertas
+        pending_rhythm = self.spool.peek_rhythm(self.replay_batch_size)
+        pending = self.spool.peek(self.replay_batch_size)
+        # Lotes de intervalos têm até ~30 batimentos cada
+        pending_intervals = self.spool.peek_intervals(max(1, self.replay_batch_size // 30))
+        ok = True
+
+        if pending_rhythm:
+            ok = self._deliver('rhythm_summaries', pending_rhythm, self.client.send_rhythm, self.spool.ack_rhythm)
+        if pending and ok:
+            ok = self._deliver('readings', pending, self.client.send, self.spool.ack)
+        if pending_intervals and ok:
+            ok = self._deliver('interval_batches', pending_intervals, self.client.send_intervals,
+                               self.spool.ack_intervals)
+
+        return bool(pending_rhythm or pending or pending_intervals), ok
+
+    def _deliver(self, table: str, rows: List[Tuple[int, object]], send: Callable[[List], bool],
+                 ack: Callable[[int], int]) -> bool:
+        """
+        Envia as linhas [(id, item)] de uma tabela e as confirma no spool. Se a
+        API recusar o lote (4xx), ele é dividido ao meio até isolar os itens
+        recusados, que vão para a dead-letter; os demais são entregues.
+
+        Returns:
+            True se todas as linhas foram confirmadas ou descartadas; False numa
+            falha transitória (rede, 5xx), com o restante mantido no spool
+        """
+        if send([item for _, item in rows]):
+            ack(rows[-1][0])
+            return True
+        if not self.client.rejected:
+            return False
+
+        if len(rows) == 1:
+            row_id, item = rows[0]
+            self.spool.dead_letter(table, row_id, item, self.client.last_error_status)
+            print(f"🗑️  Item recusado pela API (HTTP {self.client.last_error_status}) "
+                  f"movido para a dead-letter: {item}")
+            return True
+
+        middle = len(rows) // 2
+        return (self._deliver(table, rows[:middle], send, ack)
+                and self._deliver(table, rows[middle:], send, ack))
+
+    def run(self):
+        backoff = 0.5
+        while True:
+            had_pending, ok = self._replay_once()
+            if not had_pending:
+                self.spool.urgent.wait(self.max_delay)
+                self.spool.urgent.clear()
+                if self._stop_event.is_set():
+                    break
+                continue
+
+            if ok:
+                backoff = 0.5
+            elif self._stop_event.wait(backoff):
+                break
+            else:
+                backoff = min(backoff * 2, self.max_backoff)
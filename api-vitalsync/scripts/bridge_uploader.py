@@ -0,0 +1,446 @@
+"""
+bridge_uploader.py
+------------------
+Pipeline produtor/consumidor da ponte Arduino → API.
+
+A leitura serial nunca espera pela rede: cada leitura de BPM entra em uma fila
+limitada e uma thread separada envia as leituras em lotes (por tamanho ou por
+tempo) para POST /measurements/batch, reaproveitando a mesma conexão HTTP
+(requests.Session com keep-alive).
+
+Se a fila encher (API lenta ou fora do ar), a leitura mais antiga é descartada
+e contada em `dropped`; as métricas de backpressure ficam em BridgeMetrics.
+Com o spool em disco (bridge_spool.py) a fila é esvaziada para o SQLite e o
+envio passa a ser feito pelo SpoolReplayer, sem perda durante quedas da API.
+"""
+
+import time
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
+
+import requests
+
+# Status 4xx que não dizem respeito ao conteúdo enviado (credenciais, rota,
+# limites temporários): o mesmo lote pode ser aceito depois
+RETRYABLE_CLIENT_ERRORS = {401, 403, 404, 408, 425, 429}
+
+
+def _iso(timestamp: float) -> str:
+    iso = datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='milliseconds')
+    return iso.replace('+00:00', 'Z')
+
+
+@dataclass
+class Reading:
+    """
+    Uma leitura de frequência cardíaca de um dispositivo.
+    """
+    user_id: str
+    heart_rate: int
+    timestamp: float  # epoch (s) do momento da leitura na porta serial
+
+    def to_json(self) -> Dict:
+        return {
+            "userId": self.user_id,
+            "heartRate": self.heart_rate,
+            "timestamp": _iso(self.timestamp)
+        }
+
+
+@dataclass
+class IntervalBatch:
+    """
+    Sequência contínua de intervalos entre batimentos (modo raw, ver pulse_beats.py).
+    """
+    user_id: str
+    start: float  # epoch (s) do primeiro batimento da sequência
+    intervals_ms: List[int]
+
+    def heart_rate(self) -> int:
+        """BPM a partir da mediana dos intervalos do lote."""
+        ordered = sorted(self.intervals_ms)
+        return int(round(60000 / ordered[len(ordered) // 2]))
+
+    def end(self) -> float:
+        """Horário (epoch) do último batimento do lote."""
+        return self.start + sum(self.intervals_ms) / 1000
+
+    def to_json(self) -> Dict:
+        return {
+            "userId": self.user_id,
+            "start": _iso(self.start),
+            "intervalsMs": self.intervals_ms
+        }
+
+
+@dataclass
+class RhythmSummary:
+    """
+    Resultado da inferência de FA em uma janela de batimentos (modo --edge-af,
+    ver bridge_inference.py): substitui o envio de cada batimento.
+    """
+    user_id: str
+    start: float  # epoch (s) do primeiro batimento da janela
+    end: float    # epoch (s) do último batimento da janela
+    num_intervals: int
+    mean_heart_rate: float
+    probability_af: float
+    is_af: bool
+    af_onset: bool  # primeira janela com FA após uma janela sem FA (gera alerta na API)
+
+    def to_json(self) -> Dict:
+        return {
+            "userId": self.user_id,
+            "start": _iso(self.start),
+            "end": _iso(self.end),
+            "numIntervals": self.num_intervals,
+            "meanHeartRate": round(self.mean_heart_rate, 1),
+            "probabilityAf": round(self.probability_af, 4),
+            "isAf": self.is_af,
+            "afOnset": self.af_onset
+        }
+
+
+def parse_bpm_line(line: str) -> Optional[int]:
+    """
+    Extrai o BPM de uma linha 'BPM: 72' enviada pelo Arduino (None se não for uma leitura).
+    """
+    if not line.startswith("BPM:"):
+        return None
+    try:
+        return int(line.split(":", 1)[1].strip())
+    except ValueError:
+        return None
+
+
+class BridgeMetrics:
+    """
+    Contadores da ponte (thread-safe).
+
+    - enqueued: leituras colocadas na fila
+    - dropped: leituras descartadas com a fila cheia (backpressure)
+    - sent / failed: leituras enviadas / lotes que falharam
+    - rejected: itens recusados pela API (4xx), movidos para a dead-letter do spool
+      ou, sem spool, descartados
+    - duplicates: leituras que a API já tinha (reenvios após uma resposta perdida)
+    - queue_high_water: maior ocupação da fila observada
+    - spooled / spool_evicted: leituras gravadas no spool / removidas pelo limite de tamanho
+    - beats_sent: intervalos entre batimentos enviados (modo raw)
+    - rhythm_sent / af_alerts: janelas de inferência enviadas / inícios de FA detectados (modo --edge-af)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {
+            'enqueued': 0,
+            'dropped': 0,
+            'sent': 0,
+            'batches': 0,
+            'failed': 0,
+            'rejected': 0,
+            'duplicates': 0,
+            'queue_high_water': 0,
+            'spooled': 0,
+            'spool_evicted': 0,
+            'beats_sent': 0,
+            'rhythm_sent': 0,
+            'af_alerts': 0
+        }
+        self.last_upload_ms = 0.0
+
+    def add(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe_queue(self, size: int):
+        with self._lock:
+            if size > self.counters['queue_high_water']:
+                self.counters['queue_high_water'] = size
+
+    def observe_upload(self, batch_size: int, latency_ms: float):
+        with self._lock:
+            self.counters['sent'] += batch_size
+            self.counters['batches'] += 1
+            self.last_upload_ms = latency_ms
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            snapshot = dict(self.counters)
+            snapshot['last_upload_ms'] = self.last_upload_ms
+        snapshot['avg_batch'] = snapshot['sent'] / snapshot['batches'] if snapshot['batches'] else 0.0
+        return snapshot
+
+    def format(self, queue_size: int, spool_backlog: Optional[int] = None) -> str:
+        s = self.snapshot()
+        line = (f"📊 fila={queue_size} (máx {s['queue_high_water']}) | enviados={s['sent']} "
+                f"em {s['batches']} lotes (média {s['avg_batch']:.1f}) | "
+                f"descartados={s['dropped']} | falhas={s['failed']} | "
+                f"último envio={s['last_upload_ms']:.0f}ms")
+        if s['beats_sent']:
+            line += f" | intervalos enviados={s['beats_sent']}"
+        if s['rhythm_sent'] or s['af_alerts']:
+            line += f" | janelas FA enviadas={s['rhythm_sent']} (alertas={s['af_alerts']})"
+        if spool_backlog is not None:
+            line += (f" | spool={spool_backlog} pendentes "
+                     f"(duplicados={s['duplicates']}, removidos={s['spool_evicted']}, "
+                     f"recusados={s['rejected']})")
+        elif s['rejected']:
+            line += f" | recusados={s['rejected']}"
+        return line
+
+
+def enqueue_reading(readings: queue.Queue, reading: Union[Reading, IntervalBatch, RhythmSummary],
+                    metrics: BridgeMetrics):
+    """
+    Coloca uma leitura (ou lote de intervalos) na fila sem bloquear; com a fila
+    cheia, descarta o item mais antigo.
+    """
+    while True:
+        try:
+            readings.put_nowait(reading)
+            break
+        except queue.Full:
+            try:
+                readings.get_nowait()
+                metrics.add('dropped')
+            except queue.Empty:
+                pass
+    metrics.add('enqueued')
+    metrics.observe_queue(readings.qsize())
+
+
+def collect_batch(readings: queue.Queue, batch_size: int, max_delay: float,
+                  stop_event: threading.Event, poll: float = 0.5) -> List:
+    """
+    Retira um lote da fila: espera até `poll` segundos pela primeira leitura e
+    depois até max_delay segundos (ou batch_size leituras) pelas seguintes.
+    Ao encerrar (stop_event), esvazia a fila sem esperar o prazo do lote.
+    """
+    try:
+        first = readings.get(timeout=poll)
+    except queue.Empty:
+        return []
+
+    batch = [first]
+    deadline = time.monotonic() + max_delay
+    while len(batch) < batch_size:
+        remaining = 0 if stop_event.is_set() else deadline - time.monotonic()
+        try:
+            if remaining > 0:
+                batch.append(readings.get(timeout=remaining))
+            else:
+                batch.append(readings.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+class MeasurementClient:
+    """
+    Cliente HTTP de /measurements com conexão persistente.
+
+    Args:
+        api_url: URL de /measurements (os lotes vão para {api_url}/batch)
+        metrics: Métricas da ponte
+        timeout: Timeout (s) de cada requisição HTTP
+    """
+
+    def __init__(self, api_url: str, metrics: BridgeMetrics, timeout: float = 5.0):
+        self.api_url = api_url.rstrip('/')
+        self.batch_url = f"{self.api_url}/batch"
+        self.metrics = metrics
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        self.batch_supported = True
+        self.last_error_status: Optional[int] = None  # status HTTP da última falha (None: erro de rede)
+
+    @property
+    def rejected(self) -> bool:
+        """
+        True se a última falha foi uma recusa do conteúdo pela API (4xx fora de
+        RETRYABLE_CLIENT_ERRORS): reenviar os mesmos itens não adianta.
+        """
+        status = self.last_error_status
+        return status is not None and 400 <= status < 500 and status not in RETRYABLE_CLIENT_ERRORS
+
+    def _record_failure(self, error: requests.RequestException, description: str):
+        response = getattr(error, 'response', None)
+        self.last_error_status = response.status_code if response is not None else None
+        self.metrics.add('failed')
+        print(f"❌ Erro ao enviar {description}: {error}")
+
+    def send(self, batch: List[Reading]) -> bool:
+        """
+        Envia um lote. Retorna True se a API aceitou todas as leituras.
+        """
+        start = time.perf_counter()
+        try:
+            if self.batch_supported:
+                response = self.session.post(self.batch_url, timeout=self.timeout,
+                                             json={"measurements": [r.to_json() for r in batch]})
+                if response.status_code == 404:
+                    # API sem a rota de lote: enviar uma a uma pela mesma conexão
+                    print("⚠️  API sem /measurements/batch, enviando leituras individualmente")
+                    self.batch_supported = False
+                    return self.send(batch)
+                response.raise_for_status()
+                try:
+                    duplicates = response.json().get('duplicates', 0)
+                except ValueError:
+                    duplicates = 0
+                if duplicates:
+                    self.metrics.add('duplicates', duplicates)
+            else:
+                for reading in batch:
+                    self.session.post(self.api_url, json=reading.to_json(),
+                                      timeout=self.timeout).raise_for_status()
+        except requests.RequestException as e:
+            self._record_failure(e, f"lote de {len(batch)} leituras")
+            return False
+
+        self.metrics.observe_upload(len(batch), (time.perf_counter() - start) * 1000)
+        return True
+
+    def send_intervals(self, batches: List[IntervalBatch]) -> bool:
+        """
+        Envia lotes de intervalos entre batimentos para {api_url}/intervals.
+        """
+        try:
+            response = self.session.post(f"{self.api_url}/intervals", timeout=self.timeout,
+                                         json={"batches": [b.to_json() for b in batches]})
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self._record_failure(e, f"{len(batches)} lotes de intervalos")
+            return False
+
+        self.metrics.add('beats_sent', sum(len(b.intervals_ms) for b in batches))
+        return True
+
+    def send_rhythm(self, summaries: List[RhythmSummary]) -> bool:
+        """
+        Envia resultados de inferência de FA para {api_url}/rhythm.
+        """
+        try:
+            response = self.session.post(f"{self.api_url}/rhythm", timeout=self.timeout,
+                                         json={"summaries": [s.to_json() for s in summaries]})
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self._record_failure(e, f"{len(summaries)} janelas de FA")
+            return False
+
+        self.metrics.add('rhythm_sent', len(summaries))
+        return True
+
+    def send_items(self, items: List) -> List:
+        """
+        Envia uma mistura de Reading, IntervalBatch e RhythmSummary (cada tipo
+        em uma requisição; janelas de FA primeiro, por levarem os alertas).
+        Após a primeira falha os tipos seguintes não são tentados.
+
+        Returns:
+            Itens ainda não aceitos pela API (vazio se tudo foi enviado); os
+            tipos já aceitos nunca voltam, então um reenvio não os duplica
+        """
+        parts = [
+            ([item for item in items if isinstance(item, RhythmSummary)], self.send_rhythm),
+            ([item for item in items if isinstance(item, Reading)], self.send),
+            ([item for item in items if isinstance(item, IntervalBatch)], self.send_intervals),
+        ]
+        for index, (part, send) in enumerate(parts):
+            if part and not send(part):
+                return [item for remaining, _ in parts[index:] for item in remaining]
+        return []
+
+    def close(self):
+        self.session.close()
+
+
+class BatchUploader(threading.Thread):
+    """
+    Consome a fila de leituras e envia lotes para a API (modo sem spool).
+
+    Um lote é enviado quando atinge batch_size leituras ou quando a leitura mais
+    antiga do lote espera max_delay segundos. Em caso de erro só a parte do
+    lote ainda não aceita é reenviada, com backoff exponencial (até
+    max_backoff segundos), enquanto as novas leituras continuam se acumulando
+    na fila. Itens que a API recusa (4xx, ver MeasurementClient.rejected) não
+    são reenviados: o lote é dividido até isolá-los e eles são descartados.
+
+    Args:
+        client: Cliente HTTP da API
+        readings: Fila de Reading
+        batch_size: Máximo de leituras por requisição
+        max_delay: Espera máxima (s) de uma leitura antes de ser enviada
+        max_backoff: Intervalo máximo (s) entre tentativas após falhas
+    """
+
+    def __init__(self, client: MeasurementClient, readings: queue.Queue,
+                 batch_size: int = 50, max_delay: float = 1.0, max_backoff: float = 30.0):
+        super().__init__(name='batch-uploader', daemon=True)
+        self.client = client
+        self.readings = readings
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.max_backoff = max_backoff
+        self._stop_event = threading.Event()
+
+    def stop(self, flush_timeout: float = 5.0):
+        """
+        Encerra o envio, tentando mandar o que ainda estiver na fila.
+        """
+        self._stop_event.set()
+        self.join(flush_timeout)
+
+    def _send(self, items: List) -> List:
+        """
+        Envia os itens. Se a API recusar um tipo de item (4xx), a parte
+        recusada é dividida ao meio até isolar os itens recusados, que são
+        descartados; os demais são entregues.
+
+        Returns:
+            Itens a reenviar após uma falha transitória (rede, 5xx)
+        """
+        remaining = self.client.send_items(items)
+        if not remaining or not self.client.rejected:
+            return remaining
+
+        # send_items para no primeiro tipo que falhou: é a parte recusada
+        failed_type = type(remaining[0])
+        part = [item for item in remaining if type(item) is failed_type]
+        rest = [item for item in remaining if type(item) is not failed_type]
+
+        if len(part) == 1:
+            self.client.metrics.add('rejected')
+            print(f"🗑️  Item recusado pela API (HTTP {self.client.last_error_status}) descartado: {part[0]}")
+            unsent = []
+        else:
+            middle = len(part) // 2
+            unsent = self._send(part[:middle])
+            unsent = unsent + part[middle:] if unsent else self._send(part[middle:])
+
+        if unsent or not rest:
+            return unsent + rest
+        return self._send(rest)
+
+    def run(self):
+        backoff = 0.5
+        batch = []
+
+        while not (self._stop_event.is_set() and self.readings.empty() and not batch):
+            if not batch:
+                batch = collect_batch(self.readings, self.batch_size, self.max_delay, self._stop_event)
+                if not batch:
+                    continue
+
+            batch = self._send(batch)
+            if not batch:
+                backoff = 0.5
+            elif self._stop_event.is_set():
+                break
+            else:
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1,217 @@
+"""
+pulse_beats.py
+--------------
+Detecção incremental de batimentos no sinal bruto do pulse sensor (PPG), feita
+no gateway, para enviar intervalos entre batimentos (IBI) em vez da forma de onda.
+
+PROTOCOLO SERIAL (modo raw):
+    O Arduino envia as leituras do analogRead a uma taxa fixa (--sample-rate),
+    uma ou várias por linha:
+        S:512
+        S:512,518,530,547
+
+DETECTOR (por amostra, O(1)):
+    1. Suavização (média exponencial, ~8 Hz) para tirar ruído de alta frequência
+    2. Remoção da linha de base (média exponencial lenta, ~0.5 Hz)
+    3. Envelope de amplitude com decaimento (~2 s) → limiar adaptativo
+    4. Batimento = máximo local acima do limiar, com período refratário
+       (min_ibi) e histerese para não contar o mesmo pico duas vezes
+
+Os tempos dos batimentos vêm do índice da amostra (sem jitter da serial/USB),
+ancorados no relógio do gateway; se o relógio e a contagem de amostras
+divergirem (amostras perdidas, reconexão), a âncora é refeita e a sequência de
+intervalos recomeça.
+"""
+
+import math
+from typing import Callable, List, Optional, Tuple
+
+from bridge_uploader import IntervalBatch
+
+# Divergência máxima (s) entre o relógio do gateway e a contagem de amostras
+MAX_CLOCK_DRIFT = 1.0
+
+
+def parse_sample_line(line: str) -> Optional[List[int]]:
+    """
+    Extrai as amostras de uma linha 'S:512,518,...' (None se não for uma linha de amostras).
+    """
+    if not line.startswith("S:"):
+        return None
+    try:
+        return [int(value) for value in line[2:].split(',') if value.strip()]
+    except ValueError:
+        return None
+
+
+class PulseBeatDetector:
+    """
+    Detector incremental de picos sistólicos.
+
+    Args:
+        fs: Taxa de amostragem do sensor (Hz)
+        min_ibi: Intervalo mínimo entre batimentos em s (período refratário; 0.3 s = 200 BPM)
+        max_ibi: Intervalo máximo em s; acima disso a sequência é reiniciada (2.0 s = 30 BPM)
+        threshold: Fração do envelope de amplitude usada como limiar
+        warmup: Segundos iniciais sem detecção (estabilização dos filtros)
+    """
+
+    def __init__(self, fs: float, min_ibi: float = 0.3, max_ibi: float = 2.0,
+                 threshold: float = 0.5, warmup: float = 2.0):
+        self.fs = fs
+        self.min_gap = int(min_ibi * fs)
+        self.max_gap = int(max_ibi * fs)
+        self.threshold = threshold
+        self.warmup = int(warmup * fs)
+
+        # Coeficientes das médias exponenciais: alpha = 1 - exp(-2π fc / fs)
+        self.alpha_smooth = 1 - math.exp(-2 * math.pi * 8.0 / fs)
+        self.alpha_baseline = 1 - math.exp(-2 * math.pi * 0.5 / fs)
+        self.envelope_decay = math.exp(-1 / (2.0 * fs))
+
+        self.n = 0
+        self.smooth = None
+        self.baseline = None
+        self.envelope = 0.0
+        self.in_peak = False
+        self.peak_value = 0.0
+        self.peak_index = 0
+        self.last_beat = None
+
+    def reset_chain(self):
+        """
+        Esquece o último batimento: o próximo não gera intervalo (ex.: amostras perdidas).
+        """
+        self.last_beat = None
+        self.in_peak = False
+
+    def process(self, samples: List[int]) -> List[Tuple[int, Optional[int]]]:
+        """
+        Processa um bloco de amostras.
+
+        Returns:
+            Lista de (índice da amostra do batimento, intervalo desde o batimento
+            anterior em amostras ou None se a sequência foi reiniciada)
+        """
+        beats = []
+        alpha_smooth = self.alpha_smooth
+        alpha_baseline = self.alpha_baseline
+        decay = self.envelope_decay
+
+        for x in samples:
+            i = self.n
+            self.n += 1
+
+            if self.smooth is None:
+                self.smooth = self.baseline = float(x)
+            self.smooth += alpha_smooth * (x - self.smooth)
+            self.baseline += alpha_baseline * (self.smooth - self.baseline)
+            d = self.smooth - self.baseline
+
+            envelope = self.envelope * decay
+            if d > envelope:
+                envelope = d
+            self.envelope = envelope
+            if i < self.warmup:
+                continue
+
+            limit = self.threshold * envelope
+            if self.in_peak:
+                if d > self.peak_value:
+                    self.peak_value = d
+                    self.peak_index = i
+                elif d < 0.5 * limit:
+                    # Fim do pico (histerese): o máximo encontrado é o batimento
+                    self.in_peak = False
+                    beat = self.peak_index
+                    gap = None if self.last_beat is None else beat - self.last_beat
+                    if gap is not None and gap > self.max_gap:
+                        gap = None
+                    self.last_beat = beat
+                    beats.append((beat, gap))
+            elif d > limit and (self.last_beat is None or i - self.last_beat >= self.min_gap):
+                self.in_peak = True
+                self.peak_value = d
+                self.peak_index = i
+
+        return beats
+
+
+class PulseStream:
+    """
+    Sinal bruto de um dispositivo → lotes de intervalos entre batimentos.
+
+    Cada lote é uma sequência contínua de batimentos: `start` é o horário do
+    primeiro batimento e `intervals_ms` os intervalos seguintes, de modo que os
+    tempos de todos os batimentos podem ser reconstruídos no servidor.
+
+    Args:
+        user_id: Usuário dono do dispositivo
+        fs: Taxa de amostragem do sensor (Hz)
+        max_beats: Intervalos por lote
+        max_seconds: Idade máxima (s) do lote antes de ser emitido
+        on_beat: Callback opcional chamado a cada batimento com (horário epoch,
+                 True se a sequência foi reiniciada neste batimento)
+    """
+
+    def __init__(self, user_id: str, fs: float, max_beats: int = 30, max_seconds: float = 30.0,
+                 on_beat: Optional[Callable[[float, bool], None]] = None):
+        self.user_id = user_id
+        self.fs = fs
+        self.max_beats = max_beats
+        self.max_seconds = max_seconds
+        self.on_beat = on_beat
+        self.detector = PulseBeatDetector(fs)
+        self.t0 = None  # horário (epoch) da amostra de índice 0
+        self.batch_start = None
+        self.intervals: List[int] = []
+
+    def _emit(self) -> Optional[IntervalBatch]:
+        batch = None
+        if self.intervals:
+            batch = IntervalBatch(self.user_id, self.batch_start, self.intervals)
+        self.batch_start = None
+        self.intervals = []
+        return batch
+
+    def feed(self, samples: List[int], received_at: float) -> List[IntervalBatch]:
+        """
+        Processa as amostras de uma linha recebida em `received_at` (epoch).
+
+        Returns:
+            Lotes completos (por número de batimentos, idade ou quebra da sequência)
+        """
+        batches = []
+
+        # A última amostra da linha foi lida em received_at
+        last_index = self.detector.n + len(samples) - 1
+        if self.t0 is None or abs(self.t0 + last_index / self.fs - received_at) > MAX_CLOCK_DRIFT:
+            if self.t0 is not None:
+                self.detector.reset_chain()
+                batch = self._emit()
+                if batch:
+                    batches.append(batch)
+            self.t0 = received_at - last_index / self.fs
+
+        for beat_index, gap in self.detector.process(samples):
+            beat_time = self.t0 + beat_index / self.fs
+            if self.on_beat is not None:
+                self.on_beat(beat_time, gap is None)
+            if gap is None:
+                # Sequência reiniciada: fechar o lote atual e começar outro neste batimento
+                batch = self._emit()
+                if batch:
+                    batches.append(batch)
+                self.batch_start = beat_time
+                continue
+
+            if self.batch_start is None:
+                self.batch_start = beat_time - gap / self.fs
+            self.intervals.append(int(round(gap * 1000 / self.fs)))
+
+            if (len(self.intervals) >= self.max_beats
+                    or beat_time - self.batch_start >= self.max_seconds):
+                batches.append(self._emit())
+                self.batch_start = beat_time
+
+        return batches
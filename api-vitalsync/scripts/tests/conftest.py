@@ -0,0 +1,56 @@
+"""
+Configuração dos testes da ponte: os módulos de scripts/ são importados pelo
+nome, como em arduino-pulsesensor.py.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200, body=None):
+        self.status_code = status_code
+        self._body = body or {}
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+class FakeSession:
+    """
+    Substitui requests.Session: responde cada POST com handler(url, json) e
+    guarda as requisições em `posts`.
+    """
+
+    def __init__(self, handler=None):
+        self.handler = handler or (lambda url, json: FakeResponse())
+        self.posts = []
+        self.headers = {}
+
+    def post(self, url, json=None, timeout=None):
+        self.posts.append((url, json))
+        return self.handler(url, json)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_client():
+    from bridge_uploader import BridgeMetrics, MeasurementClient
+
+    def make(handler=None):
+        client = MeasurementClient('http://api/measurements', BridgeMetrics())
+        client.session = FakeSession(handler)
+        return client
+    return make
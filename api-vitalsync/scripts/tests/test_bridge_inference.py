@@ -0,0 +1,68 @@
+"""
+Testes da inferência de FA no gateway (bridge_inference.py). Exigem as
+dependências de IA-VITALSYNC (numpy, scikit-learn, joblib).
+"""
+import queue
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('sklearn')
+joblib = pytest.importorskip('joblib')
+np = pytest.importorskip('numpy')
+
+from bridge_inference import DEFAULT_MODELS_DIR, IA_ROOT, EdgeAFMonitor, load_af_model  # noqa: E402
+from bridge_serial import DeviceConfig  # noqa: E402
+from bridge_uploader import BridgeMetrics  # noqa: E402
+from conftest import SCRIPTS_DIR  # noqa: E402
+
+sys.path.append(str(IA_ROOT / 'src'))
+from streaming_detector import WINDOW_MODEL_FILE  # noqa: E402
+
+
+def test_missing_window_model_is_refused(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_af_model(tmp_path)
+
+
+def test_artifact_without_marker_is_refused(tmp_path):
+    joblib.dump({'model': None, 'scaler': None}, tmp_path / WINDOW_MODEL_FILE)
+    with pytest.raises(ValueError):
+        load_af_model(tmp_path)
+
+
+def test_edge_af_without_window_model_is_a_usage_error(tmp_path):
+    result = subprocess.run([sys.executable, str(SCRIPTS_DIR / 'arduino-pulsesensor.py'), '--raw', '--edge-af',
+                             '--model-dir', str(tmp_path)], capture_output=True, text=True, timeout=120)
+    assert result.returncode == 2
+    assert '--edge-af desativado' in result.stderr
+
+
+def classify(monitor, device, rhythm, seed):
+    from synthetic_data import generate_rr_intervals
+
+    rr, _ = generate_rr_intervals(1800, rhythm, heart_rate=70.0, ectopic_rate=0.005,
+                                  rng=np.random.default_rng(seed))
+    beats = [(t, i == 0) for i, t in enumerate(1.7e9 + np.concatenate([[0.0], np.cumsum(rr)]))]
+    return [monitor._summarize(device, result) for result in monitor._classify(device, beats)]
+
+
+@pytest.mark.skipif(not (DEFAULT_MODELS_DIR / WINDOW_MODEL_FILE).exists(),
+                    reason='IA-VITALSYNC/models/window_model.pkl não treinado')
+def test_af_onset_needs_consecutive_af_windows():
+    model, scaler, detector_class, config = load_af_model()
+    monitor = EdgeAFMonitor(model, scaler, detector_class, queue.Queue(), BridgeMetrics(),
+                            feature_names=config['feature_names'])
+    device = DeviceConfig('/dev/fake', 'u1', mode='raw', sample_rate=100.0)
+
+    # Semente com extrassístoles que deixam algumas janelas seguidas perto de P(FA)=0.5
+    summaries = classify(monitor, device, 'sinus', seed=28)
+    assert monitor.detectors[device.port].sampling_freq == 100.0
+    assert summaries
+    assert not any(summary.af_onset for summary in summaries)
+    assert sum(summary.is_af for summary in summaries) / len(summaries) < 0.05
+
+    af_device = DeviceConfig('/dev/fake-af', 'u2', mode='raw', sample_rate=100.0)
+    summaries = classify(monitor, af_device, 'af', seed=1)
+    assert [i for i, summary in enumerate(summaries) if summary.af_onset] == [monitor.onset_windows - 1]
@@ -0,0 +1,53 @@
+"""
+Testes da leitura multiplexada das portas seriais (bridge_serial.py).
+"""
+import subprocess
+import sys
+
+from bridge_serial import DeviceConfig, DeviceState, SerialMultiplexer
+from bridge_uploader import _iso
+from conftest import SCRIPTS_DIR
+
+
+class FakeSerial:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    @property
+    def in_waiting(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size):
+        return self.chunks.pop(0) if self.chunks else b''
+
+
+def read_lines(chunks):
+    lines = []
+    multiplexer = SerialMultiplexer([], lambda device, line, timestamp: lines.append((line, timestamp)))
+    state = DeviceState(DeviceConfig('/dev/fake', 'u1'), ser=FakeSerial(chunks))
+    for _ in chunks:
+        multiplexer._read(state)
+    return lines
+
+
+def test_lines_from_one_read_get_distinct_timestamps():
+    lines = read_lines([b'BPM: 70\nBPM: 71\nBPM: 72\n', b'BPM: 73\n'])
+    assert [line for line, _ in lines] == ['BPM: 70', 'BPM: 71', 'BPM: 72', 'BPM: 73']
+
+    timestamps = [timestamp for _, timestamp in lines]
+    assert all(later > earlier for earlier, later in zip(timestamps, timestamps[1:]))
+    # Distintos também na resolução da API (milissegundos)
+    assert len({_iso(timestamp) for timestamp in timestamps}) == len(timestamps)
+
+
+def test_partial_lines_are_joined():
+    lines = read_lines([b'BPM: 7', b'0\nBPM:', b' 71\n'])
+    assert [line for line, _ in lines] == ['BPM: 70', 'BPM: 71']
+
+
+def test_bad_device_argument_is_a_usage_error():
+    result = subprocess.run([sys.executable, str(SCRIPTS_DIR / 'arduino-pulsesensor.py'), '--device', 'sem-usuario'],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 2
+    assert 'PORTA=USER_ID' in result.stderr
+    assert 'Traceback' not in result.stderr
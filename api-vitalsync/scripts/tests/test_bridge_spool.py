@@ -0,0 +1,121 @@
+"""
+Testes do spool em disco da ponte (bridge_spool.py): deduplicação, confirmação
+(ack) por tabela e isolamento de itens recusados pela API.
+"""
+import pytest
+
+from bridge_spool import ReadingSpool, SpoolReplayer
+from bridge_uploader import BridgeMetrics, Reading, RhythmSummary
+from conftest import FakeResponse
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool = ReadingSpool(str(tmp_path / 'spool.db'), metrics=BridgeMetrics())
+    yield spool
+    spool.close()
+
+
+def readings(n, user_id='u1', start=0.0):
+    return [Reading(user_id, 60 + i, start + i) for i in range(n)]
+
+
+def test_duplicates_are_ignored(tmp_path):
+    spool = ReadingSpool(str(tmp_path / 'spool.db'))
+    assert spool.append(readings(3)) == 3
+    assert spool.append(readings(3)) == 0
+    assert spool.append([Reading('u2', 70, 0.0)]) == 1
+    assert len(spool) == 4
+    spool.close()
+
+    reopened = ReadingSpool(str(tmp_path / 'spool.db'))
+    assert len(reopened) == 4
+    assert reopened.append(readings(3)) == 0
+    reopened.close()
+
+
+def test_ack_removes_only_confirmed_rows(spool):
+    spool.append(readings(5))
+    pending = spool.peek(3)
+    assert [reading.timestamp for _, reading in pending] == [0.0, 1.0, 2.0]
+
+    assert spool.ack(pending[-1][0]) == 3
+    assert [reading.timestamp for _, reading in spool.peek(10)] == [3.0, 4.0]
+    assert len(spool) == 2
+
+
+def test_max_rows_evicts_oldest(tmp_path):
+    metrics = BridgeMetrics()
+    spool = ReadingSpool(str(tmp_path / 'spool.db'), max_rows=3, metrics=metrics)
+    spool.append(readings(5))
+    assert [reading.timestamp for _, reading in spool.peek(10)] == [2.0, 3.0, 4.0]
+    assert metrics.snapshot()['spool_evicted'] == 2
+    spool.close()
+
+
+def test_replayer_sends_and_acks_each_table(spool, make_client):
+    def handler(url, json):
+        return FakeResponse(503) if url.endswith('/batch') else FakeResponse()
+
+    client = make_client(handler)
+    spool.append(readings(2) + [RhythmSummary('u1', 0.0, 30.0, 40, 72.0, 0.1, False, False)])
+    replayer = SpoolReplayer(client, spool)
+
+    assert replayer._replay_once() == (True, False)
+    assert spool.peek_rhythm(10) == []
+    assert len(spool.peek(10)) == 2
+
+
+def test_rejected_item_is_isolated_and_dead_lettered(spool, make_client):
+    def handler(url, json):
+        if any(item['heartRate'] == 63 for item in json['measurements']):
+            return FakeResponse(400)
+        return FakeResponse()
+
+    client = make_client(handler)
+    spool.append(readings(8))
+    replayer = SpoolReplayer(client, spool)
+
+    assert replayer._replay_once() == (True, True)
+    assert len(spool) == 0
+    accepted = [json['measurements'] for _, json in client.session.posts
+                if all(item['heartRate'] != 63 for item in json['measurements'])]
+    assert sorted(item['heartRate'] for batch in accepted for item in batch) == [60, 61, 62, 64, 65, 66, 67]
+    assert [(table, payload['heartRate'], status) for table, payload, status in spool.dead_letters()] == [
+        ('readings', 63, 400)
+    ]
+    assert spool.metrics.snapshot()['rejected'] == 1
+    assert replayer._replay_once() == (False, True)
+
+
+def test_transient_errors_keep_rows(spool, make_client):
+    client = make_client(lambda url, json: FakeResponse(500))
+    spool.append(readings(4))
+    replayer = SpoolReplayer(client, spool)
+
+    assert replayer._replay_once() == (True, False)
+    assert len(spool) == 4
+    assert spool.dead_letters() == []
+    assert len(client.session.posts) == 1
+
+
+def test_unknown_user_does_not_stall_other_users(spool, make_client):
+    # userId desconhecido: a API responde 422 (Prisma P2023/P2025) para todo lote que o contém
+    def handler(url, json):
+        if any(item['userId'] == 'bad' for item in json['measurements']):
+            return FakeResponse(422)
+        return FakeResponse()
+
+    client = make_client(handler)
+    for i in range(4):
+        spool.append(readings(1, 'u1', start=i) + readings(1, 'bad', start=i) + readings(1, 'u2', start=i))
+    replayer = SpoolReplayer(client, spool)
+
+    assert replayer._replay_once() == (True, True)
+    assert len(spool) == 0
+    delivered = [(item['userId'], item['heartRate']) for _, json in client.session.posts
+                 if all(item['userId'] != 'bad' for item in json['measurements'])
+                 for item in json['measurements']]
+    assert sorted(delivered) == [('u1', 60)] * 4 + [('u2', 60)] * 4
+    assert [(payload['userId'], status) for _, payload, status in spool.dead_letters()] == [('bad', 422)] * 4
+    assert spool.metrics.snapshot()['rejected'] == 4
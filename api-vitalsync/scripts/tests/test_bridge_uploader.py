@@ -0,0 +1,89 @@
+"""
+Testes do envio em lotes da ponte (bridge_uploader.py).
+"""
+import queue
+import time
+
+from bridge_uploader import BatchUploader, IntervalBatch, Reading, RhythmSummary
+from conftest import FakeResponse
+
+
+def mixed_batch():
+    return [
+        RhythmSummary('u1', 0.0, 30.0, 40, 72.0, 0.1, False, False),
+        Reading('u1', 72, 1.0),
+        Reading('u1', 73, 2.0),
+        IntervalBatch('u1', 0.0, [800, 810]),
+    ]
+
+
+def test_send_items_returns_nothing_when_all_sent(make_client):
+    client = make_client()
+    assert client.send_items(mixed_batch()) == []
+    assert [url for url, _ in client.session.posts] == [
+        'http://api/measurements/rhythm', 'http://api/measurements/batch', 'http://api/measurements/intervals'
+    ]
+
+
+def test_send_items_keeps_only_unsent_parts(make_client):
+    fail_readings = True
+
+    def handler(url, json):
+        if url.endswith('/batch') and fail_readings:
+            return FakeResponse(503)
+        return FakeResponse()
+
+    client = make_client(handler)
+    remaining = client.send_items(mixed_batch())
+    assert [type(item).__name__ for item in remaining] == ['Reading', 'Reading', 'IntervalBatch']
+
+    fail_readings = False
+    client.session.posts.clear()
+    assert client.send_items(remaining) == []
+    assert [url for url, _ in client.session.posts] == [
+        'http://api/measurements/batch', 'http://api/measurements/intervals'
+    ]
+    assert client.metrics.snapshot()['rhythm_sent'] == 1
+
+
+def reject_user(user_id):
+    """
+    API que recusa (400) qualquer requisição com itens de user_id.
+    """
+    def handler(url, json):
+        items = next(iter(json.values())) if isinstance(json, dict) and len(json) == 1 else [json]
+        if any(item.get('userId') == user_id for item in items):
+            return FakeResponse(400)
+        return FakeResponse()
+    return handler
+
+
+def test_uploader_drops_rejected_items_instead_of_retrying(make_client):
+    client = make_client(reject_user('bad'))
+    readings = queue.Queue()
+    for i in range(10):
+        readings.put(Reading('bad' if i == 3 else 'u1', 70 + i, float(i)))
+    readings.put(IntervalBatch('u1', 0.0, [800, 810]))
+
+    uploader = BatchUploader(client, readings, batch_size=20, max_delay=0.01, max_backoff=0.05)
+    uploader.start()
+    deadline = time.monotonic() + 5
+    while client.metrics.snapshot()['sent'] < 9 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    uploader.stop()
+
+    metrics = client.metrics.snapshot()
+    assert metrics['sent'] == 9
+    assert metrics['rejected'] == 1
+    assert metrics['beats_sent'] == 2
+    sent_rates = {item['heartRate'] for url, body in client.session.posts if url.endswith('/batch')
+                  for item in body['measurements'] if item['userId'] == 'u1'}
+    assert sent_rates == {70, 71, 72, 74, 75, 76, 77, 78, 79}
+
+
+def test_uploader_keeps_transient_failures_for_retry(make_client):
+    client = make_client(lambda url, json: FakeResponse(503))
+    uploader = BatchUploader(client, queue.Queue())
+    batch = [Reading('u1', 72, 1.0), Reading('u1', 73, 2.0)]
+    assert uploader._send(batch) == batch
+    assert client.metrics.snapshot()['rejected'] == 0
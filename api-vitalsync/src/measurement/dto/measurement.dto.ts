@@ -1,5 +1,20 @@
 import { ApiProperty } from '@nestjs/swagger';
-import { IsInt, IsNotEmpty, IsOptional } from 'class-validator';
+import { Type } from 'class-transformer';
+import {
+  ArrayMaxSize,
+  ArrayMinSize,
+  IsArray,
+  IsBoolean,
+  IsDateString,
+  IsInt,
+  IsMongoId,
+  IsNumber,
+  IsNotEmpty,
+  IsOptional,
+  Max,
+  Min,
+  ValidateNested,
+} from 'class-validator';
 
 export class CreateMeasurementDto {
   @ApiProperty({
@@ -17,7 +32,202 @@ export class CreateMeasurementDto {
     required: false,
   })
   @IsOptional()
+  @IsMongoId()
   userId?: string;
+
+  @ApiProperty({
+    description:
+      'Data e hora da leitura no dispositivo (opcional, padrão: horário de recebimento)',
+    example: '2025-11-20T14:30:00.000Z',
+    required: false,
+  })
+  @IsOptional()
+  @IsDateString()
+  timestamp?: string;
+}
+
+export class CreateMeasurementBatchDto {
+  @ApiProperty({
+    description: 'Medições a registrar (máximo 1000 por requisição)',
+    type: [CreateMeasurementDto],
+  })
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(1000)
+  @ValidateNested({ each: true })
+  @Type(() => CreateMeasurementDto)
+  measurements: CreateMeasurementDto[];
+}
+
+export class MeasurementBatchResponseDto {
+  @ApiProperty({ description: 'Número de medições registradas', example: 50 })
+  count: number;
+
+  @ApiProperty({
+    description:
+      'Medições ignoradas por já existirem (mesmo usuário e timestamp)',
+    example: 0,
+  })
+  duplicates: number;
+}
+
+export class CreateBeatIntervalsDto {
+  @ApiProperty({
+    description: 'ID do usuário (opcional, pode vir do token)',
+    example: '663d9b15d11aac5f406697a5',
+    required: false,
+  })
+  @IsOptional()
+  @IsMongoId()
+  userId?: string;
+
+  @ApiProperty({
+    description: 'Data e hora do primeiro batimento da sequência',
+    example: '2025-11-20T14:30:00.000Z',
+  })
+  @IsDateString()
+  start: string;
+
+  @ApiProperty({
+    description: 'Intervalos entre batimentos consecutivos (ms)',
+    example: [812, 790, 845],
+    type: [Number],
+  })
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(1000)
+  @IsInt({ each: true })
+  @Min(200, { each: true })
+  @Max(3000, { each: true })
+  intervalsMs: number[];
+}
+
+export class CreateBeatIntervalsBatchDto {
+  @ApiProperty({
+    description: 'Sequências de intervalos a registrar (máximo 500 por requisição)',
+    type: [CreateBeatIntervalsDto],
+  })
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(500)
+  @ValidateNested({ each: true })
+  @Type(() => CreateBeatIntervalsDto)
+  batches: CreateBeatIntervalsDto[];
+}
+
+export class BeatIntervalsResponseDto {
+  @ApiProperty({ description: 'ID único da sequência' })
+  id: string;
+
+  @ApiProperty({ description: 'Data e hora do primeiro batimento', type: Date })
+  start: Date;
+
+  @ApiProperty({
+    description: 'Intervalos entre batimentos (ms)',
+    type: [Number],
+  })
+  intervalsMs: number[];
+
+  @ApiProperty({ description: 'ID do usuário associado' })
+  userId: string;
+}
+
+export class CreateRhythmSummaryDto {
+  @ApiProperty({
+    description: 'ID do usuário (opcional, pode vir do token)',
+    example: '663d9b15d11aac5f406697a5',
+    required: false,
+  })
+  @IsOptional()
+  @IsMongoId()
+  userId?: string;
+
+  @ApiProperty({
+    description: 'Data e hora do primeiro batimento da janela',
+    example: '2025-11-20T14:29:10.000Z',
+  })
+  @IsDateString()
+  start: string;
+
+  @ApiProperty({
+    description: 'Data e hora do último batimento da janela',
+    example: '2025-11-20T14:30:00.000Z',
+  })
+  @IsDateString()
+  end: string;
+
+  @ApiProperty({
+    description: 'Intervalos entre batimentos na janela',
+    example: 60,
+  })
+  @IsInt()
+  @Min(1)
+  numIntervals: number;
+
+  @ApiProperty({
+    description: 'Frequência cardíaca média da janela (BPM)',
+    example: 72.5,
+  })
+  @IsNumber()
+  @Min(0)
+  meanHeartRate: number;
+
+  @ApiProperty({
+    description: 'Probabilidade de FA estimada pelo modelo',
+    example: 0.12,
+  })
+  @IsNumber()
+  @Min(0)
+  @Max(1)
+  probabilityAf: number;
+
+  @ApiProperty({ description: 'Janela classificada como FA' })
+  @IsBoolean()
+  isAf: boolean;
+
+  @ApiProperty({
+    description: 'Primeira janela com FA após uma janela sem FA (gera alerta)',
+    required: false,
+  })
+  @IsOptional()
+  @IsBoolean()
+  afOnset?: boolean;
+}
+
+export class CreateRhythmSummaryBatchDto {
+  @ApiProperty({
+    description: 'Janelas classificadas no gateway (máximo 1000 por requisição)',
+    type: [CreateRhythmSummaryDto],
+  })
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(1000)
+  @ValidateNested({ each: true })
+  @Type(() => CreateRhythmSummaryDto)
+  summaries: CreateRhythmSummaryDto[];
+}
+
+export class RhythmSummaryResponseDto {
+  @ApiProperty({ description: 'ID único da janela' })
+  id: string;
+
+  @ApiProperty({ description: 'Início da janela', type: Date })
+  start: Date;
+
+  @ApiProperty({ description: 'Fim da janela', type: Date })
+  end: Date;
+
+  @ApiProperty({ description: 'Frequência cardíaca média (BPM)' })
+  meanHeartRate: number;
+
+  @ApiProperty({ description: 'Probabilidade de FA' })
+  probabilityAf: number;
+
+  @ApiProperty({ description: 'Janela classificada como FA' })
+  isAf: boolean;
+
+  @ApiProperty({ description: 'ID do usuário associado' })
+  userId: string;
 }
 
 export class MeasurementResponseDto {
@@ -9,7 +9,13 @@ import {
 } from '@nestjs/common';
 import { MeasurementService } from './measurement.service';
 import {
+  BeatIntervalsResponseDto,
+  CreateBeatIntervalsBatchDto,
+  CreateMeasurementBatchDto,
+  CreateRhythmSummaryBatchDto,
+  RhythmSummaryResponseDto,
   CreateMeasurementDto,
+  MeasurementBatchResponseDto,
   MeasurementResponseDto,
 } from './dto/measurement.dto';
 import {
@@ -48,6 +54,103 @@ export class MeasurementController {
     );
   }
 
+  @Post('batch')
+  //@UseGuards(AuthGuard)
+  @ApiOperation({
+    summary: 'Registra várias medições de BPM em uma única requisição',
+  })
+  @ApiBody({ type: CreateMeasurementBatchDto })
+  @ApiResponse({
+    status: 201,
+    description: 'Medições registradas com sucesso',
+    type: MeasurementBatchResponseDto,
+  })
+  async createBatch(
+    @Body() createMeasurementBatchDto: CreateMeasurementBatchDto,
+    @GetUser('id') userId: string,
+  ): Promise<MeasurementBatchResponseDto> {
+    return this.measurementService.createMeasurements(
+      createMeasurementBatchDto.measurements,
+      userId,
+    );
+  }
+
+  @Post('intervals')
+  //@UseGuards(AuthGuard)
+  @ApiOperation({
+    summary: 'Registra intervalos entre batimentos detectados no gateway',
+  })
+  @ApiBody({ type: CreateBeatIntervalsBatchDto })
+  @ApiResponse({
+    status: 201,
+    description: 'Intervalos registrados com sucesso',
+    type: MeasurementBatchResponseDto,
+  })
+  async createIntervals(
+    @Body() createBeatIntervalsBatchDto: CreateBeatIntervalsBatchDto,
+    @GetUser('id') userId: string,
+  ): Promise<MeasurementBatchResponseDto> {
+    return this.measurementService.createBeatIntervals(
+      createBeatIntervalsBatchDto.batches,
+      userId,
+    );
+  }
+
+  @Get('intervals')
+  //@UseGuards(AuthGuard)
+  @ApiOperation({
+    summary: 'Obtém os intervalos entre batimentos de um período (horas)',
+  })
+  @ApiResponse({
+    status: 200,
+    description: 'Sequências de intervalos no período especificado',
+    type: [BeatIntervalsResponseDto],
+  })
+  async findIntervals(
+    @GetUser('id') userId: string,
+    @Query('hours', ParseIntPipe) hours: number,
+  ): Promise<BeatIntervalsResponseDto[]> {
+    return this.measurementService.getBeatIntervalsByUser(userId, hours);
+  }
+
+  @Post('rhythm')
+  //@UseGuards(AuthGuard)
+  @ApiOperation({
+    summary: 'Registra janelas de ritmo classificadas no gateway (FA)',
+  })
+  @ApiBody({ type: CreateRhythmSummaryBatchDto })
+  @ApiResponse({
+    status: 201,
+    description: 'Janelas registradas; inícios de FA geram alertas',
+    type: MeasurementBatchResponseDto,
+  })
+  async createRhythm(
+    @Body() createRhythmSummaryBatchDto: CreateRhythmSummaryBatchDto,
+    @GetUser('id') userId: string,
+  ): Promise<MeasurementBatchResponseDto> {
+    return this.measurementService.createRhythmSummaries(
+      createRhythmSummaryBatchDto.summaries,
+      userId,
+    );
+  }
+
+  @Get('rhythm')
+  //@UseGuards(AuthGuard)
+  @ApiOperation({
+    summary: 'Obtém as janelas de ritmo de um período (horas)',
+  })
+  @ApiResponse({
+    status: 200,
+    description: 'Janelas classificadas no período especificado',
+    type: [RhythmSummaryResponseDto],
+  })
+  async findRhythm(
+    @GetUser('id') userId: string,
+    @Query('hours', ParseIntPipe) hours: number,
+  ): Promise<RhythmSummaryResponseDto[]> {
+    return this.measurementService.getRhythmSummariesByUser(userId, hours);
+  }
+
   @Get()
   //@UseGuards(AuthGuard)
   @ApiOperation({ summary: 'Lista todas as medições do usuário' })
@@ -2,7 +2,12 @@ import { Injectable } from '@nestjs/common';
 import { PrismaService } from '../prisma/prisma.service';
 import { AlertService } from '../alert/alert.service';
 import { DailySummaryService } from '../daily-summary/daily-summary.service';
-import { CreateMeasurementDto } from './dto/measurement.dto';
+import { AlertType } from '@prisma/client';
+import {
+  CreateBeatIntervalsDto,
+  CreateMeasurementDto,
+  CreateRhythmSummaryDto,
+} from './dto/measurement.dto';
 
 @Injectable()
 export class MeasurementService {
@@ -22,6 +27,9 @@ export class MeasurementService {
       const measurement = await this.prisma.measurement.create({
         data: {
           heartRate: createMeasurementDto.heartRate,
+          timestamp: createMeasurementDto.timestamp
+            ? new Date(createMeasurementDto.timestamp)
+            : undefined,
           user: { connect: { id: userId || createMeasurementDto.userId } },
         },
         include: { user: { select: { id: true } } },
@@ -45,6 +53,241 @@ export class MeasurementService {
     }
   }
 
+  async createMeasurements(
+    createMeasurementDtos: CreateMeasurementDto[],
+    userId?: string,
+  ) {
+    try {
+      const fresh = await this.filterDuplicateMeasurements(
+        createMeasurementDtos,
+        userId,
+      );
+
+      const measurements = await this.prisma.$transaction(
+        fresh.map((dto) =>
+          this.prisma.measurement.create({
+            data: {
+              heartRate: dto.heartRate,
+              timestamp: dto.timestamp ? new Date(dto.timestamp) : undefined,
+              user: { connect: { id: userId || dto.userId } },
+            },
+            select: { id: true, heartRate: true, userId: true },
+          }),
+        ),
+      );
+
+      for (const measurement of measurements) {
+        await this.alertService.checkForHeartRateAlert(
+          measurement.userId,
+          measurement.heartRate,
+          measurement.id,
+        );
+      }
+
+      // Resumo diário uma vez por usuário do lote, não por medição
+      const userIds = new Set(measurements.map((m) => m.userId));
+      for (const id of userIds) {
+        await this.dailySummaryService.generateDailySummary(id);
+      }
+
+      return {
+        count: measurements.length,
+        duplicates: createMeasurementDtos.length - fresh.length,
+      };
+    } catch (error) {
+      console.error('Erro ao criar medições em lote:', error);
+      throw error;
+    }
+  }
+
+  // Remove medições com (usuário, timestamp) já registrados ou repetidos no
+  // próprio lote, para que o reenvio de um lote (ex.: resposta perdida na
+  // rede) não duplique o histórico
+  private async filterDuplicateMeasurements(
+    createMeasurementDtos: CreateMeasurementDto[],
+    userId?: string,
+  ): Promise<CreateMeasurementDto[]> {
+    const timestampsByUser = new Map<string, Date[]>();
+    for (const dto of createMeasurementDtos) {
+      if (!dto.timestamp) continue;
+      const id = userId || dto.userId;
+      const timestamps = timestampsByUser.get(id) ?? [];
+      timestamps.push(new Date(dto.timestamp));
+      timestampsByUser.set(id, timestamps);
+    }
+
+    const existing = timestampsByUser.size
+      ? await this.prisma.measurement.findMany({
+          where: {
+            OR: [...timestampsByUser].map(([id, timestamps]) => ({
+              userId: id,
+              timestamp: { in: timestamps },
+            })),
+          },
+          select: { userId: true, timestamp: true },
+        })
+      : [];
+
+    const seen = new Set(
+      existing.map((m) => `${m.userId}|${m.timestamp.getTime()}`),
+    );
+    return createMeasurementDtos.filter((dto) => {
+      if (!dto.timestamp) return true;
+      const key = `${userId || dto.userId}|${new Date(dto.timestamp).getTime()}`;
+      if (seen.has(key)) return false;
+      seen.add(key);
+      return true;
+    });
+  }
+
+  async createBeatIntervals(
+    createBeatIntervalsDtos: CreateBeatIntervalsDto[],
+    userId?: string,
+  ) {
+    try {
+      // Reenvios da ponte repetem (userId, start): ignorar o que já existe
+      const existing = await this.prisma.beatIntervals.findMany({
+        where: {
+          OR: createBeatIntervalsDtos.map((dto) => ({
+            userId: userId || dto.userId,
+            start: new Date(dto.start),
+          })),
+        },
+        select: { userId: true, start: true },
+      });
+      const seen = new Set(
+        existing.map((b) => `${b.userId}|${b.start.getTime()}`),
+      );
+      const fresh = createBeatIntervalsDtos.filter((dto) => {
+        const key = `${userId || dto.userId}|${new Date(dto.start).getTime()}`;
+        if (seen.has(key)) return false;
+        seen.add(key);
+        return true;
+      });
+
+      const { count } = fresh.length
+        ? await this.prisma.beatIntervals.createMany({
+            data: fresh.map((dto) => ({
+              userId: userId || dto.userId,
+              start: new Date(dto.start),
+              intervalsMs: dto.intervalsMs,
+            })),
+          })
+        : { count: 0 };
+
+      return {
+        count,
+        duplicates: createBeatIntervalsDtos.length - fresh.length,
+      };
+    } catch (error) {
+      console.error('Erro ao registrar intervalos entre batimentos:', error);
+      throw error;
+    }
+  }
+
+  async getBeatIntervalsByUser(userId: string, hours: number = 24) {
+    const dateFilter = new Date();
+    dateFilter.setHours(dateFilter.getHours() - hours);
+
+    return this.prisma.beatIntervals.findMany({
+      where: {
+        userId,
+        start: { gte: dateFilter },
+      },
+      orderBy: { start: 'asc' },
+      select: {
+        id: true,
+        start: true,
+        intervalsMs: true,
+        userId: true,
+      },
+    });
+  }
+
+  async createRhythmSummaries(
+    createRhythmSummaryDtos: CreateRhythmSummaryDto[],
+    userId?: string,
+  ) {
+    try {
+      // Reenvios da ponte repetem (userId, end): ignorar o que já existe
+      const existing = await this.prisma.rhythmSummary.findMany({
+        where: {
+          OR: createRhythmSummaryDtos.map((dto) => ({
+            userId: userId || dto.userId,
+            end: new Date(dto.end),
+          })),
+        },
+        select: { userId: true, end: true },
+      });
+      const seen = new Set(
+        existing.map((r) => `${r.userId}|${r.end.getTime()}`),
+      );
+      const fresh = createRhythmSummaryDtos.filter((dto) => {
+        const key = `${userId || dto.userId}|${new Date(dto.end).getTime()}`;
+        if (seen.has(key)) return false;
+        seen.add(key);
+        return true;
+      });
+
+      const { count } = fresh.length
+        ? await this.prisma.rhythmSummary.createMany({
+            data: fresh.map((dto) => ({
+              userId: userId || dto.userId,
+              start: new Date(dto.start),
+              end: new Date(dto.end),
+              numIntervals: dto.numIntervals,
+              meanHeartRate: dto.meanHeartRate,
+              probabilityAf: dto.probabilityAf,
+              isAf: dto.isAf,
+              afOnset: dto.afOnset ?? false,
+            })),
+          })
+        : { count: 0 };
+
+      // Um alerta por episódio (a ponte marca a primeira janela com FA)
+      for (const dto of fresh) {
+        if (!dto.isAf || !dto.afOnset) continue;
+        await this.alertService.createAlert(userId || dto.userId, {
+          type: AlertType.CRITICAL,
+          message:
+            `Possível fibrilação atrial detectada ` +
+            `(probabilidade ${(dto.probabilityAf * 100).toFixed(0)}%, ` +
+            `FC média ${Math.round(dto.meanHeartRate)} bpm)`,
+        });
+      }
+
+      return {
+        count,
+        duplicates: createRhythmSummaryDtos.length - fresh.length,
+      };
+    } catch (error) {
+      console.error('Erro ao registrar janelas de ritmo:', error);
+      throw error;
+    }
+  }
+
+  async getRhythmSummariesByUser(userId: string, hours: number = 24) {
+    const dateFilter = new Date();
+    dateFilter.setHours(dateFilter.getHours() - hours);
+
+    return this.prisma.rhythmSummary.findMany({
+      where: {
+        userId,
+        end: { gte: dateFilter },
+      },
+      orderBy: { end: 'asc' },
+      select: {
+        id: true,
+        start: true,
+        end: true,
+        meanHeartRate: true,
+        probabilityAf: true,
+        isAf: true,
+        userId: true,
+      },
+    });
+  }
+
   async getMeasurementsByUser(userId: string, hours: number = 24) {
     const dateFilter = new Date();
     dateFilter.setHours(dateFilter.getHours() - hours);
@@ -0,0 +1,33 @@
+import {
+  ArgumentsHost,
+  Catch,
+  UnprocessableEntityException,
+} from '@nestjs/common';
+import { BaseExceptionFilter } from '@nestjs/core';
+import { Prisma } from '@prisma/client';
+
+// Erros causados pelos dados enviados, não pelo servidor:
+// P2023 = id em formato inválido, P2025 = registro relacionado inexistente
+// (ex.: connect com um userId desconhecido)
+const UNPROCESSABLE_CODES = new Set(['P2023', 'P2025']);
+
+// Responde 422 para esses erros em vez de 500: clientes como a ponte serial
+// tratam 5xx como falha transitória e reenviariam o mesmo lote para sempre
+@Catch(Prisma.PrismaClientKnownRequestError)
+export class PrismaExceptionFilter extends BaseExceptionFilter {
+  catch(exception: Prisma.PrismaClientKnownRequestError, host: ArgumentsHost) {
+    if (!UNPROCESSABLE_CODES.has(exception.code)) {
+      return super.catch(exception, host);
+    }
+
+    const cause = exception.meta?.cause;
+    const message =
+      typeof cause === 'string'
+        ? cause
+        : 'Registro relacionado inválido ou inexistente';
+    return super.catch(
+      new UnprocessableEntityException(`${message} (${exception.code})`),
+      host,
+    );
+  }
+}